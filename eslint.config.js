@@ -30,4 +30,25 @@ export default defineConfig([
       'react-refresh/only-export-components': ['warn', { allowConstantExport: true }],
     },
   },
+  {
+    // Build tooling runs in Node
+    files: ['vite.config.js', 'scripts/**/*.js'],
+    languageOptions: {
+      globals: globals.node,
+    },
+  },
+  {
+    // Web workers have no DOM (self, OffscreenCanvas, postMessage)
+    files: ['src/**/*.worker.js'],
+    languageOptions: {
+      globals: globals.worker,
+    },
+  },
+  {
+    // The service worker (not bundled, see scripts/serviceWorker.js)
+    files: ['src/sw.js'],
+    languageOptions: {
+      globals: globals.serviceworker,
+    },
+  },
 ])
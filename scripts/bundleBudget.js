@@ -0,0 +1,146 @@
+/**
+ * Initial-load bundle budget
+ *
+ * The initial load is everything dist/index.html pulls in before the app can
+ * render: the entry script, its modulepreloaded imports and stylesheets.
+ * Pages, editors and other lazy chunks are not part of it.
+ *
+ * - As a Vite plugin (see vite.config.js) it runs after every `vite build`
+ *   and fails the build when the gzipped initial JS exceeds the budget.
+ * - As a script it reports on an existing build:
+ *     node scripts/bundleBudget.js [dist] [--budget 150] [--json]
+ *
+ * BUNDLE_BUDGET_KB overrides the budget in both modes.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+import zlib from 'node:zlib';
+import { fileURLToPath } from 'node:url';
+
+export const DEFAULT_BUDGET_KB = 150;
+
+// First-load estimate: HTML round trips plus the initial assets over each link
+const NETWORK_PROFILES = [
+  { name: 'Slow 4G', rttMs: 150, kbps: 1600 },
+  { name: '4G', rttMs: 70, kbps: 9000 },
+  { name: 'Broadband', rttMs: 20, kbps: 50000 },
+];
+
+const ASSET_REF = /<(script|link)\b[^>]*?\b(?:src|href)="([^"]+\.(?:js|css))"[^>]*>/g;
+
+const gzipSize = (buffer) => zlib.gzipSync(buffer, { level: 9 }).length;
+
+const budgetFromEnv = (fallback) => {
+  const value = Number(process.env.BUNDLE_BUDGET_KB);
+  return value > 0 ? value : fallback;
+};
+
+const fileEntry = (outDir, ref) => {
+  const file = path.join(outDir, ref.replace(/^\//, ''));
+  const buffer = fs.readFileSync(file);
+  return { file: path.relative(outDir, file), bytes: buffer.length, gzip: gzipSize(buffer) };
+};
+
+export function analyzeInitialLoad(outDir) {
+  const htmlBuffer = fs.readFileSync(path.join(outDir, 'index.html'));
+  const html = htmlBuffer.toString('utf8');
+
+  const initial = [];
+  const seen = new Set();
+  for (const [, , ref] of html.matchAll(ASSET_REF)) {
+    if (/^https?:/.test(ref) || seen.has(ref)) continue;
+    seen.add(ref);
+    initial.push({ ...fileEntry(outDir, ref), type: ref.endsWith('.css') ? 'css' : 'js' });
+  }
+
+  // Everything else under assets/ only loads on demand
+  const assetsDir = path.join(outDir, 'assets');
+  const initialFiles = new Set(initial.map(entry => entry.file));
+  const lazy = fs.existsSync(assetsDir)
+    ? fs.readdirSync(assetsDir)
+      .filter(name => name.endsWith('.js') && !initialFiles.has(path.join('assets', name)))
+      .map(name => fileEntry(outDir, `/assets/${name}`))
+      .sort((a, b) => b.gzip - a.gzip)
+    : [];
+
+  const sum = (entries, key) => entries.reduce((total, entry) => total + entry[key], 0);
+  const js = initial.filter(entry => entry.type === 'js');
+  const css = initial.filter(entry => entry.type === 'css');
+  const htmlGzip = gzipSize(htmlBuffer);
+  const transferBytes = htmlGzip + sum(initial, 'gzip');
+
+  return {
+    initial,
+    lazy,
+    totals: {
+      jsBytes: sum(js, 'bytes'),
+      jsGzip: sum(js, 'gzip'),
+      cssGzip: sum(css, 'gzip'),
+      lazyJsGzip: sum(lazy, 'gzip'),
+      transferBytes,
+    },
+    firstLoad: NETWORK_PROFILES.map(({ name, rttMs, kbps }) => ({
+      profile: name,
+      // connect + HTML, then the assets in parallel; kbps == bits per millisecond
+      ms: Math.round(rttMs * 3 + (transferBytes * 8) / kbps),
+    })),
+  };
+}
+
+const kb = (bytes) => `${(bytes / 1024).toFixed(1)} kB`;
+
+export function formatReport(report, budgetKb) {
+  const lines = ['', 'Initial load (gzip):'];
+  for (const entry of report.initial) {
+    lines.push(`  ${entry.file.padEnd(48)} ${kb(entry.gzip).padStart(10)}`);
+  }
+  lines.push(`  ${'initial JS'.padEnd(48)} ${kb(report.totals.jsGzip).padStart(10)}  (budget ${budgetKb} kB)`);
+  lines.push(`  ${'lazy JS (on demand)'.padEnd(48)} ${kb(report.totals.lazyJsGzip).padStart(10)} in ${report.lazy.length} chunks`);
+  lines.push('First-load estimate:');
+  for (const { profile, ms } of report.firstLoad) {
+    lines.push(`  ${profile.padEnd(48)} ${`${ms} ms`.padStart(10)}`);
+  }
+  return lines.join('\n');
+}
+
+const overBudget = (report, budgetKb) => report.totals.jsGzip > budgetKb * 1024;
+
+export function bundleBudget({ budgetKb = DEFAULT_BUDGET_KB } = {}) {
+  let outDir;
+  const budget = budgetFromEnv(budgetKb);
+  return {
+    name: 'bundle-budget',
+    apply: 'build',
+    configResolved(config) {
+      outDir = path.resolve(config.root, config.build.outDir);
+    },
+    closeBundle() {
+      if (!fs.existsSync(path.join(outDir, 'index.html'))) return;
+      const report = analyzeInitialLoad(outDir);
+      console.log(formatReport(report, budget));
+      if (overBudget(report, budget)) {
+        throw new Error(`Initial JS is ${kb(report.totals.jsGzip)} gzipped, over the ${budget} kB budget`);
+      }
+    },
+  };
+}
+
+// CLI
+if (process.argv[1] && path.resolve(process.argv[1]) === fileURLToPath(import.meta.url)) {
+  const args = process.argv.slice(2);
+  const flag = (name) => {
+    const index = args.indexOf(name);
+    return index === -1 ? undefined : args.splice(index, 2)[1];
+  };
+  const budget = Number(flag('--budget')) || budgetFromEnv(DEFAULT_BUDGET_KB);
+  const json = args.includes('--json');
+  const outDir = path.resolve(args.find(arg => !arg.startsWith('--')) || 'dist');
+
+  const report = analyzeInitialLoad(outDir);
+  console.log(json ? JSON.stringify({ budgetKb: budget, ...report }, null, 2) : formatReport(report, budget));
+  if (overBudget(report, budget)) {
+    console.error(`\n✗ Initial JS over the ${budget} kB budget`);
+    process.exit(1);
+  }
+}
@@ -0,0 +1,84 @@
+/**
+ * Precompressed build output
+ *
+ * Vite plugin: after `vite build`, writes `<file>.br` (Brotli, max quality)
+ * and `<file>.gz` (gzip -9) next to every compressible file in dist/, so the
+ * server can send them as-is (server/lib/staticAssets.js) instead of
+ * compressing the same bytes on every request. Variants that would not be
+ * smaller than the original are skipped.
+ */
+
+import fs from 'node:fs/promises';
+import path from 'node:path';
+import zlib from 'node:zlib';
+import { promisify } from 'node:util';
+
+const brotli = promisify(zlib.brotliCompress);
+const gzip = promisify(zlib.gzip);
+
+const COMPRESSIBLE = /\.(js|mjs|css|html|svg|json|txt|xml|webmanifest|ico|map)$/;
+const MIN_BYTES = 1024;
+
+async function* walk(dir) {
+  for (const entry of await fs.readdir(dir, { withFileTypes: true })) {
+    const full = path.join(dir, entry.name);
+    if (entry.isDirectory()) yield* walk(full);
+    else yield full;
+  }
+}
+
+async function compressFile(file) {
+  const source = await fs.readFile(file);
+  if (source.length < MIN_BYTES) return { br: 0, gz: 0, bytes: source.length };
+  const [br, gz] = await Promise.all([
+    brotli(source, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: source.length,
+      },
+    }),
+    gzip(source, { level: 9 }),
+  ]);
+  const written = { bytes: source.length, br: 0, gz: 0 };
+  if (br.length < source.length) {
+    await fs.writeFile(`${file}.br`, br);
+    written.br = br.length;
+  }
+  if (gz.length < source.length) {
+    await fs.writeFile(`${file}.gz`, gz);
+    written.gz = gz.length;
+  }
+  return written;
+}
+
+export async function precompressDir(outDir) {
+  const files = [];
+  for await (const file of walk(outDir)) {
+    if (COMPRESSIBLE.test(file)) files.push(file);
+  }
+  const results = await Promise.all(files.map(compressFile));
+  return results.reduce((totals, { bytes, br, gz }) => ({
+    files: totals.files + (br || gz ? 1 : 0),
+    bytes: totals.bytes + (br || gz ? bytes : 0),
+    br: totals.br + br,
+    gz: totals.gz + gz,
+  }), { files: 0, bytes: 0, br: 0, gz: 0 });
+}
+
+export function precompress() {
+  let outDir;
+  return {
+    name: 'precompress',
+    apply: 'build',
+    configResolved(config) {
+      outDir = path.resolve(config.root, config.build.outDir);
+    },
+    async closeBundle() {
+      const started = Date.now();
+      const totals = await precompressDir(outDir);
+      const kb = (bytes) => `${(bytes / 1024).toFixed(1)} kB`;
+      console.log(`\nPrecompressed ${totals.files} files (${kb(totals.bytes)}): ` +
+        `brotli ${kb(totals.br)}, gzip ${kb(totals.gz)} in ${Date.now() - started}ms`);
+    },
+  };
+}
@@ -0,0 +1,55 @@
+/**
+ * Service worker build step
+ *
+ * Vite plugin: emits dist/sw.js from src/sw.js with the precache list filled
+ * in: index.html, every file of the build and the public/ files. The version
+ * hashes that list (build file names carry content hashes), the contents of
+ * the unhashed files and the worker source, so every build that changes
+ * anything installs a new worker and drops the old caches.
+ * src/utils/serviceWorker.js registers it in production.
+ */
+
+import fs from 'node:fs';
+import path from 'node:path';
+import crypto from 'node:crypto';
+
+// Never precached: source maps and the precompressed variants
+const SKIP = /\.(map|br|gz)$/;
+
+const publicFiles = (dir, prefix = '') => {
+  if (!dir || !fs.existsSync(dir)) return [];
+  return fs.readdirSync(dir, { withFileTypes: true }).flatMap(entry => (entry.isDirectory()
+    ? publicFiles(path.join(dir, entry.name), `${prefix}${entry.name}/`)
+    : [`${prefix}${entry.name}`]));
+};
+
+export function serviceWorker({ source = 'src/sw.js', fileName = 'sw.js' } = {}) {
+  let config;
+  return {
+    name: 'service-worker',
+    apply: 'build',
+    configResolved(resolved) {
+      config = resolved;
+    },
+    generateBundle(_options, bundle) {
+      const template = fs.readFileSync(path.resolve(config.root, source), 'utf8');
+      const unhashed = publicFiles(config.publicDir);
+      const files = new Set(['index.html', ...Object.keys(bundle), ...unhashed]);
+      const urls = [...files]
+        .filter(file => file !== fileName && !SKIP.test(file))
+        .sort()
+        .map(file => `${config.base}${file}`);
+
+      const hash = crypto.createHash('sha256').update(template).update(urls.join('\n'));
+      hash.update(fs.readFileSync(path.resolve(config.root, 'index.html')));
+      unhashed.forEach(file => hash.update(fs.readFileSync(path.join(config.publicDir, file))));
+      const version = hash.digest('hex').slice(0, 12);
+
+      this.emitFile({
+        type: 'asset',
+        fileName,
+        source: template.replace('= self.__PRECACHE__;', `= ${JSON.stringify({ version, urls })};`),
+      });
+    },
+  };
+}
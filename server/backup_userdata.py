@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+"""
+Incremental backups and point-in-time restores of the userdatas collection.
+
+Each backup run reads only the UserData documents changed since the previous
+run (`updatedAt` >= the archive's watermark), either from a mongoexport dump
+or by running mongoexport with that query. Runs are added to an archive
+directory:
+
+  manifest.json               completed runs and the watermark
+  runs/<run>.json.gz          per run: document versions and where new bodies are
+  chunks/<run>-<n>.jsonl.gz   document bodies (the shortcut collections), one per
+                              line, gzip, a new chunk every --chunk-mb
+  blobs/<ab>/<hash>.gz        inline icons (data: URLs), stored once by hash
+
+Bodies are stored by content hash, with icons replaced by a {"$blob": hash}
+reference. A document saved without changes, or a library identical to one
+already archived (e.g. copies of the demo data), adds only a small version
+record; documents identical to their newest version (such as the ones saved
+in the same millisecond as the watermark) add nothing. Each run is written fully before the manifest names it, so an
+interrupted run leaves nothing that a restore would read.
+
+A restore picks, for each selected user, the newest version whose updatedAt
+is at or before --at. Chunks are decoded and icons re-inlined in parallel
+worker processes, each writing its documents to a temporary part file that
+is appended to the output in order. The output is mongoexport-style JSON lines, written to a
+file or piped to `mongoimport --mode upsert --upsertFields userId`.
+Documents deleted from the database are not tracked; a restore returns their
+last archived version.
+
+Uploaded icons live in GridFS (`/api/icons/:id`) and are not removed when an
+item drops them. sweep-icons deletes the ones that no current document and
+no archived version references, once they are older than --grace-days (an
+upload still waiting in an open form keeps its icon). Run it after a backup:
+archived references keep every restore's icons, and the items deleted since
+the previous run.
+
+--mongoexport / --mongoimport / --mongofiles take any command with the same
+interface, so a local stand-in can replace the real tools in tests.
+
+Usage:
+  python backup_userdata.py backup backups/ --dump userdatas.jsonl
+  python backup_userdata.py backup backups/ --uri "$MONGODB_URI"
+  python backup_userdata.py list backups/ --user 64f1c0...
+  python backup_userdata.py restore backups/ --user 64f1c0... --at 2026-10-01T12:00 -o restore.jsonl
+  python backup_userdata.py restore backups/ --all --uri "$MONGODB_URI"
+  python backup_userdata.py sweep-icons backups/ --uri "$MONGODB_URI" --dry-run
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+
+from db_stream import COLLECTIONS, iter_mongo_documents
+
+ARCHIVE_VERSION = 1
+MONGO_COLLECTION = 'userdatas'
+
+# Top-level document fields stored as the deduplicated body; the rest
+# (_id, userId, dataType, timestamps) is kept with each version
+BODY_FIELDS = set(COLLECTIONS) | {'apps'}
+
+DEFAULT_CHUNK_MB = 16
+# Shorter data: URLs stay inline; a blob file would cost more than it saves
+MIN_BLOB_LENGTH = 256
+BLOB_KEY = '$blob'
+_BLOB_REF = re.compile(r'\{"\$blob":"([0-9a-f]{32})"\}')
+
+# GridFS bucket of uploaded icons (routes/icons.js)
+ICON_BUCKET = 'icons'
+DEFAULT_GRACE_DAYS = 7
+# Relative or absolute, in any field
+_ICON_REF = re.compile(r'/api/icons/([0-9a-f]{24})')
+
+# Versions without an updatedAt sort before every other
+_NEVER = datetime.min.replace(tzinfo=timezone.utc)
+
+
+# ============= Documents =============
+
+def parse_time(value):
+    """A datetime (UTC) from a Date in any mongoexport form, an ISO string or epoch ms."""
+    if isinstance(value, dict):
+        value = value.get('$date')
+        if isinstance(value, dict):
+            value = value.get('$numberLong')
+    if isinstance(value, str) and value.lstrip('-').isdigit():
+        value = int(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return datetime.fromtimestamp(value / 1000, timezone.utc)
+    if not isinstance(value, str) or not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def format_time(moment):
+    moment = moment.astimezone(timezone.utc)
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + f'{moment.microsecond // 1000:03d}Z'
+
+
+def _oid(value):
+    return str(value.get('$oid', value) if isinstance(value, dict) else value)
+
+
+def user_key(doc):
+    return _oid(doc.get('userId') or doc.get('_id'))
+
+
+def _canonical(value):
+    return json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+def _hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+# Icons repeat across documents (demo copies, shared apps); a dict lookup is
+# cheaper than hashing the data: URL again
+@lru_cache(maxsize=256)
+def _icon_hash(value):
+    return _hash(value)
+
+
+def split_icons(body, blobs):
+    """Copy of `body` with long data: URLs in item fields replaced by blob references."""
+    stripped = {}
+    for name, items in body.items():
+        if not isinstance(items, list):
+            stripped[name] = items
+            continue
+        stripped[name] = []
+        for item in items:
+            if isinstance(item, dict):
+                icons = [f for f, v in item.items()
+                         if isinstance(v, str) and len(v) >= MIN_BLOB_LENGTH and v.startswith('data:')]
+                if icons:
+                    item = dict(item)
+                    for field in icons:
+                        blob = _icon_hash(item[field])
+                        blobs[blob] = item[field]
+                        item[field] = {BLOB_KEY: blob}
+            stripped[name].append(item)
+    return stripped
+
+
+def join_icons(text, blob_json):
+    """Inverse of split_icons on a stored body line (canonical JSON), without parsing it."""
+    return _BLOB_REF.sub(lambda m: blob_json(m.group(1)), text)
+
+
+# ============= Archive =============
+
+class Archive:
+    """An archive directory: manifest, per-run indexes, body chunks and icon blobs."""
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self.manifest_path = self.root / 'manifest.json'
+
+    def manifest(self):
+        if not self.manifest_path.exists():
+            return {'version': ARCHIVE_VERSION, 'watermark': None, 'runs': []}
+        with open(self.manifest_path, encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported archive version {manifest.get('version')} in {self.manifest_path}")
+        return manifest
+
+    def save_manifest(self, manifest):
+        tmp = self.manifest_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+            f.write('\n')
+        tmp.replace(self.manifest_path)
+
+    def index(self, run_id):
+        with gzip.open(self.root / 'runs' / f'{run_id}.json.gz', 'rt', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_index(self, run_id, index):
+        path = self.root / 'runs' / f'{run_id}.json.gz'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            json.dump(index, f, separators=(',', ':'), ensure_ascii=False)
+
+    def indexes(self, manifest=None):
+        """(run id, index) of every completed run, oldest first."""
+        for run in (manifest or self.manifest())['runs']:
+            yield run['id'], self.index(run['id'])
+
+    def chunk_path(self, chunk):
+        return self.root / 'chunks' / f'{chunk}.jsonl.gz'
+
+    def blob_path(self, blob):
+        return self.root / 'blobs' / blob[:2] / f'{blob}.gz'
+
+    def write_blob(self, blob, value):
+        """Store an icon unless it exists; returns the compressed bytes written."""
+        path = self.blob_path(blob)
+        if path.exists():
+            return 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            f.write(value)
+        tmp.replace(path)
+        return path.stat().st_size
+
+
+class ChunkWriter:
+    """Appends body lines to gzip chunks, starting a new one every `chunk_bytes`."""
+
+    def __init__(self, archive, run_id, chunk_bytes):
+        self.archive = archive
+        self.run_id = run_id
+        self.chunk_bytes = chunk_bytes
+        self.chunks = []
+        self.f = None
+        self.lines = 0
+        self.size = 0
+
+    def write(self, line):
+        if self.f is None or self.size >= self.chunk_bytes:
+            self._open()
+        self.f.write(line + '\n')
+        self.size += len(line) + 1
+        self.lines += 1
+        return self.chunks[-1], self.lines - 1
+
+    def _open(self):
+        self.close()
+        chunk = f'{self.run_id}-{len(self.chunks):04d}'
+        path = self.archive.chunk_path(chunk)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.f = gzip.open(path, 'wt', encoding='utf-8')
+        self.chunks.append(chunk)
+        self.lines = 0
+        self.size = 0
+
+    def close(self):
+        if self.f is not None:
+            self.f.close()
+            self.f = None
+
+    def bytes_written(self):
+        return sum(self.archive.chunk_path(chunk).stat().st_size for chunk in self.chunks)
+
+
+# ============= Backup =============
+
+def _json_lines(f):
+    # Line by line: documents with inline icons run to megabytes, and
+    # db_stream's incremental decoder would retry each one per 64KB read
+    for line in f:
+        if line.strip():
+            yield json.loads(line)
+
+
+def mongoexport_lines(command, uri, collection, query=None, fields=None):
+    """Run mongoexport (or a stand-in) on one collection; yields its output lines."""
+    argv = [*shlex.split(command), '--uri', uri, '--collection', collection, '--query', json.dumps(query or {})]
+    if fields:
+        argv += ['--fields', ','.join(fields)]
+    proc = subprocess.Popen(argv, stdout=subprocess.PIPE)
+    try:
+        yield from io.TextIOWrapper(proc.stdout, encoding='utf-8')
+    finally:
+        proc.stdout.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f'{argv[0]} exited with {proc.returncode}')
+
+
+def mongoexport_documents(command, uri, since):
+    """Run mongoexport (or a stand-in) for the documents updated since `since`."""
+    query = {'updatedAt': {'$gte': {'$date': format_time(since)}}} if since else {}
+    yield from _json_lines(mongoexport_lines(command, uri, MONGO_COLLECTION, query))
+
+
+def dump_documents(path):
+    """Documents of a mongoexport dump: JSON lines, or one array (--jsonArray)."""
+    with open(path, encoding='utf-8') as f:
+        head = f.read(4096).lstrip()
+        f.seek(0)
+        yield from (iter_mongo_documents(f) if head.startswith('[') else _json_lines(f))
+
+
+def backup(archive, documents, source, full=False, chunk_bytes=DEFAULT_CHUNK_MB * 2**20):
+    """Archive the documents changed since the last run; returns the run record."""
+    started = time.perf_counter()
+    manifest = archive.manifest()
+    since = None if full else parse_time(manifest['watermark'])
+    run_id = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+
+    # What earlier runs hold: every body, and each user's newest version
+    stored = set()
+    latest = {}
+    for _, index in archive.indexes(manifest):
+        stored.update(index['bodies'])
+        for version in index['versions']:
+            latest[version['user']] = (version['hash'], version['state'])
+
+    writer = ChunkWriter(archive, run_id, chunk_bytes)
+    bodies, versions = {}, []
+    blobs_seen = set()
+    counts = {'documents': 0, 'skipped': 0, 'unchanged': 0, 'versions': 0, 'bodies': 0, 'blobs': 0, 'blob_bytes': 0}
+    watermark = since
+    try:
+        for doc in documents:
+            counts['documents'] += 1
+            updated = parse_time(doc.get('updatedAt'))
+            # A dump holds everything; >= since because saves within the same
+            # millisecond as the last run may have come after it
+            if since and updated and updated < since:
+                counts['skipped'] += 1
+                continue
+            if updated and (watermark is None or updated > watermark):
+                watermark = updated
+
+            blobs = {}
+            body = split_icons({k: v for k, v in doc.items() if k in BODY_FIELDS}, blobs)
+            meta = {k: v for k, v in doc.items() if k not in BODY_FIELDS}
+            body_text = _canonical(body)
+            body_hash = _hash(body_text)
+            # A save without changes still gets a version (its body is reused);
+            # only a document identical to the user's newest version is skipped
+            state = _hash(_canonical(meta))
+            user = user_key(doc)
+            if latest.get(user) == (body_hash, state):
+                counts['unchanged'] += 1
+                continue
+            latest[user] = (body_hash, state)
+
+            for blob, value in blobs.items():
+                if blob not in blobs_seen:
+                    blobs_seen.add(blob)
+                    written = archive.write_blob(blob, value)
+                    if written:
+                        counts['blobs'] += 1
+                        counts['blob_bytes'] += written
+            if body_hash not in stored and body_hash not in bodies:
+                bodies[body_hash] = writer.write(body_text)
+                counts['bodies'] += 1
+            versions.append({'user': user, 'at': format_time(updated) if updated else None,
+                             'hash': body_hash, 'state': state, 'meta': meta})
+            counts['versions'] += 1
+    finally:
+        writer.close()
+
+    archive.write_index(run_id, {'bodies': bodies, 'versions': versions})
+    run = {
+        'id': run_id,
+        'source': source,
+        'since': format_time(since) if since else None,
+        'watermark': format_time(watermark) if watermark else None,
+        **counts,
+        'chunks': len(writer.chunks),
+        'chunk_bytes': writer.bytes_written(),
+        'seconds': round(time.perf_counter() - started, 2),
+    }
+    manifest['runs'].append(run)
+    manifest['watermark'] = run['watermark'] or manifest['watermark']
+    archive.save_manifest(manifest)
+    return run
+
+
+# ============= Restore =============
+
+def select_versions(archive, users=None, data_type=None, at=None):
+    """The newest version at or before `at` per user, and where each body is stored."""
+    chosen = {}
+    locations = {}
+    for _, index in archive.indexes():
+        locations.update(index['bodies'])
+        for version in index['versions']:
+            if users is not None and version['user'] not in users:
+                continue
+            if data_type and version['meta'].get('dataType') != data_type:
+                continue
+            moment = parse_time(version['at']) or _NEVER
+            if at and moment > at:
+                continue
+            current = chosen.get(version['user'])
+            if current is None or moment >= current[0]:
+                chosen[version['user']] = (moment, version)
+    return {user: version for user, (_, version) in chosen.items()}, locations
+
+
+@lru_cache(maxsize=None)
+def _blob_reader(root):
+    archive = Archive(root)
+
+    # Icons repeat across documents: keep them JSON-encoded, ready to splice
+    @lru_cache(maxsize=4096)
+    def blob_json(blob):
+        with gzip.open(archive.blob_path(blob), 'rt', encoding='utf-8') as f:
+            return json.dumps(f.read(), ensure_ascii=False)
+    return blob_json
+
+
+def _document_head(meta, body_rest):
+    """Start of a restored document: the version's fields, open for the body's."""
+    head = json.dumps(meta, ensure_ascii=False, separators=(',', ':'))[:-1]
+    return head + ',' if len(head) > 1 and body_rest[0] != '}' else head
+
+
+def _write_chunk(root, chunk, metas, out):
+    """Write the documents whose bodies are on the given lines of one chunk; returns the count."""
+    blob_json = _blob_reader(root)
+    written = 0
+    remaining = len(metas)
+    with gzip.open(Archive(root).chunk_path(chunk), 'rt', encoding='utf-8') as f:
+        for n, line in enumerate(f):
+            if n not in metas:
+                continue
+            # The body's fields and closing brace (and newline); documents are
+            # written in two parts so the megabyte-sized body is not copied again
+            body_rest = join_icons(line, blob_json)[1:]
+            for meta in metas[n]:
+                out.write(_document_head(meta, body_rest))
+                out.write(body_rest)
+                written += 1
+            remaining -= 1
+            if not remaining:
+                break
+    return written
+
+
+def _write_part(root, chunk, metas, part):
+    """Worker: one chunk's documents into a part file (restored documents run to megabytes)."""
+    with open(part, 'w', encoding='utf-8') as out:
+        return part, _write_chunk(root, chunk, metas, out)
+
+
+def restore(archive, chosen, locations, out, workers=None):
+    """Write the chosen versions as mongoexport JSON lines; returns the count."""
+    by_chunk = {}
+    for version in chosen.values():
+        chunk, line = locations[version['hash']]
+        by_chunk.setdefault(chunk, {}).setdefault(line, []).append(version['meta'])
+
+    chunks = sorted(by_chunk)
+    root = str(archive.root)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        return sum(_write_chunk(root, chunk, by_chunk[chunk], out) for chunk in chunks)
+    written = 0
+    with tempfile.TemporaryDirectory(prefix='restore-') as tmp, ProcessPoolExecutor(max_workers=workers) as pool:
+        parts = [os.path.join(tmp, f'{chunk}.jsonl') for chunk in chunks]
+        for part, count in pool.map(_write_part, [root] * len(chunks), chunks, [by_chunk[c] for c in chunks], parts):
+            with open(part, encoding='utf-8') as f:
+                shutil.copyfileobj(f, out)
+            os.unlink(part)
+            written += count
+    return written
+
+
+# ============= Icon sweep =============
+
+def icon_references(lines, found):
+    """Add the uploaded icon ids that appear in some text lines to `found`."""
+    for line in lines:
+        if '/api/icons/' in line:
+            found.update(_ICON_REF.findall(line))
+    return found
+
+
+def archived_icon_references(archive):
+    """Icon ids referenced by any archived body (chunks are scanned as text)."""
+    found = set()
+    for path in sorted((archive.root / 'chunks').glob('*.jsonl.gz')):
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            icon_references(f, found)
+    return found
+
+
+def sweep_icons(archive, uri, grace, dry_run=False, mongoexport='mongoexport', mongofiles='mongofiles'):
+    """Delete uploaded icons nothing references; returns the sweep report."""
+    started = time.perf_counter()
+    # References first: an icon uploaded after this point is inside the grace period
+    cutoff = datetime.now(timezone.utc) - grace
+    referenced = archived_icon_references(archive)
+    archived = len(referenced)
+    icon_references(mongoexport_lines(mongoexport, uri, MONGO_COLLECTION), referenced)
+
+    report = {'files': 0, 'referenced': 0, 'recent': 0, 'orphans': 0, 'deleted': 0, 'bytes': 0,
+              'archived_references': archived, 'references': len(referenced)}
+    orphans = []
+    for doc in _json_lines(mongoexport_lines(mongoexport, uri, f'{ICON_BUCKET}.files',
+                                             fields=['_id', 'uploadDate', 'length'])):
+        report['files'] += 1
+        file_id = _oid(doc['_id'])
+        if file_id in referenced:
+            report['referenced'] += 1
+        elif (parse_time(doc.get('uploadDate')) or cutoff) >= cutoff:
+            report['recent'] += 1
+        else:
+            orphans.append(file_id)
+            report['bytes'] += int(doc.get('length') or 0)
+    report['orphans'] = len(orphans)
+
+    if not dry_run:
+        for file_id in orphans:
+            argv = [*shlex.split(mongofiles), '--uri', uri, '--prefix', ICON_BUCKET,
+                    'delete_id', json.dumps({'$oid': file_id})]
+            if subprocess.run(argv, stdout=subprocess.DEVNULL).returncode != 0:
+                raise RuntimeError(f'{argv[0]} exited with an error deleting icon {file_id} '
+                                   f"({report['deleted']} of {len(orphans)} deleted)")
+            report['deleted'] += 1
+    report['seconds'] = round(time.perf_counter() - started, 2)
+    return report
+
+
+# ============= Reports =============
+
+def _mb(size):
+    return f'{size / 2**20:,.1f} MB'
+
+
+def print_run(run):
+    print('=' * 50)
+    print(f"Backup run {run['id']} ({run['seconds']:.2f}s)")
+    print(f"Changed since: {run['since'] or 'the beginning'}  ->  watermark {run['watermark']}")
+    print('=' * 50)
+    print(f"  Documents read:      {run['documents']:>10,}")
+    print(f"  Older than watermark:{run['skipped']:>10,}")
+    print(f"  Unchanged:           {run['unchanged']:>10,}")
+    print(f"  New versions:        {run['versions']:>10,}")
+    print(f"  New bodies:          {run['bodies']:>10,}  ({run['chunks']} chunks, {_mb(run['chunk_bytes'])})")
+    print(f"  New icons:           {run['blobs']:>10,}  ({_mb(run['blob_bytes'])})")
+    print(f"\n✓ Run {run['id']} saved")
+
+
+def print_runs(archive, user=None):
+    manifest = archive.manifest()
+    print('=' * 50)
+    print(f"{archive.root}: {len(manifest['runs'])} runs, watermark {manifest['watermark']}")
+    print('=' * 50)
+    if user is None:
+        for run in manifest['runs']:
+            print(f"  {run['id']}  {run['versions']:>8,} versions  {run['bodies']:>8,} bodies  "
+                  f"{run['blobs']:>6,} icons  {_mb(run['chunk_bytes'] + run['blob_bytes']):>10}")
+        return True
+    found = False
+    for run_id, index in archive.indexes(manifest):
+        for version in index['versions']:
+            if version['user'] == user:
+                found = True
+                print(f"  {version['at']}  body {version['hash'][:12]}  (run {run_id})")
+    if not found:
+        print(f"✗ No versions of user {user}")
+    return found
+
+
+def print_sweep(report, grace_days, dry_run):
+    print('=' * 50)
+    print(f"Icon sweep ({report['seconds']:.2f}s){' - dry run' if dry_run else ''}")
+    print('=' * 50)
+    print(f"  Uploaded icons:      {report['files']:>10,}")
+    print(f"  Referenced:          {report['referenced']:>10,}  "
+          f"({report['references']:,} ids in use, {report['archived_references']:,} in backups)")
+    print(f"  Within grace period: {report['recent']:>10,}  ({grace_days:g} days)")
+    print(f"  Unreferenced:        {report['orphans']:>10,}  ({_mb(report['bytes'])})")
+    if dry_run:
+        print(f"\n✓ Nothing deleted; {report['orphans']:,} icons would be")
+    else:
+        print(f"\n✓ Deleted {report['deleted']:,} icons")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Incremental backups and point-in-time restores of UserData')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('backup', help='Archive the documents changed since the last run')
+    run.add_argument('archive', help='Archive directory (created on first use)')
+    source = run.add_mutually_exclusive_group(required=True)
+    source.add_argument('--dump', help='mongoexport dump of userdatas (JSON lines or --jsonArray)')
+    source.add_argument('--uri', help='Run mongoexport against this MongoDB URI')
+    run.add_argument('--mongoexport', default='mongoexport', help='mongoexport command (default: mongoexport)')
+    run.add_argument('--full', action='store_true', help='Read every document, not only the changed ones')
+    run.add_argument('--chunk-mb', type=float, default=DEFAULT_CHUNK_MB,
+                     help=f'Uncompressed size of a body chunk (default: {DEFAULT_CHUNK_MB})')
+    run.add_argument('--json', action='store_true', help='Print the run record as JSON')
+
+    listing = commands.add_parser('list', help='Show the runs, or the versions of one user')
+    listing.add_argument('archive')
+    listing.add_argument('--user', dest='user_id', help='List the archived versions of this userId')
+
+    back = commands.add_parser('restore', help='Restore documents as of a point in time')
+    back.add_argument('archive')
+    who = back.add_mutually_exclusive_group(required=True)
+    who.add_argument('--user', dest='user_ids', action='append', help='userId to restore (repeatable)')
+    who.add_argument('--data-type', choices=['admin', 'demo', 'client'], help='Restore every user of this dataType')
+    who.add_argument('--all', action='store_true', help='Restore every user')
+    back.add_argument('--at', help='Point in time, ISO 8601 (default: the newest versions); UTC unless it has an offset')
+    target = back.add_mutually_exclusive_group(required=True)
+    target.add_argument('-o', '--output', help='Write mongoexport JSON lines here (for mongoimport)')
+    target.add_argument('--uri', help='Upsert straight into this MongoDB URI with mongoimport')
+    back.add_argument('--mongoimport', default='mongoimport', help='mongoimport command (default: mongoimport)')
+    back.add_argument('-w', '--workers', type=int, help='Worker processes (default: CPU count)')
+
+    sweep = commands.add_parser('sweep-icons', help='Delete uploaded icons no document or backup references')
+    sweep.add_argument('archive')
+    sweep.add_argument('--uri', required=True, help='MongoDB URI of the userdatas and the icons bucket')
+    sweep.add_argument('--grace-days', type=float, default=DEFAULT_GRACE_DAYS,
+                       help=f'Keep unreferenced icons uploaded more recently than this (default: {DEFAULT_GRACE_DAYS})')
+    sweep.add_argument('--dry-run', action='store_true', help='Report what would be deleted, delete nothing')
+    sweep.add_argument('--mongoexport', default='mongoexport', help='mongoexport command (default: mongoexport)')
+    sweep.add_argument('--mongofiles', default='mongofiles', help='mongofiles command (default: mongofiles)')
+    sweep.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    archive = Archive(args.archive)
+    if args.command == 'backup':
+        if args.chunk_mb <= 0:
+            parser.error('--chunk-mb must be positive')
+        archive.root.mkdir(parents=True, exist_ok=True)
+        since = None if args.full else parse_time(archive.manifest()['watermark'])
+        if args.dump:
+            documents, label = dump_documents(args.dump), args.dump
+        else:
+            documents, label = mongoexport_documents(args.mongoexport, args.uri, since), 'mongoexport'
+        try:
+            run = backup(archive, documents, label, args.full, int(args.chunk_mb * 2**20))
+        except RuntimeError as e:
+            # The manifest is untouched, so the next run starts from the same watermark
+            print(f"✗ Backup failed: {e}")
+            sys.exit(1)
+        if args.json:
+            print(json.dumps(run, indent=2))
+        else:
+            print_run(run)
+        return
+
+    if not archive.manifest_path.exists():
+        parser.error(f'{args.archive} is not a backup archive (no manifest.json)')
+    if args.command == 'list':
+        sys.exit(0 if print_runs(archive, args.user_id) else 1)
+    if args.command == 'sweep-icons':
+        if args.grace_days < 0:
+            parser.error('--grace-days cannot be negative')
+        try:
+            report = sweep_icons(archive, args.uri, timedelta(days=args.grace_days), args.dry_run,
+                                 args.mongoexport, args.mongofiles)
+        except RuntimeError as e:
+            print(f"✗ Icon sweep failed: {e}")
+            sys.exit(1)
+        if args.json:
+            print(json.dumps(report, indent=2))
+        else:
+            print_sweep(report, args.grace_days, args.dry_run)
+        return
+
+    try:
+        at = parse_time(args.at) if args.at else None
+    except ValueError:
+        parser.error(f'--at: not an ISO 8601 time: {args.at}')
+    started = time.perf_counter()
+    users = set(args.user_ids) if args.user_ids else None
+    chosen, locations = select_versions(archive, users, args.data_type, at)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            written = restore(archive, chosen, locations, out, args.workers)
+    else:
+        argv = [*shlex.split(args.mongoimport), '--uri', args.uri, '--collection', MONGO_COLLECTION,
+                '--mode', 'upsert', '--upsertFields', 'userId']
+        proc = subprocess.Popen(argv, stdin=subprocess.PIPE)
+        with io.TextIOWrapper(proc.stdin, encoding='utf-8') as out:
+            written = restore(archive, chosen, locations, out, args.workers)
+        if proc.wait() != 0:
+            print(f"✗ {argv[0]} exited with {proc.returncode}")
+            sys.exit(1)
+
+    when = format_time(at) if at else 'the newest versions'
+    print(f"✓ Restored {written:,} documents as of {when} in {time.perf_counter() - started:.2f}s "
+          f"-> {args.output or args.uri}")
+    missing = sorted(users - set(chosen)) if users else []
+    for user in missing:
+        print(f"✗ No version of user {user} at or before {when}")
+    sys.exit(1 if missing else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Measure API throughput as cluster workers are added.
+
+For each worker count, starts `node cluster.js` with WEB_CONCURRENCY set on a
+free port, waits for /api/health/ready, then drives the endpoint with
+keep-alive client processes for a fixed duration. Reports requests/second,
+latency percentiles and scaling efficiency (throughput relative to
+workers x the single-worker throughput). MongoDB must be reachable through
+MONGODB_URI as usual.
+
+The load generator needs CPU too: on an N-core box, measuring up to N/2
+workers with the rest left for clients gives the honest picture.
+
+Usage:
+  python bench_cluster.py                                # 1, 2, 4 ... up to the core count
+  python bench_cluster.py --workers 1 2 4 --clients 32 --duration 15
+  python bench_cluster.py --path /api/export?format=json --min-efficiency 0.8
+"""
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from bench_startup import free_port, percentile, probe
+
+SERVER_DIR = Path(__file__).parent
+
+
+def client_loop(port, path, headers, deadline, results):
+    """One client process: sequential keep-alive requests until the deadline."""
+    latencies = []
+    errors = 0
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            if response.status >= 400:
+                errors += 1
+            else:
+                latencies.append((time.perf_counter() - started) * 1000)
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    conn.close()
+    results.put((latencies, errors))
+
+
+def start_server(workers, timeout):
+    port = free_port()
+    env = {**os.environ, 'PORT': str(port), 'WEB_CONCURRENCY': str(workers), 'SKIP_BOOTSTRAP': 'true'}
+    server = subprocess.Popen(['node', 'cluster.js'], cwd=SERVER_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with {server.returncode}: {server.stderr.read().decode()[-500:]}")
+        status, _ = probe(f'http://127.0.0.1:{port}/api/health/ready')
+        if status == 200:
+            # The probe reached one worker; the others finish connecting moments later
+            if workers > 1:
+                time.sleep(1)
+            return server, port
+        time.sleep(0.05)
+    server.kill()
+    raise RuntimeError(f'server not ready after {timeout}s')
+
+
+def stop_server(server):
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def run_load(port, path, headers, clients, duration, warmup):
+    results = multiprocessing.Queue()
+    deadline = time.time() + warmup
+    # Warm-up: JIT, connection pool, in-process caches
+    procs = [multiprocessing.Process(target=client_loop, args=(port, path, headers, deadline, results)) for _ in range(clients)]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        results.get()
+    for p in procs:
+        p.join()
+
+    deadline = time.time() + duration
+    procs = [multiprocessing.Process(target=client_loop, args=(port, path, headers, deadline, results)) for _ in range(clients)]
+    for p in procs:
+        p.start()
+    latencies, errors = [], 0
+    for _ in procs:
+        lat, err = results.get()
+        latencies.extend(lat)
+        errors += err
+    for p in procs:
+        p.join()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / duration,
+        'p50_ms': percentile(latencies, 0.5) if latencies else None,
+        'p99_ms': percentile(latencies, 0.99) if latencies else None,
+    }
+
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = [n for n in (1, 2, 4, 8, 16, 32) if n <= cores] or [1]
+    parser = argparse.ArgumentParser(description='Throughput scaling of the clustered API server')
+    parser.add_argument('--workers', type=int, nargs='+', default=default_workers, help='WEB_CONCURRENCY values to measure')
+    parser.add_argument('--clients', type=int, default=max(8, cores * 2), help='Concurrent client processes')
+    parser.add_argument('--duration', type=float, default=10, help='Seconds of measured load per run (default: 10)')
+    parser.add_argument('--warmup', type=float, default=2, help='Seconds of unmeasured load first (default: 2)')
+    parser.add_argument('--path', default='/api/shortcuts', help='Endpoint to load (default: /api/shortcuts, anonymous demo data)')
+    parser.add_argument('--token', help='Bearer token to send with every request')
+    parser.add_argument('--timeout', type=float, default=60, help='Seconds to wait for readiness (default: 60)')
+    parser.add_argument('--min-efficiency', type=float, help='Exit 1 if any run scales below this fraction of linear')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    headers = {'Accept-Encoding': 'gzip'}
+    if args.token:
+        headers['Authorization'] = f'Bearer {args.token}'
+
+    runs = []
+    for workers in sorted(set(args.workers)):
+        server, port = start_server(workers, args.timeout)
+        try:
+            result = run_load(port, args.path, headers, args.clients, args.duration, args.warmup)
+        finally:
+            stop_server(server)
+        result['workers'] = workers
+        runs.append(result)
+        if not args.json:
+            print(f"{workers:>3} workers: {result['rps']:>9,.0f} req/s  p50 {result['p50_ms']:.1f}ms  "
+                  f"p99 {result['p99_ms']:.1f}ms  errors {result['errors']}")
+
+    base = runs[0]['rps'] / runs[0]['workers']
+    for run in runs:
+        run['efficiency'] = run['rps'] / (base * run['workers']) if base else 0
+
+    if args.json:
+        print(json.dumps({'path': args.path, 'clients': args.clients, 'runs': runs}, indent=2))
+    else:
+        print(f"\nscaling vs {runs[0]['workers']} worker(s) on {cores} cores:")
+        for run in runs:
+            print(f"  {run['workers']:>3} workers  {run['efficiency'] * run['workers']:>5.2f}x  ({run['efficiency']:.0%} of linear)")
+
+    if args.min_efficiency is not None:
+        below = [run for run in runs if run['efficiency'] < args.min_efficiency]
+        if below:
+            print(f"✗ scaling below {args.min_efficiency:.0%} of linear at "
+                  f"{', '.join(str(run['workers']) for run in below)} workers", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark server startup: time from spawning `node index.js` until the
+liveness and readiness probes answer.
+
+Each run starts a fresh server on a free port, polls /api/health/live and
+/api/health/ready, records both times (plus the server's own startupMs and
+whether the bootstrap was skipped) and stops the server again. MongoDB must
+be reachable through MONGODB_URI as usual.
+
+Usage:
+  python bench_startup.py --runs 10
+  python bench_startup.py --env FORCE_BOOTSTRAP=true      # cost of a full bootstrap
+  python bench_startup.py --max-ready-ms 3000            # exit 1 when the median is slower
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).parent
+POLL_INTERVAL = 0.01
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def probe(url):
+    """Return (status, json body) or (None, None) while the server isn't listening."""
+    try:
+        with urllib.request.urlopen(url, timeout=1) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, None
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None, None
+
+
+def run_once(extra_env, timeout):
+    port = free_port()
+    env = {**os.environ, **extra_env, 'PORT': str(port)}
+    base = f'http://127.0.0.1:{port}/api/health'
+    started = time.perf_counter()
+    server = subprocess.Popen(['node', 'index.js'], cwd=SERVER_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    live_ms = ready_ms = None
+    body = None
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"server exited with {server.returncode}: {server.stderr.read().decode()[-500:]}")
+            if live_ms is None:
+                status, _ = probe(f'{base}/live')
+                if status == 200:
+                    live_ms = (time.perf_counter() - started) * 1000
+            if live_ms is not None:
+                status, body = probe(f'{base}/ready')
+                if status == 200:
+                    ready_ms = (time.perf_counter() - started) * 1000
+                    break
+            time.sleep(POLL_INTERVAL)
+        else:
+            raise RuntimeError(f'server not ready after {timeout}s')
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    return {
+        'live_ms': live_ms,
+        'ready_ms': ready_ms,
+        'server_startup_ms': body.get('startupMs'),
+        'bootstrap_skipped': (body.get('bootstrap') or {}).get('skipped'),
+    }
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure server time-to-live and time-to-ready')
+    parser.add_argument('-n', '--runs', type=int, default=5, help='Number of cold starts (default: 5)')
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help='Extra environment for the server')
+    parser.add_argument('--timeout', type=float, default=60, help='Seconds to wait for readiness per run (default: 60)')
+    parser.add_argument('--max-ready-ms', type=float, help='Fail when the median time-to-ready exceeds this')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    args = parser.parse_args()
+
+    extra_env = dict(item.split('=', 1) for item in args.env)
+    results = []
+    for i in range(args.runs):
+        result = run_once(extra_env, args.timeout)
+        results.append(result)
+        if not args.json:
+            print(f"run {i + 1}: live {result['live_ms']:.0f}ms, ready {result['ready_ms']:.0f}ms "
+                  f"(server {result['server_startup_ms']}ms, bootstrap {'skipped' if result['bootstrap_skipped'] else 'ran'})")
+
+    ready = [r['ready_ms'] for r in results]
+    live = [r['live_ms'] for r in results]
+    summary = {
+        'runs': len(results),
+        'live_ms': {'median': statistics.median(live), 'p95': percentile(live, 0.95)},
+        'ready_ms': {'median': statistics.median(ready), 'p95': percentile(ready, 0.95), 'max': max(ready)},
+    }
+    if args.json:
+        print(json.dumps({'summary': summary, 'results': results}, indent=2))
+    else:
+        print(f"\ntime-to-live  median {summary['live_ms']['median']:.0f}ms  p95 {summary['live_ms']['p95']:.0f}ms")
+        print(f"time-to-ready median {summary['ready_ms']['median']:.0f}ms  p95 {summary['ready_ms']['p95']:.0f}ms  "
+              f"max {summary['ready_ms']['max']:.0f}ms")
+
+    if args.max_ready_ms is not None and summary['ready_ms']['median'] > args.max_ready_ms:
+        print(f"✗ median time-to-ready above {args.max_ready_ms:g}ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Compare static frontend serving: precompressed build vs per-request compression.
+
+Starts the production server twice on the same dist/ build: once serving
+the precompressed .br/.gz files (default) and once with
+PRECOMPRESSED_STATIC=false (express.static + compression(), as before).
+Each mode fetches index.html and every built asset --rounds times over one
+keep-alive connection, then reports:
+  - server CPU per request (utime + stime from /proc, Linux only)
+  - bytes transferred per full page load
+  - requests a repeat visit makes (immutable assets are not revalidated)
+
+Run `npm run build` first. MongoDB must be reachable through MONGODB_URI,
+as for any server start.
+
+Usage:
+  python bench_static.py
+  python bench_static.py --rounds 200 --accept gzip
+  python bench_static.py --json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from bench_startup import free_port, probe, SERVER_DIR
+
+DIST_DIR = SERVER_DIR.parent / 'dist'
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+MODES = {
+    'precompressed': {},
+    'dynamic': {'PRECOMPRESSED_STATIC': 'false'},
+}
+
+
+def cpu_seconds(pid):
+    """utime + stime of a process, from /proc/<pid>/stat."""
+    with open(f'/proc/{pid}/stat') as f:
+        # The command name may contain spaces; fields resume after its ')'
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+
+
+def asset_paths():
+    paths = ['/']
+    for file in sorted((DIST_DIR / 'assets').rglob('*')):
+        if file.is_file() and file.suffix not in ('.br', '.gz'):
+            paths.append('/' + file.relative_to(DIST_DIR).as_posix())
+    return paths
+
+
+def start_server(extra_env, timeout=60):
+    port = free_port()
+    env = {**os.environ, **extra_env, 'PORT': str(port), 'NODE_ENV': 'production', 'SKIP_BOOTSTRAP': 'true'}
+    server = subprocess.Popen(['node', 'index.js'], cwd=SERVER_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with {server.returncode}: {server.stderr.read().decode()[-500:]}")
+        status, _ = probe(f'http://127.0.0.1:{port}/api/health/live')
+        if status == 200:
+            return server, port
+        time.sleep(0.05)
+    server.kill()
+    raise RuntimeError(f'server not live after {timeout}s')
+
+
+def fetch_all(conn, paths, accept):
+    """One page load: every path once. Returns (bytes, {path: headers})."""
+    transferred = 0
+    headers = {}
+    for path in paths:
+        conn.request('GET', path, headers={'Accept-Encoding': accept})
+        response = conn.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise RuntimeError(f'{path} returned {response.status}')
+        transferred += len(body)
+        headers[path] = {k.lower(): v for k, v in response.getheaders()}
+    return transferred, headers
+
+
+def repeat_visit_requests(headers):
+    """Requests a browser still makes on a repeat visit within the cache lifetime."""
+    return sum(1 for h in headers.values() if 'immutable' not in h.get('cache-control', ''))
+
+
+def run_mode(name, rounds, accept):
+    paths = asset_paths()
+    server, port = start_server(MODES[name])
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        fetch_all(conn, paths, accept)  # warm up
+        cpu_before = cpu_seconds(server.pid)
+        started = time.perf_counter()
+        for _ in range(rounds):
+            transferred, headers = fetch_all(conn, paths, accept)
+        elapsed = time.perf_counter() - started
+        cpu = cpu_seconds(server.pid) - cpu_before
+        conn.close()
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    requests = rounds * len(paths)
+    encodings = sorted({h.get('content-encoding', 'identity') for h in headers.values()})
+    return {
+        'mode': name,
+        'requests': requests,
+        'cpu_ms_per_request': cpu * 1000 / requests,
+        'requests_per_second': requests / elapsed,
+        'bytes_per_page_load': transferred,
+        'repeat_visit_requests': repeat_visit_requests(headers),
+        'assets': len(paths),
+        'encodings': encodings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompressed vs dynamically compressed static serving')
+    parser.add_argument('--rounds', type=int, default=50, help='Full page loads per mode (default: 50)')
+    parser.add_argument('--accept', default='br, gzip', help="Accept-Encoding to send (default: 'br, gzip')")
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    if not (DIST_DIR / 'index.html').exists():
+        sys.exit(f'No build at {DIST_DIR} - run `npm run build` first')
+    if not Path('/proc/self/stat').exists():
+        sys.exit('CPU accounting needs /proc (Linux)')
+
+    results = [run_mode(name, args.rounds, args.accept) for name in MODES]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'mode':<15}{'CPU/req':>10}{'req/s':>10}{'bytes/load':>13}{'repeat reqs':>13}  encodings")
+    for r in results:
+        print(f"{r['mode']:<15}{r['cpu_ms_per_request']:>8.3f}ms{r['requests_per_second']:>10,.0f}"
+              f"{r['bytes_per_page_load']:>13,}{r['repeat_visit_requests']:>8}/{r['assets']:<4}  {', '.join(r['encodings'])}")
+    new, old = results
+    if old['cpu_ms_per_request'] > 0:
+        print(f"\nCPU per request: {new['cpu_ms_per_request'] / old['cpu_ms_per_request']:.0%} of dynamic compression")
+    if old['bytes_per_page_load'] > 0:
+        print(f"Transfer per page load: {new['bytes_per_page_load'] / old['bytes_per_page_load']:.0%} of dynamic compression")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Regression benchmarks for the Python data tools.
+
+Generates deterministic shortcut libraries at each size (default 1k, 100k and
+1M items), runs every tool against them as a separate process and records
+wall time, peak RSS and items/second. Results are compared with the stored
+baseline (bench_baseline.json); the run fails when any case got slower or
+bigger by more than --threshold percent. Everything runs offline.
+
+Cases:
+  validate     validate_db.py on a db.json (single worker)
+  export-csv   export_shortcuts.py --format csv
+  export-json  export_shortcuts.py --format json
+  import       import_shortcuts.py --dry-run of a Raycast export into demo_db.json
+  migrate      migrate_extension_to_category.py on a copy of the db.json
+  update-db    update_db.py on a copy of the db.json
+  diff         diff_db.py between the db.json and an edited copy (1% of items
+               added, removed or changed), writing the batch body
+
+Usage:
+  python bench_tools.py                          # compare with the baseline
+  python bench_tools.py --sizes 1000 100000 --cases validate export-csv
+  python bench_tools.py --save                   # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).parent
+BASELINE_FILE = SERVER_DIR / 'bench_baseline.json'
+DATA_DIR = SERVER_DIR / '.bench_data'
+
+# Bump when the generated data changes shape so cached datasets are rebuilt
+DATASET_VERSION = 1
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+# Share of the items the 'db-edited' dataset adds, removes or changes
+EDITS = 0.01
+
+# Share of each collection in a generated library
+MIX = [
+    ('leaderShortcuts', 0.30),
+    ('raycastShortcuts', 0.30),
+    ('systemShortcuts', 0.30),
+    ('leaderGroups', 0.02),
+    ('appsLibrary', 0.08),
+]
+
+# Names update_db.py links by context, so its matching paths are exercised
+APP_NAMES = ['Raycast', 'Finder', 'Safari', 'Notion', 'Cursor', 'Discord', 'Ghostty', 'Calendar',
+             'Loop', 'Homerow', 'CleanShot X', 'Spotlight', 'Visual Studio Code', 'Beeper']
+CATEGORIES = ['Applications', 'Browsers', 'Productivity', 'Utility', 'Window Management', 'Media']
+KEYS = 'abcdefghijklmnopqrstuvwxyz0123456789'
+MODIFIERS = ['Hyper', 'Cmd', 'Cmd+Shift', 'Ctrl+Opt', 'Cmd+Opt']
+
+
+# ============= Datasets =============
+
+def _item(collection, i, rng):
+    app = rng.choice(APP_NAMES)
+    if collection == 'leaderShortcuts':
+        return {'id': f'leader_{i}', 'sequence': ['Leader', rng.choice(KEYS), rng.choice(KEYS)],
+                'app': app, 'action': f'Open {app} #{i}', 'category': rng.choice(CATEGORIES), 'notes': None}
+    if collection == 'raycastShortcuts':
+        item = {'id': f'raycast_{i}', 'keys': f'{rng.choice(MODIFIERS)}+{rng.choice(KEYS).upper()}',
+                'commandName': f'Open {app} {i}', 'aliasText': None, 'notes': None}
+        # Half still use the legacy field migrate_extension_to_category.py moves
+        item['extension' if i % 2 else 'category'] = rng.choice(CATEGORIES)
+        return item
+    if collection == 'systemShortcuts':
+        return {'id': f'sys_{i}', 'keys': f'{rng.choice(MODIFIERS)}+{rng.choice(KEYS).upper()}',
+                'appOrContext': app, 'action': f'Toggle {app} panel {i}', 'category': rng.choice(CATEGORIES), 'notes': None}
+    if collection == 'leaderGroups':
+        return {'id': f'group_{i}', 'key': rng.choice(KEYS), 'name': f'Group {i}', 'parentKey': None}
+    return {'id': f'app_{i}', 'name': f'{app} {i}', 'category': rng.choice(CATEGORIES),
+            'bundleId': f'com.example.app{i}', 'tags': ['bench', app.lower()], 'iconUrl': None, 'notes': None}
+
+
+def write_db(path, size, seed, edits=0.0):
+    """
+    Stream a db.json with `size` items split across the collections by MIX.
+
+    With `edits`, that share of the items is removed, changed or added (a
+    third each, added ones at the end of their collection), on top of the
+    same library the seed gives without edits.
+    """
+    rng = random.Random(seed)
+    edit_rng = random.Random(seed + 1)
+    counts = [int(size * share) for _, share in MIX]
+    counts[0] += size - sum(counts)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{')
+        for n, ((collection, _), count) in enumerate(zip(MIX, counts)):
+            f.write(f'{"," if n else ""}\n"{collection}": [')
+            first = True
+            added = 0
+            for i in range(count):
+                item = _item(collection, i, rng)
+                roll = edit_rng.random() * 3 if edits else 3
+                if roll < edits:
+                    continue
+                if roll < 2 * edits:
+                    item['notes' if 'notes' in item else 'name'] = f'Edited {i}'
+                elif roll < 3 * edits:
+                    added += 1
+                f.write(('\n' if first else ',\n') + json.dumps(item))
+                first = False
+            for i in range(count, count + added):
+                f.write(('\n' if first else ',\n') + json.dumps(_item(collection, i, edit_rng)))
+                first = False
+            f.write('\n]')
+        f.write('\n}\n')
+
+
+def write_raycast_export(path, size, seed):
+    """A Raycast command list; a fifth of it duplicates itself to exercise dedupe."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"commands": [')
+        for i in range(size):
+            n = i if i % 5 else rng.randrange(max(1, i))
+            app = APP_NAMES[n % len(APP_NAMES)]
+            command = {'title': f'Open {app} {n}', 'hotkey': f'{rng.choice(MODIFIERS)}+{KEYS[n % len(KEYS)].upper()}',
+                       'alias': f'{app[:2].lower()}{n}', 'extension': rng.choice(CATEGORIES)}
+            f.write(('\n' if i == 0 else ',\n') + json.dumps(command))
+        f.write('\n]}\n')
+
+
+def dataset(kind, size, seed, data_dir):
+    """Path of a generated dataset, built once and reused while the version matches."""
+    path = data_dir / f'{kind}-v{DATASET_VERSION}-{size}-{seed}.json'
+    if not path.exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        tmp = path.with_suffix('.tmp')
+        if kind == 'raycast':
+            write_raycast_export(tmp, size, seed)
+        else:
+            write_db(tmp, size, seed, EDITS if kind == 'db-edited' else 0.0)
+        tmp.replace(path)
+        print(f"  generated {path.name} ({path.stat().st_size / 1e6:.1f} MB, "
+              f"{time.perf_counter() - started:.1f}s)", file=sys.stderr)
+    return path
+
+
+# ============= Cases =============
+
+# name -> (dataset kind(s), whether the tool rewrites its input, argv builder);
+# the builder gets the paths of any further datasets after `out`
+CASES = {
+    'validate': ('db', False, lambda src, out: ['validate_db.py', src, '--workers', '1', '--samples', '0']),
+    'export-csv': ('db', False, lambda src, out: ['export_shortcuts.py', src, '--format', 'csv', '-o', out]),
+    'export-json': ('db', False, lambda src, out: ['export_shortcuts.py', src, '--format', 'json', '-o', out]),
+    'import': ('raycast', False, lambda src, out: ['import_shortcuts.py', src, '--into', str(SERVER_DIR / 'demo_db.json'), '--dry-run']),
+    'migrate': ('db', True, lambda src, out: ['migrate_extension_to_category.py', src]),
+    'update-db': ('db', True, lambda src, out: ['update_db.py', src]),
+    'diff': (('db', 'db-edited'), False, lambda src, out, edited: ['diff_db.py', src, edited, '--batch', out, '--exit-zero']),
+}
+
+
+def run_tool(argv):
+    """Run one tool; returns (wall seconds, peak RSS bytes) for that process alone."""
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, *argv], cwd=SERVER_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    # wait4 reports the resource usage of exactly this child
+    _, status, usage = os.wait4(proc.pid, 0)
+    wall = time.perf_counter() - started
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    stderr = proc.stderr.read().decode(errors='replace')
+    proc.stderr.close()
+    if proc.returncode != 0:
+        raise RuntimeError(f"{' '.join(argv[:1])} exited with {proc.returncode}: {stderr[-500:]}")
+    # ru_maxrss is kilobytes on Linux, bytes on macOS
+    rss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+    return wall, rss
+
+
+def bench_case(name, size, seed, data_dir, repeat):
+    kinds, rewrites, argv_for = CASES[name]
+    source, *others = [dataset(kind, size, seed, data_dir) for kind in ((kinds,) if isinstance(kinds, str) else kinds)]
+    walls, peaks = [], []
+    for _ in range(repeat):
+        work = data_dir / f'work-{name}.json'
+        out = data_dir / f'out-{name}'
+        if rewrites:
+            shutil.copyfile(source, work)
+        try:
+            wall, rss = run_tool(argv_for(str(work if rewrites else source), str(out), *map(str, others)))
+        finally:
+            for path in (work, out):
+                if path.exists():
+                    path.unlink()
+        walls.append(wall)
+        peaks.append(rss)
+    wall = statistics.median(walls)
+    return {
+        'wall_s': round(wall, 4),
+        'peak_rss_mb': round(max(peaks) / 2**20, 1),
+        'items_per_s': round(size / wall) if wall else None,
+    }
+
+
+# ============= Baseline =============
+
+def load_baseline(path):
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, merge_into):
+    baseline = merge_into or {'cases': {}}
+    for name, sizes in results.items():
+        baseline['cases'].setdefault(name, {}).update(sizes)
+    baseline['machine'] = {'python': platform.python_version(), 'platform': platform.platform(),
+                           'cpus': os.cpu_count()}
+    baseline['recorded'] = time.strftime('%Y-%m-%d')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(result, base, threshold, min_wall_delta, min_rss_delta):
+    """Regressions of one case/size as (metric, before, after, percent)."""
+    regressions = []
+    checks = [
+        ('wall_s', min_wall_delta),
+        ('peak_rss_mb', min_rss_delta),
+    ]
+    for metric, min_delta in checks:
+        before, after = base.get(metric), result[metric]
+        if not before:
+            continue
+        delta = after - before
+        if delta > min_delta and delta / before * 100 > threshold:
+            regressions.append((metric, before, after, delta / before * 100))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Python data tools against a stored baseline')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Dataset sizes in items (default: 1k 100k 1M)')
+    parser.add_argument('--cases', nargs='+', choices=sorted(CASES), default=list(CASES), help='Cases to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case; the median wall time is kept (default: 3)')
+    parser.add_argument('--seed', type=int, default=1, help='Dataset seed (default: 1)')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_FILE, help=f'Baseline file (default: {BASELINE_FILE.name})')
+    parser.add_argument('--save', action='store_true', help='Record these results into the baseline instead of comparing')
+    parser.add_argument('--threshold', type=float, default=20.0, help='Regression threshold in percent (default: 20)')
+    parser.add_argument('--min-wall-delta', type=float, default=0.05, help='Ignore wall-time changes below this many seconds (default: 0.05)')
+    parser.add_argument('--min-rss-delta', type=float, default=5.0, help='Ignore peak-RSS changes below this many MB (default: 5)')
+    parser.add_argument('--data-dir', type=Path, default=DATA_DIR, help=f'Where generated datasets are cached (default: {DATA_DIR.name}/)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = {}
+    for size in sorted(args.sizes):
+        for name in args.cases:
+            result = bench_case(name, size, args.seed, args.data_dir, args.repeat)
+            results.setdefault(name, {})[str(size)] = result
+            if not args.json:
+                print(f"{name:<12}{size:>10,} items  {result['wall_s']:>8.3f}s  "
+                      f"{result['peak_rss_mb']:>8.1f} MB  {result['items_per_s'] or 0:>12,} items/s")
+
+    baseline = load_baseline(args.baseline)
+    if args.save:
+        save_baseline(args.baseline, results, baseline)
+        print(f"✓ Baseline saved to {args.baseline}")
+        return
+
+    regressions = []
+    compared = 0
+    for name, sizes in results.items():
+        for size, result in sizes.items():
+            base = ((baseline or {}).get('cases', {}).get(name) or {}).get(size)
+            if base:
+                compared += 1
+                regressions += [(name, size, *r) for r in compare(result, base, args.threshold,
+                                                                   args.min_wall_delta, args.min_rss_delta)]
+
+    if args.json:
+        print(json.dumps({'results': results, 'regressions': [
+            {'case': n, 'size': int(s), 'metric': m, 'baseline': b, 'current': c, 'percent': round(p, 1)}
+            for n, s, m, b, c, p in regressions]}, indent=2))
+    elif not baseline:
+        print(f"\nNo baseline at {args.baseline} - record one with --save")
+    else:
+        print(f"\nCompared {compared} results with the baseline from {baseline.get('recorded', '?')} "
+              f"(>{args.threshold:g}% is a regression):")
+        if not regressions:
+            print('  ✓ No regressions')
+        for name, size, metric, before, after, pct in regressions:
+            print(f"  ✗ {name} @ {int(size):,}: {metric} {before} -> {after} (+{pct:.0f}%)")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
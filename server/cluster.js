@@ -0,0 +1,117 @@
+// Cluster entry point (`npm start`).
+//
+// WEB_CONCURRENCY sets how many API workers to fork. Unset or `1` runs
+// index.js directly in this process: the core count the OS reports ignores
+// container CPU quotas, so more processes are opt-in. The primary only
+// supervises:
+// - crashed workers are replaced, with backoff if they die right after starting
+// - SIGHUP replaces workers one at a time, each old worker retiring only once
+//   its replacement is listening, so capacity never drops to zero; a
+//   replacement that exits first aborts the restart
+// - SIGTERM/SIGINT drain every worker (see shutdown in index.js) and exit
+// - cache invalidations from one worker are relayed to all the others
+//   (lib/cacheBus.js)
+//
+// Nothing else is shared: /api/metrics and the /api/telemetry percentiles
+// describe only the worker that answered the request. Keep WEB_CONCURRENCY
+// at 1 where those numbers matter, or use TELEMETRY_LOG (every worker appends
+// to the same file) with telemetry_report.py.
+
+const cluster = require('cluster');
+const path = require('path');
+const { MESSAGE_TYPE } = require('./lib/cacheBus');
+
+const WORKERS = Math.max(1, parseInt(process.env.WEB_CONCURRENCY, 10) || 1);
+
+// Workers dying sooner than this after forking count as a crash loop
+const MIN_UPTIME_MS = 5000;
+const MAX_RESTART_DELAY_MS = 30000;
+
+if (WORKERS === 1) {
+    require('./index');
+} else {
+    cluster.setupPrimary({ exec: path.join(__dirname, 'index.js') });
+
+    // Worker ids that are being retired on purpose (no replacement on exit)
+    const retiring = new Set();
+    let restartDelay = 0;
+    let shuttingDown = false;
+
+    const relay = (sender) => (message) => {
+        if (!message || message.type !== MESSAGE_TYPE) return;
+        for (const worker of Object.values(cluster.workers)) {
+            if (worker !== sender && worker.isConnected()) worker.send(message);
+        }
+    };
+
+    const fork = () => {
+        const worker = cluster.fork();
+        worker.startedAt = Date.now();
+        worker.on('message', relay(worker));
+        return worker;
+    };
+
+    // Ask a worker to drain; index.js exits once in-flight requests finish
+    const retire = (worker) => new Promise((resolve) => {
+        retiring.add(worker.id);
+        worker.once('exit', resolve);
+        worker.process.kill('SIGTERM');
+    });
+
+    cluster.on('exit', (worker, code, signal) => {
+        if (retiring.delete(worker.id) || shuttingDown) return;
+        console.error(`Worker ${worker.process.pid} died (${signal || code}), restarting`);
+        // Back off while workers keep crashing during startup
+        const quick = Date.now() - worker.startedAt < MIN_UPTIME_MS;
+        restartDelay = quick ? Math.min(MAX_RESTART_DELAY_MS, Math.max(1000, restartDelay * 2)) : 0;
+        setTimeout(() => {
+            if (!shuttingDown) fork();
+        }, restartDelay);
+    });
+
+    // Rolling restart (e.g. `kill -HUP <primary pid>` after a deploy)
+    let restarting = false;
+    process.on('SIGHUP', async () => {
+        if (restarting || shuttingDown) return;
+        restarting = true;
+        console.log('Rolling restart of all workers');
+        for (const old of Object.values(cluster.workers)) {
+            const replacement = fork();
+            const listening = await new Promise((resolve) => {
+                const exited = () => {
+                    // Emitted before cluster's 'exit': don't respawn the spare
+                    retiring.add(replacement.id);
+                    resolve(false);
+                };
+                replacement.once('exit', exited);
+                replacement.once('listening', () => {
+                    // From here on an exit is a crash like any other
+                    replacement.off('exit', exited);
+                    resolve(true);
+                });
+            });
+            if (!listening) {
+                // Most likely the new code fails to start: keep the old workers
+                console.error(`Rolling restart aborted: worker ${replacement.process.pid} exited before listening`);
+                restarting = false;
+                return;
+            }
+            await retire(old);
+        }
+        restarting = false;
+        console.log('Rolling restart complete');
+    });
+
+    const shutdown = async (signal) => {
+        if (shuttingDown) return;
+        shuttingDown = true;
+        console.log(`${signal} received, draining ${Object.keys(cluster.workers).length} workers`);
+        await Promise.all(Object.values(cluster.workers).map(retire));
+        process.exit(0);
+    };
+    process.on('SIGTERM', () => shutdown('SIGTERM'));
+    process.on('SIGINT', () => shutdown('SIGINT'));
+
+    console.log(`Primary ${process.pid} starting ${WORKERS} workers`);
+    for (let i = 0; i < WORKERS; i++) fork();
+}
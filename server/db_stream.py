@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Streaming readers for shortcut databases.
+
+Reads shortcut items one at a time, without loading the whole file, from:
+- a legacy db.json / demo_db.json snapshot ({"leaderShortcuts": [...], ...})
+- a `mongoexport` dump of the userdatas collection, either newline-delimited
+  (the mongoexport default) or a single array (--jsonArray)
+
+Only the standard library is used so the data tools run anywhere.
+"""
+
+import json
+from json.decoder import scanstring
+
+# Collections stored on every UserData document, in export order
+COLLECTIONS = [
+    'leaderShortcuts',
+    'raycastShortcuts',
+    'systemShortcuts',
+    'leaderGroups',
+    'appsLibrary',
+]
+
+# Legacy key names that hold the same data as a current collection
+COLLECTION_ALIASES = {'apps': 'appsLibrary'}
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = ' \t\n\r'
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Buffered cursor over a text file that refills on demand."""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer stays about one item long
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'EOF'}'")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(self.buf, self.pos)
+                # A scalar ending exactly at the buffer edge may be truncated
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Read more; grow the chunk so huge items (icon blobs) stay linear
+            if not self._fill():
+                continue
+            self.chunk_size = max(self.chunk_size, len(self.buf))
+
+    def string(self):
+        self.expect('"')
+        while True:
+            try:
+                text, end = scanstring(self.buf, self.pos)
+                self.pos = end
+                return text
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def array(self):
+        """Yield the items of the array starting at the cursor."""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            sep = self.peek()
+            self.pos += 1
+            if sep == ']':
+                return
+            if sep != ',':
+                raise ValueError(f"Expected ',' or ']' in array but found '{sep or 'EOF'}'")
+
+
+def iter_db_items(f, collections=None):
+    """
+    Yield (collection, item) pairs from a db.json-style object, streaming.
+
+    `apps` is reported as `appsLibrary`, and skipped when `appsLibrary` was
+    already seen (the server prefers `appsLibrary` the same way).
+    """
+    reader = _Reader(f)
+    seen = set()
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.string()
+        reader.expect(':')
+        name = COLLECTION_ALIASES.get(key, key)
+        wanted = name in COLLECTIONS and (collections is None or name in collections)
+        if wanted and key != name and name in seen:
+            wanted = False
+        if wanted and reader.peek() == '[':
+            seen.add(name)
+            for item in reader.array():
+                if isinstance(item, dict):
+                    yield name, item
+        else:
+            reader.value()
+        sep = reader.peek()
+        reader.pos += 1
+        if sep == '}':
+            return
+        if sep != ',':
+            raise ValueError(f"Expected ',' or '}}' in object but found '{sep or 'EOF'}'")
+
+
+def iter_mongo_documents(f):
+    """Yield UserData documents from a mongoexport dump (JSON lines or --jsonArray)."""
+    reader = _Reader(f)
+    if reader.peek() == '[':
+        yield from reader.array()
+        return
+    while reader.peek():
+        yield reader.value()
+
+
+def _oid(value):
+    """Unwrap mongoexport's extended JSON ({"$oid": "..."}) to a plain string."""
+    if isinstance(value, dict):
+        return value.get('$oid') or value.get('$date') or str(value)
+    return value
+
+
+def document_matches(doc, user_id=None, data_type=None):
+    if user_id and str(_oid(doc.get('userId'))) != user_id:
+        return False
+    if data_type and doc.get('dataType') != data_type:
+        return False
+    return True
+
+
+def iter_mongo_items(f, collections=None, user_id=None, data_type=None):
+    """Yield (collection, item) pairs from the matching documents of a Mongo dump."""
+    for doc in iter_mongo_documents(f):
+        if not document_matches(doc, user_id, data_type):
+            continue
+        for name in COLLECTIONS:
+            if collections is not None and name not in collections:
+                continue
+            items = doc.get(name)
+            if not items and name == 'appsLibrary':
+                items = doc.get('apps')
+            for item in items or []:
+                if isinstance(item, dict):
+                    yield name, item
+
+
+def is_mongo_dump(path):
+    """Guess the source type: .jsonl/.ndjson files and top-level arrays are Mongo dumps."""
+    path = str(path)
+    if path.endswith(('.jsonl', '.ndjson')):
+        return True
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, chunk_size=4096)
+        if reader.peek() == '[':
+            return True
+        # A db.json starts with a collection key; a Mongo document with _id/userId
+        reader.expect('{')
+        return reader.peek() == '"' and reader.string() in ('_id', 'userId', 'dataType')
+
+
+def iter_items(path, collections=None, user_id=None, data_type=None, mongo=None):
+    """Yield (collection, item) pairs from any supported source file."""
+    if mongo is None:
+        mongo = is_mongo_dump(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if mongo:
+            yield from iter_mongo_items(f, collections, user_id, data_type)
+        else:
+            yield from iter_db_items(f, collections)
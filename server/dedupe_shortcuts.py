@@ -0,0 +1,441 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate shortcuts across collections.
+
+The same action often exists as a System hotkey, a Raycast command and a
+Leader sequence with slightly different wording ("Open Comet browser" /
+"Open Comet"). This tool finds those candidates without comparing every pair:
+
+1. Each item's action/commandName/notes text is normalized and split into
+   character 3-grams, and a MinHash signature is computed (in a process pool).
+2. Signatures are cut into LSH bands. Items sharing a band within the same
+   appId become candidate pairs, so the work grows with the item count
+   rather than its square.
+3. A second streaming pass computes the exact Jaccard similarity of the
+   candidates only. Pairs at or above --threshold whose normalized action /
+   commandName text is the same are grouped (union-find), every pair within
+   a group is scored, and one item per group is suggested as the one to
+   keep: the most complete one.
+
+The merge plan (-o) is a body for POST /api/shortcuts/batch: it deletes the
+duplicates and copies notes onto the kept item when it has none. A duplicate
+bound to other keys or another Leader sequence is deleted only when that
+binding can move onto the kept item (same field, empty there); otherwise it
+stays, since deleting it would lose the binding. Review the plan, then apply
+it as the library's owner:
+
+  curl -X POST http://localhost:3001/api/shortcuts/batch \\
+       -H "Authorization: Bearer $TOKEN" -H 'Content-Type: application/json' \\
+       -d @merge.json
+
+Usage:
+  python dedupe_shortcuts.py demo_db.json
+  python dedupe_shortcuts.py demo_db.json --threshold 0.7 -o merge.json
+  python dedupe_shortcuts.py userdatas.jsonl --user 64f1c0... --json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import time
+import unicodedata
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations, islice
+
+from db_stream import is_mongo_dump, iter_items
+from shortcut_keys import normalize_keys
+
+# Shortcut collections and the fields that describe what each item does
+TEXT_FIELDS = {
+    'leaderShortcuts': ['action', 'notes'],
+    'raycastShortcuts': ['commandName', 'notes'],
+    'systemShortcuts': ['action', 'notes'],
+}
+COLLECTION_ORDER = list(TEXT_FIELDS)
+
+# Fields that bind an item to a trigger; only the kept item's own can take one over
+BINDING_FIELDS = {
+    'leaderShortcuts': ['sequence'],
+    'raycastShortcuts': ['keys'],
+    'systemShortcuts': ['keys'],
+}
+
+DEFAULT_THRESHOLD = 0.8
+
+STOPWORDS = {'a', 'an', 'and', 'the', 'to', 'in', 'of', 'for', 'with', 'on', 'at', 'from', 'by', 'or'}
+SHINGLE_SIZE = 3
+
+# MinHash permutations h -> (a*h + b) mod P over 32-bit shingle hashes
+MERSENNE_PRIME = (1 << 61) - 1
+DEFAULT_PERMUTATIONS = 128
+SEED = 42
+
+BATCH_SIZE = 5000
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def normalize(text):
+    """Lowercase, strip accents and punctuation, drop stopwords."""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode().lower()
+    return ' '.join(t for t in _TOKEN.findall(text) if t not in STOPWORDS)
+
+
+def item_text(collection, item):
+    parts = (item.get(field) for field in TEXT_FIELDS[collection])
+    return normalize(' '.join(p for p in parts if isinstance(p, str)))
+
+
+def action_text(collection, item):
+    """Normalized action / commandName alone: duplicates must agree on it."""
+    value = item.get(TEXT_FIELDS[collection][0])
+    return normalize(value) if isinstance(value, str) else ''
+
+
+def bindings(collection, item):
+    """{field: normalized value} of the item's keys / sequence (empty ones left out)."""
+    found = {}
+    for field in BINDING_FIELDS[collection]:
+        value = item.get(field)
+        if field == 'keys':
+            value = normalize_keys(value) if isinstance(value, str) else ''
+        elif isinstance(value, list):
+            value = tuple(str(part).strip().lower() for part in value)
+        if value:
+            found[field] = value
+    return found
+
+
+def shingles(text):
+    padded = f' {text} '
+    if len(padded) <= SHINGLE_SIZE:
+        return {padded}
+    return {padded[i:i + SHINGLE_SIZE] for i in range(len(padded) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+
+def permutations(count, seed=SEED):
+    rng = random.Random(seed)
+    return [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(0, MERSENNE_PRIME)) for _ in range(count)]
+
+
+def lsh_params(perms, threshold):
+    """
+    (bands, rows) with bands * rows == perms whose S-curve midpoint
+    (1/bands)^(1/rows) lies just below `threshold`: high recall, and the exact
+    check in the second pass removes the extra candidates.
+    """
+    best = (perms, 1)
+    for rows in range(1, perms + 1):
+        if perms % rows:
+            continue
+        bands = perms // rows
+        if (1 / bands) ** (1 / rows) <= threshold * 0.9:
+            best = (bands, rows)
+    return best
+
+
+# Permuted values per shingle, per process. Shingles repeat across items (the
+# 3-gram alphabet is small), so a signature is mostly an elementwise min over
+# cached rows instead of perms x shingles multiplications.
+_permuted = {}
+
+
+def _permuted_row(shingle, coefficients):
+    row = _permuted.get(shingle)
+    if row is None:
+        h = zlib.crc32(shingle.encode())
+        row = _permuted[shingle] = tuple([(a * h + b) % MERSENNE_PRIME for a, b in coefficients])
+    return row
+
+
+# ============= Worker entry point (must be top-level to pickle) =============
+
+def _band_hashes(texts, perms, bands, rows):
+    """Band hashes of each text's MinHash signature, flattened (bands per text)."""
+    coefficients = permutations(perms)
+    if _permuted and len(next(iter(_permuted.values()))) != perms:
+        _permuted.clear()
+    out = array('q')
+    for text in texts:
+        permuted = [_permuted_row(s, coefficients) for s in shingles(text)]
+        signature = map(min, *permuted) if len(permuted) > 1 else iter(permuted[0])
+        # zip over one iterator cuts the signature into consecutive bands of `rows`
+        out.extend(map(hash, zip(*[signature] * rows)))
+    return out
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        root = x
+        while self.parent.setdefault(root, root) != root:
+            root = self.parent[root]
+        while x != root:
+            self.parent[x], x = root, self.parent[x]
+        return root
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def _items(source, user_id, data_type, mongo):
+    return iter_items(source, set(TEXT_FIELDS), user_id=user_id, data_type=data_type, mongo=mongo)
+
+
+def candidate_pairs(source, threshold=DEFAULT_THRESHOLD, perms=DEFAULT_PERMUTATIONS, workers=None,
+                    user_id=None, data_type=None, mongo=None, stats=None):
+    """First pass: LSH candidate pairs (i, j) of item positions in the stream."""
+    workers = workers or os.cpu_count() or 1
+    bands, rows = lsh_params(perms, threshold)
+    stats = stats if stats is not None else {}
+
+    # appId (or its absence) of every item; items without text get None
+    groups = {}
+    group_of = []
+
+    def numbered():
+        for collection, item in _items(source, user_id, data_type, mongo):
+            text = item_text(collection, item)
+            app = item.get('appId') or ''
+            group_of.append(groups.setdefault(app, len(groups)) if text else None)
+            if text:
+                yield text
+
+    band_values = array('q')
+    if workers == 1:
+        for batch in _batched(numbered(), BATCH_SIZE):
+            band_values.extend(_band_hashes(batch, perms, bands, rows))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a bounded number of batches in flight so memory stays flat
+            pending = deque()
+            for batch in _batched(numbered(), BATCH_SIZE):
+                pending.append(pool.submit(_band_hashes, batch, perms, bands, rows))
+                if len(pending) >= workers * 2:
+                    band_values.extend(pending.popleft().result())
+            while pending:
+                band_values.extend(pending.popleft().result())
+
+    positions = [i for i, group in enumerate(group_of) if group is not None]
+    pairs = set()
+    for band in range(bands):
+        buckets = {}
+        for k, i in enumerate(positions):
+            buckets.setdefault((group_of[i], band_values[k * bands + band]), []).append(i)
+        # Every pair in a bucket, not just pairs with its first member
+        for members in buckets.values():
+            pairs.update(combinations(members, 2))
+
+    stats.update(items=len(group_of), hashed=len(positions), bands=bands, rows=rows, candidates=len(pairs))
+    return pairs
+
+
+def find_duplicates(source, threshold=DEFAULT_THRESHOLD, perms=DEFAULT_PERMUTATIONS, workers=None,
+                    user_id=None, data_type=None, mongo=None, stats=None):
+    """Groups of near-duplicate items: [{'similarity', 'items': [(collection, item), ...]}]."""
+    if mongo is None:
+        mongo = is_mongo_dump(source)
+    stats = stats if stats is not None else {}
+    pairs = candidate_pairs(source, threshold, perms, workers, user_id, data_type, mongo, stats)
+
+    # Second pass: details of the candidates only
+    wanted = {i for pair in pairs for i in pair}
+    details = {}
+    for i, (collection, item) in enumerate(_items(source, user_id, data_type, mongo)):
+        if i in wanted:
+            item.pop('iconUrl', None)
+            details[i] = (collection, item, shingles(item_text(collection, item)), action_text(collection, item))
+
+    def similar(i, j):
+        """Jaccard score of a duplicate pair, None when the pair is not one."""
+        if details[i][3] != details[j][3]:
+            return None
+        score = jaccard(details[i][2], details[j][2])
+        return score if score >= threshold else None
+
+    union = _UnionFind()
+    for i, j in pairs:
+        if similar(i, j) is not None:
+            union.union(i, j)
+
+    # Group by component, then score every pair inside it: items linked only
+    # through a third one may still be duplicates of each other directly
+    components = {}
+    for i in list(union.parent):
+        components.setdefault(union.find(i), []).append(i)
+    groups = []
+    duplicates = 0
+    for root in sorted(components):
+        positions = sorted(components[root])
+        pairs = {}
+        for (a, i), (b, j) in combinations(enumerate(positions), 2):
+            score = similar(i, j)
+            if score is not None:
+                pairs[(a, b)] = score
+        duplicates += len(pairs)
+        groups.append({
+            'similarity': round(min(pairs.values()), 3),
+            'items': [details[i][:2] for i in positions],
+            'pairs': pairs,
+        })
+    stats.update(duplicates=duplicates, groups=len(groups))
+    return groups
+
+
+def _completeness(entry):
+    collection, item = entry
+    filled = sum(1 for key, value in item.items() if key != 'id' and value not in (None, '', []))
+    return (-filled, COLLECTION_ORDER.index(collection))
+
+
+def merge_plan(groups):
+    """
+    Keep the most complete item of each group and delete the items directly
+    similar to it; copy the first deleted item's notes onto the kept item when
+    it has none. A duplicate with another binding (keys / Leader sequence) is
+    deleted only if the binding moves onto the kept item, i.e. the kept item
+    has the same field and it is empty; otherwise it is kept. Items only
+    linked through another duplicate (A~B~C) are listed but left alone.
+    """
+    operations = []
+    planned = []
+    for group in groups:
+        items = group['items']
+        keep = min(range(len(items)), key=lambda k: _completeness(items[k]))
+        linked = {j if i == keep else i for i, j in group['pairs'] if keep in (i, j)}
+        keep_type, keep_item = items[keep]
+        kept_bindings = bindings(keep_type, keep_item)
+
+        duplicates, distinct, changes = [], [], {}
+        for k in sorted(linked):
+            collection, item = items[k]
+            moved = {}
+            for field, value in bindings(collection, item).items():
+                if kept_bindings.get(field) == value:
+                    continue
+                if field in BINDING_FIELDS[keep_type] and field not in kept_bindings:
+                    moved[field] = item[field]
+                else:
+                    moved = None
+                    break
+            if moved is None:
+                distinct.append(items[k])
+                continue
+            changes.update(moved)
+            kept_bindings.update(bindings(collection, moved))
+            duplicates.append(items[k])
+
+        notes = next((item.get('notes') for _, item in duplicates if item.get('notes')), None)
+        if notes and not keep_item.get('notes'):
+            changes['notes'] = notes
+        if changes:
+            operations.append({'op': 'update', 'type': keep_type, 'id': keep_item['id'], 'changes': changes})
+        operations.extend({'op': 'delete', 'type': c, 'id': item['id']} for c, item in duplicates)
+        planned.append({
+            'similarity': group['similarity'],
+            'keep': {'type': keep_type, 'id': keep_item['id']},
+            'remove': [{'type': c, 'id': item['id']} for c, item in duplicates],
+            'other_binding': [{'type': c, 'id': item['id']} for c, item in distinct],
+            'changes': changes,
+            'items': [{'type': c, **item} for c, item in items],
+        })
+    return {'operations': operations, 'groups': planned}
+
+
+def _describe(collection, item):
+    trigger = item.get('keys') or ' '.join(item.get('sequence') or []) or '-'
+    text = item.get('action') or item.get('commandName') or ''
+    return f"{collection:<17} {item.get('id', '?'):<32} {trigger:<18} {text}"
+
+
+def print_report(plan, stats, elapsed):
+    print('=' * 50)
+    print(f"Scanned {stats['items']:,} items in {elapsed:.2f}s "
+          f"({stats['items'] / max(elapsed, 1e-9):,.0f} items/s)")
+    print(f"LSH {stats['bands']} bands x {stats['rows']} rows: {stats['candidates']:,} candidate pairs, "
+          f"{stats['duplicates']:,} above the threshold")
+    print('=' * 50)
+    for group in plan['groups']:
+        keep = (group['keep']['type'], group['keep']['id'])
+        remove = {(r['type'], r['id']) for r in group['remove']}
+        bound = {(r['type'], r['id']) for r in group['other_binding']}
+        print(f"\nSimilarity >= {group['similarity']:.2f}")
+        for item in group['items']:
+            key = (item['type'], item['id'])
+            marker = 'keep' if key == keep else 'drop' if key in remove else 'bind' if key in bound else '    '
+            print(f"  {marker}  {_describe(item['type'], item)}")
+
+    deletes = sum(1 for op in plan['operations'] if op['op'] == 'delete')
+    bound = sum(len(group['other_binding']) for group in plan['groups'])
+    if plan['groups']:
+        print(f"\n✗ {len(plan['groups']):,} duplicate groups ({deletes:,} items to remove, "
+              f"{bound:,} kept for their own binding)")
+    else:
+        print('\n✓ No near-duplicates found')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find near-duplicate shortcuts across collections')
+    parser.add_argument('source', help='db.json / demo_db.json, or a mongoexport dump of userdatas')
+    parser.add_argument('-t', '--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Minimum Jaccard similarity of the normalized text (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('-o', '--output', help='Write the merge plan (POST /api/shortcuts/batch body) here')
+    parser.add_argument('-w', '--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--perms', type=int, default=DEFAULT_PERMUTATIONS,
+                        help=f'MinHash permutations (default: {DEFAULT_PERMUTATIONS})')
+    parser.add_argument('--user', dest='user_id', help='Mongo dump: only this userId')
+    parser.add_argument('--data-type', choices=['admin', 'demo'], help='Mongo dump: only this dataType')
+    parser.add_argument('--json', action='store_true', help='Print the merge plan as JSON')
+    args = parser.parse_args()
+
+    if not 0 < args.threshold <= 1:
+        parser.error('--threshold must be in (0, 1]')
+    mongo = is_mongo_dump(args.source)
+    if mongo and not (args.user_id or args.data_type):
+        # Duplicates only make sense within one library
+        parser.error('Mongo dumps hold every user - pass --user or --data-type')
+
+    started = time.perf_counter()
+    stats = {}
+    groups = find_duplicates(args.source, args.threshold, args.perms, args.workers,
+                             args.user_id, args.data_type, mongo, stats)
+    plan = merge_plan(groups)
+    elapsed = time.perf_counter() - started
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(plan, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps({**plan, 'stats': stats}, indent=2, ensure_ascii=False))
+    else:
+        print_report(plan, stats, elapsed)
+        if args.output:
+            print(f"✓ Merge plan written to {args.output}")
+    sys.exit(1 if groups else 0)
+
+
+if __name__ == '__main__':
+    main()
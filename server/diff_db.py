@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Structural diff and three-way merge of shortcut databases.
+
+Compares two libraries (db.json, demo_db.json or a mongoexport dump of
+userdatas) collection by collection, matching items by `id`, and reports the
+items added, removed and changed, with the fields that changed.
+
+With --base it merges instead: BASE is the upstream set a library started
+from, OURS the library as edited since and THEIRS the new upstream set (e.g.
+last release's demo_db.json, a user's export and the new demo_db.json).
+Upstream changes to items the library left alone are taken, local edits are
+kept, and items edited on both sides are merged field by field. A field
+changed differently on both sides, or an item deleted on one side and edited
+on the other, is a conflict, settled by --prefer.
+
+The inputs are streamed side by side and only items that are out of step are
+held in memory, indexed by (collection, id). Snapshots keep their item order
+(new items are appended), so memory follows the size of the changes rather
+than of the files.
+
+--batch writes the changes as a body for POST /api/shortcuts/batch (old ->
+new, or OURS -> merged), to apply them to a live library:
+
+  curl -X POST http://localhost:3001/api/shortcuts/batch \\
+       -H "Authorization: Bearer $TOKEN" -H 'Content-Type: application/json' \\
+       -d @changes.json
+
+Usage:
+  python diff_db.py old_db.json db.json
+  python diff_db.py userdatas-old.jsonl userdatas.jsonl --data-type admin --json
+  python diff_db.py --base demo_v1.json my_export.json demo_db.json -o merged.json
+  python diff_db.py --base demo_v1.json my_export.json demo_db.json --prefer theirs --batch changes.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from itertools import zip_longest
+
+from db_stream import COLLECTIONS, is_mongo_dump, iter_items
+from export_shortcuts import export_json
+
+# POST /api/shortcuts/batch accepts at most this many operations
+MAX_BATCH_OPERATIONS = 5000
+
+# Fields that name an item in reports, by collection
+LABEL_FIELDS = ['action', 'commandName', 'name']
+
+_MISSING = object()
+
+
+def item_key(collection, item):
+    """Match key of an item; items without an id only match identical items."""
+    item_id = item.get('id')
+    if not isinstance(item_id, str) or not item_id:
+        item_id = json.dumps(item, sort_keys=True)
+    return collection, item_id
+
+
+def label(item):
+    return next((item[f] for f in LABEL_FIELDS if isinstance(item.get(f), str) and item[f]), '')
+
+
+def field_changes(old, new):
+    """{field: [old, new]} for every field that differs (None when absent)."""
+    changes = {}
+    for field in list(old) + [f for f in new if f not in old]:
+        before, after = old.get(field, _MISSING), new.get(field, _MISSING)
+        if before != after:
+            changes[field] = [None if before is _MISSING else before, None if after is _MISSING else after]
+    return changes
+
+
+# ============= Diff =============
+
+def diff_items(old_items, new_items, stats=None):
+    """
+    Diff two (collection, item) streams.
+
+    Returns {collection: {'added': [item], 'removed': [item],
+    'changed': [(before, after)]}} for collections with differences. Both
+    streams advance together; an item is parked until the other side reaches
+    its id, so only out-of-step items are held.
+    """
+    pending_old, pending_new = {}, {}
+    changed = {}
+    counts = {'old': 0, 'new': 0, 'peak_pending': 0}
+
+    for old, new in zip_longest(old_items, new_items):
+        # In step (the common case): compare directly
+        if old is not None and new is not None and old[0] == new[0]:
+            old_id = old[1].get('id')
+            if isinstance(old_id, str) and old_id and old_id == new[1].get('id'):
+                counts['old'] += 1
+                counts['new'] += 1
+                if old[1] != new[1]:
+                    changed.setdefault(old[0], []).append((old[1], new[1]))
+                continue
+        if old is not None:
+            counts['old'] += 1
+            key = item_key(*old)
+            match = pending_new.pop(key, None)
+            if match is None:
+                pending_old[key] = old[1]
+            elif match != old[1]:
+                changed.setdefault(key[0], []).append((old[1], match))
+        if new is not None:
+            counts['new'] += 1
+            key = item_key(*new)
+            match = pending_old.pop(key, None)
+            if match is None:
+                pending_new[key] = new[1]
+            elif match != new[1]:
+                changed.setdefault(key[0], []).append((match, new[1]))
+        pending = len(pending_old) + len(pending_new)
+        if pending > counts['peak_pending']:
+            counts['peak_pending'] = pending
+
+    result = {}
+    for collection in COLLECTIONS:
+        entry = {
+            'added': [item for (c, _), item in pending_new.items() if c == collection],
+            'removed': [item for (c, _), item in pending_old.items() if c == collection],
+            'changed': changed.get(collection, []),
+        }
+        if any(entry.values()):
+            result[collection] = entry
+    if stats is not None:
+        stats.update(counts)
+    return result
+
+
+def diff_operations(diff):
+    """POST /api/shortcuts/batch operations that turn the old side into the new one."""
+    operations = []
+    for collection, entry in diff.items():
+        operations += [{'op': 'delete', 'type': collection, 'id': item['id']}
+                       for item in entry['removed'] if 'id' in item]
+        operations += [{'op': 'update', 'type': collection, 'id': after['id'],
+                        'changes': {f: v[1] for f, v in field_changes(before, after).items()}}
+                       for before, after in entry['changed']]
+        operations += [{'op': 'create', 'type': collection, 'id': item.get('id'), 'item': item}
+                       for item in entry['added']]
+    return operations
+
+
+# ============= Merge =============
+
+def merge_fields(base, ours, theirs, prefer):
+    """Three-way merge of one item's fields; returns (merged, {field: [ours, theirs]})."""
+    merged = {}
+    conflicts = {}
+    for field in list(ours) + [f for f in theirs if f not in ours] + [f for f in base if f not in ours and f not in theirs]:
+        b, o, t = (side.get(field, _MISSING) for side in (base, ours, theirs))
+        if o == t or t == b:
+            value = o
+        elif o == b:
+            value = t
+        else:
+            value = o if prefer == 'ours' else t
+            conflicts[field] = [None if o is _MISSING else o, None if t is _MISSING else t]
+        if value is not _MISSING:
+            merged[field] = value
+    return merged, conflicts
+
+
+class Merge:
+    """
+    Applies the upstream changes (BASE -> THEIRS) to OURS while it streams.
+
+    Only items upstream touched are looked at; everything else in OURS passes
+    through as is. `operations` collects the batch that turns OURS into the
+    merged library and `conflicts` every conflict with how it was settled.
+    """
+
+    def __init__(self, upstream, prefer='ours'):
+        self.prefer = prefer
+        # collection -> id -> (base item or None, theirs item or None)
+        self.touched = {}
+        for collection, entry in upstream.items():
+            touched = self.touched.setdefault(collection, {})
+            for item in entry['added']:
+                touched[item_key(collection, item)[1]] = (None, item)
+            for item in entry['removed']:
+                touched[item_key(collection, item)[1]] = (item, None)
+            for before, after in entry['changed']:
+                touched[item_key(collection, after)[1]] = (before, after)
+        self.seen = set()
+        self.operations = []
+        self.conflicts = []
+        self.stats = {}
+
+    def _count(self, collection, what):
+        counts = self.stats.setdefault(collection, {'taken': 0, 'merged': 0, 'conflicts': 0})
+        counts[what] += 1
+
+    def _conflict(self, collection, item, kind, fields=None):
+        resolution = 'kept ours' if self.prefer == 'ours' else 'took theirs'
+        self.conflicts.append({'collection': collection, 'id': item.get('id'), 'label': label(item),
+                               'kind': kind, 'fields': fields or {}, 'resolution': resolution})
+        self._count(collection, 'conflicts')
+
+    def resolve(self, collection, ours, base, theirs):
+        """The merged item for an id upstream touched and OURS still has (None to delete)."""
+        if base is None:
+            # Added on both sides
+            if ours == theirs:
+                return ours
+            merged, fields = merge_fields({}, ours, theirs, self.prefer)
+        elif theirs is None:
+            if ours == base:
+                self._count(collection, 'taken')
+                return None
+            self._conflict(collection, ours, 'edited here, deleted upstream')
+            return ours if self.prefer == 'ours' else None
+        elif ours == base:
+            self._count(collection, 'taken')
+            return theirs
+        elif ours == theirs:
+            return ours
+        else:
+            merged, fields = merge_fields(base, ours, theirs, self.prefer)
+        if fields:
+            self._conflict(collection, ours, 'edited on both sides', fields)
+        else:
+            self._count(collection, 'merged')
+        return merged
+
+    def _emit(self, collection, ours, merged):
+        # Items without an id cannot be addressed by a batch operation
+        addressable = 'id' in ours
+        if merged is None:
+            if addressable:
+                self.operations.append({'op': 'delete', 'type': collection, 'id': ours['id']})
+            return
+        if merged != ours and addressable:
+            self.operations.append({'op': 'update', 'type': collection, 'id': ours['id'],
+                                    'changes': {f: v[1] for f, v in field_changes(ours, merged).items()}})
+        yield collection, merged
+
+    def _unseen(self, collection):
+        """Items upstream has that OURS does not: new upstream, or deleted here."""
+        for item_id, (base, theirs) in self.touched.get(collection, {}).items():
+            if (collection, item_id) in self.seen or theirs is None:
+                continue
+            self.seen.add((collection, item_id))
+            if base is not None:
+                if base == theirs:
+                    continue
+                self._conflict(collection, theirs, 'deleted here, edited upstream')
+                if self.prefer == 'ours':
+                    continue
+            else:
+                self._count(collection, 'taken')
+            self.operations.append({'op': 'create', 'type': collection, 'id': theirs.get('id'), 'item': theirs})
+            yield collection, theirs
+
+    def items(self, ours_items):
+        """Yield the merged (collection, item) stream, grouped by collection."""
+        current = None
+        for collection, item in ours_items:
+            if collection != current:
+                if current is not None:
+                    yield from self._unseen(current)
+                current = collection
+            key = item_key(collection, item)
+            entry = self.touched.get(collection, {}).get(key[1])
+            if entry is None:
+                yield collection, item
+                continue
+            self.seen.add(key)
+            base, theirs = entry
+            yield from self._emit(collection, item, self.resolve(collection, item, base, theirs))
+        if current is not None:
+            yield from self._unseen(current)
+        for collection in COLLECTIONS:
+            yield from self._unseen(collection)
+
+
+# ============= Reports =============
+
+def _show(value):
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= 60 else text[:57] + '...'
+
+
+def print_diff(diff, stats, elapsed, limit):
+    print('=' * 50)
+    print(f"Compared {stats['old']:,} with {stats['new']:,} items in {elapsed:.2f}s "
+          f"(at most {stats['peak_pending']:,} held at once)")
+    print('=' * 50)
+    for collection, entry in diff.items():
+        print(f"\n{collection}: +{len(entry['added']):,} -{len(entry['removed']):,} ~{len(entry['changed']):,}")
+        lines = [f"  + {item.get('id')}  {label(item)}" for item in entry['added']]
+        lines += [f"  - {item.get('id')}  {label(item)}" for item in entry['removed']]
+        for before, after in entry['changed']:
+            lines.append(f"  ~ {after.get('id')}  {label(after)}")
+            lines += [f"      {field}: {_show(old)} -> {_show(new)}"
+                      for field, (old, new) in field_changes(before, after).items()]
+        for line in lines[:limit]:
+            print(line)
+        if len(lines) > limit:
+            print(f"  ... {len(lines) - limit:,} more lines")
+
+    total = sum(len(v) for entry in diff.values() for v in entry.values())
+    if total:
+        print(f"\n✗ {total:,} items differ")
+    else:
+        print('\n✓ No differences')
+
+
+def print_merge(merge, elapsed, limit):
+    print('=' * 50)
+    print(f"Merged in {elapsed:.2f}s (conflicts: {'keep ours' if merge.prefer == 'ours' else 'take theirs'})")
+    print('=' * 50)
+    for collection, counts in merge.stats.items():
+        print(f"  {collection:<18} {counts['taken']:>7,} taken  {counts['merged']:>7,} merged  "
+              f"{counts['conflicts']:>7,} conflicts")
+    if merge.conflicts:
+        print('\nConflicts:')
+    for conflict in merge.conflicts[:limit]:
+        print(f"  {conflict['collection']}/{conflict['id']}  {conflict['label']}: "
+              f"{conflict['kind']} ({conflict['resolution']})")
+        for field, (ours, theirs) in conflict['fields'].items():
+            print(f"      {field}: ours {_show(ours)}, theirs {_show(theirs)}")
+    if len(merge.conflicts) > limit:
+        print(f"  ... {len(merge.conflicts) - limit:,} more")
+
+    print(f"\n{len(merge.operations):,} changes to the library")
+    if merge.conflicts:
+        print(f"✗ {len(merge.conflicts):,} conflicts")
+    else:
+        print('✓ No conflicts')
+
+
+def write_batch(path, operations):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'operations': operations}, f, indent=2, ensure_ascii=False)
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        print(f"⚠ {len(operations):,} operations - the server takes at most {MAX_BATCH_OPERATIONS:,} "
+              f"per batch, send them in parts", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Diff or three-way merge shortcut databases')
+    parser.add_argument('old', metavar='OLD|OURS', help='db.json / demo_db.json, or a mongoexport dump of userdatas')
+    parser.add_argument('new', metavar='NEW|THEIRS', help='The file to compare with (the new upstream set with --base)')
+    parser.add_argument('--base', help='Merge: the upstream set OURS started from')
+    parser.add_argument('--prefer', choices=['ours', 'theirs'], default='ours',
+                        help='Merge: which side wins a conflict (default: ours)')
+    parser.add_argument('-o', '--output', help='Merge: write the merged db.json here')
+    parser.add_argument('--batch', help='Write the changes as a POST /api/shortcuts/batch body')
+    parser.add_argument('--user', dest='user_id', help='Mongo dumps: only this userId')
+    parser.add_argument('--data-type', choices=['admin', 'demo'], help='Mongo dumps: only this dataType')
+    parser.add_argument('--limit', type=int, default=20, help='Report lines per collection (default: 20)')
+    parser.add_argument('--json', action='store_true', help='Print the result as JSON')
+    parser.add_argument('--exit-zero', action='store_true', help='Exit 0 even when differences or conflicts are found')
+    args = parser.parse_args()
+
+    paths = [p for p in (args.base, args.old, args.new) if p]
+    if args.output and not args.base:
+        parser.error('-o writes a merge result - pass --base')
+    mongo = {path: is_mongo_dump(path) for path in paths}
+    if any(mongo.values()) and not (args.user_id or args.data_type):
+        # Items are matched by id within one library
+        parser.error('Mongo dumps hold every user - pass --user or --data-type')
+
+    def read(path):
+        return iter_items(path, None, args.user_id, args.data_type, mongo[path])
+
+    started = time.perf_counter()
+    if not args.base:
+        stats = {}
+        diff = diff_items(read(args.old), read(args.new), stats)
+        elapsed = time.perf_counter() - started
+        operations = diff_operations(diff)
+        if args.batch:
+            write_batch(args.batch, operations)
+        if args.json:
+            print(json.dumps({'collections': {
+                collection: {
+                    'added': entry['added'],
+                    'removed': entry['removed'],
+                    'changed': [{'id': after.get('id'), 'fields': field_changes(before, after)}
+                                for before, after in entry['changed']],
+                } for collection, entry in diff.items()}, 'stats': stats}, indent=2, ensure_ascii=False))
+        else:
+            print_diff(diff, stats, elapsed, args.limit)
+            if args.batch:
+                print(f"✓ {len(operations):,} operations written to {args.batch}")
+        sys.exit(1 if diff and not args.exit_zero else 0)
+
+    upstream = diff_items(read(args.base), read(args.new))
+    merge = Merge(upstream, args.prefer)
+    merged = merge.items(read(args.old))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.writelines(export_json(merged))
+    else:
+        for _ in merged:
+            pass
+    elapsed = time.perf_counter() - started
+    if args.batch:
+        write_batch(args.batch, merge.operations)
+    if args.json:
+        print(json.dumps({'collections': merge.stats, 'conflicts': merge.conflicts,
+                          'operations': len(merge.operations)}, indent=2, ensure_ascii=False))
+    else:
+        print_merge(merge, elapsed, args.limit)
+        if args.output:
+            print(f"✓ Merged library written to {args.output}")
+        if args.batch:
+            print(f"✓ {len(merge.operations):,} operations written to {args.batch}")
+    sys.exit(1 if merge.conflicts and not args.exit_zero else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Export shortcuts from db.json or a Mongo dump, streaming.
+
+Formats match GET /api/export (server/lib/exportFormats.js):
+  markdown   - reference tables, like the Export tab in the app
+  json       - {"leaderShortcuts": [...], ...}
+  csv        - one row per item across all collections
+  raycast    - Raycast command list with hotkeys and aliases
+  leaderkey  - Leader Key config.json group/action tree
+
+Items are read and written one at a time, so memory stays flat regardless
+of library size (leaderkey buffers only the leader sequences it nests).
+Icons (iconUrl) are left out unless --icons is given.
+
+Usage:
+  python export_shortcuts.py demo_db.json --format csv -o shortcuts.csv
+  python export_shortcuts.py userdatas.jsonl --data-type admin --format json
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+from datetime import date
+
+from db_stream import COLLECTIONS, iter_items, is_mongo_dump
+
+DEFAULT_COLLECTIONS = ['leaderShortcuts', 'raycastShortcuts', 'systemShortcuts']
+
+SECTION_TITLES = {
+    'leaderShortcuts': 'Leader Key Shortcuts',
+    'raycastShortcuts': 'Raycast Shortcuts',
+    'systemShortcuts': 'System Shortcuts',
+    'leaderGroups': 'Leader Key Groups',
+    'appsLibrary': 'Apps Library',
+}
+
+MARKDOWN_TABLES = {
+    'leaderShortcuts': (
+        '| Sequence | Action | Category | Notes |\n|----------|--------|----------|-------|\n',
+        lambda s: [' → '.join(s.get('sequence') or []), s.get('action'), s.get('category'), s.get('notes')],
+    ),
+    'raycastShortcuts': (
+        '| Keys/Alias | Command | Extension | Notes |\n|------------|---------|-----------|-------|\n',
+        lambda s: [s.get('keys') or s.get('aliasText') or 'N/A', s.get('commandName'), s.get('category'), s.get('notes')],
+    ),
+    'systemShortcuts': (
+        '| Keys | Action | Category | Notes |\n|------|--------|----------|-------|\n',
+        lambda s: [s.get('keys') or 'N/A', s.get('action'), s.get('category'), s.get('notes')],
+    ),
+    'leaderGroups': (
+        '| Key | Name | Parent |\n|-----|------|--------|\n',
+        lambda g: [g.get('key'), g.get('name'), g.get('parentKey')],
+    ),
+    'appsLibrary': (
+        '| Name | Category | Bundle ID | Tags |\n|------|----------|-----------|------|\n',
+        lambda a: [a.get('name'), a.get('category'), a.get('bundleId'), ', '.join(a.get('tags') or [])],
+    ),
+}
+
+CSV_COLUMNS = [
+    'collection', 'id', 'keys', 'sequence', 'aliasText', 'action', 'commandName', 'name',
+    'appOrContext', 'category', 'appId', 'key', 'parentKey', 'bundleId', 'tags', 'notes',
+]
+
+# Formats with a fixed set of collections (others are meaningless there)
+FORMAT_COLLECTIONS = {
+    'raycast': ['raycastShortcuts'],
+    'leaderkey': ['leaderGroups', 'leaderShortcuts', 'appsLibrary'],
+}
+
+
+def _md_cell(value):
+    if value is None:
+        return ''
+    return str(value).replace('|', '\\|').replace('\r\n', ' ').replace('\n', ' ')
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ' '.join(str(v) for v in value)
+    return value
+
+
+def export_markdown(items, icons=False):
+    yield f"# Keyboard Shortcuts Reference\n\n*Exported on {date.today().isoformat()}*\n\n"
+    current = None
+    for name, item in items:
+        if name != current:
+            if current is not None:
+                yield '\n'
+            current = name
+            yield f"## {SECTION_TITLES[name]}\n\n{MARKDOWN_TABLES[name][0]}"
+        row = MARKDOWN_TABLES[name][1](item)
+        yield '| ' + ' | '.join(_md_cell(v) for v in row) + ' |\n'
+    if current is not None:
+        yield '\n'
+
+
+def export_json(items, icons=False):
+    yield '{'
+    current = None
+    first = True
+    for name, item in items:
+        if name != current:
+            if current is not None:
+                yield ']' if first else '\n  ]'
+                yield ','
+            current = name
+            first = True
+            yield f"\n  {json.dumps(name)}: ["
+        yield ('' if first else ',') + '\n    ' + json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+        first = False
+    if current is not None:
+        yield ']' if first else '\n  ]'
+    yield '\n}\n'
+
+
+def export_csv(items, icons=False):
+    columns = CSV_COLUMNS + (['iconUrl'] if icons else [])
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator='\n')
+    writer.writerow(columns)
+    for name, item in items:
+        writer.writerow([name if col == 'collection' else _csv_cell(item.get(col)) for col in columns])
+        # Hand rows over in batches rather than one tiny write per item
+        if out.tell() >= 64 * 1024:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue()
+
+
+def export_raycast(items, icons=False):
+    yield '{\n  "version": 1,\n  "commands": ['
+    first = True
+    for _, item in items:
+        command = {
+            'title': item.get('commandName') or '',
+            'extension': item.get('category') or '',
+            'hotkey': item.get('keys') or None,
+            'alias': item.get('aliasText') or None,
+        }
+        yield ('' if first else ',') + '\n    ' + json.dumps(command, ensure_ascii=False, separators=(',', ':'))
+        first = False
+    yield ']\n}\n' if first else '\n  ]\n}\n'
+
+
+def export_leaderkey(items, icons=False):
+    groups = {}
+    shortcuts = []
+    app_names = {}
+    for name, item in items:
+        if name == 'leaderGroups':
+            groups[(item.get('parentKey') or '', item.get('key'))] = item.get('name') or ''
+        elif name == 'leaderShortcuts':
+            shortcuts.append((item.get('sequence') or [], item.get('action') or '', item.get('appId')))
+        elif name == 'appsLibrary':
+            app_names[item.get('id')] = item.get('name')
+
+    root = {'type': 'group', 'actions': []}
+    for sequence, action, app_id in shortcuts:
+        keys = [k for i, k in enumerate(sequence) if not (i == 0 and str(k).lower() == 'leader')]
+        if not keys:
+            continue
+        node = root
+        for depth, key in enumerate(keys[:-1]):
+            child = next((a for a in node['actions'] if a['type'] == 'group' and a['key'] == key), None)
+            if child is None:
+                parent_key = keys[depth - 1] if depth else ''
+                child = {'key': key, 'type': 'group', 'label': groups.get((parent_key, key), ''), 'actions': []}
+                node['actions'].append(child)
+            node = child
+        app_name = app_names.get(app_id) if app_id else None
+        node['actions'].append({
+            'key': keys[-1],
+            'type': 'application' if app_name else 'command',
+            'label': action,
+            'value': f"/Applications/{app_name}.app" if app_name else '',
+        })
+    yield json.dumps(root, indent=2, ensure_ascii=False) + '\n'
+
+
+EXPORTERS = {
+    'markdown': export_markdown,
+    'json': export_json,
+    'csv': export_csv,
+    'raycast': export_raycast,
+    'leaderkey': export_leaderkey,
+}
+
+
+def _strip_icons(items):
+    for name, item in items:
+        item.pop('iconUrl', None)
+        yield name, item
+
+
+def export(source, out, fmt='markdown', collections=None, icons=False,
+           user_id=None, data_type=None, mongo=None):
+    """Stream `source` to the text file `out` in the given format."""
+    if collections is None:
+        collections = FORMAT_COLLECTIONS.get(fmt, DEFAULT_COLLECTIONS)
+    elif fmt in FORMAT_COLLECTIONS:
+        collections = [c for c in FORMAT_COLLECTIONS[fmt] if c in collections]
+
+    items = iter_items(source, set(collections), user_id=user_id, data_type=data_type, mongo=mongo)
+    if not icons:
+        items = _strip_icons(items)
+    for chunk in EXPORTERS[fmt](items, icons=icons):
+        out.write(chunk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export shortcuts from db.json or a Mongo dump')
+    parser.add_argument('source', help='db.json / demo_db.json, or a mongoexport dump of userdatas')
+    parser.add_argument('-f', '--format', choices=sorted(EXPORTERS), default='markdown')
+    parser.add_argument('-o', '--output', help='Output file (default: stdout)')
+    parser.add_argument('-c', '--collections', help=f"Comma-separated subset of: {', '.join(COLLECTIONS)}")
+    parser.add_argument('--icons', action='store_true', help='Include iconUrl fields')
+    parser.add_argument('--user', dest='user_id', help='Mongo dump: export this userId')
+    parser.add_argument('--data-type', choices=['admin', 'demo', 'client'], help='Mongo dump: export this dataType')
+    args = parser.parse_args()
+
+    collections = None
+    if args.collections:
+        collections = [c.strip() for c in args.collections.split(',')]
+        collections = ['appsLibrary' if c == 'apps' else c for c in collections]
+        unknown = [c for c in collections if c not in COLLECTIONS]
+        if unknown:
+            parser.error(f"Unknown collections: {', '.join(unknown)}")
+
+    mongo = is_mongo_dump(args.source)
+    if mongo and not (args.user_id or args.data_type):
+        parser.error('Mongo dumps hold every user - pass --user or --data-type')
+
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        export(args.source, out, args.format, collections, args.icons,
+               user_id=args.user_id, data_type=args.data_type, mongo=mongo)
+    finally:
+        if args.output:
+            out.close()
+            print(f"✓ Exported to {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Bulk import shortcuts from native config exports into db.json.
+
+Supported sources (auto-detected, or pass --format):
+  raycast    - Raycast command list ({"commands": [{"title", "hotkey", "alias", ...}]})
+  leaderkey  - Leader Key config.json (nested group/action tree)
+  system     - macOS App Shortcuts: `defaults export <domain> file.plist` or
+               `defaults export -g file.plist` (NSUserKeyEquivalents), XML,
+               binary or converted to JSON
+  json       - a db.json or an /api/export JSON export
+
+Key strings are normalized with the same rules as parseKeyString, items that
+already exist in the library are skipped via an in-memory index, appId is
+linked from the apps library by name/bundle id, and the result is written back
+in a single save. POST /api/import (server/routes/import.js) does the same
+against MongoDB.
+
+Usage:
+  python import_shortcuts.py raycast-export.json --into db.json
+  python import_shortcuts.py safari.plist --app com.apple.Safari --into db.json --dry-run
+"""
+
+import argparse
+import json
+import os
+import plistlib
+import re
+import time
+
+from db_stream import COLLECTIONS
+from shortcut_keys import format_keys, normalize_keys, parse_cocoa_key_equivalent, parse_key_string
+from shortcut_schema import validate_item
+
+ID_PREFIXES = {
+    'leaderShortcuts': 'leader',
+    'raycastShortcuts': 'raycast',
+    'systemShortcuts': 'sys',
+    'leaderGroups': 'group',
+    'appsLibrary': 'app',
+}
+
+
+def _slug(text):
+    return re.sub(r'[^a-z0-9]+', '_', str(text or '').lower()).strip('_')[:40] or 'item'
+
+
+def _display_keys(key_string):
+    return format_keys(*parse_key_string(key_string))
+
+
+# ============= Source parsers =============
+# Each parser yields (collection, item, app_hint) for a loaded source document.
+
+def parse_raycast(data):
+    commands = data.get('commands', []) if isinstance(data, dict) else data
+    for command in commands or []:
+        if not isinstance(command, dict):
+            continue
+        title = command.get('title') or command.get('commandName') or command.get('name') or ''
+        hotkey = command.get('hotkey') or command.get('keys') or command.get('shortcut')
+        alias = command.get('alias') or command.get('aliasText')
+        if not title or not (hotkey or alias):
+            continue
+        item = {
+            'keys': _display_keys(hotkey) or None,
+            'commandName': title,
+            'aliasText': alias or None,
+            'category': command.get('extension') or command.get('category') or '',
+            'notes': None,
+        }
+        # "Open Beeper Desktop" launches the app called "Beeper Desktop"
+        hint = command.get('app') or re.sub(r'^open\s+', '', title, flags=re.IGNORECASE)
+        yield 'raycastShortcuts', item, hint
+
+
+def parse_leaderkey(data):
+    def walk(node, path, top_label):
+        for action in node.get('actions') or []:
+            key = action.get('key')
+            if not key:
+                continue
+            if action.get('type') == 'group':
+                label = action.get('label') or ''
+                yield 'leaderGroups', {
+                    'key': key,
+                    'name': label or key,
+                    'parentKey': path[-1] if path else None,
+                    'iconUrl': None,
+                }, None
+                yield from walk(action, path + [key], top_label or label)
+                continue
+
+            value = action.get('value') or ''
+            app_name = None
+            if action.get('type') == 'application' and value:
+                app_name = os.path.basename(value.rstrip('/'))
+                if app_name.endswith('.app'):
+                    app_name = app_name[:-4]
+            yield 'leaderShortcuts', {
+                'sequence': ['Leader'] + path + [key],
+                'category': top_label or '',
+                'app': app_name,
+                'action': action.get('label') or (f"Open {app_name}" if app_name else value),
+                'notes': None,
+            }, app_name
+
+    yield from walk(data, [], '')
+
+
+def parse_system(data, app=None):
+    if 'NSUserKeyEquivalents' in data:
+        domains = {app or 'Global': data}
+    else:
+        domains = {k: v for k, v in data.items() if isinstance(v, dict) and 'NSUserKeyEquivalents' in v}
+
+    for domain, prefs in domains.items():
+        for menu_title, equivalent in (prefs.get('NSUserKeyEquivalents') or {}).items():
+            modifiers, key = parse_cocoa_key_equivalent(equivalent)
+            if not key:
+                continue
+            # Menu paths are stored as "\033File\033Export…"
+            action = ' → '.join(part for part in menu_title.split('\x1b') if part)
+            hint = None if domain == 'Global' else domain
+            yield 'systemShortcuts', {
+                'keys': format_keys(modifiers, key),
+                'appOrContext': hint or 'Global',
+                'action': action,
+                'category': 'Menu',
+                'notes': None,
+            }, hint
+
+
+def parse_json(data):
+    for collection in COLLECTIONS:
+        items = data.get(collection)
+        if collection == 'appsLibrary' and not items:
+            items = data.get('apps')
+        for item in items or []:
+            if isinstance(item, dict):
+                yield collection, dict(item), None
+
+
+PARSERS = {
+    'raycast': parse_raycast,
+    'leaderkey': parse_leaderkey,
+    'system': parse_system,
+    'json': parse_json,
+}
+
+
+def detect_format(data):
+    if isinstance(data, list) or (isinstance(data, dict) and 'commands' in data):
+        return 'raycast'
+    if isinstance(data, dict) and data.get('type') == 'group' and 'actions' in data:
+        return 'leaderkey'
+    if isinstance(data, dict) and any(k in data for k in COLLECTIONS + ['apps']):
+        return 'json'
+    if isinstance(data, dict) and ('NSUserKeyEquivalents' in data or any(
+            isinstance(v, dict) and 'NSUserKeyEquivalents' in v for v in data.values())):
+        return 'system'
+    raise ValueError('Unrecognized import format - pass --format')
+
+
+def load_source(path):
+    with open(path, 'rb') as f:
+        head = f.read(8)
+        f.seek(0)
+        if path.endswith('.plist') or head.startswith(b'bplist') or head.startswith(b'<?xml'):
+            return plistlib.load(f)
+        return json.load(f)
+
+
+# ============= Dedupe index =============
+
+class LibraryIndex:
+    """Hash indexes over an existing library for O(1) duplicate checks and app linking."""
+
+    def __init__(self, db):
+        self.ids = set()
+        self.seen = {c: set() for c in COLLECTIONS}
+        self.apps_by_name = {}
+        self.apps_by_bundle = {}
+        for collection in COLLECTIONS:
+            for item in db.get(collection) or []:
+                self._remember(collection, item)
+
+    @staticmethod
+    def identity(collection, item):
+        if collection == 'raycastShortcuts':
+            trigger = normalize_keys(item.get('keys')) or f"alias:{(item.get('aliasText') or '').lower()}"
+            return trigger, (item.get('commandName') or '').strip().lower()
+        if collection == 'systemShortcuts':
+            return normalize_keys(item.get('keys')), (item.get('action') or '').strip().lower()
+        if collection == 'leaderShortcuts':
+            sequence = [str(k).lower() for k in item.get('sequence') or []]
+            if sequence and sequence[0] == 'leader':
+                sequence = sequence[1:]
+            return tuple(sequence)
+        if collection == 'leaderGroups':
+            return item.get('parentKey') or None, item.get('key')
+        return (item.get('name') or '').strip().lower()
+
+    def _remember(self, collection, item, identity=None):
+        if item.get('id'):
+            self.ids.add(item['id'])
+        self.seen[collection].add(identity if identity is not None else self.identity(collection, item))
+        if collection == 'appsLibrary':
+            if item.get('name'):
+                self.apps_by_name[item['name'].strip().lower()] = item.get('id')
+            if item.get('bundleId'):
+                self.apps_by_bundle[item['bundleId'].lower()] = item.get('id')
+
+    def find_app(self, hint):
+        if not hint:
+            return None
+        hint = hint.strip().lower()
+        return self.apps_by_bundle.get(hint) or self.apps_by_name.get(hint)
+
+    def new_id(self, collection, item):
+        label = item.get('commandName') or item.get('action') or item.get('name') or '_'.join(item.get('sequence') or [])
+        base = f"{ID_PREFIXES[collection]}_{_slug(label)}"
+        candidate, n = base, 2
+        while candidate in self.ids:
+            candidate, n = f"{base}_{n}", n + 1
+        return candidate
+
+    def add(self, collection, item, app_hint=None):
+        """Accept `item` unless it duplicates the library or this batch. Returns True when added."""
+        identity = self.identity(collection, item)
+        if item.get('id') in self.ids or identity in self.seen[collection]:
+            return False
+        if collection not in ('appsLibrary', 'leaderGroups') and not item.get('appId'):
+            item['appId'] = self.find_app(app_hint)
+        if not item.get('id'):
+            item['id'] = self.new_id(collection, item)
+        self._remember(collection, item, identity)
+        return True
+
+
+def import_into(db, entries):
+    """Merge parsed (collection, item, app_hint) entries into `db`.
+
+    Returns (added counts, skipped duplicates, invalid items); invalid items are
+    reported as {collection, id, errors} and left out, like the API does.
+    """
+    index = LibraryIndex(db)
+    added = {c: [] for c in COLLECTIONS}
+    skipped = 0
+    invalid = []
+    # Apps first so shortcuts in the same batch can link to them
+    entries = sorted(entries, key=lambda e: e[0] != 'appsLibrary')
+    for collection, item, hint in entries:
+        if not index.add(collection, item, hint):
+            skipped += 1
+            continue
+        value, errors, _ = validate_item(collection, item)
+        if errors:
+            invalid.append({'collection': collection, 'id': item.get('id'), 'errors': errors})
+        else:
+            added[collection].append(value)
+    for collection, items in added.items():
+        if items:
+            db.setdefault(collection, []).extend(items)
+    return {c: len(items) for c, items in added.items() if items}, skipped, invalid
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import shortcuts into db.json')
+    parser.add_argument('source', help='Raycast / Leader Key / App Shortcuts plist / JSON export')
+    parser.add_argument('--into', required=True, help='db.json to import into')
+    parser.add_argument('-f', '--format', choices=sorted(PARSERS), help='Source format (default: auto-detect)')
+    parser.add_argument('--app', help='system format: bundle id or app name the plist belongs to')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be imported without saving')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    data = load_source(args.source)
+    fmt = args.format or detect_format(data)
+    entries = list(parse_system(data, args.app) if fmt == 'system' else PARSERS[fmt](data))
+
+    with open(args.into, 'r', encoding='utf-8') as f:
+        db = json.load(f)
+    added, skipped, invalid = import_into(db, entries)
+    elapsed = time.perf_counter() - started
+
+    for collection, count in added.items():
+        print(f"  + {count} {collection}")
+    for entry in invalid[:20]:
+        print(f"  ✗ {entry['collection']} {entry['id']}: {'; '.join(entry['errors'])}")
+    print(f"Parsed {len(entries)} {fmt} items: {sum(added.values())} new, {skipped} duplicates, "
+          f"{len(invalid)} invalid ({elapsed * 1000:.0f}ms)")
+
+    if args.dry_run:
+        print('Dry run - nothing saved')
+    elif added:
+        with open(args.into, 'w', encoding='utf-8') as f:
+            json.dump(db, f, indent=2, ensure_ascii=False)
+        print(f"✓ Updated {args.into}")
+
+
+if __name__ == '__main__':
+    main()
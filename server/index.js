@@ -1,68 +1,69 @@
 require('dotenv').config();
 const express = require('express');
-const fs = require('fs');
 const path = require('path');
 const cors = require('cors');
-const bodyParser = require('body-parser');
 const mongoose = require('mongoose');
 const compression = require('compression');
 
 // Import auth middleware and routes
 const { verifyToken, requireAuth, requireAdmin } = require('./middleware/auth');
 const authRoutes = require('./routes/auth');
-const User = require('./models/User');
-const UserData = require('./models/UserData');
+const exportRoutes = require('./routes/export');
+const importRoutes = require('./routes/import');
+const iconRoutes = require('./routes/icons');
+const telemetryRoutes = require('./routes/telemetry');
+const { COLLECTIONS, getDbKey, getUserData, loadUserData, parseReadSpec, saveUserData, saveBatchResult, UserDataUnavailableError, sendDataUnavailable } = require('./lib/userData');
+const { validateItem } = require('./lib/validation');
+const { MAX_BATCH_OPERATIONS, applyBatch, newItemId, findBatch, batchRecord, replayResponse } = require('./lib/batchOperations');
+const { parseBody, bodyErrorHandler } = require('./lib/bodyParsing');
+const { runBootstrap } = require('./lib/bootstrap');
+const { createStaticAssets } = require('./lib/staticAssets');
+const { markReady, markDraining, liveness, readiness } = require('./lib/health');
+const { METRICS_CONTENT_TYPE, httpMetrics, instrumentMongoClient, recordProxyImage, renderMetrics } = require('./lib/metrics');
 
 const app = express();
 const PORT = process.env.PORT || 3001;
 
-// Legacy file paths for migration
-const LEGACY_DB_FILE = path.join(__dirname, 'db.json');
-const LEGACY_DEMO_DB_FILE = path.join(__dirname, 'demo_db.json');
+// Behind a load balancer (e.g. Render), TRUST_PROXY=1 makes req.ip the
+// client's address from X-Forwarded-For - per-IP limits depend on it
+if (process.env.TRUST_PROXY) {
+    const hops = Number(process.env.TRUST_PROXY);
+    app.set('trust proxy', Number.isInteger(hops) ? hops : process.env.TRUST_PROXY);
+}
+
+// Per-route latency and payload metrics (before compression to count wire bytes)
+app.use(httpMetrics);
 
-// Enable gzip compression for all responses
-app.use(compression());
+// Enable gzip compression for dynamic responses; precompressed static
+// files (lib/staticAssets.js) opt out
+app.use(compression({
+    filter: (req, res) => !res.locals.skipCompression && compression.filter(req, res)
+}));
 
 // MongoDB Connection String - Replace with your MongoDB Atlas connection string
 const MONGODB_URI = process.env.MONGODB_URI || 'mongodb://localhost:27017/shortcuts_manager';
 
-// Track if MongoDB is connected
-let mongoConnected = false;
-
-// Connect to MongoDB
-mongoose.connect(MONGODB_URI)
+// Connect to MongoDB, then bootstrap default users / legacy data (skipped once applied).
+// SKIP_BOOTSTRAP=true skips it entirely; FORCE_BOOTSTRAP=true re-runs it.
+mongoose.connect(MONGODB_URI, { monitorCommands: true })
   .then(async () => {
+    instrumentMongoClient(mongoose.connection.getClient());
     console.log('Connected to MongoDB');
-    mongoConnected = true;
-    
-    // Create admin user if it doesn't exist
-    try {
-      // Create or update admin user
-      let admin = await User.findOne({ username: 'renshu' });
-      if (!admin) {
-        admin = new User({ username: 'renshu', password: 'renshu123', role: 'admin', displayName: 'Renshu' });
-        await admin.save();
-        console.log('Admin user created: renshu');
-      } else {
-        console.log('Admin user exists: renshu');
-      }
-      
-      // Create or update demo user
-      let demo = await User.findOne({ username: 'gabby_demo' });
-      if (!demo) {
-        demo = new User({ username: 'gabby_demo', password: 'gabby123', role: 'demo', displayName: 'Gabby (Demo)' });
-        await demo.save();
-        console.log('Demo user created: gabby_demo');
-      } else {
-        console.log('Demo user exists: gabby_demo');
+
+    let bootstrap = { skipped: true, reason: 'SKIP_BOOTSTRAP' };
+    if (process.env.SKIP_BOOTSTRAP !== 'true') {
+      try {
+        bootstrap = await runBootstrap({ force: process.env.FORCE_BOOTSTRAP === 'true' });
+        console.log(bootstrap.skipped
+          ? `Bootstrap v${bootstrap.version} already applied`
+          : `Bootstrap v${bootstrap.version} applied in ${bootstrap.durationMs}ms`);
+      } catch (err) {
+        // Existing data can still be served; the next boot retries
+        console.error('Bootstrap failed:', err);
+        bootstrap = { skipped: false, error: err.message };
       }
-      
-      // Migrate existing JSON data to MongoDB if not already migrated
-      await migrateDataToMongoDB(admin, demo);
-      
-    } catch (err) {
-      console.error('Error creating default users:', err);
     }
+    markReady(bootstrap);
   })
   .catch(err => {
     console.error('MongoDB connection failed:', err.message);
@@ -70,152 +71,74 @@ mongoose.connect(MONGODB_URI)
     process.exit(1); // Exit if MongoDB is not available - we need it now
   });
 
-// Migration function: move data from JSON files to MongoDB
-async function migrateDataToMongoDB(adminUser, demoUser) {
-  try {
-    // Check if admin data exists in MongoDB
-    let adminData = await UserData.findOne({ userId: adminUser._id });
-    if (!adminData && fs.existsSync(LEGACY_DB_FILE)) {
-      console.log('Migrating admin data from db.json to MongoDB...');
-      const fileData = JSON.parse(fs.readFileSync(LEGACY_DB_FILE, 'utf8'));
-      adminData = new UserData({
-        userId: adminUser._id,
-        dataType: 'admin',
-        leaderShortcuts: fileData.leaderShortcuts || [],
-        leaderGroups: fileData.leaderGroups || [],
-        raycastShortcuts: fileData.raycastShortcuts || [],
-        systemShortcuts: fileData.systemShortcuts || [],
-        appsLibrary: fileData.appsLibrary || fileData.apps || []
-      });
-      await adminData.save();
-      console.log('Admin data migrated successfully!');
-    }
-    
-    // Check if demo data exists in MongoDB
-    let demoData = await UserData.findOne({ userId: demoUser._id });
-    if (!demoData && fs.existsSync(LEGACY_DEMO_DB_FILE)) {
-      console.log('Migrating demo data from demo_db.json to MongoDB...');
-      const fileData = JSON.parse(fs.readFileSync(LEGACY_DEMO_DB_FILE, 'utf8'));
-      demoData = new UserData({
-        userId: demoUser._id,
-        dataType: 'demo',
-        leaderShortcuts: fileData.leaderShortcuts || [],
-        leaderGroups: fileData.leaderGroups || [],
-        raycastShortcuts: fileData.raycastShortcuts || [],
-        systemShortcuts: fileData.systemShortcuts || [],
-        appsLibrary: fileData.appsLibrary || fileData.apps || []
-      });
-      await demoData.save();
-      console.log('Demo data migrated successfully!');
-    }
-  } catch (err) {
-    console.error('Error migrating data to MongoDB:', err);
-  }
-}
-
-// Increase limit to handle larger payloads (images)
 app.use(cors());
-app.use(express.json({ limit: '100mb' }));
-app.use(express.urlencoded({ limit: '100mb', extended: true }));
-app.use(bodyParser.json({ limit: '100mb' }));
-app.use(bodyParser.urlencoded({ limit: '100mb', extended: true }));
+
+// One body-parsing stage with per-route limits (see lib/bodyParsing.js)
+app.use(parseBody);
+app.use(bodyErrorHandler);
 
 // Add token verification to all requests (optional auth)
 app.use(verifyToken);
 
-// Health check endpoint for Render
-app.get('/api/health', (req, res) => {
-    res.status(200).json({ status: 'ok', timestamp: new Date().toISOString() });
+// Health probes: liveness answers immediately, readiness once Mongo + bootstrap are done
+app.get('/api/health', liveness);
+app.get('/api/health/live', liveness);
+app.get('/api/health/ready', readiness);
+
+// Prometheus metrics, behind `Authorization: Bearer <METRICS_TOKEN>`. In
+// production they are not served at all without a token: they expose route
+// latencies, error counts and pool saturation. Elsewhere a missing token
+// leaves them open for local scraping.
+// Per process: with WEB_CONCURRENCY > 1 a scrape sees one worker (see cluster.js).
+app.get('/api/metrics', (req, res) => {
+    const token = process.env.METRICS_TOKEN;
+    if (!token && process.env.NODE_ENV === 'production') {
+        return res.status(404).json({ error: 'Metrics are disabled (set METRICS_TOKEN)' });
+    }
+    if (token && req.headers['authorization'] !== `Bearer ${token}`) {
+        return res.status(401).json({ error: 'Metrics token required' });
+    }
+    res.set('Content-Type', METRICS_CONTENT_TYPE);
+    res.send(renderMetrics());
 });
 
 // Auth routes
 app.use('/api/auth', authRoutes);
 
-// Helper to get the actual DB key
-const getDbKey = (type) => {
-    if (type === 'apps') return 'appsLibrary';
-    return type;
-};
+// Streaming export (markdown, json, csv, raycast, leaderkey)
+app.use('/api/export', exportRoutes);
 
-// Helper to get user's data from MongoDB
-const getUserData = async (user) => {
-    const defaultData = { 
-        leaderShortcuts: [], 
-        raycastShortcuts: [], 
-        systemShortcuts: [], 
-        leaderGroups: [], 
-        appsLibrary: [] 
-    };
-    
-    try {
-        // Not logged in = show demo data
-        if (!user) {
-            const demoUser = await User.findOne({ role: 'demo' });
-            if (!demoUser) return defaultData;
-            const demoData = await UserData.findOne({ userId: demoUser._id });
-            return demoData ? demoData.toObject() : defaultData;
-        }
-        
-        // Demo user
-        if (user.role === 'demo') {
-            const demoData = await UserData.findOne({ userId: user.id });
-            return demoData ? demoData.toObject() : defaultData;
-        }
-        
-        // Admin user
-        if (user.role === 'admin') {
-            const adminData = await UserData.findOne({ userId: user.id });
-            return adminData ? adminData.toObject() : defaultData;
-        }
-        
-        // Client user - get or create their data
-        let userData = await UserData.findOne({ userId: user.id });
-        if (!userData) {
-            userData = new UserData({
-                userId: user.id,
-                dataType: 'client',
-                ...defaultData
-            });
-            await userData.save();
-        }
-        return userData.toObject();
-    } catch (err) {
-        console.error("Error getting user data from MongoDB:", err);
-        return defaultData;
-    }
-};
+// Bulk import from Raycast / Leader Key / App Shortcuts exports
+app.use('/api/import', importRoutes);
 
-// Helper to save user's data to MongoDB
-const saveUserData = async (data, user) => {
-    try {
-        const updateData = {
-            leaderShortcuts: data.leaderShortcuts || [],
-            leaderGroups: data.leaderGroups || [],
-            raycastShortcuts: data.raycastShortcuts || [],
-            systemShortcuts: data.systemShortcuts || [],
-            appsLibrary: data.appsLibrary || [],
-            updatedAt: new Date()
-        };
-        
-        await UserData.findOneAndUpdate(
-            { userId: user.id },
-            { $set: updateData },
-            { upsert: true, new: true }
-        );
-    } catch (err) {
-        console.error("Error saving user data to MongoDB:", err);
-        throw err;
-    }
-};
+// Icon uploads (streamed binary) and icon serving
+app.use('/api/icons', iconRoutes);
+
+// Client performance telemetry (sampled sessions, see src/utils/perf.js)
+app.use('/api/telemetry', telemetryRoutes);
 
 // GET all shortcuts
 // - Not logged in: See demo database - showcase mode
 // - Demo user: See/edit demo database
 // - Admin users: See/edit admin database
 // - Client users: See/edit their own database
+//
+// ?collections= and ?fields= narrow the read (lib/userData.js parseReadSpec):
+//   ?collections=raycastShortcuts,systemShortcuts&fields=id,keys,appId
+//   ?fields=-iconUrl
+// With ?collections= only the listed collections are returned, under the
+// names given (no appsLibrary/apps duplicate).
 app.get('/api/shortcuts', async (req, res) => {
+    const spec = parseReadSpec(req.query);
+    if (spec.error) {
+        return res.status(400).json({ error: spec.error });
+    }
+
     try {
-        const data = await getUserData(req.user);
+        const data = await getUserData(req.user, spec);
+        if (spec.collections) {
+            return res.json(Object.fromEntries(spec.collections.map(({ name, dbKey }) => [name, data[dbKey] || []])));
+        }
         res.json({
             leaderShortcuts: data.leaderShortcuts || [],
             leaderGroups: data.leaderGroups || [],
@@ -230,28 +153,99 @@ app.get('/api/shortcuts', async (req, res) => {
     }
 });
 
+// Apply many creates/updates/deletes in one read and one write (all authenticated users)
+// POST /api/shortcuts/batch  { operations: [{ op, type, id, item?, changes? }], batchId?, dryRun? }
+// - op: create | update | delete, applied in order (lib/batchOperations.js)
+// - creates with a 'temp_*' id get a server id; `ids` maps temp -> server id
+//   and later operations in the batch may use the temp id
+// - all-or-nothing: any invalid operation rejects the whole batch
+// - a repeated `batchId` (a client retry) returns the first result
+// The body from `python dedupe_shortcuts.py -o merge.json` can be posted as-is,
+// and the client's offline outbox flushes through here (useShortcutsStore).
+app.post('/api/shortcuts/batch', requireAuth, async (req, res) => {
+    const { operations, batchId, dryRun } = req.body || {};
+    if (!Array.isArray(operations) || operations.length === 0) {
+        return res.status(400).json({ error: 'Request body must include a non-empty `operations` list' });
+    }
+    if (operations.length > MAX_BATCH_OPERATIONS) {
+        return res.status(400).json({ error: `At most ${MAX_BATCH_OPERATIONS} operations per batch` });
+    }
+    if (batchId !== undefined && (typeof batchId !== 'string' || !batchId || batchId.length > 100)) {
+        return res.status(400).json({ error: '`batchId` must be a string of up to 100 characters' });
+    }
+
+    // Retries are recognised by batchId on the user's document, in the same
+    // write as the data, so a retry on another worker or one racing the
+    // original request is never applied twice
+    const recorded = Boolean(batchId) && !dryRun;
+
+    try {
+        const db = await loadUserData(req.user);
+        const previous = recorded && findBatch(db, batchId);
+        if (previous) {
+            return res.json(replayResponse(db, operations, previous));
+        }
+
+        const { errors, changed, ...result } = applyBatch(db, operations);
+        if (errors.length > 0) {
+            return res.status(400).json({ error: 'Invalid operations', details: errors.slice(0, 20) });
+        }
+        if (recorded) {
+            const saved = await saveBatchResult(changed ? db : null, req.user, batchRecord(batchId, result));
+            if (!saved) {
+                // The same batch was saved meanwhile: answer with its result
+                const current = await loadUserData(req.user);
+                const original = findBatch(current, batchId);
+                if (!original) throw new Error(`batch ${batchId} was neither saved nor recorded`);
+                return res.json(replayResponse(current, operations, original));
+            }
+        } else if (!dryRun && changed) {
+            await saveUserData(db, req.user);
+        }
+        res.json({ ...result, dryRun: Boolean(dryRun) });
+    } catch (err) {
+        console.error('POST /api/shortcuts/batch error:', err);
+        if (err instanceof UserDataUnavailableError) {
+            return sendDataUnavailable(res, err);
+        }
+        res.status(500).json({ error: "Failed to apply batch" });
+    }
+});
+
 // Generic create endpoint (all authenticated users)
 app.post('/api/shortcuts/:type', requireAuth, async (req, res) => {
     const { type } = req.params;
     const dbKey = getDbKey(type);
-    const newItem = req.body;
+    if (!COLLECTIONS.includes(dbKey)) {
+        return res.status(400).json({ error: 'Invalid type' });
+    }
+
+    const newItem = { ...req.body };
+
+    // Assign ID if missing
+    if (!newItem.id) {
+        newItem.id = newItemId(type);
+    }
+
+    const { value, errors } = validateItem(dbKey, newItem);
+    if (errors.length > 0) {
+        return res.status(400).json({ error: 'Invalid item', details: errors });
+    }
     
     try {
-        const db = await getUserData(req.user);
+        const db = await loadUserData(req.user);
         if (!db[dbKey]) {
             db[dbKey] = [];
         }
 
-        // Assign ID if missing
-        if (!newItem.id) {
-            newItem.id = `${type.replace('Shortcuts', '').replace('Library', '')}_${Date.now()}`;
-        }
-
-        db[dbKey].push(newItem);
+        db[dbKey].push(value);
         await saveUserData(db, req.user);
-        res.json(newItem);
+        res.json(value);
     } catch (err) {
         console.error(`POST /api/shortcuts/${type} error:`, err);
+        if (err instanceof UserDataUnavailableError) {
+            return sendDataUnavailable(res, err);
+        }
         res.status(500).json({ error: "Failed to save item" });
     }
 });
@@ -261,9 +255,12 @@ app.put('/api/shortcuts/:type/:id', requireAuth, async (req, res) => {
     const { type, id } = req.params;
     const dbKey = getDbKey(type);
     const updatedItem = req.body;
+    if (!COLLECTIONS.includes(dbKey)) {
+        return res.status(400).json({ error: 'Invalid type or collection missing' });
+    }
 
     try {
-        const db = await getUserData(req.user);
+        const db = await loadUserData(req.user);
         if (!db[dbKey]) {
             return res.status(400).json({ error: 'Invalid type or collection missing' });
         }
@@ -273,11 +270,20 @@ app.put('/api/shortcuts/:type/:id', requireAuth, async (req, res) => {
             return res.status(404).json({ error: 'Item not found' });
         }
 
-        db[dbKey][index] = { ...db[dbKey][index], ...updatedItem };
+        // Validate the merged item; the id in the URL always wins
+        const { value, errors } = validateItem(dbKey, { ...db[dbKey][index], ...updatedItem, id });
+        if (errors.length > 0) {
+            return res.status(400).json({ error: 'Invalid item', details: errors });
+        }
+
+        db[dbKey][index] = value;
         await saveUserData(db, req.user);
         res.json(db[dbKey][index]);
     } catch (err) {
         console.error(`PUT /api/shortcuts/${type}/${id} error:`, err);
+        if (err instanceof UserDataUnavailableError) {
+            return sendDataUnavailable(res, err);
+        }
         res.status(500).json({ error: "Failed to update item" });
     }
 });
@@ -286,9 +292,12 @@ app.put('/api/shortcuts/:type/:id', requireAuth, async (req, res) => {
 app.delete('/api/shortcuts/:type/:id', requireAuth, async (req, res) => {
     const { type, id } = req.params;
     const dbKey = getDbKey(type);
+    if (!COLLECTIONS.includes(dbKey)) {
+        return res.status(400).json({ error: 'Invalid type' });
+    }
     
     try {
-        const db = await getUserData(req.user);
+        const db = await loadUserData(req.user);
         if (!db[dbKey]) {
             return res.status(400).json({ error: 'Invalid type' });
         }
@@ -298,6 +307,9 @@ app.delete('/api/shortcuts/:type/:id', requireAuth, async (req, res) => {
         res.json({ success: true });
     } catch (err) {
         console.error(`DELETE /api/shortcuts/${type}/${id} error:`, err);
+        if (err instanceof UserDataUnavailableError) {
+            return sendDataUnavailable(res, err);
+        }
         res.status(500).json({ error: "Failed to delete item" });
     }
 });
@@ -307,6 +319,7 @@ app.get('/api/proxy-image', async (req, res) => {
     const { url } = req.query;
     
     if (!url) {
+        recordProxyImage('invalid');
         return res.status(400).json({ error: 'URL parameter is required' });
     }
     
@@ -315,9 +328,11 @@ app.get('/api/proxy-image', async (req, res) => {
     try {
         parsedUrl = new URL(url);
         if (!['http:', 'https:'].includes(parsedUrl.protocol)) {
+            recordProxyImage('invalid');
             return res.status(400).json({ error: 'URL must use http or https protocol' });
         }
     } catch (e) {
+        recordProxyImage('invalid');
         return res.status(400).json({ error: 'Invalid URL format' });
     }
     
@@ -338,6 +353,7 @@ app.get('/api/proxy-image', async (req, res) => {
         clearTimeout(timeoutId);
         
         if (!response.ok) {
+            recordProxyImage('http_error');
             return res.status(response.status).json({ 
                 error: `Failed to fetch: ${response.status} ${response.statusText}`,
                 url: url
@@ -348,11 +364,13 @@ app.get('/api/proxy-image', async (req, res) => {
         const buffer = await response.arrayBuffer();
         
         if (buffer.byteLength === 0) {
+            recordProxyImage('empty');
             return res.status(502).json({ error: 'Empty response from remote server' });
         }
         
         const base64 = Buffer.from(buffer).toString('base64');
         
+        recordProxyImage('ok');
         res.json({ 
             dataUrl: `data:${contentType};base64,${base64}`,
             contentType 
@@ -362,18 +380,23 @@ app.get('/api/proxy-image', async (req, res) => {
         
         // Provide more specific error messages
         if (err.name === 'AbortError') {
+            recordProxyImage('timeout');
             return res.status(504).json({ error: 'Request timeout - remote server took too long to respond' });
         }
         if (err.cause?.code === 'ENOTFOUND') {
+            recordProxyImage('dns_error');
             return res.status(502).json({ error: `DNS lookup failed - could not resolve hostname: ${parsedUrl.hostname}` });
         }
         if (err.cause?.code === 'ECONNREFUSED') {
+            recordProxyImage('refused');
             return res.status(502).json({ error: 'Connection refused by remote server' });
         }
         if (err.cause?.code === 'ETIMEDOUT') {
+            recordProxyImage('timeout');
             return res.status(504).json({ error: 'Connection timed out' });
         }
         
+        recordProxyImage('error');
         res.status(500).json({ error: `Failed to proxy image: ${err.message}` });
     }
 });
@@ -381,14 +404,18 @@ app.get('/api/proxy-image', async (req, res) => {
 // Serve static frontend files in production
 if (process.env.NODE_ENV === 'production') {
     const frontendPath = path.join(__dirname, '..', 'dist');
-    
-    // Serve static files from the React app build
-    app.use(express.static(frontendPath));
+
+    // Serve the build's precompressed .br/.gz variants with immutable caching for
+    // hashed assets. PRECOMPRESSED_STATIC=false falls back to express.static.
+    const precompressed = process.env.PRECOMPRESSED_STATIC !== 'false';
+    const staticAssets = precompressed ? createStaticAssets(frontendPath) : express.static(frontendPath);
+    app.use(staticAssets);
     
     // Handle React routing - use middleware for catch-all (Express 5 compatible)
     app.use((req, res, next) => {
         // Only serve index.html for non-API routes that aren't already handled
         if (!req.path.startsWith('/api') && req.method === 'GET') {
+            if (precompressed) return staticAssets.sendIndex(req, res, next);
             res.sendFile(path.join(frontendPath, 'index.html'));
         } else {
             next();
@@ -405,7 +432,30 @@ process.on('uncaughtException', (err) => {
     // process.exit(1); 
 });
 
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
     console.log(`Server running on http://localhost:${PORT}`);
 });
 
+// Graceful shutdown (SIGTERM from the platform or the cluster primary):
+// fail readiness, stop accepting connections, let in-flight requests finish,
+// then close MongoDB. SHUTDOWN_TIMEOUT_MS bounds the wait.
+const SHUTDOWN_TIMEOUT_MS = parseInt(process.env.SHUTDOWN_TIMEOUT_MS, 10) || 10000;
+let shuttingDown = false;
+const shutdown = (signal) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    console.log(`${signal} received, draining connections`);
+    markDraining();
+    setTimeout(() => {
+        console.error('Shutdown timed out, exiting');
+        process.exit(1);
+    }, SHUTDOWN_TIMEOUT_MS).unref();
+    server.close(async () => {
+        await mongoose.disconnect().catch(() => {});
+        process.exit(0);
+    });
+    server.closeIdleConnections();
+};
+process.on('SIGTERM', () => shutdown('SIGTERM'));
+process.on('SIGINT', () => shutdown('SIGINT'));
+
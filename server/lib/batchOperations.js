@@ -0,0 +1,178 @@
+// Batched writes for POST /api/shortcuts/batch.
+//
+// A batch is applied in order to one in-memory copy of the user's data, which
+// the caller then saves once:
+//   { op: 'create', type, id?, item }    a missing or 'temp_*' id gets a server id
+//   { op: 'update', type, id, changes }  merges `changes` into the item, like PUT
+//   { op: 'delete', type, id }
+// Later operations may refer to a create's temp id, as their target or as a
+// field value (e.g. a shortcut's appId). `ids` in the result maps each temp id
+// to its server id. Updates and deletes of items that no longer exist are
+// reported in `missing` instead of failing, so queued offline edits to items
+// removed elsewhere still go through. Any invalid operation rejects the batch.
+
+const { COLLECTIONS, getDbKey } = require('./collections');
+const { validateItem } = require('./validation');
+
+const MAX_BATCH_OPERATIONS = 5000;
+const TEMP_ID = /^temp_/;
+
+// Server id for a new item, in the same form as POST /api/shortcuts/:type
+const newItemId = (type, suffix = '') => `${type.replace('Shortcuts', '').replace('Library', '')}_${Date.now()}${suffix}`;
+
+// Replace temp ids created earlier in the batch with their server ids
+const resolveIds = (fields, ids) => {
+    const resolved = {};
+    for (const [name, value] of Object.entries(fields)) {
+        resolved[name] = typeof value === 'string' && ids[value] ? ids[value] : value;
+    }
+    return resolved;
+};
+
+// Apply `operations` to `db` in place. Returns the counts per collection, the
+// temp id map and, per operation, the stored item (null for deletes and
+// missing items); `errors` is non-empty when the batch must be rejected.
+const applyBatch = (db, operations) => {
+    const errors = [];
+    const missing = [];
+    const created = {};
+    const updated = {};
+    const deleted = {};
+    const ids = {};
+    const items = [];
+    const count = (totals, dbKey) => { totals[dbKey] = (totals[dbKey] || 0) + 1; };
+
+    // id -> position per collection, built on first use; deletes leave a hole
+    // (null) that is compacted once at the end
+    const positions = {};
+    const positionsOf = (dbKey) => {
+        if (!positions[dbKey]) {
+            db[dbKey] = db[dbKey] || [];
+            positions[dbKey] = new Map(db[dbKey].map((item, position) => [item.id, position]));
+        }
+        return positions[dbKey];
+    };
+    const compact = new Set();
+
+    operations.forEach((operation, index) => {
+        const { op, type, changes, item } = operation || {};
+        const dbKey = getDbKey(type);
+        items.push(null);
+        if (!COLLECTIONS.includes(dbKey)) {
+            return errors.push({ index, error: 'Invalid type' });
+        }
+        if (op === 'create') {
+            if (!item || typeof item !== 'object' || Array.isArray(item)) {
+                return errors.push({ index, error: 'create needs an `item`' });
+            }
+        } else if (op === 'update') {
+            if (!changes || typeof changes !== 'object' || Array.isArray(changes)) {
+                return errors.push({ index, error: 'update needs `changes`' });
+            }
+        } else if (op !== 'delete') {
+            return errors.push({ index, error: "op must be 'create', 'update' or 'delete'" });
+        }
+
+        const requestedId = operation.id ?? (op === 'create' ? item.id : undefined);
+        if (requestedId !== undefined && (typeof requestedId !== 'string' || !requestedId)) {
+            return errors.push({ index, error: 'Invalid id' });
+        }
+        const byId = positionsOf(dbKey);
+        const list = db[dbKey];
+
+        if (op === 'create') {
+            let id = requestedId;
+            if (!id || TEMP_ID.test(id)) {
+                id = newItemId(type, `_${index}`);
+                if (requestedId) ids[requestedId] = id;
+            } else if (byId.has(id)) {
+                // Already there (e.g. an undone delete replayed twice): keep it
+                items[index] = list[byId.get(id)];
+                return;
+            }
+            const { value, errors: itemErrors } = validateItem(dbKey, { ...resolveIds(item, ids), id });
+            if (itemErrors.length > 0) {
+                return errors.push({ index, error: 'Invalid item', details: itemErrors });
+            }
+            byId.set(id, list.push(value) - 1);
+            items[index] = value;
+            return count(created, dbKey);
+        }
+
+        const id = ids[requestedId] || requestedId;
+        if (!id) {
+            return errors.push({ index, error: 'Invalid id' });
+        }
+        if (!byId.has(id)) {
+            return missing.push({ type: dbKey, id });
+        }
+        const position = byId.get(id);
+
+        if (op === 'delete') {
+            list[position] = null;
+            byId.delete(id);
+            compact.add(dbKey);
+            return count(deleted, dbKey);
+        }
+
+        const { value, errors: itemErrors } = validateItem(dbKey, { ...list[position], ...resolveIds(changes, ids), id });
+        if (itemErrors.length > 0) {
+            return errors.push({ index, error: 'Invalid item', details: itemErrors });
+        }
+        list[position] = value;
+        items[index] = value;
+        count(updated, dbKey);
+    });
+
+    for (const dbKey of compact) {
+        db[dbKey] = db[dbKey].filter(Boolean);
+    }
+    const changed = [created, updated, deleted].some(totals => Object.keys(totals).length > 0);
+    return { errors, missing, created, updated, deleted, ids, items, changed };
+};
+
+// Recent batches are recorded on the UserData document (`recentBatches`), so
+// a retry after a lost response (flaky connection) replays the first result
+// on any worker instead of creating the items twice. The record is written in
+// the same conditional update as the data (lib/userData.js saveBatchResult).
+const RECENT_BATCHES = 10;
+
+const findBatch = (data, batchId) => (data.recentBatches || []).find(batch => batch.batchId === batchId) || null;
+
+// What a replay needs: the counts, the temp id map and, per operation, the id
+// of the stored item. The items themselves are re-read from the current data.
+const batchRecord = (batchId, result) => ({
+    batchId,
+    at: new Date(),
+    response: {
+        missing: result.missing,
+        created: result.created,
+        updated: result.updated,
+        deleted: result.deleted,
+        ids: result.ids
+    },
+    itemIds: result.items.map(item => (item ? item.id : null))
+});
+
+const replayResponse = (data, operations, record) => {
+    const byId = {};
+    const itemsOf = (dbKey) => {
+        if (!byId[dbKey]) byId[dbKey] = new Map((data[dbKey] || []).map(item => [item.id, item]));
+        return byId[dbKey];
+    };
+    const items = record.itemIds.map((id, index) => {
+        const dbKey = getDbKey((operations[index] || {}).type);
+        return id && COLLECTIONS.includes(dbKey) ? itemsOf(dbKey).get(id) || null : null;
+    });
+    return { ...record.response, items, dryRun: false, replayed: true };
+};
+
+module.exports = {
+    MAX_BATCH_OPERATIONS,
+    RECENT_BATCHES,
+    applyBatch,
+    newItemId,
+    findBatch,
+    batchRecord,
+    replayResponse
+};
@@ -0,0 +1,70 @@
+// Single request-body parsing stage.
+//
+// Every route gets exactly one JSON/urlencoded parser, sized for what the
+// route actually accepts. CRUD payloads are small; only bulk imports and
+// outbox batches get a larger allowance. Binary uploads (icons) are never
+// buffered here - their routes read the request stream themselves.
+
+const express = require('express');
+
+const DEFAULT_BODY_LIMIT = '1mb';
+
+// Path prefix -> body limit, first match wins
+const BODY_LIMITS = [
+    ['/api/import', '25mb'],      // whole Raycast / Leader Key / App Shortcuts exports
+    ['/api/shortcuts/batch', '16mb'], // offline outbox flushes: whole items, icons included
+    ['/api/telemetry', '64kb']    // sendBeacon batches
+];
+
+// Routes that consume the raw request stream
+const STREAMED_ROUTES = ['/api/icons'];
+
+// Routes that also accept text/plain bodies (sendBeacon sends JSON as text)
+const TEXT_ROUTES = ['/api/telemetry'];
+
+const parsers = new Map();
+const parsersFor = (limit) => {
+    if (!parsers.has(limit)) {
+        parsers.set(limit, {
+            json: express.json({ limit }),
+            urlencoded: express.urlencoded({ limit, extended: true }),
+            text: express.text({ limit })
+        });
+    }
+    return parsers.get(limit);
+};
+
+const bodyLimitFor = (path) => {
+    const match = BODY_LIMITS.find(([prefix]) => path.startsWith(prefix));
+    return match ? match[1] : DEFAULT_BODY_LIMIT;
+};
+
+const parseBody = (req, res, next) => {
+    if (STREAMED_ROUTES.some(prefix => req.path.startsWith(prefix))) return next();
+    const { json, urlencoded, text } = parsersFor(bodyLimitFor(req.path));
+    const last = TEXT_ROUTES.some(prefix => req.path.startsWith(prefix))
+        ? (err) => (err ? next(err) : text(req, res, next))
+        : next;
+    json(req, res, (err) => (err ? next(err) : urlencoded(req, res, last)));
+};
+
+// JSON errors for the parse stage instead of Express' default HTML page
+const bodyErrorHandler = (err, req, res, next) => {
+    if (err.type === 'entity.too.large') {
+        return res.status(413).json({ error: `Request body too large (limit ${bodyLimitFor(req.path)})` });
+    }
+    if (err.type === 'entity.parse.failed') {
+        return res.status(400).json({ error: 'Malformed JSON body' });
+    }
+    if (err.type === 'encoding.unsupported' || err.type === 'charset.unsupported') {
+        return res.status(415).json({ error: err.message });
+    }
+    next(err);
+};
+
+module.exports = {
+    DEFAULT_BODY_LIMIT,
+    BODY_LIMITS,
+    parseBody,
+    bodyErrorHandler
+};
@@ -0,0 +1,104 @@
+// One-time database bootstrap: default accounts and legacy JSON migration.
+//
+// Every step is idempotent - safe to re-run and safe when several instances
+// boot against the same database at once. Independent steps run concurrently,
+// and the whole bootstrap is skipped once the stored version matches
+// BOOTSTRAP_VERSION, so a normal boot costs a single query.
+
+const fs = require('fs');
+const path = require('path');
+const User = require('../models/User');
+const UserData = require('../models/UserData');
+const ServerMeta = require('../models/ServerMeta');
+
+// Bump when a bootstrap step is added so existing databases run it once
+const BOOTSTRAP_VERSION = 1;
+const BOOTSTRAP_KEY = 'bootstrap';
+
+const LEGACY_DB_FILE = path.join(__dirname, '..', 'db.json');
+const LEGACY_DEMO_DB_FILE = path.join(__dirname, '..', 'demo_db.json');
+
+const DEFAULT_ACCOUNTS = [
+    { username: 'renshu', password: 'renshu123', role: 'admin', displayName: 'Renshu', dataType: 'admin', legacyFile: LEGACY_DB_FILE },
+    { username: 'gabby_demo', password: 'gabby123', role: 'demo', displayName: 'Gabby (Demo)', dataType: 'demo', legacyFile: LEGACY_DEMO_DB_FILE }
+];
+
+const isDuplicateKey = (err) => err && err.code === 11000;
+
+// Find or create a default account; returns its _id
+const ensureUser = async ({ username, password, role, displayName }) => {
+    const existing = await User.findOne({ username }).select('_id').lean();
+    if (existing) return existing._id;
+
+    try {
+        const user = await new User({ username, password, role, displayName }).save();
+        console.log(`Default user created: ${username}`);
+        return user._id;
+    } catch (err) {
+        // Another instance created it first
+        if (!isDuplicateKey(err)) throw err;
+        const created = await User.findOne({ username }).select('_id').lean();
+        return created._id;
+    }
+};
+
+// Copy a legacy db.json into MongoDB unless the user already has data
+const migrateLegacyFile = async (userId, dataType, file) => {
+    if (await UserData.exists({ userId })) return false;
+
+    let fileData;
+    try {
+        fileData = JSON.parse(await fs.promises.readFile(file, 'utf8'));
+    } catch (err) {
+        if (err.code === 'ENOENT') return false;
+        throw err;
+    }
+
+    try {
+        await UserData.create({
+            userId,
+            dataType,
+            leaderShortcuts: fileData.leaderShortcuts || [],
+            leaderGroups: fileData.leaderGroups || [],
+            raycastShortcuts: fileData.raycastShortcuts || [],
+            systemShortcuts: fileData.systemShortcuts || [],
+            appsLibrary: fileData.appsLibrary || fileData.apps || []
+        });
+    } catch (err) {
+        if (!isDuplicateKey(err)) throw err;
+        return false;
+    }
+    console.log(`Migrated ${path.basename(file)} to MongoDB (${dataType} data)`);
+    return true;
+};
+
+// Run the bootstrap unless this database already has it.
+// Returns { skipped, version, durationMs }.
+const runBootstrap = async ({ force = false } = {}) => {
+    const started = Date.now();
+
+    if (!force) {
+        const meta = await ServerMeta.findOne({ key: BOOTSTRAP_KEY }).lean();
+        if (meta && meta.version >= BOOTSTRAP_VERSION) {
+            return { skipped: true, version: meta.version, durationMs: Date.now() - started };
+        }
+    }
+
+    // Accounts (each a bcrypt hash when created) and their migrations run side by side
+    await Promise.all(DEFAULT_ACCOUNTS.map(async (account) => {
+        const userId = await ensureUser(account);
+        await migrateLegacyFile(userId, account.dataType, account.legacyFile);
+    }));
+
+    await ServerMeta.updateOne(
+        { key: BOOTSTRAP_KEY },
+        { $max: { version: BOOTSTRAP_VERSION }, $set: { updatedAt: new Date() } },
+        { upsert: true }
+    );
+    return { skipped: false, version: BOOTSTRAP_VERSION, durationMs: Date.now() - started };
+};
+
+module.exports = {
+    BOOTSTRAP_VERSION,
+    runBootstrap
+};
@@ -0,0 +1,42 @@
+// Cache invalidation across cluster workers.
+//
+// Each worker keeps its own in-process caches. When one of them changes the
+// underlying data it calls invalidate(cache, key): the entry is dropped
+// locally at once and the message goes to the cluster primary, which relays
+// it to every other worker (see cluster.js). Without a cluster it is a
+// plain local call.
+
+const cluster = require('cluster');
+
+const MESSAGE_TYPE = 'cache:invalidate';
+
+const handlers = new Map();
+
+// handler(key) runs for every invalidation of `cache`; key null means "everything"
+const onInvalidate = (cache, handler) => {
+    if (!handlers.has(cache)) handlers.set(cache, []);
+    handlers.get(cache).push(handler);
+};
+
+const apply = (cache, key) => {
+    for (const handler of handlers.get(cache) || []) handler(key);
+};
+
+const invalidate = (cache, key = null) => {
+    apply(cache, key);
+    if (cluster.isWorker && process.connected) {
+        process.send({ type: MESSAGE_TYPE, cache, key });
+    }
+};
+
+if (cluster.isWorker) {
+    process.on('message', (message) => {
+        if (message && message.type === MESSAGE_TYPE) apply(message.cache, message.key);
+    });
+}
+
+module.exports = {
+    MESSAGE_TYPE,
+    onInvalidate,
+    invalidate
+};
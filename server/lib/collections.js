@@ -0,0 +1,13 @@
+// Shortcut collections stored on every UserData document
+const COLLECTIONS = ['leaderShortcuts', 'leaderGroups', 'raycastShortcuts', 'systemShortcuts', 'appsLibrary'];
+
+// Helper to get the actual DB key
+const getDbKey = (type) => {
+    if (type === 'apps') return 'appsLibrary';
+    return type;
+};
+
+module.exports = {
+    COLLECTIONS,
+    getDbKey
+};
@@ -0,0 +1,199 @@
+// Export formats for the streaming export endpoint (/api/export).
+//
+// Every format is a small writer object driven item by item, so the route can
+// flush output in chunks instead of building the whole document in memory:
+//   begin() -> collectionStart(name) -> item(name, item)* -> collectionEnd(name) -> end()
+// Each hook returns the text to append (or '').
+//
+// server/export_shortcuts.py implements the same formats for offline use, and
+// src/utils/exportFormats.js the markdown/json/csv ones for the client's
+// fallback - keep them in sync.
+
+const SECTION_TITLES = {
+    leaderShortcuts: 'Leader Key Shortcuts',
+    raycastShortcuts: 'Raycast Shortcuts',
+    systemShortcuts: 'System Shortcuts',
+    leaderGroups: 'Leader Key Groups',
+    appsLibrary: 'Apps Library'
+};
+
+const MARKDOWN_TABLES = {
+    leaderShortcuts: {
+        header: '| Sequence | Action | Category | Notes |\n|----------|--------|----------|-------|\n',
+        row: (s) => [(s.sequence || []).join(' → '), s.action, s.category, s.notes]
+    },
+    raycastShortcuts: {
+        header: '| Keys/Alias | Command | Extension | Notes |\n|------------|---------|-----------|-------|\n',
+        row: (s) => [s.keys || s.aliasText || 'N/A', s.commandName, s.category, s.notes]
+    },
+    systemShortcuts: {
+        header: '| Keys | Action | Category | Notes |\n|------|--------|----------|-------|\n',
+        row: (s) => [s.keys || 'N/A', s.action, s.category, s.notes]
+    },
+    leaderGroups: {
+        header: '| Key | Name | Parent |\n|-----|------|--------|\n',
+        row: (g) => [g.key, g.name, g.parentKey]
+    },
+    appsLibrary: {
+        header: '| Name | Category | Bundle ID | Tags |\n|------|----------|-----------|------|\n',
+        row: (a) => [a.name, a.category, a.bundleId, (a.tags || []).join(', ')]
+    }
+};
+
+const CSV_COLUMNS = [
+    'collection', 'id', 'keys', 'sequence', 'aliasText', 'action', 'commandName', 'name',
+    'appOrContext', 'category', 'appId', 'key', 'parentKey', 'bundleId', 'tags', 'notes'
+];
+
+const mdCell = (value) => (value === null || value === undefined ? '' : String(value).replace(/\|/g, '\\|').replace(/\r?\n/g, ' '));
+
+const csvCell = (value) => {
+    if (value === null || value === undefined) return '';
+    const str = Array.isArray(value) ? value.join(' ') : String(value);
+    return /[",\r\n]/.test(str) ? `"${str.replace(/"/g, '""')}"` : str;
+};
+
+const markdown = () => ({
+    contentType: 'text/markdown; charset=utf-8',
+    extension: 'md',
+    begin: () => `# Keyboard Shortcuts Reference\n\n*Exported on ${new Date().toISOString().split('T')[0]}*\n\n`,
+    collectionStart: (name) => `## ${SECTION_TITLES[name]}\n\n${MARKDOWN_TABLES[name].header}`,
+    item: (name, item) => `| ${MARKDOWN_TABLES[name].row(item).map(mdCell).join(' | ')} |\n`,
+    collectionEnd: () => '\n',
+    end: () => ''
+});
+
+const json = () => {
+    let first = true;
+    let firstCollection = true;
+    return {
+        contentType: 'application/json; charset=utf-8',
+        extension: 'json',
+        begin: () => '{',
+        collectionStart: (name) => {
+            first = true;
+            const sep = firstCollection ? '' : ',';
+            firstCollection = false;
+            return `${sep}\n  ${JSON.stringify(name)}: [`;
+        },
+        item: (name, item) => {
+            const sep = first ? '' : ',';
+            first = false;
+            return `${sep}\n    ${JSON.stringify(item)}`;
+        },
+        collectionEnd: () => (first ? ']' : '\n  ]'),
+        end: () => '\n}\n'
+    };
+};
+
+const csv = () => ({
+    contentType: 'text/csv; charset=utf-8',
+    extension: 'csv',
+    begin: (options) => `${CSV_COLUMNS.concat(options.icons ? ['iconUrl'] : []).join(',')}\n`,
+    collectionStart: () => '',
+    item: (name, item, options) => {
+        const cells = CSV_COLUMNS.map(col => (col === 'collection' ? name : csvCell(item[col])));
+        if (options.icons) cells.push(csvCell(item.iconUrl));
+        return `${cells.join(',')}\n`;
+    },
+    collectionEnd: () => '',
+    end: () => ''
+});
+
+// Raycast-native: a flat list of commands with their hotkey and alias.
+// Only raycastShortcuts are meaningful here; other collections are skipped.
+const raycast = () => {
+    let first = true;
+    return {
+        contentType: 'application/json; charset=utf-8',
+        extension: 'raycast.json',
+        collections: ['raycastShortcuts'],
+        begin: () => '{\n  "version": 1,\n  "commands": [',
+        collectionStart: () => '',
+        item: (name, item) => {
+            const sep = first ? '' : ',';
+            first = false;
+            return `${sep}\n    ${JSON.stringify({
+                title: item.commandName || '',
+                extension: item.category || '',
+                hotkey: item.keys || null,
+                alias: item.aliasText || null
+            })}`;
+        },
+        collectionEnd: () => '',
+        end: () => (first ? ']\n}\n' : '\n  ]\n}\n')
+    };
+};
+
+// Leader Key-native: the nested group/action tree of Leader Key's config.json.
+// The tree can only be emitted once every sequence is known, so this format
+// buffers the (small) leader collections and writes everything in end().
+const leaderKey = () => {
+    const groups = [];
+    const shortcuts = [];
+    const appNames = new Map();
+
+    const buildTree = () => {
+        const root = { type: 'group', actions: [] };
+        const groupLabels = new Map(groups.map(g => [`${g.parentKey || ''}/${g.key}`, g.name]));
+
+        for (const shortcut of shortcuts) {
+            const keys = (shortcut.sequence || []).filter((k, i) => !(i === 0 && /^leader$/i.test(k)));
+            if (keys.length === 0) continue;
+
+            let node = root;
+            keys.slice(0, -1).forEach((key, depth) => {
+                let child = node.actions.find(a => a.type === 'group' && a.key === key);
+                if (!child) {
+                    const parentKey = depth === 0 ? '' : keys[depth - 1];
+                    child = { key, type: 'group', label: groupLabels.get(`${parentKey}/${key}`) || '', actions: [] };
+                    node.actions.push(child);
+                }
+                node = child;
+            });
+
+            const appName = shortcut.appId && appNames.get(shortcut.appId);
+            node.actions.push({
+                key: keys[keys.length - 1],
+                type: appName ? 'application' : 'command',
+                label: shortcut.action || '',
+                value: appName ? `/Applications/${appName}.app` : ''
+            });
+        }
+        return root;
+    };
+
+    return {
+        contentType: 'application/json; charset=utf-8',
+        extension: 'leaderkey.json',
+        collections: ['leaderGroups', 'leaderShortcuts', 'appsLibrary'],
+        begin: () => '',
+        collectionStart: () => '',
+        item: (name, item) => {
+            if (name === 'leaderGroups') groups.push({ key: item.key, name: item.name, parentKey: item.parentKey });
+            else if (name === 'leaderShortcuts') shortcuts.push({ sequence: item.sequence, action: item.action, appId: item.appId });
+            else if (name === 'appsLibrary') appNames.set(item.id, item.name);
+            return '';
+        },
+        collectionEnd: () => '',
+        end: () => `${JSON.stringify(buildTree(), null, 2)}\n`
+    };
+};
+
+const EXPORT_FORMATS = {
+    markdown,
+    json,
+    csv,
+    raycast,
+    leaderkey: leaderKey
+};
+
+const createExporter = (format) => {
+    const factory = EXPORT_FORMATS[format];
+    return factory ? factory() : null;
+};
+
+module.exports = {
+    EXPORT_FORMATS,
+    createExporter
+};
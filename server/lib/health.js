@@ -0,0 +1,59 @@
+// Liveness and readiness probes.
+//
+// Liveness answers as soon as the process is serving HTTP. Readiness waits
+// for MongoDB and the bootstrap, so a new instance only joins the pool once
+// it can actually serve data.
+
+const mongoose = require('mongoose');
+const { Gauge } = require('./metrics');
+
+const state = {
+    bootstrapped: false,
+    bootstrap: null,
+    startupMs: null,
+    draining: false
+};
+
+const startupSeconds = new Gauge('server_startup_seconds', 'Process start until ready to serve');
+
+// Call once the bootstrap has finished (or was skipped)
+const markReady = (bootstrap) => {
+    state.bootstrapped = true;
+    state.bootstrap = bootstrap;
+    state.startupMs = Math.round(process.uptime() * 1000);
+    startupSeconds.set({}, state.startupMs / 1000);
+    console.log(`Ready in ${state.startupMs}ms`);
+};
+
+// Call when shutting down so load balancers stop routing here first
+const markDraining = () => {
+    state.draining = true;
+};
+
+const isReady = () => !state.draining && state.bootstrapped && mongoose.connection.readyState === 1;
+
+// GET /api/health, /api/health/live
+const liveness = (req, res) => {
+    const { rss, heapUsed } = process.memoryUsage();
+    res.status(200).json({ status: 'ok', timestamp: new Date().toISOString(), memory: { rss, heapUsed } });
+};
+
+// GET /api/health/ready
+const readiness = (req, res) => {
+    const checks = {
+        mongo: mongoose.connection.readyState === 1,
+        bootstrap: state.bootstrapped
+    };
+    if (!isReady()) {
+        return res.status(503).json({ status: state.draining ? 'draining' : 'starting', checks });
+    }
+    res.status(200).json({ status: 'ready', checks, startupMs: state.startupMs, bootstrap: state.bootstrap });
+};
+
+module.exports = {
+    markReady,
+    markDraining,
+    isReady,
+    liveness,
+    readiness
+};
@@ -0,0 +1,231 @@
+// Import parsers and dedupe index for POST /api/import.
+//
+// Parsers turn a native config export into { collection, item, appHint }
+// entries; LibraryIndex checks them against the existing library with hash
+// lookups and links appId. server/import_shortcuts.py mirrors this module for
+// offline use - keep the two in sync.
+
+const { COLLECTIONS } = require('./collections');
+const { parseKeyString, parseCocoaKeyEquivalent, normalizeKeys, formatKeys } = require('./shortcutKeys');
+const { validateItem } = require('./validation');
+
+const ID_PREFIXES = {
+    leaderShortcuts: 'leader',
+    raycastShortcuts: 'raycast',
+    systemShortcuts: 'sys',
+    leaderGroups: 'group',
+    appsLibrary: 'app'
+};
+
+const slug = (text) => String(text || '').toLowerCase().replace(/[^a-z0-9]+/g, '_').replace(/^_+|_+$/g, '').slice(0, 40) || 'item';
+
+// Raycast command list: { commands: [{ title, hotkey, alias, extension }] }
+function* parseRaycast(data) {
+    const commands = Array.isArray(data) ? data : (data.commands || []);
+    for (const command of commands) {
+        if (!command || typeof command !== 'object') continue;
+        const title = command.title || command.commandName || command.name || '';
+        const hotkey = command.hotkey || command.keys || command.shortcut;
+        const alias = command.alias || command.aliasText;
+        if (!title || !(hotkey || alias)) continue;
+
+        yield {
+            collection: 'raycastShortcuts',
+            item: {
+                keys: formatKeys(parseKeyString(hotkey)) || null,
+                commandName: title,
+                aliasText: alias || null,
+                category: command.extension || command.category || '',
+                notes: null
+            },
+            // "Open Beeper Desktop" launches the app called "Beeper Desktop"
+            appHint: command.app || title.replace(/^open\s+/i, '')
+        };
+    }
+}
+
+// Leader Key config.json: nested { type: 'group', actions: [...] } tree
+function* parseLeaderKey(data) {
+    function* walk(node, path, topLabel) {
+        for (const action of node.actions || []) {
+            if (!action.key) continue;
+            if (action.type === 'group') {
+                const label = action.label || '';
+                yield {
+                    collection: 'leaderGroups',
+                    item: { key: action.key, name: label || action.key, parentKey: path.length ? path[path.length - 1] : null, iconUrl: null },
+                    appHint: null
+                };
+                yield* walk(action, [...path, action.key], topLabel || label);
+                continue;
+            }
+
+            const value = action.value || '';
+            let appName = null;
+            if (action.type === 'application' && value) {
+                appName = value.replace(/\/+$/, '').split('/').pop().replace(/\.app$/, '');
+            }
+            yield {
+                collection: 'leaderShortcuts',
+                item: {
+                    sequence: ['Leader', ...path, action.key],
+                    category: topLabel || '',
+                    app: appName,
+                    action: action.label || (appName ? `Open ${appName}` : value),
+                    notes: null
+                },
+                appHint: appName
+            };
+        }
+    }
+    yield* walk(data, [], '');
+}
+
+// macOS App Shortcuts (NSUserKeyEquivalents), as JSON (`plutil -convert json`)
+function* parseSystem(data, app) {
+    const domains = data.NSUserKeyEquivalents
+        ? { [app || 'Global']: data }
+        : Object.fromEntries(Object.entries(data).filter(([, v]) => v && typeof v === 'object' && v.NSUserKeyEquivalents));
+
+    for (const [domain, prefs] of Object.entries(domains)) {
+        for (const [menuTitle, equivalent] of Object.entries(prefs.NSUserKeyEquivalents || {})) {
+            const parsed = parseCocoaKeyEquivalent(equivalent);
+            if (!parsed.key) continue;
+            const hint = domain === 'Global' ? null : domain;
+            yield {
+                collection: 'systemShortcuts',
+                item: {
+                    keys: formatKeys(parsed),
+                    appOrContext: hint || 'Global',
+                    // Menu paths are stored as "\u001bFile\u001bExport…"
+                    action: menuTitle.split('\u001b').filter(Boolean).join(' → '),
+                    category: 'Menu',
+                    notes: null
+                },
+                appHint: hint
+            };
+        }
+    }
+}
+
+// db.json or an /api/export JSON export
+function* parseJson(data) {
+    for (const collection of COLLECTIONS) {
+        let items = data[collection];
+        if (collection === 'appsLibrary' && !(items && items.length)) items = data.apps;
+        for (const item of items || []) {
+            if (item && typeof item === 'object') yield { collection, item: { ...item }, appHint: null };
+        }
+    }
+}
+
+const IMPORT_PARSERS = {
+    raycast: parseRaycast,
+    leaderkey: parseLeaderKey,
+    system: parseSystem,
+    json: parseJson
+};
+
+const detectFormat = (data) => {
+    if (Array.isArray(data) || (data && data.commands)) return 'raycast';
+    if (data && data.type === 'group' && data.actions) return 'leaderkey';
+    if (data && [...COLLECTIONS, 'apps'].some(k => k in data)) return 'json';
+    if (data && (data.NSUserKeyEquivalents || Object.values(data).some(v => v && v.NSUserKeyEquivalents))) return 'system';
+    return null;
+};
+
+// Hash indexes over the existing library for O(1) duplicate checks and app linking
+class LibraryIndex {
+    constructor(library) {
+        this.ids = new Set();
+        this.seen = Object.fromEntries(COLLECTIONS.map(c => [c, new Set()]));
+        this.appsByName = new Map();
+        this.appsByBundle = new Map();
+        for (const collection of COLLECTIONS) {
+            for (const item of library[collection] || []) this.remember(collection, item);
+        }
+    }
+
+    static identity(collection, item) {
+        switch (collection) {
+            case 'raycastShortcuts':
+                return `${normalizeKeys(item.keys) || `alias:${(item.aliasText || '').toLowerCase()}`}|${(item.commandName || '').trim().toLowerCase()}`;
+            case 'systemShortcuts':
+                return `${normalizeKeys(item.keys)}|${(item.action || '').trim().toLowerCase()}`;
+            case 'leaderShortcuts': {
+                const sequence = (item.sequence || []).map(k => String(k).toLowerCase());
+                if (sequence[0] === 'leader') sequence.shift();
+                return sequence.join(' ');
+            }
+            case 'leaderGroups':
+                return `${item.parentKey || ''}/${item.key}`;
+            default:
+                return (item.name || '').trim().toLowerCase();
+        }
+    }
+
+    remember(collection, item, identity = LibraryIndex.identity(collection, item)) {
+        if (item.id) this.ids.add(item.id);
+        this.seen[collection].add(identity);
+        if (collection === 'appsLibrary') {
+            if (item.name) this.appsByName.set(item.name.trim().toLowerCase(), item.id);
+            if (item.bundleId) this.appsByBundle.set(item.bundleId.toLowerCase(), item.id);
+        }
+    }
+
+    findApp(hint) {
+        if (!hint) return null;
+        const key = hint.trim().toLowerCase();
+        return this.appsByBundle.get(key) || this.appsByName.get(key) || null;
+    }
+
+    newId(collection, item) {
+        const label = item.commandName || item.action || item.name || (item.sequence || []).join('_');
+        const base = `${ID_PREFIXES[collection]}_${slug(label)}`;
+        let candidate = base;
+        for (let n = 2; this.ids.has(candidate); n++) candidate = `${base}_${n}`;
+        return candidate;
+    }
+
+    // Accept an item unless it duplicates the library or this batch
+    add(collection, item, appHint) {
+        const identity = LibraryIndex.identity(collection, item);
+        if (this.ids.has(item.id) || this.seen[collection].has(identity)) {
+            return false;
+        }
+        if (collection !== 'appsLibrary' && collection !== 'leaderGroups' && !item.appId) {
+            item.appId = this.findApp(appHint);
+        }
+        if (!item.id) item.id = this.newId(collection, item);
+        this.remember(collection, item, identity);
+        return true;
+    }
+}
+
+// Dedupe and validate parsed entries against `library`; returns the new items per collection
+const planImport = (library, entries) => {
+    const index = new LibraryIndex(library);
+    const added = Object.fromEntries(COLLECTIONS.map(c => [c, []]));
+    const invalid = [];
+    let skipped = 0;
+
+    // Apps first so shortcuts in the same batch can link to them
+    const ordered = [...entries].sort((a, b) => (a.collection !== 'appsLibrary') - (b.collection !== 'appsLibrary'));
+    for (const { collection, item, appHint } of ordered) {
+        if (!index.add(collection, item, appHint)) {
+            skipped++;
+            continue;
+        }
+        const { value, errors } = validateItem(collection, item);
+        if (errors.length > 0) invalid.push({ collection, id: item.id, errors });
+        else added[collection].push(value);
+    }
+    return { added, skipped, invalid };
+};
+
+module.exports = {
+    IMPORT_PARSERS,
+    detectFormat,
+    LibraryIndex,
+    planImport
+};
@@ -0,0 +1,264 @@
+// Server metrics in the Prometheus text exposition format (served at /api/metrics).
+//
+// A small in-process registry - counters, gauges and histograms with labels -
+// plus the instrumentation hooks the server wires in: HTTP latency and payload
+// sizes per route, MongoDB command timings, cache lookups and event-loop lag.
+
+const { monitorEventLoopDelay } = require('perf_hooks');
+
+const LATENCY_BUCKETS = [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10];
+const BYTES_BUCKETS = [256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216];
+
+const metrics = [];
+
+const escapeLabel = (value) => String(value).replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+
+const formatLabels = (names, values, extra = '') => {
+    const pairs = names.map((name, i) => `${name}="${escapeLabel(values[i])}"`);
+    if (extra) pairs.push(extra);
+    return pairs.length ? `{${pairs.join(',')}}` : '';
+};
+
+class Metric {
+    constructor(type, name, help, labelNames = []) {
+        this.type = type;
+        this.name = name;
+        this.help = help;
+        this.labelNames = labelNames;
+        this.series = new Map();
+        metrics.push(this);
+    }
+
+    // Series are keyed by their label values in labelNames order
+    entry(labels, create) {
+        const values = this.labelNames.map(name => (labels[name] === undefined ? '' : labels[name]));
+        const key = values.join('\u0000');
+        let entry = this.series.get(key);
+        if (!entry) {
+            entry = create(values);
+            this.series.set(key, entry);
+        }
+        return entry;
+    }
+
+    // Drop every series (for metrics a collector rebuilds on each scrape)
+    clear() {
+        this.series.clear();
+    }
+
+    render() {
+        const lines = [`# HELP ${this.name} ${this.help}`, `# TYPE ${this.name} ${this.type}`];
+        for (const entry of this.series.values()) this.renderEntry(entry, lines);
+        return lines;
+    }
+}
+
+class Counter extends Metric {
+    constructor(name, help, labelNames) {
+        super('counter', name, help, labelNames);
+    }
+
+    inc(labels = {}, value = 1) {
+        this.entry(labels, values => ({ values, value: 0 })).value += value;
+    }
+
+    renderEntry({ values, value }, lines) {
+        lines.push(`${this.name}${formatLabels(this.labelNames, values)} ${value}`);
+    }
+}
+
+class Gauge extends Metric {
+    constructor(name, help, labelNames) {
+        super('gauge', name, help, labelNames);
+    }
+
+    set(labels, value) {
+        this.entry(labels, values => ({ values, value: 0 })).value = value;
+    }
+
+    renderEntry({ values, value }, lines) {
+        lines.push(`${this.name}${formatLabels(this.labelNames, values)} ${value}`);
+    }
+}
+
+class Histogram extends Metric {
+    constructor(name, help, labelNames, buckets = LATENCY_BUCKETS) {
+        super('histogram', name, help, labelNames);
+        this.buckets = buckets;
+    }
+
+    observe(labels, value) {
+        const entry = this.entry(labels, values => ({ values, counts: new Array(this.buckets.length).fill(0), sum: 0, count: 0 }));
+        // Counts are stored per bucket and made cumulative when rendering
+        const index = this.buckets.findIndex(bound => value <= bound);
+        if (index !== -1) entry.counts[index]++;
+        entry.sum += value;
+        entry.count++;
+    }
+
+    renderEntry({ values, counts, sum, count }, lines) {
+        let cumulative = 0;
+        this.buckets.forEach((bound, i) => {
+            cumulative += counts[i];
+            lines.push(`${this.name}_bucket${formatLabels(this.labelNames, values, `le="${bound}"`)} ${cumulative}`);
+        });
+        lines.push(`${this.name}_bucket${formatLabels(this.labelNames, values, 'le="+Inf"')} ${count}`);
+        lines.push(`${this.name}_sum${formatLabels(this.labelNames, values)} ${sum}`);
+        lines.push(`${this.name}_count${formatLabels(this.labelNames, values)} ${count}`);
+    }
+}
+
+// ============= Metrics =============
+
+const httpDuration = new Histogram('http_request_duration_seconds', 'HTTP request latency by route', ['method', 'route', 'status']);
+const httpRequestBytes = new Histogram('http_request_size_bytes', 'Declared request body size by route', ['method', 'route'], BYTES_BUCKETS);
+const httpResponseBytes = new Histogram('http_response_size_bytes', 'Response bytes written by route (after compression)', ['method', 'route'], BYTES_BUCKETS);
+const mongoDuration = new Histogram('mongodb_command_duration_seconds', 'MongoDB command latency', ['command', 'collection', 'outcome']);
+const userDataDuration = new Histogram('userdata_operation_duration_seconds', 'getUserData / saveUserData latency', ['operation']);
+const cacheLookups = new Counter('cache_lookups_total', 'Cache lookups by result', ['cache', 'result']);
+const cacheHitRatio = new Gauge('cache_hit_ratio', 'Share of cache lookups that were hits', ['cache']);
+const proxyImageRequests = new Counter('proxy_image_requests_total', '/api/proxy-image outcomes', ['result']);
+const eventLoopLag = new Gauge('nodejs_eventloop_lag_seconds', 'Event-loop delay since the previous scrape', ['quantile']);
+const eventLoopLagMax = new Gauge('nodejs_eventloop_lag_max_seconds', 'Largest event-loop delay since the previous scrape');
+const residentMemory = new Gauge('process_resident_memory_bytes', 'Resident set size');
+const heapUsed = new Gauge('nodejs_heap_used_bytes', 'V8 heap in use');
+const uptime = new Gauge('process_uptime_seconds', 'Seconds since the process started');
+
+// The delay histogram measures whole sampling intervals; lag is what exceeds the resolution
+const LOOP_RESOLUTION_MS = 10;
+const loopDelay = monitorEventLoopDelay({ resolution: LOOP_RESOLUTION_MS });
+loopDelay.enable();
+const lagSeconds = (nanoseconds) => Math.max(0, nanoseconds / 1e9 - LOOP_RESOLUTION_MS / 1000);
+
+// ============= Instrumentation =============
+
+const secondsSince = (start) => Number(process.hrtime.bigint() - start) / 1e9;
+
+const chunkLength = (chunk, encoding) => {
+    if (!chunk || typeof chunk === 'function') return 0;
+    if (typeof chunk === 'string') return Buffer.byteLength(chunk, typeof encoding === 'string' ? encoding : 'utf8');
+    return chunk.length || 0;
+};
+
+// Route template (e.g. /api/shortcuts/:type) keeps label cardinality bounded
+const routeLabel = (req) => {
+    if (req.route) return `${req.baseUrl}${req.route.path}`;
+    if (req.baseUrl) return req.baseUrl;
+    return req.path.startsWith('/api') ? 'unmatched' : 'static';
+};
+
+// Register before compression so the byte counts are what goes over the wire
+const httpMetrics = (req, res, next) => {
+    const start = process.hrtime.bigint();
+    let bytes = 0;
+    const { write, end } = res;
+    res.write = function (chunk, encoding, callback) {
+        bytes += chunkLength(chunk, encoding);
+        return write.call(this, chunk, encoding, callback);
+    };
+    res.end = function (chunk, encoding, callback) {
+        bytes += chunkLength(chunk, encoding);
+        return end.call(this, chunk, encoding, callback);
+    };
+
+    res.once('finish', () => {
+        const route = routeLabel(req);
+        httpDuration.observe({ method: req.method, route, status: res.statusCode }, secondsSince(start));
+        const declared = Number(req.headers['content-length']);
+        if (declared > 0) httpRequestBytes.observe({ method: req.method, route }, declared);
+        httpResponseBytes.observe({ method: req.method, route }, bytes);
+    });
+    next();
+};
+
+// Time the driver's commands; needs the client created with monitorCommands: true
+const instrumentMongoClient = (client) => {
+    const collections = new Map();
+    client.on('commandStarted', (event) => {
+        const target = event.command && event.command[event.commandName];
+        collections.set(event.requestId, typeof target === 'string' ? target : '');
+    });
+    const record = (outcome) => (event) => {
+        const collection = collections.get(event.requestId) || '';
+        collections.delete(event.requestId);
+        mongoDuration.observe({ command: event.commandName, collection, outcome }, event.duration / 1000);
+    };
+    client.on('commandSucceeded', record('success'));
+    client.on('commandFailed', record('failure'));
+};
+
+// Await `fn()` and record its latency under userdata_operation_duration_seconds
+const timeUserData = async (operation, fn) => {
+    const start = process.hrtime.bigint();
+    try {
+        return await fn();
+    } finally {
+        userDataDuration.observe({ operation }, secondsSince(start));
+    }
+};
+
+const recordCacheLookup = (cache, hit) => {
+    cacheLookups.inc({ cache, result: hit ? 'hit' : 'miss' });
+};
+
+const recordProxyImage = (result) => {
+    proxyImageRequests.inc({ result });
+};
+
+// ============= Exposition =============
+
+// Extra snapshot hooks run before every render (e.g. client telemetry percentiles)
+const collectors = [];
+const registerCollector = (collect) => {
+    collectors.push(collect);
+};
+
+const collectSnapshots = () => {
+    for (const collect of collectors) collect();
+
+    const lookups = {};
+    for (const { values, value } of cacheLookups.series.values()) {
+        const [cache, result] = values;
+        lookups[cache] = lookups[cache] || { hit: 0, total: 0 };
+        lookups[cache].total += value;
+        if (result === 'hit') lookups[cache].hit += value;
+    }
+    for (const [cache, { hit, total }] of Object.entries(lookups)) {
+        cacheHitRatio.set({ cache }, total ? hit / total : 0);
+    }
+
+    // Reset so each scrape covers its own interval
+    if (loopDelay.count > 0) {
+        for (const quantile of [0.5, 0.9, 0.99]) {
+            eventLoopLag.set({ quantile }, lagSeconds(loopDelay.percentile(quantile * 100)));
+        }
+        eventLoopLagMax.set({}, lagSeconds(loopDelay.max));
+    }
+    loopDelay.reset();
+
+    const memory = process.memoryUsage();
+    residentMemory.set({}, memory.rss);
+    heapUsed.set({}, memory.heapUsed);
+    uptime.set({}, process.uptime());
+};
+
+const renderMetrics = () => {
+    collectSnapshots();
+    return metrics.flatMap(metric => metric.render()).join('\n') + '\n';
+};
+
+const METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8';
+
+module.exports = {
+    Counter,
+    Gauge,
+    Histogram,
+    METRICS_CONTENT_TYPE,
+    httpMetrics,
+    instrumentMongoClient,
+    timeUserData,
+    recordCacheLookup,
+    recordProxyImage,
+    registerCollector,
+    renderMetrics
+};
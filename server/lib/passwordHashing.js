@@ -0,0 +1,196 @@
+// bcrypt on a bounded worker-thread pool.
+//
+// A bcrypt hash or compare is ~50-100ms of pure CPU at cost 10; run on the
+// main thread, a burst of logins stalls every other request. Jobs go to a
+// fixed pool of workers instead, behind a queue with a hard depth limit -
+// once it is full, new jobs fail immediately with PasswordHashingBusyError
+// (a 503 with Retry-After) rather than piling up latency for everyone.
+//
+// BCRYPT_ROUNDS sets the cost for new hashes. Raising it is safe: older
+// hashes keep verifying, and needsRehash() tells login to upgrade them.
+
+const fs = require('fs');
+const os = require('os');
+const path = require('path');
+const { Worker } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+const { Counter, Gauge, Histogram, registerCollector } = require('./metrics');
+
+const WORKER_FILE = path.join(__dirname, 'passwordWorker.js');
+
+const intFromEnv = (name, fallback, min, max) => {
+    const value = parseInt(process.env[name], 10);
+    return Number.isFinite(value) ? Math.min(max, Math.max(min, value)) : fallback;
+};
+
+// Cores this process may use: the OS count, capped by a cgroup v2 CPU quota
+// (containers usually see every host core)
+const availableCpus = () => {
+    const cpus = typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length;
+    try {
+        const [quota, period] = fs.readFileSync('/sys/fs/cgroup/cpu.max', 'utf8').trim().split(' ');
+        if (quota !== 'max') return Math.max(1, Math.min(cpus, Math.floor(Number(quota) / Number(period))));
+    } catch {
+        // no cgroup v2 quota
+    }
+    return cpus;
+};
+
+// Every API process (WEB_CONCURRENCY, see cluster.js) has its own pool, so
+// split the cores left after one event loop per process between them
+const PROCESSES = intFromEnv('WEB_CONCURRENCY', 1, 1, 1024);
+const SPARE_CPUS_PER_PROCESS = Math.floor((availableCpus() - PROCESSES) / PROCESSES);
+
+const BCRYPT_ROUNDS = intFromEnv('BCRYPT_ROUNDS', 10, 4, 31);
+const POOL_SIZE = intFromEnv('PASSWORD_HASH_WORKERS', Math.min(4, Math.max(1, SPARE_CPUS_PER_PROCESS)), 1, 64);
+const MAX_QUEUE = intFromEnv('PASSWORD_HASH_QUEUE', 64, 0, 100000);
+
+const jobDuration = new Histogram('password_hash_duration_seconds', 'bcrypt time inside a worker', ['operation']);
+const queueWait = new Histogram('password_hash_queue_wait_seconds', 'Time a bcrypt job waited for a free worker', ['operation']);
+const rejections = new Counter('password_hash_rejections_total', 'bcrypt jobs rejected because the queue was full', ['operation']);
+const queueDepth = new Gauge('password_hash_queue_depth', 'bcrypt jobs waiting for a worker');
+const busyWorkers = new Gauge('password_hash_busy_workers', 'Workers currently running a bcrypt job');
+
+class PasswordHashingBusyError extends Error {
+    constructor(retryAfter) {
+        super('Password hashing queue is full');
+        this.name = 'PasswordHashingBusyError';
+        this.retryAfter = retryAfter;
+    }
+}
+
+const secondsSince = (start) => Number(process.hrtime.bigint() - start) / 1e9;
+
+class PasswordPool {
+    constructor(size, maxQueue) {
+        this.size = size;
+        this.maxQueue = maxQueue;
+        this.workers = [];
+        this.idle = [];
+        this.queue = [];
+        this.nextId = 1;
+        // Moving average of job time, for Retry-After
+        this.avgJobMs = 75;
+    }
+
+    // Workers start on first use so scripts that only load the model pay nothing
+    start() {
+        while (this.workers.length < this.size) this.spawn();
+    }
+
+    spawn() {
+        const worker = new Worker(WORKER_FILE);
+        const slot = { worker, job: null };
+        worker.on('message', (message) => this.finish(slot, message));
+        worker.on('error', (err) => this.replace(slot, err));
+        worker.on('exit', (code) => {
+            if (code !== 0) this.replace(slot, new Error(`password worker exited with code ${code}`));
+        });
+        // Only busy workers keep the process alive (unref after the listeners, which ref it)
+        worker.unref();
+        this.workers.push(slot);
+        this.idle.push(slot);
+        this.drain();
+    }
+
+    replace(slot, err) {
+        if (!this.workers.includes(slot)) return;
+        console.error('Password worker failed:', err.message);
+        this.workers = this.workers.filter(s => s !== slot);
+        this.idle = this.idle.filter(s => s !== slot);
+        if (slot.job) slot.job.reject(err);
+        slot.job = null;
+        this.spawn();
+    }
+
+    run(operation, payload) {
+        if (this.workers.length === 0) this.start();
+        if (this.idle.length === 0 && this.queue.length >= this.maxQueue) {
+            rejections.inc({ operation });
+            return Promise.reject(new PasswordHashingBusyError(this.retryAfter()));
+        }
+        return new Promise((resolve, reject) => {
+            this.queue.push({ id: this.nextId++, operation, payload, resolve, reject, queuedAt: process.hrtime.bigint() });
+            this.drain();
+        });
+    }
+
+    drain() {
+        while (this.idle.length > 0 && this.queue.length > 0) {
+            const slot = this.idle.pop();
+            const job = this.queue.shift();
+            queueWait.observe({ operation: job.operation }, secondsSince(job.queuedAt));
+            job.startedAt = process.hrtime.bigint();
+            slot.job = job;
+            slot.worker.ref();
+            slot.worker.postMessage({ id: job.id, op: job.operation, ...job.payload });
+        }
+    }
+
+    finish(slot, { id, result, error }) {
+        const job = slot.job;
+        if (!job || job.id !== id) return;
+        const seconds = secondsSince(job.startedAt);
+        jobDuration.observe({ operation: job.operation }, seconds);
+        this.avgJobMs = this.avgJobMs * 0.9 + seconds * 100;
+        slot.job = null;
+        slot.worker.unref();
+        this.idle.push(slot);
+        if (error) job.reject(new Error(error));
+        else job.resolve(result);
+        this.drain();
+    }
+
+    // Seconds until the current backlog should have cleared
+    retryAfter() {
+        return Math.max(1, Math.ceil((this.queue.length / this.size) * this.avgJobMs / 1000));
+    }
+
+    isSaturated() {
+        return this.idle.length === 0 && this.workers.length > 0 && this.queue.length >= this.maxQueue;
+    }
+}
+
+const pool = new PasswordPool(POOL_SIZE, MAX_QUEUE);
+
+registerCollector(() => {
+    queueDepth.set({}, pool.queue.length);
+    busyWorkers.set({}, pool.workers.length - pool.idle.length);
+});
+
+const hashPassword = (password) => pool.run('hash', { password, rounds: BCRYPT_ROUNDS });
+
+const verifyPassword = (password, hash) => pool.run('compare', { password, hash });
+
+// True when the hash was made with a lower cost than BCRYPT_ROUNDS
+const needsRehash = (hash) => {
+    try {
+        return bcrypt.getRounds(hash) < BCRYPT_ROUNDS;
+    } catch {
+        return false;
+    }
+};
+
+// Route middleware: turn away password work before touching the database
+const rejectWhenBusy = (req, res, next) => {
+    if (pool.isSaturated()) {
+        rejections.inc({ operation: 'request' });
+        return sendBusy(res, new PasswordHashingBusyError(pool.retryAfter()));
+    }
+    next();
+};
+
+const sendBusy = (res, err) => {
+    res.set('Retry-After', String(err.retryAfter));
+    res.status(503).json({ error: 'Server is busy, please retry shortly', retryAfter: err.retryAfter });
+};
+
+module.exports = {
+    BCRYPT_ROUNDS,
+    PasswordHashingBusyError,
+    hashPassword,
+    verifyPassword,
+    needsRehash,
+    rejectWhenBusy,
+    sendBusy
+};
@@ -0,0 +1,16 @@
+// Worker thread for lib/passwordHashing.js: runs bcrypt synchronously,
+// off the main event loop.
+
+const { parentPort } = require('worker_threads');
+const bcrypt = require('bcryptjs');
+
+parentPort.on('message', ({ id, op, password, hash, rounds }) => {
+    try {
+        const result = op === 'hash'
+            ? bcrypt.hashSync(password, bcrypt.genSaltSync(rounds))
+            : bcrypt.compareSync(password, hash);
+        parentPort.postMessage({ id, result });
+    } catch (err) {
+        parentPort.postMessage({ id, error: err.message });
+    }
+});
@@ -0,0 +1,82 @@
+// Key string normalization for server-side import and dedupe.
+//
+// Same rules as parseKeyString in src/components/views/ShortcutCheckerView.jsx:
+// lowercase, split on '+', map modifier aliases, sort modifiers, last
+// non-modifier part is the key. macOS glyphs (⌘⇧⌥⌃) are also accepted.
+// server/shortcut_keys.py mirrors this for the Python tools.
+
+const MODIFIER_ALIASES = {
+    cmd: 'cmd',
+    command: 'cmd',
+    ctrl: 'ctrl',
+    control: 'ctrl',
+    opt: 'opt',
+    option: 'opt',
+    alt: 'opt',
+    shift: 'shift',
+    hyper: 'hyper'
+};
+
+const MODIFIER_SYMBOLS = { '⌘': 'cmd', '⇧': 'shift', '⌥': 'opt', '⌃': 'ctrl', '◆': 'hyper' };
+const SYMBOL_PATTERN = /[⌘⇧⌥⌃◆]/;
+
+// Cocoa NSUserKeyEquivalents prefixes
+const COCOA_MODIFIERS = { '@': 'cmd', '$': 'shift', '~': 'opt', '^': 'ctrl' };
+
+// Display order and labels used throughout the app ("Ctrl+Option+Cmd+B")
+const DISPLAY_ORDER = ['hyper', 'ctrl', 'opt', 'cmd', 'shift'];
+const DISPLAY_NAMES = { hyper: 'Hyper', ctrl: 'Ctrl', opt: 'Option', cmd: 'Cmd', shift: 'Shift' };
+
+// Parse a key string like "cmd+shift+a" into normalized parts
+const parseKeyString = (keyString) => {
+    if (!keyString) return { modifiers: [], key: '' };
+
+    let text = String(keyString);
+    if (SYMBOL_PATTERN.test(text)) {
+        const chars = [...text];
+        text = chars.filter(ch => MODIFIER_SYMBOLS[ch]).map(ch => MODIFIER_SYMBOLS[ch])
+            .concat(chars.filter(ch => !MODIFIER_SYMBOLS[ch]).join(''))
+            .join('+');
+    }
+
+    const modifiers = [];
+    let key = '';
+    text.toLowerCase().split('+').map(p => p.trim()).filter(Boolean).forEach(part => {
+        if (MODIFIER_ALIASES[part]) modifiers.push(MODIFIER_ALIASES[part]);
+        else key = part;
+    });
+
+    return { modifiers: modifiers.sort(), key };
+};
+
+// Parse a Cocoa key equivalent like "@$k"
+const parseCocoaKeyEquivalent = (equivalent) => {
+    const modifiers = [];
+    let rest = equivalent || '';
+    while (rest.length > 1 && COCOA_MODIFIERS[rest[0]]) {
+        modifiers.push(COCOA_MODIFIERS[rest[0]]);
+        rest = rest.slice(1);
+    }
+    return { modifiers: modifiers.sort(), key: rest.toLowerCase() };
+};
+
+// Canonical form used for indexing: "cmd+shift+a" ('' when there is no key)
+const normalizeKeys = (keyString) => {
+    const { modifiers, key } = parseKeyString(keyString);
+    return key ? [...modifiers, key].join('+') : '';
+};
+
+// Display form stored in the library: "Cmd+Shift+A"
+const formatKeys = ({ modifiers, key }) => {
+    if (!key) return '';
+    const ordered = [...new Set(modifiers)].sort((a, b) => DISPLAY_ORDER.indexOf(a) - DISPLAY_ORDER.indexOf(b));
+    const label = key.length === 1 ? key.toUpperCase() : key[0].toUpperCase() + key.slice(1);
+    return [...ordered.map(m => DISPLAY_NAMES[m]), label].join('+');
+};
+
+module.exports = {
+    parseKeyString,
+    parseCocoaKeyEquivalent,
+    normalizeKeys,
+    formatKeys
+};
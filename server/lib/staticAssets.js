@@ -0,0 +1,109 @@
+// Production frontend serving from the precompressed build.
+//
+// `vite build` writes .br and .gz variants next to each asset
+// (scripts/precompress.js). This serves the best variant the client accepts,
+// so nothing is compressed per request, and lets browsers keep hashed
+// assets forever:
+// - /assets/*-<hash>.*  Cache-Control: immutable, one year
+// - everything else     (index.html, public/ files) revalidated every time
+//
+// The file list is read once at startup - a deployed build never changes,
+// and only known paths are ever served.
+
+const fs = require('fs');
+const path = require('path');
+
+const IMMUTABLE = 'public, max-age=31536000, immutable';
+const REVALIDATE = 'no-cache';
+
+// Vite's default asset names: /assets/<name>-<8+ char hash>.<ext>
+const HASHED_ASSET = /^\/assets\/.+-[\w-]{8,}\.\w+$/;
+
+// Server preference when the client accepts several
+const ENCODINGS = [
+    { name: 'br', ext: '.br' },
+    { name: 'gzip', ext: '.gz' }
+];
+
+// Content codings the client accepts (q=0 means "not acceptable")
+const acceptedEncodings = (header) => {
+    const accepted = new Set();
+    for (const part of (header || '').split(',')) {
+        const [name, ...params] = part.trim().toLowerCase().split(';');
+        const q = params.map(p => p.trim()).find(p => p.startsWith('q='));
+        if (name && !(q && Number(q.slice(2)) === 0)) accepted.add(name);
+    }
+    if (accepted.has('*')) ENCODINGS.forEach(({ name }) => accepted.add(name));
+    return accepted;
+};
+
+// url path -> Set of available encodings
+const scanBuild = (root) => {
+    const files = new Map();
+    const walk = (dir) => {
+        for (const entry of fs.readdirSync(dir, { withFileTypes: true })) {
+            const full = path.join(dir, entry.name);
+            if (entry.isDirectory()) {
+                walk(full);
+            } else if (!ENCODINGS.some(({ ext }) => entry.name.endsWith(ext))) {
+                const encodings = new Set(ENCODINGS.filter(({ ext }) => fs.existsSync(full + ext)).map(({ name }) => name));
+                files.set('/' + path.relative(root, full).split(path.sep).join('/'), encodings);
+            }
+        }
+    };
+    if (fs.existsSync(root)) walk(root);
+    return files;
+};
+
+const createStaticAssets = (root) => {
+    const files = scanBuild(root);
+
+    const serve = (urlPath, req, res, next) => {
+        const encodings = files.get(urlPath);
+        const accepted = acceptedEncodings(req.headers['accept-encoding']);
+        const encoding = ENCODINGS.find(({ name }) => encodings.has(name) && accepted.has(name));
+
+        // Never run these through compression() (see index.js)
+        res.locals.skipCompression = true;
+        res.set('Cache-Control', HASHED_ASSET.test(urlPath) ? IMMUTABLE : REVALIDATE);
+        if (encodings.size > 0) res.vary('Accept-Encoding');
+
+        let file = path.join(root, urlPath);
+        if (encoding) {
+            res.type(path.extname(urlPath));
+            res.set('Content-Encoding', encoding.name);
+            file += encoding.ext;
+        }
+        res.sendFile(file, { cacheControl: false }, (err) => {
+            if (err && !res.headersSent) next(err);
+        });
+    };
+
+    const middleware = (req, res, next) => {
+        if (req.method !== 'GET' && req.method !== 'HEAD') return next();
+        let urlPath;
+        try {
+            urlPath = decodeURIComponent(req.path);
+        } catch {
+            return next();
+        }
+        if (urlPath.endsWith('/')) urlPath += 'index.html';
+        if (!files.has(urlPath)) return next();
+        serve(urlPath, req, res, next);
+    };
+
+    // SPA fallback: index.html for client-side routes
+    middleware.sendIndex = (req, res, next) => {
+        if (!files.has('/index.html')) return next();
+        serve('/index.html', req, res, next);
+    };
+
+    middleware.fileCount = files.size;
+    return middleware;
+};
+
+module.exports = {
+    IMMUTABLE,
+    acceptedEncodings,
+    createStaticAssets
+};
@@ -0,0 +1,188 @@
+// Client performance telemetry (sent by src/utils/perf.js).
+//
+// Keeps a rolling window of the latest samples per (release, metric) and
+// derives percentiles from it on read. Batches can also be appended to a
+// JSON-lines log (TELEMETRY_LOG) for telemetry_report.py.
+//
+// Ingestion needs no login, so it is bounded on every side: batches per IP
+// per minute, the log's size (rotated to TELEMETRY_LOG.1), and the releases
+// accepted - only the ones this deployment built (TELEMETRY_RELEASES, else
+// VITE_RELEASE), so made-up labels cannot create series or evict real ones.
+
+const fs = require('fs');
+const { Gauge, registerCollector } = require('./metrics');
+
+const WINDOW_SIZE = 1000;
+// Caps keep a misbehaving client from growing memory without bound. Past
+// MAX_SERIES the least recently updated series is evicted, so made-up
+// release/metric pairs cannot lock out real ones.
+const MAX_SERIES = 500;
+const MAX_BATCH = 200;
+const MAX_VALUE_MS = 10 * 60 * 1000;
+const METRIC_PATTERN = /^[a-z0-9_.:-]{1,64}$/i;
+
+const intFromEnv = (name, fallback) => {
+    const value = parseInt(process.env[name], 10);
+    return Number.isFinite(value) && value >= 0 ? value : fallback;
+};
+
+// A sampled session sends a batch every 30s or 50 samples, plus one on hide
+// (per IP - see TRUST_PROXY in index.js; 0 turns the limit off)
+const RATE_LIMIT = intFromEnv('TELEMETRY_RATE_LIMIT', 30);
+const RATE_WINDOW_MS = 60 * 1000;
+const MAX_TRACKED_IPS = 10000;
+const MAX_LOG_BYTES = intFromEnv('TELEMETRY_LOG_MAX_MB', 100) * 1024 * 1024;
+
+// perf.js reports VITE_RELEASE, or 'dev' when the build had none
+const RELEASES = new Set((process.env.TELEMETRY_RELEASES || process.env.VITE_RELEASE || 'dev')
+    .split(',').map(r => r.trim()).filter(Boolean));
+const QUANTILES = [0.5, 0.75, 0.95, 0.99];
+
+class RollingWindow {
+    constructor(size) {
+        this.values = new Float64Array(size);
+        this.filled = 0;
+        this.next = 0;
+        this.total = 0;
+    }
+
+    push(value) {
+        this.values[this.next] = value;
+        this.next = (this.next + 1) % this.values.length;
+        this.filled = Math.min(this.filled + 1, this.values.length);
+        this.total++;
+    }
+
+    percentiles(quantiles) {
+        const sorted = this.values.slice(0, this.filled).sort();
+        return quantiles.map(q => (sorted.length ? sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))] : 0));
+    }
+}
+
+// Ordered by last update (oldest first)
+const series = new Map();
+
+// Fixed one-minute windows: ip -> batches so far
+let rateWindowStart = 0;
+const batchesByIp = new Map();
+
+// Whether another batch from `ip` is allowed now
+const allowBatch = (ip, now = Date.now()) => {
+    if (RATE_LIMIT === 0) return true;
+    if (now - rateWindowStart >= RATE_WINDOW_MS) {
+        rateWindowStart = now;
+        batchesByIp.clear();
+    }
+    const count = batchesByIp.get(ip) || 0;
+    // Past the tracking cap, unseen addresses wait for the next window
+    if (count >= RATE_LIMIT || (count === 0 && batchesByIp.size >= MAX_TRACKED_IPS)) return false;
+    batchesByIp.set(ip, count + 1);
+    return true;
+};
+
+// The log rotates to <TELEMETRY_LOG>.1 (replacing the previous one) once it
+// reaches TELEMETRY_LOG_MAX_MB (0: never). Cluster workers share the file: one that finds
+// it rotated by another reopens it instead of writing to the old one.
+const LOG_PATH = process.env.TELEMETRY_LOG || null;
+let logStream = null;
+let logInode = null;
+let logBytes = 0;
+
+const openLog = () => {
+    // Opened synchronously so the inode and size are those of this file
+    const fd = fs.openSync(LOG_PATH, 'a');
+    const stat = fs.fstatSync(fd);
+    logInode = stat.ino;
+    logBytes = stat.size;
+    logStream = fs.createWriteStream(null, { fd });
+    logStream.on('error', (err) => console.error('Telemetry log error:', err.message));
+};
+
+const writeLog = (line) => {
+    if (!logStream) openLog();
+    const bytes = Buffer.byteLength(line);
+    if (MAX_LOG_BYTES && logBytes + bytes > MAX_LOG_BYTES) {
+        let current = null;
+        try {
+            current = fs.statSync(LOG_PATH);
+        } catch {
+            // removed: reopen creates it
+        }
+        if (current && current.ino === logInode && current.size + bytes > MAX_LOG_BYTES) {
+            fs.renameSync(LOG_PATH, `${LOG_PATH}.1`);
+        }
+        logStream.end();
+        openLog();
+    }
+    logStream.write(line);
+    logBytes += bytes;
+};
+
+// Validate a beacon payload; returns { release, samples } or { error }
+const parseBatch = (body) => {
+    let batch = body;
+    if (typeof batch === 'string') {
+        try {
+            batch = JSON.parse(batch);
+        } catch {
+            return { error: 'Malformed telemetry batch' };
+        }
+    }
+    if (!batch || typeof batch !== 'object' || !Array.isArray(batch.samples)) {
+        return { error: 'Telemetry batch must include samples' };
+    }
+    if (batch.samples.length > MAX_BATCH) {
+        return { error: `At most ${MAX_BATCH} samples per batch` };
+    }
+    // Not a release this deployment built: accepted, but not recorded
+    if (!RELEASES.has(batch.release)) {
+        return { release: null, samples: [] };
+    }
+    const release = batch.release;
+    const samples = batch.samples.filter(s => s && METRIC_PATTERN.test(s.m)
+        && typeof s.v === 'number' && Number.isFinite(s.v) && s.v >= 0 && s.v <= MAX_VALUE_MS);
+    return { release, samples };
+};
+
+const recordBatch = (release, samples) => {
+    for (const { m: metric, v: value } of samples) {
+        const key = `${release}\u0000${metric}`;
+        let entry = series.get(key);
+        if (entry) {
+            series.delete(key);
+        } else {
+            if (series.size >= MAX_SERIES) series.delete(series.keys().next().value);
+            entry = { release, metric, window: new RollingWindow(WINDOW_SIZE) };
+        }
+        series.set(key, entry);
+        entry.window.push(value);
+    }
+    if (LOG_PATH && samples.length > 0) {
+        writeLog(JSON.stringify({ t: new Date().toISOString(), release, samples }) + '\n');
+    }
+};
+
+// Percentiles per (release, metric) over each rolling window
+const summarize = () => [...series.values()].map(({ release, metric, window }) => {
+    const [p50, p75, p95, p99] = window.percentiles(QUANTILES);
+    return { release, metric, count: window.total, window: window.filled, p50, p75, p95, p99 };
+});
+
+// Also exposed on /api/metrics
+const clientPerf = new Gauge('client_perf_milliseconds', 'Client timings over the rolling window', ['release', 'metric', 'quantile']);
+registerCollector(() => {
+    // Rebuilt on each scrape so evicted series disappear
+    clientPerf.clear();
+    for (const { release, metric, window } of series.values()) {
+        window.percentiles(QUANTILES).forEach((value, i) => clientPerf.set({ release, metric, quantile: QUANTILES[i] }, value));
+    }
+});
+
+module.exports = {
+    WINDOW_SIZE,
+    RollingWindow,
+    allowBatch,
+    parseBatch,
+    recordBatch,
+    summarize
+};
@@ -0,0 +1,255 @@
+const User = require('../models/User');
+const UserData = require('../models/UserData');
+const { COLLECTIONS, getDbKey } = require('./collections');
+const { recordCacheLookup, timeUserData } = require('./metrics');
+const { invalidate, onInvalidate } = require('./cacheBus');
+const { RECENT_BATCHES } = require('./batchOperations');
+
+// Every anonymous request reads the demo user's data; remember its id briefly
+const DEMO_OWNER_TTL_MS = 60 * 1000;
+let demoOwner = { id: null, expires: 0 };
+
+// ...and the demo document itself. Writes to it invalidate every worker's
+// copy (lib/cacheBus.js); the TTL only bounds staleness from offline tools.
+const DEMO_DATA_TTL_MS = 5 * 60 * 1000;
+let demoData = { value: null, expires: 0 };
+
+onInvalidate('demo_data', () => {
+    demoData = { value: null, expires: 0 };
+});
+
+const emptyData = () => ({
+    leaderShortcuts: [],
+    raycastShortcuts: [],
+    systemShortcuts: [],
+    leaderGroups: [],
+    appsLibrary: []
+});
+
+// Resolve whose UserData document a request reads from.
+// Anonymous visitors read the demo user's data (showcase mode).
+const resolveDataOwnerId = async (user) => {
+    if (user) return user.id;
+    const hit = demoOwner.id !== null && demoOwner.expires > Date.now();
+    recordCacheLookup('demo_owner', hit);
+    if (hit) return demoOwner.id;
+
+    const demoUser = await User.findOne({ role: 'demo' }).select('_id').lean();
+    if (!demoUser) return null;
+    demoOwner = { id: demoUser._id, expires: Date.now() + DEMO_OWNER_TTL_MS };
+    return demoUser._id;
+};
+
+// Sparse reads: GET /api/shortcuts?collections=raycastShortcuts,apps&fields=id,keys
+// - collections: only these collections (`apps` is an alias of appsLibrary)
+// - fields: only these item fields (`id` is always kept), or with a leading
+//   `-` on every name, all fields but these (e.g. fields=-iconUrl)
+const FIELD_NAME = /^[A-Za-z_]\w{0,63}$/;
+const MAX_FIELDS = 32;
+
+const listParam = (value) => (value === undefined ? null : [].concat(value).join(',').split(',').map(s => s.trim()).filter(Boolean));
+
+// Returns { collections, include, exclude } (null = not restricted) or { error }
+const parseReadSpec = (query = {}) => {
+    const spec = { collections: null, include: null, exclude: null };
+
+    const collections = listParam(query.collections);
+    if (collections) {
+        const unknown = collections.filter(name => !COLLECTIONS.includes(getDbKey(name)));
+        if (collections.length === 0 || unknown.length > 0) {
+            return { error: `Unknown collections: ${unknown.join(', ') || '(none)'}. Use: ${[...COLLECTIONS, 'apps'].join(', ')}` };
+        }
+        spec.collections = [...new Set(collections)].map(name => ({ name, dbKey: getDbKey(name) }));
+    }
+
+    const fields = listParam(query.fields);
+    if (fields) {
+        const excluded = fields.filter(f => f.startsWith('-'));
+        const names = fields.map(f => f.replace(/^-/, ''));
+        if (names.length === 0 || names.length > MAX_FIELDS || !names.every(f => FIELD_NAME.test(f))) {
+            return { error: `fields must be 1-${MAX_FIELDS} comma-separated field names` };
+        }
+        if (excluded.length > 0 && excluded.length < fields.length) {
+            return { error: 'fields must either list the fields to return or, each prefixed with -, the fields to leave out' };
+        }
+        if (excluded.length > 0) spec.exclude = [...new Set(names)].filter(f => f !== 'id');
+        else spec.include = [...new Set(['id', ...names])];
+    }
+    return spec;
+};
+
+const isFullRead = (spec) => !spec || (!spec.collections && !spec.include && !spec.exclude);
+
+// The spec as a Mongo projection, so unwanted collections and fields (icon
+// blobs) never leave the database
+const readProjection = (spec) => {
+    if (isFullRead(spec)) return null;
+    const keys = spec.collections ? spec.collections.map(c => c.dbKey) : COLLECTIONS;
+    const projection = { _id: 0 };
+    if (spec.include) {
+        keys.forEach(c => spec.include.forEach(f => { projection[`${c}.${f}`] = 1; }));
+    } else if (spec.exclude) {
+        COLLECTIONS.filter(c => !keys.includes(c)).forEach(c => { projection[c] = 0; });
+        keys.forEach(c => spec.exclude.forEach(f => { projection[`${c}.${f}`] = 0; }));
+    } else {
+        keys.forEach(c => { projection[c] = 1; });
+    }
+    return projection;
+};
+
+// The same projection applied in memory (for the cached demo data)
+const projectData = (data, spec) => {
+    if (isFullRead(spec)) return data;
+    const keys = spec.collections ? spec.collections.map(c => c.dbKey) : COLLECTIONS;
+    const projectItem = spec.include
+        ? (item) => Object.fromEntries(spec.include.filter(f => f in item).map(f => [f, item[f]]))
+        : spec.exclude
+            ? (item) => Object.fromEntries(Object.entries(item).filter(([f]) => !spec.exclude.includes(f)))
+            : (item) => item;
+    return Object.fromEntries(keys.map(c => [c, (data[c] || []).map(projectItem)]));
+};
+
+// Thrown by loadUserData when MongoDB can't be read; writers answer 503
+// rather than saving an empty library over the real one
+class UserDataUnavailableError extends Error {
+    constructor(cause) {
+        super('User data is temporarily unavailable');
+        this.name = 'UserDataUnavailableError';
+        this.cause = cause;
+        this.retryAfter = 5;
+    }
+}
+
+// Load user's data from MongoDB (plain objects, never hydrated)
+// `spec` (from parseReadSpec) limits what is read; writers read everything.
+// Throws UserDataUnavailableError when the read fails.
+const loadUserData = (user, spec = null) => timeUserData('get', async () => {
+    const defaultData = emptyData();
+    const projection = readProjection(spec);
+
+    try {
+        const ownerId = await resolveDataOwnerId(user);
+        if (!ownerId) return defaultData;
+
+        // Anonymous reads share one cached copy of the demo data (read-only)
+        if (!user) {
+            const hit = demoData.value !== null && demoData.expires > Date.now();
+            recordCacheLookup('demo_data', hit);
+            if (!hit) {
+                const data = await UserData.findOne({ userId: ownerId }).lean();
+                demoData = { value: data || defaultData, expires: Date.now() + DEMO_DATA_TTL_MS };
+            }
+            return projectData(demoData.value, spec);
+        }
+
+        // Demo and admin users only ever read existing data
+        if (user.role === 'demo' || user.role === 'admin') {
+            const data = await UserData.findOne({ userId: ownerId }, projection).lean();
+            return data || defaultData;
+        }
+
+        // Client user - get or create their data
+        const data = await UserData.findOne({ userId: ownerId }, projection).lean();
+        if (data) return data;
+        try {
+            await new UserData({
+                userId: ownerId,
+                dataType: 'client',
+                ...defaultData
+            }).save();
+        } catch (err) {
+            // A concurrent request created it first: read that one
+            if (err.code !== 11000) throw err;
+            return (await UserData.findOne({ userId: ownerId }, projection).lean()) || defaultData;
+        }
+        return defaultData;
+    } catch (err) {
+        throw new UserDataUnavailableError(err);
+    }
+});
+
+// Read-only variant for GET handlers: an unreachable database shows an
+// empty library instead of an error page. Never save what this returns.
+const getUserData = async (user, spec = null) => {
+    try {
+        return await loadUserData(user, spec);
+    } catch (err) {
+        console.error("Error getting user data from MongoDB:", err.cause || err);
+        return emptyData();
+    }
+};
+
+const sendDataUnavailable = (res, err) => {
+    res.set('Retry-After', String(err.retryAfter));
+    res.status(503).json({ error: 'Your data is temporarily unavailable, please retry shortly', retryAfter: err.retryAfter });
+};
+
+// Call after writing a user's UserData outside saveUserData
+const invalidateUserData = (user) => {
+    if (user.role === 'demo' || (demoOwner.id && String(demoOwner.id) === String(user.id))) {
+        invalidate('demo_data');
+    }
+};
+
+const collectionsUpdate = (data) => ({
+    leaderShortcuts: data.leaderShortcuts || [],
+    leaderGroups: data.leaderGroups || [],
+    raycastShortcuts: data.raycastShortcuts || [],
+    systemShortcuts: data.systemShortcuts || [],
+    appsLibrary: data.appsLibrary || [],
+    updatedAt: new Date()
+});
+
+// Helper to save user's data to MongoDB
+const saveUserData = (data, user) => timeUserData('save', async () => {
+    try {
+        await UserData.findOneAndUpdate(
+            { userId: user.id },
+            { $set: collectionsUpdate(data) },
+            { upsert: true, new: true }
+        );
+        invalidateUserData(user);
+    } catch (err) {
+        console.error("Error saving user data to MongoDB:", err);
+        throw err;
+    }
+});
+
+// Save the outcome of POST /api/shortcuts/batch (`data` is null when nothing
+// changed) and record its batchId in one conditional write. Returns false,
+// writing nothing, when the batchId is already recorded: a retry that raced
+// the original request, on this worker or another one.
+const saveBatchResult = (data, user, record) => timeUserData('save', async () => {
+    const update = { $push: { recentBatches: { $each: [record], $slice: -RECENT_BATCHES } } };
+    if (data) update.$set = collectionsUpdate(data);
+    try {
+        await UserData.findOneAndUpdate(
+            { userId: user.id, 'recentBatches.batchId': { $ne: record.batchId } },
+            update,
+            { upsert: true, projection: { _id: 1 } }
+        );
+    } catch (err) {
+        // The filter missed because the batchId is there, so the upsert tried
+        // to insert a second document for this user
+        if (err.code === 11000) return false;
+        console.error("Error saving batch to MongoDB:", err);
+        throw err;
+    }
+    if (data) invalidateUserData(user);
+    return true;
+});
+
+module.exports = {
+    COLLECTIONS,
+    getDbKey,
+    emptyData,
+    resolveDataOwnerId,
+    parseReadSpec,
+    UserDataUnavailableError,
+    loadUserData,
+    getUserData,
+    sendDataUnavailable,
+    saveUserData,
+    saveBatchResult,
+    invalidateUserData
+};
@@ -0,0 +1,81 @@
+// Item validation for every UserData collection.
+//
+// The schemas live in schemas/shortcuts.json (shared with the Python tools via
+// shortcut_schema.py). They are compiled once at startup into one checker per
+// field, so validating an item is a single pass over precomputed closures.
+
+const schema = require('../schemas/shortcuts.json');
+
+const TYPE_CHECKS = {
+    string: (v) => typeof v === 'string',
+    number: (v) => typeof v === 'number' && Number.isFinite(v),
+    boolean: (v) => typeof v === 'boolean'
+};
+
+const compileField = (name, spec, limits) => {
+    const required = spec.endsWith('!');
+    const type = spec.replace(/!$/, '');
+    const isArray = type.endsWith('[]');
+    const base = isArray ? type.slice(0, -2) : type;
+    const check = TYPE_CHECKS[base];
+    if (!check) throw new Error(`Unknown type "${spec}" for field ${name}`);
+    const maxLength = limits[name] || limits.string;
+
+    const checkOne = (value) => check(value) && (base !== 'string' || value.length <= maxLength);
+
+    return (value, errors) => {
+        if (value === undefined || value === null || value === '' || (isArray && Array.isArray(value) && value.length === 0)) {
+            if (required) errors.push(`${name} is required`);
+            return;
+        }
+        if (isArray) {
+            if (!Array.isArray(value)) errors.push(`${name} must be a list of ${base} values`);
+            else if (value.length > limits.array) errors.push(`${name} has more than ${limits.array} entries`);
+            else if (!value.every(checkOne)) errors.push(`${name} must be a list of ${base} values`);
+            return;
+        }
+        if (!check(value)) errors.push(`${name} must be a ${base}`);
+        else if (base === 'string' && value.length > maxLength) errors.push(`${name} is longer than ${maxLength} characters`);
+    };
+};
+
+const compileCollection = (spec, limits) => {
+    const fields = Object.entries(spec.fields).map(([name, type]) => [name, compileField(name, type, limits)]);
+    const known = new Set(Object.keys(spec.fields));
+    const renamed = Object.entries(spec.renamed || {});
+
+    // Returns { value, errors, unknown }: value keeps known fields only
+    return (item) => {
+        if (!item || typeof item !== 'object' || Array.isArray(item)) {
+            return { value: null, errors: ['item must be an object'], unknown: [] };
+        }
+        const value = {};
+        const errors = [];
+        const unknown = [];
+        for (const key in item) {
+            if (known.has(key)) value[key] = item[key];
+            else unknown.push(key);
+        }
+        for (const [legacy, target] of renamed) {
+            if (item[legacy] && !value[target]) value[target] = item[legacy];
+        }
+        for (const [name, checkField] of fields) checkField(value[name], errors);
+        return { value, errors, unknown };
+    };
+};
+
+const VALIDATORS = Object.fromEntries(
+    Object.entries(schema.collections).map(([name, spec]) => [name, compileCollection(spec, schema.limits)])
+);
+
+// Validate one item of `collection` (a DB key such as 'appsLibrary')
+const validateItem = (collection, item) => {
+    const validator = VALIDATORS[collection];
+    if (!validator) return { value: null, errors: [`unknown collection "${collection}"`], unknown: [] };
+    return validator(item);
+};
+
+module.exports = {
+    VALIDATORS,
+    validateItem
+};
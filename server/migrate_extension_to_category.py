@@ -3,7 +3,7 @@
 Migration script: Move raycastShortcuts 'extension' field to 'category'
 
 This script:
-1. Reads demo_db.json (and db.json if exists)
+1. Reads demo_db.json (and db.json if exists), or the files given as arguments
 2. For each raycastShortcut:
    - If 'extension' exists and 'category' is empty/doesn't exist: copy extension → category
    - Remove the 'extension' field
@@ -12,6 +12,7 @@ This script:
 
 import json
 import os
+import sys
 from pathlib import Path
 
 def migrate_file(filepath):
@@ -55,8 +56,8 @@ def migrate_file(filepath):
 def main():
     script_dir = Path(__file__).parent
     
-    # Files to migrate
-    files = [
+    # Files to migrate (given on the command line, or the bundled databases)
+    files = [Path(arg) for arg in sys.argv[1:]] or [
         script_dir / 'demo_db.json',
         script_dir / 'db.json',
     ]
@@ -0,0 +1,21 @@
+const mongoose = require('mongoose');
+
+// Small key/value records about the deployment itself (e.g. which
+// bootstrap version has already been applied to this database)
+const serverMetaSchema = new mongoose.Schema({
+  key: {
+    type: String,
+    required: true,
+    unique: true
+  },
+  version: {
+    type: Number,
+    default: 0
+  },
+  updatedAt: {
+    type: Date,
+    default: Date.now
+  }
+});
+
+module.exports = mongoose.model('ServerMeta', serverMetaSchema);
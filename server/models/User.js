@@ -1,5 +1,5 @@
 const mongoose = require('mongoose');
-const bcrypt = require('bcryptjs');
+const { hashPassword, verifyPassword, needsRehash } = require('../lib/passwordHashing');
 
 const userSchema = new mongoose.Schema({
   username: {
@@ -29,17 +29,21 @@ const userSchema = new mongoose.Schema({
   }
 });
 
-// Hash password before saving
+// Hash password before saving (on the bcrypt worker pool)
 userSchema.pre('save', async function() {
   if (!this.isModified('password')) return;
-  
-  const salt = await bcrypt.genSalt(10);
-  this.password = await bcrypt.hash(this.password, salt);
+
+  this.password = await hashPassword(this.password);
 });
 
 // Compare password method
 userSchema.methods.comparePassword = async function(candidatePassword) {
-  return bcrypt.compare(candidatePassword, this.password);
+  return verifyPassword(candidatePassword, this.password);
+};
+
+// True when the stored hash predates the current BCRYPT_ROUNDS
+userSchema.methods.needsRehash = function() {
+  return needsRehash(this.password);
 };
 
 // Remove password from JSON response
@@ -35,6 +35,12 @@ const userDataSchema = new mongoose.Schema({
     type: Array,
     default: []
   },
+  // Last few POST /api/shortcuts/batch requests by client batchId, so retries
+  // replay instead of applying twice (lib/batchOperations.js)
+  recentBatches: {
+    type: Array,
+    default: []
+  },
   updatedAt: {
     type: Date,
     default: Date.now
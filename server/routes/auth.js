@@ -2,9 +2,10 @@ const express = require('express');
 const router = express.Router();
 const User = require('../models/User');
 const { generateToken, requireAuth } = require('../middleware/auth');
+const { PasswordHashingBusyError, rejectWhenBusy, sendBusy } = require('../lib/passwordHashing');
 
 // Register new user
-router.post('/register', async (req, res) => {
+router.post('/register', rejectWhenBusy, async (req, res) => {
   try {
     const { username, password, displayName } = req.body;
 
@@ -37,13 +38,16 @@ router.post('/register', async (req, res) => {
       token
     });
   } catch (error) {
+    if (error instanceof PasswordHashingBusyError) {
+      return sendBusy(res, error);
+    }
     console.error('Register error:', error);
     res.status(500).json({ error: 'Failed to register user' });
   }
 });
 
 // Login
-router.post('/login', async (req, res) => {
+router.post('/login', rejectWhenBusy, async (req, res) => {
   try {
     const { username, password } = req.body;
     
@@ -62,6 +66,12 @@ router.post('/login', async (req, res) => {
       return res.status(401).json({ error: 'Invalid username or password' });
     }
 
+    // Upgrade hashes made with an older BCRYPT_ROUNDS; the response doesn't wait
+    if (user.needsRehash()) {
+      user.password = password;
+      user.save().catch(err => console.error('Password rehash failed:', err.message));
+    }
+
     // Generate token
     const token = generateToken(user);
 
@@ -75,6 +85,9 @@ router.post('/login', async (req, res) => {
       token
     });
   } catch (error) {
+    if (error instanceof PasswordHashingBusyError) {
+      return sendBusy(res, error);
+    }
     console.error('Login error:', error);
     res.status(500).json({ error: 'Failed to login' });
   }
@@ -100,7 +113,7 @@ router.get('/me', requireAuth, async (req, res) => {
 });
 
 // Update profile
-router.put('/me', requireAuth, async (req, res) => {
+router.put('/me', requireAuth, rejectWhenBusy, async (req, res) => {
   try {
     const { displayName, currentPassword, newPassword } = req.body;
     const user = await User.findById(req.user.id);
@@ -143,6 +156,9 @@ router.put('/me', requireAuth, async (req, res) => {
       token
     });
   } catch (error) {
+    if (error instanceof PasswordHashingBusyError) {
+      return sendBusy(res, error);
+    }
     console.error('Update profile error:', error);
     res.status(500).json({ error: 'Failed to update profile' });
   }
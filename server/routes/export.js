@@ -0,0 +1,96 @@
+const express = require('express');
+const router = express.Router();
+const UserData = require('../models/UserData');
+const { COLLECTIONS, resolveDataOwnerId } = require('../lib/userData');
+const { EXPORT_FORMATS, createExporter } = require('../lib/exportFormats');
+
+// Flush to the socket once this much output has been buffered
+const CHUNK_SIZE = 64 * 1024;
+
+const DEFAULT_COLLECTIONS = ['leaderShortcuts', 'raycastShortcuts', 'systemShortcuts'];
+
+// The client went away (or the response was ended): stop producing output
+const closed = (res) => res.destroyed || res.writableEnded;
+
+// Write a chunk, waiting for 'drain' when the socket buffer is full.
+// Resolves false instead if the client disconnects meanwhile.
+const writeChunk = (res, chunk) => new Promise((resolve, reject) => {
+  if (closed(res)) return resolve(false);
+  if (!chunk || res.write(chunk)) return resolve(true);
+  const done = (result, err) => {
+    res.off('drain', onDrain);
+    res.off('close', onClose);
+    res.off('error', onError);
+    if (err) reject(err);
+    else resolve(result);
+  };
+  const onDrain = () => done(true);
+  const onClose = () => done(false);
+  const onError = (err) => done(false, err);
+  res.once('drain', onDrain);
+  res.once('close', onClose);
+  res.once('error', onError);
+});
+
+// Export the caller's shortcuts (demo data when not logged in)
+// GET /api/export?format=markdown|json|csv|raycast|leaderkey&collections=a,b&icons=true
+router.get('/', async (req, res) => {
+  const format = (req.query.format || 'markdown').toLowerCase();
+  const exporter = createExporter(format);
+  if (!exporter) {
+    return res.status(400).json({ error: `Unknown format. Use one of: ${Object.keys(EXPORT_FORMATS).join(', ')}` });
+  }
+
+  const requested = req.query.collections
+    ? req.query.collections.split(',').map(c => (c.trim() === 'apps' ? 'appsLibrary' : c.trim()))
+    : (exporter.collections || DEFAULT_COLLECTIONS);
+  const invalid = requested.filter(c => !COLLECTIONS.includes(c));
+  if (invalid.length > 0) {
+    return res.status(400).json({ error: `Unknown collections: ${invalid.join(', ')}` });
+  }
+  const collections = exporter.collections
+    ? exporter.collections.filter(c => requested.includes(c))
+    : requested;
+  const options = { icons: req.query.icons === 'true' || req.query.icons === '1' };
+
+  try {
+    const ownerId = await resolveDataOwnerId(req.user);
+
+    // Only load what will be written: skip other collections and icon blobs
+    const projection = { _id: 0 };
+    COLLECTIONS.filter(c => !collections.includes(c)).forEach(c => { projection[c] = 0; });
+    if (!options.icons) {
+      collections.forEach(c => { projection[`${c}.iconUrl`] = 0; });
+    }
+    const data = ownerId ? await UserData.findOne({ userId: ownerId }, projection).lean() : null;
+
+    res.setHeader('Content-Type', exporter.contentType);
+    res.setHeader('Content-Disposition', `attachment; filename="shortcuts-${new Date().toISOString().split('T')[0]}.${exporter.extension}"`);
+
+    let buffer = exporter.begin(options);
+    for (const name of collections) {
+      const items = (data && data[name]) || [];
+      if (items.length === 0 && format === 'markdown') continue;
+
+      buffer += exporter.collectionStart(name, options);
+      for (const item of items) {
+        buffer += exporter.item(name, item, options);
+        if (buffer.length >= CHUNK_SIZE) {
+          if (!(await writeChunk(res, buffer))) return;
+          buffer = '';
+        }
+      }
+      buffer += exporter.collectionEnd(name, options);
+    }
+    buffer += exporter.end(options);
+    if (await writeChunk(res, buffer)) res.end();
+  } catch (err) {
+    console.error('GET /api/export error:', err);
+    if (!res.headersSent) {
+      return res.status(500).json({ error: 'Failed to export data' });
+    }
+    if (!res.destroyed) res.destroy(err);
+  }
+});
+
+module.exports = router;
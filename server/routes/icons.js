@@ -0,0 +1,145 @@
+const express = require('express');
+const router = express.Router();
+const mongoose = require('mongoose');
+const { requireAuth } = require('../middleware/auth');
+const { recordCacheLookup } = require('../lib/metrics');
+
+// Icons are streamed straight into GridFS - the request body is never buffered.
+// Items only hold `/api/icons/:id` URLs, so replacing or deleting an item leaves
+// its icon here; `backup_userdata.py sweep-icons` removes unreferenced ones.
+const ICON_UPLOAD_LIMIT = 5 * 1024 * 1024;
+const ICON_TYPES = new Set([
+  'image/png',
+  'image/jpeg',
+  'image/gif',
+  'image/webp',
+  'image/svg+xml',
+  'image/x-icon',
+  'image/vnd.microsoft.icon'
+]);
+
+let bucket = null;
+const getBucket = () => {
+  if (!bucket && mongoose.connection.db) {
+    bucket = new mongoose.mongo.GridFSBucket(mongoose.connection.db, { bucketName: 'icons' });
+  }
+  return bucket;
+};
+
+const parseIconId = (value) => (mongoose.Types.ObjectId.isValid(value) ? new mongoose.Types.ObjectId(value) : null);
+
+// Upload an icon as the raw request body
+// POST /api/icons  (Content-Type: image/png | image/jpeg | ...)
+// -> 201 { id, url, size, contentType }
+router.post('/', requireAuth, (req, res) => {
+  const contentType = (req.headers['content-type'] || '').split(';')[0].trim().toLowerCase();
+  if (!ICON_TYPES.has(contentType)) {
+    return res.status(415).json({ error: `Upload the image bytes with one of these content types: ${[...ICON_TYPES].join(', ')}` });
+  }
+  if (Number(req.headers['content-length']) > ICON_UPLOAD_LIMIT) {
+    // Discard the body without buffering it so the connection stays usable
+    req.resume();
+    return res.status(413).json({ error: `Icon too large (limit ${ICON_UPLOAD_LIMIT / 1024 / 1024}MB)` });
+  }
+
+  const store = getBucket();
+  if (!store) {
+    req.resume();
+    return res.status(503).json({ error: 'Icon storage unavailable' });
+  }
+
+  const upload = store.openUploadStream('icon', { metadata: { userId: req.user.id, contentType } });
+  let received = 0;
+  let failed = false;
+
+  const fail = (status, error) => {
+    if (failed) return;
+    failed = true;
+    req.unpipe(upload);
+    req.resume();
+    upload.destroy();
+    // Removes any chunks already written for this upload
+    store.delete(upload.id).catch(() => {});
+    if (!res.headersSent && !req.destroyed) res.status(status).json({ error });
+  };
+
+  req.on('data', (chunk) => {
+    received += chunk.length;
+    if (received > ICON_UPLOAD_LIMIT) fail(413, `Icon too large (limit ${ICON_UPLOAD_LIMIT / 1024 / 1024}MB)`);
+  });
+  req.on('aborted', () => fail(400, 'Upload aborted'));
+  req.on('error', () => fail(400, 'Upload failed'));
+  upload.on('error', (err) => {
+    if (!failed) console.error('POST /api/icons error:', err);
+    fail(500, 'Failed to store icon');
+  });
+  upload.on('finish', () => {
+    if (failed) return;
+    if (received === 0) return fail(400, 'Empty upload');
+    res.status(201).json({ id: upload.id.toString(), url: `/api/icons/${upload.id}`, size: received, contentType });
+  });
+
+  req.pipe(upload);
+});
+
+// Serve an icon. Content at an id never changes, so it can be cached forever.
+// GET /api/icons/:id
+router.get('/:id', async (req, res) => {
+  const id = parseIconId(req.params.id);
+  const store = getBucket();
+  if (!id || !store) return res.status(404).json({ error: 'Icon not found' });
+
+  try {
+    const [file] = await store.find({ _id: id }).limit(1).toArray();
+    if (!file) return res.status(404).json({ error: 'Icon not found' });
+
+    const etag = `"${file._id}"`;
+    res.set({
+      'Content-Type': file.metadata?.contentType || 'application/octet-stream',
+      'Cache-Control': 'public, max-age=31536000, immutable',
+      'ETag': etag,
+      'X-Content-Type-Options': 'nosniff',
+      // SVG icons must never run scripts
+      'Content-Security-Policy': "default-src 'none'; style-src 'unsafe-inline'"
+    });
+    if (req.headers['if-none-match']) {
+      const fresh = req.headers['if-none-match'] === etag;
+      recordCacheLookup('icon_revalidation', fresh);
+      if (fresh) return res.status(304).end();
+    }
+
+    res.set('Content-Length', String(file.length));
+    store.openDownloadStream(id)
+      .on('error', (err) => {
+        console.error(`GET /api/icons/${req.params.id} error:`, err);
+        res.destroy(err);
+      })
+      .pipe(res);
+  } catch (err) {
+    console.error(`GET /api/icons/${req.params.id} error:`, err);
+    res.status(500).json({ error: 'Failed to load icon' });
+  }
+});
+
+// Delete an icon (its uploader or an admin)
+// DELETE /api/icons/:id
+router.delete('/:id', requireAuth, async (req, res) => {
+  const id = parseIconId(req.params.id);
+  const store = getBucket();
+  if (!id || !store) return res.status(404).json({ error: 'Icon not found' });
+
+  try {
+    const [file] = await store.find({ _id: id }).limit(1).toArray();
+    if (!file) return res.status(404).json({ error: 'Icon not found' });
+    if (String(file.metadata?.userId) !== String(req.user.id) && req.user.role !== 'admin') {
+      return res.status(403).json({ error: 'Not allowed to delete this icon' });
+    }
+    await store.delete(id);
+    res.json({ success: true });
+  } catch (err) {
+    console.error(`DELETE /api/icons/${req.params.id} error:`, err);
+    res.status(500).json({ error: 'Failed to delete icon' });
+  }
+});
+
+module.exports = router;
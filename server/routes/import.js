@@ -0,0 +1,61 @@
+const express = require('express');
+const router = express.Router();
+const UserData = require('../models/UserData');
+const { requireAuth } = require('../middleware/auth');
+const { COLLECTIONS, invalidateUserData } = require('../lib/userData');
+const { IMPORT_PARSERS, detectFormat, planImport } = require('../lib/importFormats');
+
+// Bulk import a native config export into the caller's library
+// POST /api/import  { format?, data, app?, dryRun? }
+// - format: raycast | leaderkey | system | json (auto-detected when omitted)
+// - app: for system exports, the bundle id or app name the shortcuts belong to
+router.post('/', requireAuth, async (req, res) => {
+  const started = process.hrtime.bigint();
+  const { data, app, dryRun } = req.body || {};
+  if (!data || typeof data !== 'object') {
+    return res.status(400).json({ error: 'Request body must include the exported config as `data`' });
+  }
+
+  const format = req.body.format || detectFormat(data);
+  const parser = IMPORT_PARSERS[format];
+  if (!parser) {
+    return res.status(400).json({ error: `Unknown or undetectable format. Use one of: ${Object.keys(IMPORT_PARSERS).join(', ')}` });
+  }
+
+  try {
+    const entries = [...parser(data, app)];
+
+    // Dedupe needs ids/keys/names only - never load icon blobs
+    const projection = Object.fromEntries(COLLECTIONS.map(c => [`${c}.iconUrl`, 0]));
+    const library = (await UserData.findOne({ userId: req.user.id }, projection).lean()) || {};
+    const { added, skipped, invalid } = planImport(library, entries);
+
+    const counts = Object.fromEntries(Object.entries(added).filter(([, items]) => items.length).map(([c, items]) => [c, items.length]));
+    if (!dryRun && Object.keys(counts).length > 0) {
+      // One write for the whole batch
+      const push = Object.fromEntries(Object.keys(counts).map(c => [c, { $each: added[c] }]));
+      await UserData.updateOne(
+        { userId: req.user.id },
+        { $push: push, $set: { updatedAt: new Date() } },
+        { upsert: true }
+      );
+      invalidateUserData(req.user);
+    }
+
+    res.json({
+      format,
+      parsed: entries.length,
+      added: counts,
+      skipped,
+      invalid: invalid.length,
+      errors: invalid.slice(0, 20),
+      dryRun: Boolean(dryRun),
+      durationMs: Number(process.hrtime.bigint() - started) / 1e6
+    });
+  } catch (err) {
+    console.error('POST /api/import error:', err);
+    res.status(500).json({ error: 'Failed to import data' });
+  }
+});
+
+module.exports = router;
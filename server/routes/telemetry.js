@@ -0,0 +1,29 @@
+const express = require('express');
+const router = express.Router();
+const { requireAdmin } = require('../middleware/auth');
+const { WINDOW_SIZE, allowBatch, parseBatch, recordBatch, summarize } = require('../lib/telemetry');
+
+// Ingest a batch of client timings (navigator.sendBeacon from src/utils/perf.js)
+// POST /api/telemetry  { release, samples: [{ m: metric, v: milliseconds }] }
+// Beacons arrive as text/plain to stay CORS-simple; JSON bodies work too.
+router.post('/', (req, res) => {
+  if (!allowBatch(req.ip)) {
+    res.set('Retry-After', '60');
+    return res.status(429).json({ error: 'Too many telemetry batches' });
+  }
+  const { error, release, samples } = parseBatch(req.body);
+  if (error) {
+    return res.status(400).json({ error });
+  }
+  recordBatch(release, samples);
+  res.status(204).end();
+});
+
+// Rolling percentiles per release and metric (admin only), for this process
+// only when cluster.js runs several workers
+// GET /api/telemetry
+router.get('/', requireAdmin, (req, res) => {
+  res.json({ windowSize: WINDOW_SIZE, metrics: summarize() });
+});
+
+module.exports = router;
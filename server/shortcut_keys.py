@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Key string normalization shared by the Python data tools.
+
+Follows the same rules as parseKeyString in
+src/components/views/ShortcutCheckerView.jsx (and server/lib/shortcutKeys.js):
+lowercase, split on '+', map modifier aliases (command -> cmd, control -> ctrl,
+option/alt -> opt), sort the modifiers, and keep the last non-modifier part as
+the key. On top of that, macOS glyphs (⌘⇧⌥⌃) and Cocoa key equivalents
+("@$k") are accepted so native exports can be read.
+"""
+
+MODIFIER_ALIASES = {
+    'cmd': 'cmd',
+    'command': 'cmd',
+    'ctrl': 'ctrl',
+    'control': 'ctrl',
+    'opt': 'opt',
+    'option': 'opt',
+    'alt': 'opt',
+    'shift': 'shift',
+    'hyper': 'hyper',
+}
+
+MODIFIER_SYMBOLS = {'⌘': 'cmd', '⇧': 'shift', '⌥': 'opt', '⌃': 'ctrl', '◆': 'hyper'}
+
+# Cocoa NSUserKeyEquivalents prefixes (System Settings > Keyboard Shortcuts > App Shortcuts)
+COCOA_MODIFIERS = {'@': 'cmd', '$': 'shift', '~': 'opt', '^': 'ctrl'}
+
+# Display order and labels used throughout the app ("Ctrl+Option+Cmd+B")
+DISPLAY_ORDER = ['hyper', 'ctrl', 'opt', 'cmd', 'shift']
+DISPLAY_NAMES = {'hyper': 'Hyper', 'ctrl': 'Ctrl', 'opt': 'Option', 'cmd': 'Cmd', 'shift': 'Shift'}
+
+
+def parse_key_string(key_string):
+    """Parse "cmd+shift+a" into (sorted modifiers tuple, key)."""
+    if not key_string:
+        return (), ''
+    text = str(key_string)
+    # Expand glyphs into '+'-separated names: "⌘⇧A" -> "cmd+shift+A"
+    if any(ch in MODIFIER_SYMBOLS for ch in text):
+        text = '+'.join([MODIFIER_SYMBOLS[ch] for ch in text if ch in MODIFIER_SYMBOLS]
+                        + [''.join(ch for ch in text if ch not in MODIFIER_SYMBOLS)])
+
+    modifiers = []
+    key = ''
+    for part in text.lower().split('+'):
+        part = part.strip()
+        if not part:
+            continue
+        if part in MODIFIER_ALIASES:
+            modifiers.append(MODIFIER_ALIASES[part])
+        else:
+            key = part
+    return tuple(sorted(modifiers)), key
+
+
+def parse_cocoa_key_equivalent(equivalent):
+    """Parse a Cocoa key equivalent like "@$k" into (sorted modifiers tuple, key)."""
+    modifiers = []
+    rest = equivalent or ''
+    while len(rest) > 1 and rest[0] in COCOA_MODIFIERS:
+        modifiers.append(COCOA_MODIFIERS[rest[0]])
+        rest = rest[1:]
+    return tuple(sorted(modifiers)), rest.lower()
+
+
+def normalize_keys(key_string):
+    """Canonical form used for indexing and dedupe: "cmd+shift+a" ('' when empty)."""
+    modifiers, key = parse_key_string(key_string)
+    if not key:
+        return ''
+    return '+'.join(list(modifiers) + [key])
+
+
+def format_keys(modifiers, key):
+    """Display form stored in the library: ("cmd", "shift"), "a" -> "Cmd+Shift+A"."""
+    if not key:
+        return ''
+    ordered = sorted(set(modifiers), key=DISPLAY_ORDER.index)
+    label = key.upper() if len(key) == 1 else key[:1].upper() + key[1:]
+    return '+'.join([DISPLAY_NAMES[m] for m in ordered] + [label])
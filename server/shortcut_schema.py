@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Item validation for the Python data tools.
+
+Compiles schemas/shortcuts.json (the same file the server validates with,
+see server/lib/validation.js) into one checker per field. validate_item()
+returns the cleaned item (known fields only, legacy renames applied), the
+list of errors and the unknown fields that were dropped - with the same
+messages the API returns.
+"""
+
+import json
+import math
+from pathlib import Path
+
+SCHEMA_FILE = Path(__file__).parent / 'schemas' / 'shortcuts.json'
+
+TYPE_CHECKS = {
+    'string': lambda v: isinstance(v, str),
+    # bool is an int subclass - keep it out of number
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v),
+    'boolean': lambda v: isinstance(v, bool),
+}
+
+
+def _compile_field(name, spec, limits):
+    required = spec.endswith('!')
+    type_name = spec.rstrip('!')
+    is_array = type_name.endswith('[]')
+    base = type_name[:-2] if is_array else type_name
+    if base not in TYPE_CHECKS:
+        raise ValueError(f'Unknown type "{spec}" for field {name}')
+    check = TYPE_CHECKS[base]
+    max_length = limits.get(name, limits['string'])
+    max_items = limits['array']
+
+    def check_one(value):
+        return check(value) and (base != 'string' or len(value) <= max_length)
+
+    def check_field(value, errors):
+        if value is None or value == '' or (is_array and isinstance(value, list) and not value):
+            if required:
+                errors.append(f'{name} is required')
+            return
+        if is_array:
+            if not isinstance(value, list):
+                errors.append(f'{name} must be a list of {base} values')
+            elif len(value) > max_items:
+                errors.append(f'{name} has more than {max_items} entries')
+            elif not all(check_one(v) for v in value):
+                errors.append(f'{name} must be a list of {base} values')
+            return
+        if not check(value):
+            errors.append(f'{name} must be a {base}')
+        elif base == 'string' and len(value) > max_length:
+            errors.append(f'{name} is longer than {max_length} characters')
+
+    return check_field
+
+
+def _compile_collection(spec, limits):
+    fields = [(name, _compile_field(name, type_spec, limits)) for name, type_spec in spec['fields'].items()]
+    known = frozenset(spec['fields'])
+    renamed = list((spec.get('renamed') or {}).items())
+
+    def validate(item):
+        if not isinstance(item, dict):
+            return None, ['item must be an object'], []
+        value = {k: v for k, v in item.items() if k in known}
+        unknown = [k for k in item if k not in known]
+        for legacy, target in renamed:
+            if item.get(legacy) and not value.get(target):
+                value[target] = item[legacy]
+        errors = []
+        for name, check_field in fields:
+            check_field(value.get(name), errors)
+        return value, errors, unknown
+
+    return validate
+
+
+def load_validators(path=SCHEMA_FILE):
+    with open(path, 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    return {name: _compile_collection(spec, schema['limits']) for name, spec in schema['collections'].items()}
+
+
+VALIDATORS = load_validators()
+
+
+def validate_item(collection, item):
+    """Validate one item of `collection`. Returns (cleaned item, errors, unknown fields)."""
+    validator = VALIDATORS.get(collection)
+    if validator is None:
+        return None, [f'unknown collection "{collection}"'], []
+    return validator(item)
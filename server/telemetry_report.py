@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Summarize client performance telemetry per release and flag regressions.
+
+Reads the JSON-lines log the server appends to when TELEMETRY_LOG is set
+(one {"t", "release", "samples": [{"m", "v"}]} batch per line; pass the
+rotated TELEMETRY_LOG.1 too for a longer history), or the live
+rolling percentiles from GET /api/telemetry (admin token required).
+
+For every metric, the chosen percentile of the newest release is compared
+with the release before it (or --baseline). A metric regresses when it got
+slower by more than --threshold percent and --min-delta milliseconds.
+Exits with status 1 when anything regressed, so it can gate a deploy.
+
+Usage:
+  python telemetry_report.py telemetry.jsonl
+  python telemetry_report.py telemetry.jsonl --release 1.4.0 --baseline 1.3.2 -p p95
+  python telemetry_report.py --url https://example.com --token $ADMIN_TOKEN
+"""
+
+import argparse
+import json
+import math
+import sys
+import urllib.request
+
+PERCENTILES = {'p50': 0.5, 'p75': 0.75, 'p95': 0.95, 'p99': 0.99}
+
+
+def percentile(sorted_values, q):
+    # Same nearest-rank rule as server/lib/telemetry.js
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, math.floor(q * len(sorted_values)))]
+
+
+def summarize_log(paths):
+    """Stream JSON-lines logs into {release: {metric: stats}}, releases in first-seen order."""
+    values = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    batch = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                metrics = values.setdefault(batch.get('release') or 'unknown', {})
+                for sample in batch.get('samples') or []:
+                    metrics.setdefault(sample['m'], []).append(float(sample['v']))
+
+    summary = {}
+    for release, metrics in values.items():
+        summary[release] = {}
+        for metric, samples in metrics.items():
+            samples.sort()
+            stats = {name: percentile(samples, q) for name, q in PERCENTILES.items()}
+            stats['count'] = len(samples)
+            summary[release][metric] = stats
+    return summary
+
+
+def summarize_url(base_url, token):
+    """Fetch the server's rolling percentiles into {release: {metric: stats}}."""
+    request = urllib.request.Request(
+        f"{base_url.rstrip('/')}/api/telemetry",
+        headers={'Authorization': f'Bearer {token}'} if token else {},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        data = json.load(response)
+    summary = {}
+    for row in data['metrics']:
+        summary.setdefault(row['release'], {})[row['metric']] = {
+            **{name: row[name] for name in PERCENTILES},
+            'count': row['count'],
+        }
+    return summary
+
+
+def find_regressions(summary, release, baseline, stat, threshold, min_delta):
+    regressions = []
+    for metric, current in summary[release].items():
+        previous = summary[baseline].get(metric)
+        if not previous:
+            continue
+        delta = current[stat] - previous[stat]
+        if delta > min_delta and previous[stat] > 0 and delta / previous[stat] * 100 > threshold:
+            regressions.append((metric, previous[stat], current[stat], delta / previous[stat] * 100))
+    return sorted(regressions, key=lambda r: -r[3])
+
+
+def print_release(release, metrics):
+    print(f"\n{release}")
+    print(f"  {'metric':<28}{'count':>8}" + ''.join(f"{name:>10}" for name in PERCENTILES))
+    for metric in sorted(metrics):
+        stats = metrics[metric]
+        print(f"  {metric:<28}{stats['count']:>8,}" + ''.join(f"{stats[name]:>8.1f}ms" for name in PERCENTILES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize client performance telemetry per release')
+    parser.add_argument('logs', nargs='*', help='TELEMETRY_LOG JSON-lines files')
+    parser.add_argument('--url', help='Server base URL to read live rolling percentiles from')
+    parser.add_argument('--token', help='Admin JWT for --url')
+    parser.add_argument('--release', help='Release to check (default: newest)')
+    parser.add_argument('--baseline', help='Release to compare against (default: the one before --release)')
+    parser.add_argument('-p', '--percentile', choices=sorted(PERCENTILES), default='p75', help='Statistic to compare (default: p75)')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Regression threshold in percent (default: 10)')
+    parser.add_argument('--min-delta', type=float, default=5.0, help='Ignore changes smaller than this many ms (default: 5)')
+    args = parser.parse_args()
+
+    if not args.logs and not args.url:
+        parser.error('give telemetry log files or --url')
+    summary = summarize_url(args.url, args.token) if args.url else summarize_log(args.logs)
+    if not summary:
+        print('No telemetry samples found')
+        return
+
+    releases = list(summary)
+    for release in releases:
+        print_release(release, summary[release])
+
+    release = args.release or releases[-1]
+    if release not in summary:
+        sys.exit(f"Unknown release: {release}")
+    baseline = args.baseline or (releases[releases.index(release) - 1] if releases.index(release) > 0 else None)
+    if not baseline:
+        print(f"\nOnly one release ({release}) - nothing to compare")
+        return
+    if baseline not in summary:
+        sys.exit(f"Unknown baseline release: {baseline}")
+
+    regressions = find_regressions(summary, release, baseline, args.percentile, args.threshold, args.min_delta)
+    print(f"\n{release} vs {baseline} ({args.percentile}, >{args.threshold:g}% and >{args.min_delta:g}ms):")
+    if not regressions:
+        print('  ✓ No regressions')
+        return
+    for metric, before, after, pct in regressions:
+        print(f"  ✗ {metric:<28}{before:>8.1f}ms -> {after:.1f}ms (+{pct:.0f}%)")
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import argparse
 import json
 import os
 
@@ -12,6 +13,11 @@ def save_db(data):
         json.dump(data, f, indent=2)
 
 def main():
+    global db_path
+    parser = argparse.ArgumentParser(description='Add missing apps and link shortcuts to them in db.json')
+    parser.add_argument('db', nargs='?', default=db_path, help=f'db.json to update (default: {db_path})')
+    db_path = parser.parse_args().db
+
     data = load_db()
     
     # 1. Add missing apps
@@ -144,7 +150,7 @@ def main():
             app_name = sc['app']
             if app_name in context_to_id:
                 sc['appId'] = context_to_id[app_name]
-                print(f"Linked Leader {sc['key']} to {sc['appId']}")
+                print(f"Linked Leader {sc['id']} to {sc['appId']}")
 
     save_db(data)
     print("Database updated successfully.")
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Scan a shortcuts database and report every item that breaks the schema.
+
+Validates each item against schemas/shortcuts.json (the rules the API
+enforces) and reports invalid items, the most common errors and unknown or
+legacy fields (like raycastShortcuts.extension) that the API would strip.
+
+Work is spread over a process pool:
+- mongoexport JSON-lines dumps are split into byte ranges and each worker
+  parses and validates its own range
+- db.json files (one JSON object) are streamed by the parent and validated
+  in batches by the workers
+
+Usage:
+  python validate_db.py demo_db.json
+  python validate_db.py userdatas.jsonl --workers 8 --samples 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from db_stream import COLLECTIONS, document_matches, is_mongo_dump, iter_items
+from shortcut_schema import validate_item
+
+BATCH_SIZE = 20000
+# Byte ranges per worker for JSON-lines dumps (more ranges = better balancing)
+RANGES_PER_WORKER = 4
+
+
+class Report:
+    """Counts from validating a slice of the database; reports from workers are merged."""
+
+    def __init__(self, max_samples=20):
+        self.max_samples = max_samples
+        self.items = Counter()
+        self.invalid = Counter()
+        self.errors = Counter()
+        self.unknown = Counter()
+        self.samples = []
+
+    def check(self, collection, item, where=''):
+        self.items[collection] += 1
+        _, errors, unknown = validate_item(collection, item)
+        for field in unknown:
+            self.unknown[(collection, field)] += 1
+        if errors:
+            self.invalid[collection] += 1
+            for message in errors:
+                self.errors[(collection, message)] += 1
+            if len(self.samples) < self.max_samples:
+                item_id = item.get('id') if isinstance(item, dict) else None
+                self.samples.append({'collection': collection, 'id': item_id, 'where': where, 'errors': errors})
+
+    def check_document(self, doc, where=''):
+        for collection in COLLECTIONS:
+            items = doc.get(collection)
+            if not items and collection == 'appsLibrary':
+                items = doc.get('apps')
+            for item in items or []:
+                self.check(collection, item, where)
+
+    def merge(self, other):
+        self.items.update(other.items)
+        self.invalid.update(other.invalid)
+        self.errors.update(other.errors)
+        self.unknown.update(other.unknown)
+        self.samples.extend(other.samples[:max(0, self.max_samples - len(self.samples))])
+        return self
+
+    def to_dict(self):
+        return {
+            'items': dict(self.items),
+            'invalid': dict(self.invalid),
+            'errors': [{'collection': c, 'error': m, 'count': n} for (c, m), n in self.errors.most_common()],
+            'unknownFields': [{'collection': c, 'field': f, 'count': n} for (c, f), n in self.unknown.most_common()],
+            'samples': self.samples,
+        }
+
+
+# ============= Worker entry points (must be top-level to pickle) =============
+
+def _scan_batch(batch, max_samples):
+    report = Report(max_samples)
+    for collection, item in batch:
+        report.check(collection, item)
+    return report
+
+
+def _scan_range(path, start, end, user_id, data_type, max_samples):
+    """Validate the JSON lines that start within [start, end) of a mongoexport dump."""
+    report = Report(max_samples)
+    with open(path, 'rb') as f:
+        if start > 0:
+            # Skip the line that began before our range
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            doc = json.loads(line)
+            if document_matches(doc, user_id, data_type):
+                report.check_document(doc, where=str(doc.get('dataType') or ''))
+    return report
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _is_json_lines(path):
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                return line.lstrip().startswith(b'{')
+    return False
+
+
+def scan(path, workers=None, max_samples=20, user_id=None, data_type=None):
+    """Validate every item in `path` and return a merged Report."""
+    workers = workers or os.cpu_count() or 1
+    report = Report(max_samples)
+    mongo = is_mongo_dump(path)
+
+    if mongo and _is_json_lines(path):
+        size = os.path.getsize(path)
+        if workers == 1:
+            return report.merge(_scan_range(path, 0, size, user_id, data_type, max_samples))
+        step = max(1, -(-size // (workers * RANGES_PER_WORKER)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_scan_range, path, start, min(start + step, size), user_id, data_type, max_samples)
+                       for start in range(0, size, step)]
+            for future in futures:
+                report.merge(future.result())
+        return report
+
+    items = iter_items(path, user_id=user_id, data_type=data_type, mongo=mongo)
+    if workers == 1:
+        for collection, item in items:
+            report.check(collection, item)
+        return report
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Keep a bounded number of batches in flight so memory stays flat
+        pending = deque()
+        for batch in _batched(items, BATCH_SIZE):
+            pending.append(pool.submit(_scan_batch, batch, max_samples))
+            if len(pending) >= workers * 2:
+                report.merge(pending.popleft().result())
+        while pending:
+            report.merge(pending.popleft().result())
+    return report
+
+
+def print_report(report, elapsed):
+    total = sum(report.items.values())
+    invalid = sum(report.invalid.values())
+    print('=' * 50)
+    print(f"Scanned {total:,} items in {elapsed:.2f}s ({total / max(elapsed, 1e-9):,.0f} items/s)")
+    print('=' * 50)
+    for collection in COLLECTIONS:
+        if report.items[collection]:
+            print(f"  {collection:<18} {report.items[collection]:>10,} items  {report.invalid[collection]:>8,} invalid")
+
+    if report.errors:
+        print('\nMost common errors:')
+        for (collection, message), count in report.errors.most_common(15):
+            print(f"  {count:>8,}  {collection}: {message}")
+    if report.unknown:
+        print('\nUnknown / legacy fields (stripped by the API):')
+        for (collection, field), count in report.unknown.most_common(15):
+            print(f"  {count:>8,}  {collection}.{field}")
+    if report.samples:
+        print('\nSample invalid items:')
+        for sample in report.samples:
+            where = f" [{sample['where']}]" if sample['where'] else ''
+            print(f"  {sample['collection']} {sample['id']!r}{where}: {'; '.join(sample['errors'])}")
+
+    print(f"\n{'✓ All items valid' if invalid == 0 else f'✗ {invalid:,} invalid items'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate a shortcuts database against the API schema')
+    parser.add_argument('source', help='db.json / demo_db.json, or a mongoexport dump of userdatas')
+    parser.add_argument('-w', '--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--samples', type=int, default=20, help='Invalid items to show (default: 20)')
+    parser.add_argument('--user', dest='user_id', help='Mongo dump: only this userId')
+    parser.add_argument('--data-type', choices=['admin', 'demo', 'client'], help='Mongo dump: only this dataType')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    report = scan(args.source, args.workers, args.samples, args.user_id, args.data_type)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(report.to_dict(), indent=2, ensure_ascii=False))
+    else:
+        print_report(report, elapsed)
+    sys.exit(1 if report.invalid else 0)
+
+
+if __name__ == '__main__':
+    main()
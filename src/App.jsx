@@ -9,11 +9,8 @@
  * - Wiring up data store with views
  */
 
-import { useState, useEffect, useCallback, useMemo, memo } from 'react';
+import { useState, useEffect, useCallback, useMemo, useRef, memo, lazy, Suspense } from 'react';
 import { Layout } from './components/layout/Layout';
-import { ShortcutForm } from './components/ui/ShortcutForm';
-import { GroupForm } from './components/ui/GroupForm';
-import { AppForm } from './components/ui/AppForm';
 import { UndoRedoHint } from './components/ui/UndoRedoHint';
 import { useHistory } from './context/HistoryContext';
 import { useAuth } from './context/AuthContext';
@@ -21,14 +18,17 @@ import { useShortcutsStore } from './hooks/useShortcutsStore';
 import { useToast } from './components/ui/Toast';
 import { Plus } from 'lucide-react';
 
-// Page components (memoized containers)
-import { LeaderPage, RaycastPage, SystemPage, AppsPage, HistoryPage, ExportPage, ShortcutCheckerPage } from './pages';
+// Page components (memoized containers, one lazy chunk each)
+import { LeaderPage, RaycastPage, SystemPage, AppsPage, HistoryPage, ExportPage, ShortcutCheckerPage, preloadPage } from './pages';
 
 // Performance utilities
-import { markAppStart, trackRouteChange, measureFirstViewRender, DEBUG_PERF } from './utils/perf';
+import {
+  markAppStart, trackRouteChange, measureFirstViewRender, measureRouteComplete,
+  markSearch, measureSearch, PERF_ENABLED
+} from './utils/perf';
 
-// Mark app start for performance tracking
-if (DEBUG_PERF) {
+// Mark app start for performance tracking (dev logging or sampled telemetry)
+if (PERF_ENABLED) {
   markAppStart();
 }
 
@@ -55,22 +55,67 @@ const getInitialTab = () => {
   return 'leader';
 };
 
+// Fetch the landing page's chunk alongside the data instead of after it
+preloadPage(getInitialTab());
+
+// ============= Lazy Editors =============
+
+// Only editors open forms, so visitors never download them
+const EDITOR_LOADERS = {
+  ShortcutForm: () => import('./components/ui/ShortcutForm'),
+  GroupForm: () => import('./components/ui/GroupForm'),
+  AppForm: () => import('./components/ui/AppForm'),
+};
+
+const lazyEditor = (name) => lazy(() => EDITOR_LOADERS[name]().then(module => ({ default: module[name] })));
+
+const ShortcutForm = lazyEditor('ShortcutForm');
+const GroupForm = lazyEditor('GroupForm');
+const AppForm = lazyEditor('AppForm');
+
+const preloadEditors = () => {
+  Object.values(EDITOR_LOADERS).forEach(load => load().catch(() => {}));
+};
+
+// True from the first time `isOpen` is set, so modals keep their close animation
+const useOpenedOnce = (isOpen) => {
+  const [opened, setOpened] = useState(isOpen);
+  if (isOpen && !opened) setOpened(true);
+  return opened || isOpen;
+};
+
 // ============= Loading Skeleton =============
 
-const LoadingSkeleton = memo(function LoadingSkeleton() {
+const LoadingSkeleton = memo(function LoadingSkeleton({ label = 'Loading shortcuts...' }) {
   return (
     <div className="flex flex-col items-center justify-center h-full text-[var(--text-muted)] animate-pulse gap-4">
       <div className="w-12 h-12 rounded-xl bg-[var(--text-muted)]/20"></div>
-      <div>Loading shortcuts...</div>
+      <div>{label}</div>
     </div>
   );
 });
 
+// A tab mounts on first visit, then stays mounted (hidden) to keep its state
+function TabPanel({ active, visited, children }) {
+  if (!visited) return null;
+  return (
+    <div className={`h-full ${active ? 'block' : 'hidden'}`}>
+      <Suspense fallback={<LoadingSkeleton label="Loading view..." />}>
+        {children}
+      </Suspense>
+    </div>
+  );
+}
+
 // ============= Main App Component =============
 
 function App() {
   // ---- Route State ----
   const [activeTab, setActiveTab] = useState(getInitialTab);
+  const [visitedTabs, setVisitedTabs] = useState(() => new Set([getInitialTab()]));
+  if (!visitedTabs.has(activeTab)) {
+    setVisitedTabs(new Set(visitedTabs).add(activeTab));
+  }
   
   // ---- Auth & Permissions ----
   const { user, canEdit, loading: authLoading } = useAuth();
@@ -98,12 +143,19 @@ function App() {
   const [editingGroup, setEditingGroup] = useState(null);
   const [isAppFormOpen, setIsAppFormOpen] = useState(false);
   const [editingApp, setEditingApp] = useState(null);
+  const shortcutFormMounted = useOpenedOnce(isFormOpen);
+  const groupFormMounted = useOpenedOnce(isGroupFormOpen);
+  const appFormMounted = useOpenedOnce(isAppFormOpen);
   
   // ---- Highlight State ----
   const [highlightedShortcutId, setHighlightedShortcutId] = useState(null);
   
   // ---- Search State ----
   const [searchQuery, setSearchQuery] = useState('');
+  const handleSearch = useCallback((query) => {
+    markSearch();
+    setSearchQuery(query);
+  }, []);
 
   // ============= Effects =============
 
@@ -123,7 +175,7 @@ function App() {
     const handlePopState = (event) => {
       const newTab = event.state?.tab || ROUTE_MAP[window.location.pathname.toLowerCase()] || 'leader';
       setActiveTab(newTab);
-      if (DEBUG_PERF) trackRouteChange('popstate', newTab);
+      if (PERF_ENABLED) trackRouteChange('popstate', newTab);
     };
 
     window.addEventListener('popstate', handlePopState);
@@ -136,6 +188,17 @@ function App() {
     return () => window.removeEventListener('popstate', handlePopState);
   }, []);
 
+  // Editors will likely open a form; fetch the form chunks once the browser is idle
+  useEffect(() => {
+    if (!canEdit) return;
+    if ('requestIdleCallback' in window) {
+      const id = window.requestIdleCallback(preloadEditors);
+      return () => window.cancelIdleCallback(id);
+    }
+    const id = setTimeout(preloadEditors, 2000);
+    return () => clearTimeout(id);
+  }, [canEdit]);
+
   // Keyboard shortcuts for undo/redo
   useEffect(() => {
     const handleKeyDown = (e) => {
@@ -164,13 +227,23 @@ function App() {
     return () => window.removeEventListener('keydown', handleKeyDown);
   });  // No deps - uses stable functions from outer scope
 
-  // Performance: measure first view render
+  // Performance: first view render, then each tab switch
+  const firstViewMeasured = useRef(false);
   useEffect(() => {
-    if (!store.loading && DEBUG_PERF) {
+    if (store.loading || !PERF_ENABLED) return;
+    if (!firstViewMeasured.current) {
+      firstViewMeasured.current = true;
       measureFirstViewRender(activeTab);
+    } else {
+      measureRouteComplete(activeTab);
     }
   }, [store.loading, activeTab]);
 
+  // Performance: search latency (runs after the filtered views commit)
+  useEffect(() => {
+    measureSearch();
+  }, [searchQuery]);
+
   // ============= Handlers =============
 
   const toggleTheme = useCallback(() => {
@@ -178,7 +251,7 @@ function App() {
   }, []);
 
   const handleTabChange = useCallback((newTab) => {
-    if (DEBUG_PERF) trackRouteChange(activeTab, newTab);
+    if (PERF_ENABLED) trackRouteChange(activeTab, newTab);
     setActiveTab(newTab);
     const newPath = newTab === 'leader' ? '/' : `/${newTab}`;
     window.history.pushState({ tab: newTab }, '', newPath);
@@ -577,7 +650,8 @@ function App() {
     <Layout 
       activeTab={activeTab} 
       onTabChange={handleTabChange}
-      onSearch={setSearchQuery}
+      onTabIntent={preloadPage}
+      onSearch={handleSearch}
       searchQuery={searchQuery}
       user={user}
       theme={theme}
@@ -589,7 +663,7 @@ function App() {
         ) : (
           <>
             {/* Leader View */}
-            <div className={`h-full ${activeTab === 'leader' ? 'block' : 'hidden'}`}>
+            <TabPanel active={activeTab === 'leader'} visited={visitedTabs.has('leader')}>
               <LeaderPage 
                 shortcuts={store.leaderShortcuts}
                 groups={store.leaderGroups}
@@ -601,10 +675,10 @@ function App() {
                 onCreateShortcut={handleCreateWithContext}
                 highlightedShortcutId={highlightedShortcutId}
               />
-            </div>
+            </TabPanel>
             
             {/* Raycast View */}
-            <div className={`h-full ${activeTab === 'raycast' ? 'block' : 'hidden'}`}>
+            <TabPanel active={activeTab === 'raycast'} visited={visitedTabs.has('raycast')}>
               <RaycastPage 
                 shortcuts={store.raycastShortcuts}
                 apps={store.apps}
@@ -613,10 +687,10 @@ function App() {
                 onEditGroup={handleEditGroup}
                 highlightedShortcutId={highlightedShortcutId}
               />
-            </div>
+            </TabPanel>
             
             {/* System View */}
-            <div className={`h-full ${activeTab === 'system' ? 'block' : 'hidden'}`}>
+            <TabPanel active={activeTab === 'system'} visited={visitedTabs.has('system')}>
               <SystemPage 
                 shortcuts={store.systemShortcuts}
                 apps={store.apps}
@@ -625,39 +699,39 @@ function App() {
                 onEditGroup={handleEditGroup}
                 highlightedShortcutId={highlightedShortcutId}
               />
-            </div>
+            </TabPanel>
             
             {/* Apps View */}
-            <div className={`h-full ${activeTab === 'apps' ? 'block' : 'hidden'}`}>
+            <TabPanel active={activeTab === 'apps'} visited={visitedTabs.has('apps')}>
               <AppsPage 
                 apps={store.apps}
                 searchQuery={searchQuery}
                 onEdit={handleEditApp}
                 onCreate={handleCreateApp}
               />
-            </div>
+            </TabPanel>
 
             {/* Export View */}
-            <div className={`h-full ${activeTab === 'export' ? 'block' : 'hidden'}`}>
+            <TabPanel active={activeTab === 'export'} visited={visitedTabs.has('export')}>
               <ExportPage shortcuts={exportData} />
-            </div>
+            </TabPanel>
 
             {/* Shortcut Checker View */}
-            <div className={`h-full ${activeTab === 'checker' ? 'block' : 'hidden'}`}>
+            <TabPanel active={activeTab === 'checker'} visited={visitedTabs.has('checker')}>
               <ShortcutCheckerPage 
                 raycastShortcuts={store.raycastShortcuts}
                 systemShortcuts={store.systemShortcuts}
                 onNavigate={handleNavigateToShortcut}
               />
-            </div>
+            </TabPanel>
 
             {/* History View */}
-            <div className={`h-full ${activeTab === 'history' ? 'block' : 'hidden'}`}>
+            <TabPanel active={activeTab === 'history'} visited={visitedTabs.has('history')}>
               <HistoryPage 
                 onRevert={handleRevertToEntry}
                 onReapply={handleReapply}
               />
-            </div>
+            </TabPanel>
           </>
         )}
 
@@ -695,37 +769,45 @@ function App() {
           />
         )}
 
-        {/* Modals */}
-        <ShortcutForm 
-          isOpen={isFormOpen} 
-          onClose={() => setIsFormOpen(false)} 
-          shortcut={editingShortcut}
-          shortcutType={getShortcutType()} 
-          prefixSequence={prefixSequence}
-          onSave={handleSave}
-          onDelete={editingShortcut ? () => handleDelete(editingShortcut.id) : undefined}
-          onArchive={editingShortcut ? (archived) => handleArchive(editingShortcut.id, archived) : undefined}
-          apps={store.apps} 
-        />
-        
-        <GroupForm 
-          isOpen={isGroupFormOpen} 
-          onClose={() => setIsGroupFormOpen(false)} 
-          group={editingGroup}
-          onSave={handleSaveGroup}
-          onDelete={editingGroup ? () => handleDeleteGroup(editingGroup.id) : undefined}
-          parentGroups={store.leaderGroups} 
-        />
-
-        <AppForm 
-          isOpen={isAppFormOpen}
-          onClose={() => setIsAppFormOpen(false)}
-          app={editingApp}
-          shortcuts={exportData} 
-          onSave={handleSaveApp}
-          onDelete={editingApp ? () => handleDeleteApp(editingApp.id) : undefined}
-          onEditShortcut={handleEditShortcutFromApp}
-        />
+        {/* Modals (lazy chunks, mounted from their first open) */}
+        <Suspense fallback={null}>
+          {shortcutFormMounted && (
+            <ShortcutForm 
+              isOpen={isFormOpen} 
+              onClose={() => setIsFormOpen(false)} 
+              shortcut={editingShortcut}
+              shortcutType={getShortcutType()} 
+              prefixSequence={prefixSequence}
+              onSave={handleSave}
+              onDelete={editingShortcut ? () => handleDelete(editingShortcut.id) : undefined}
+              onArchive={editingShortcut ? (archived) => handleArchive(editingShortcut.id, archived) : undefined}
+              apps={store.apps} 
+            />
+          )}
+
+          {groupFormMounted && (
+            <GroupForm 
+              isOpen={isGroupFormOpen} 
+              onClose={() => setIsGroupFormOpen(false)} 
+              group={editingGroup}
+              onSave={handleSaveGroup}
+              onDelete={editingGroup ? () => handleDeleteGroup(editingGroup.id) : undefined}
+              parentGroups={store.leaderGroups} 
+            />
+          )}
+
+          {appFormMounted && (
+            <AppForm 
+              isOpen={isAppFormOpen}
+              onClose={() => setIsAppFormOpen(false)}
+              app={editingApp}
+              shortcuts={exportData} 
+              onSave={handleSaveApp}
+              onDelete={editingApp ? () => handleDeleteApp(editingApp.id) : undefined}
+              onEditShortcut={handleEditShortcutFromApp}
+            />
+          )}
+        </Suspense>
       </div>
     </Layout>
   );
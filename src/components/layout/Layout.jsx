@@ -19,7 +19,7 @@ const NAV_ITEMS = [
   { id: 'history', label: 'History', icon: History, headerLabel: 'Change History', editorsOnly: true },
 ];
 
-export const Layout = memo(function Layout({ children, activeTab, onTabChange, theme, toggleTheme, onSearch, searchQuery = '' }) {
+export const Layout = memo(function Layout({ children, activeTab, onTabChange, onTabIntent, theme, toggleTheme, onSearch, searchQuery = '' }) {
   const [sidebarOpen, setSidebarOpen] = useState(false);
   const [sidebarCollapsed, setSidebarCollapsed] = useState(true); // Desktop collapsed state
   const [sidebarHovered, setSidebarHovered] = useState(false);
@@ -166,6 +166,9 @@ export const Layout = memo(function Layout({ children, activeTab, onTabChange, t
                   onTabChange(item.id);
                   setSidebarOpen(false);
                 }}
+                // Prefetch the page's chunk while the pointer is on its way
+                onMouseEnter={onTabIntent ? () => onTabIntent(item.id) : undefined}
+                onFocus={onTabIntent ? () => onTabIntent(item.id) : undefined}
                 className={`
                   flex items-center gap-3 rounded-xl transition-all duration-200 relative group
                   ${isExpanded ? 'px-3 py-2.5' : 'px-0 py-2.5 justify-center'}
@@ -4,6 +4,7 @@ import { Modal, FormInput, FormSelect, Button, ConfirmModal } from './Modal';
 import { ImageDropZone } from './ImageDropZone';
 import { CategorySelector } from './CategorySelector';
 import { Trash2, Tag, X, LayoutGrid, Command, Keyboard, ExternalLink } from 'lucide-react';
+import { iconSrc } from '../../config/api';
 
 
 
@@ -161,7 +162,7 @@ export function AppForm({
                     <div className="w-20 h-20 rounded-2xl bg-[var(--input-bg)] flex items-center justify-center overflow-hidden border border-[var(--glass-border)]">
                         {formData.iconUrl ? (
                             <img 
-                                src={formData.iconUrl} 
+                                src={iconSrc(formData.iconUrl)} 
                                 alt={formData.name || 'App'} 
                                 className="w-full h-full object-contain"
                             />
@@ -1,12 +1,13 @@
 import { useState, useRef, useEffect } from 'react';
 import { Box, Search, ChevronDown, X, Plus, Check } from 'lucide-react';
+import { iconSrc } from '../../config/api';
 
 // App icon component with fallback
 const AppIcon = ({ iconUrl, name, size = 24 }) => {
     if (iconUrl) {
         return (
             <img 
-                src={iconUrl} 
+                src={iconSrc(iconUrl)} 
                 alt={name}
                 className="rounded object-contain"
                 style={{ width: size, height: size }}
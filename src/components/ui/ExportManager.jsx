@@ -1,13 +1,58 @@
 import { useState } from 'react';
 import { Download, Check, LayoutGrid, Zap, Monitor, FileText } from 'lucide-react';
 import { motion, AnimatePresence } from 'framer-motion';
+import { EXPORT_URL } from '../../config/api';
+import { useAuth } from '../../context/AuthContext';
+import { getOutboxKey, loadOutbox } from '../../utils/outbox';
+import { LOCAL_EXPORT_FORMATS, exportLocally } from '../../utils/exportFormats';
+
+// Collection backing each selectable type
+const COLLECTION_KEYS = {
+  leader: 'leaderShortcuts',
+  raycast: 'raycastShortcuts',
+  system: 'systemShortcuts',
+};
+
+// Formats supported by GET /api/export
+const FORMAT_OPTIONS = [
+  { id: 'markdown', label: 'Markdown', extension: 'md' },
+  { id: 'json', label: 'JSON', extension: 'json' },
+  { id: 'csv', label: 'CSV', extension: 'csv' },
+  // Native config formats pick their own collections on the server
+  { id: 'raycast', label: 'Raycast', extension: 'raycast.json', native: true },
+  { id: 'leaderkey', label: 'Leader Key', extension: 'leaderkey.json', native: true },
+];
+
+// Save a Blob as a file
+function download(blob, filename) {
+  const url = URL.createObjectURL(blob);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = filename;
+  document.body.appendChild(link);
+  link.click();
+  document.body.removeChild(link);
+  URL.revokeObjectURL(url);
+}
+
+// Fetch the export from the server; it streams, we only hold the finished Blob
+async function fetchExport(params, token) {
+  const headers = token ? { Authorization: `Bearer ${token}` } : {};
+  const response = await fetch(`${EXPORT_URL}?${params}`, { headers });
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}`);
+  }
+  return response.blob();
+}
 
 export function ExportManager({ shortcuts }) {
+  const { token, user } = useAuth();
   const [selectedTypes, setSelectedTypes] = useState({
     leader: true,
     raycast: true,
     system: true,
   });
+  const [format, setFormat] = useState('markdown');
   const [exportStatus, setExportStatus] = useState(null);
 
   const toggleType = (type) => {
@@ -17,68 +62,7 @@ export function ExportManager({ shortcuts }) {
     }));
   };
 
-  const formatLeaderShortcut = (shortcut) => {
-    const sequence = shortcut.sequence?.join(' → ') || '';
-    return `| ${sequence} | ${shortcut.action || ''} | ${shortcut.category || ''} | ${shortcut.notes || ''} |`;
-  };
-
-  const formatRaycastShortcut = (shortcut) => {
-    const keys = shortcut.keys || shortcut.aliasText || 'N/A';
-    return `| ${keys} | ${shortcut.commandName || ''} | ${shortcut.category || ''} | ${shortcut.notes || ''} |`;
-  };
-
-  const formatSystemShortcut = (shortcut) => {
-    const keys = shortcut.keys || 'N/A';
-    return `| ${keys} | ${shortcut.action || ''} | ${shortcut.category || ''} | ${shortcut.notes || ''} |`;
-  };
-
-  const generateMarkdown = () => {
-    let markdown = `# Keyboard Shortcuts Reference\n\n`;
-    markdown += `*Exported on ${new Date().toLocaleDateString('en-US', { 
-      year: 'numeric', 
-      month: 'long', 
-      day: 'numeric',
-      hour: '2-digit',
-      minute: '2-digit'
-    })}*\n\n`;
-
-    // Leader Key shortcuts
-    if (selectedTypes.leader && shortcuts.leaderShortcuts?.length > 0) {
-      markdown += `## Leader Key Shortcuts\n\n`;
-      markdown += `| Sequence | Action | Category | Notes |\n`;
-      markdown += `|----------|--------|----------|-------|\n`;
-      shortcuts.leaderShortcuts.forEach(shortcut => {
-        markdown += formatLeaderShortcut(shortcut) + '\n';
-      });
-      markdown += '\n';
-    }
-
-    // Raycast shortcuts
-    if (selectedTypes.raycast && shortcuts.raycastShortcuts?.length > 0) {
-      markdown += `## Raycast Shortcuts\n\n`;
-      markdown += `| Keys/Alias | Command | Extension | Notes |\n`;
-      markdown += `|------------|---------|-----------|-------|\n`;
-      shortcuts.raycastShortcuts.forEach(shortcut => {
-        markdown += formatRaycastShortcut(shortcut) + '\n';
-      });
-      markdown += '\n';
-    }
-
-    // System shortcuts
-    if (selectedTypes.system && shortcuts.systemShortcuts?.length > 0) {
-      markdown += `## System Shortcuts\n\n`;
-      markdown += `| Keys | Action | Category | Notes |\n`;
-      markdown += `|------|--------|----------|-------|\n`;
-      shortcuts.systemShortcuts.forEach(shortcut => {
-        markdown += formatSystemShortcut(shortcut) + '\n';
-      });
-      markdown += '\n';
-    }
-
-    return markdown;
-  };
-
-  const handleExport = () => {
+  const handleExport = async () => {
     const hasSelection = Object.values(selectedTypes).some(v => v);
     if (!hasSelection) {
       setExportStatus('error');
@@ -86,20 +70,47 @@ export function ExportManager({ shortcuts }) {
       return;
     }
 
-    const markdown = generateMarkdown();
-    
-    // Create blob and download
-    const blob = new Blob([markdown], { type: 'text/markdown' });
-    const url = URL.createObjectURL(blob);
-    const link = document.createElement('a');
-    link.href = url;
-    link.download = `shortcuts-${new Date().toISOString().split('T')[0]}.md`;
-    document.body.appendChild(link);
-    link.click();
-    document.body.removeChild(link);
-    URL.revokeObjectURL(url);
+    const collections = Object.keys(selectedTypes)
+      .filter(type => selectedTypes[type])
+      .map(type => COLLECTION_KEYS[type]);
+    const formatOption = FORMAT_OPTIONS.find(f => f.id === format);
+    const filename = `shortcuts-${new Date().toISOString().split('T')[0]}.${formatOption.extension}`;
+    const params = new URLSearchParams({ format });
+    if (!formatOption.native) {
+      params.set('collections', collections.join(','));
+    }
+
+    // Edits still queued in the outbox aren't on the server yet, so the
+    // server's export would leave them out: build it from what is on screen
+    const pendingChanges = user ? loadOutbox(getOutboxKey(user)).ops.length : 0;
+    const offline = typeof navigator !== 'undefined' && navigator.onLine === false;
+    const local = Boolean(LOCAL_EXPORT_FORMATS[format]);
 
-    setExportStatus('success');
+    setExportStatus('loading');
+    try {
+      if (local && (offline || pendingChanges > 0)) {
+        download(exportLocally(format, shortcuts, collections), filename);
+      } else if (offline || pendingChanges > 0) {
+        // Native formats are built by the server only
+        setExportStatus(offline ? 'offline' : 'pending');
+        setTimeout(() => setExportStatus(null), 3000);
+        return;
+      } else {
+        let blob;
+        try {
+          blob = await fetchExport(params, token);
+        } catch (err) {
+          if (!local) throw err;
+          console.warn('Server export failed, exporting locally:', err);
+          blob = exportLocally(format, shortcuts, collections);
+        }
+        download(blob, filename);
+      }
+      setExportStatus('success');
+    } catch (err) {
+      console.error('Export failed:', err);
+      setExportStatus('failed');
+    }
     setTimeout(() => setExportStatus(null), 2000);
   };
 
@@ -161,7 +172,22 @@ export function ExportManager({ shortcuts }) {
         
         {/* Header */}
         <div className="text-center mb-4 flex-none">
-          <p className="text-sm text-[var(--text-secondary)]">Select the collections you want to include in your markdown export</p>
+          <p className="text-sm text-[var(--text-secondary)]">Select the collections and format for your export</p>
+          <div className="flex flex-wrap justify-center gap-2 mt-3">
+            {FORMAT_OPTIONS.map(option => (
+              <button
+                key={option.id}
+                onClick={() => setFormat(option.id)}
+                className={`px-3 py-1.5 rounded-lg text-xs font-semibold border transition-colors ${
+                  format === option.id
+                    ? 'bg-emerald-500/15 border-emerald-500/40 text-emerald-500'
+                    : 'bg-[var(--glass-panel)] border-[var(--glass-border)] text-[var(--text-muted)] hover:text-[var(--text-primary)]'
+                }`}
+              >
+                {option.label}
+              </button>
+            ))}
+          </div>
         </div>
 
         {/* Dynamic Flex Selection */}
@@ -269,7 +295,7 @@ export function ExportManager({ shortcuts }) {
 
           <motion.button
             onClick={handleExport}
-            disabled={getTotalSelected() === 0}
+            disabled={getTotalSelected() === 0 || exportStatus === 'loading'}
             className={`
               flex flex-1 sm:flex-none items-center gap-2 lg:gap-3 py-3 lg:py-5 px-6 lg:px-10 rounded-xl lg:rounded-2xl font-bold text-sm lg:text-xl shadow-xl
               transition-all duration-200 justify-center
@@ -287,6 +313,14 @@ export function ExportManager({ shortcuts }) {
               </>
             ) : exportStatus === 'error' ? (
               <span className="whitespace-nowrap">Select Items</span>
+            ) : exportStatus === 'failed' ? (
+              <span className="whitespace-nowrap">Export Failed</span>
+            ) : exportStatus === 'offline' ? (
+              <span className="whitespace-nowrap">Needs Connection</span>
+            ) : exportStatus === 'pending' ? (
+              <span className="whitespace-nowrap">Changes Still Syncing</span>
+            ) : exportStatus === 'loading' ? (
+              <span className="whitespace-nowrap">Exporting…</span>
             ) : (
               <>
                 <Download className="w-4 h-4 lg:w-6 lg:h-6" />
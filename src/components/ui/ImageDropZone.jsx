@@ -1,12 +1,43 @@
-import { useState, useCallback } from 'react';
+import { useState, useCallback, lazy, Suspense } from 'react';
 import { Upload, X, Edit2 } from 'lucide-react';
-import { ImageEditor } from './ImageEditor';
+import { ICON_PATH, ICONS_URL, iconSrc } from '../../config/api';
+import { useAuth } from '../../context/AuthContext';
+
+// The canvas editor is rarely opened; load it on first use
+const ImageEditor = lazy(() => import('./ImageEditor').then(module => ({ default: module.ImageEditor })));
+
+// Source files up to this size open in the editor (decoded off the main thread)
+const MAX_SOURCE_BYTES = 10 * 1024 * 1024;
+
+// Upload the edited icon (a WebP/PNG Blob) as raw bytes; returns the
+// relative `/api/icons/:id` URL to store on the item
+async function uploadIcon(blob, token) {
+    const response = await fetch(ICONS_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': blob.type, Authorization: `Bearer ${token}` },
+        body: blob
+    });
+    if (!response.ok) throw new Error(`Icon upload failed (${response.status})`);
+    const { url } = await response.json();
+    return url;
+}
+
+// Inline copy for when there is nowhere to upload (guests) or the upload fails
+const blobToDataUrl = (blob) => new Promise((resolve, reject) => {
+    const reader = new FileReader();
+    reader.onload = () => resolve(reader.result);
+    reader.onerror = () => reject(reader.error);
+    reader.readAsDataURL(blob);
+});
 
 export function ImageDropZone({ value, onChange, label = "Icon" }) {
+    const { token } = useAuth();
     const [isDragging, setIsDragging] = useState(false);
     const [error, setError] = useState(null);
     const [editorOpen, setEditorOpen] = useState(false);
+    const [editorMounted, setEditorMounted] = useState(false);
     const [pendingImage, setPendingImage] = useState(null);
+    if (editorOpen && !editorMounted) setEditorMounted(true);
 
     const handleDragOver = useCallback((e) => {
         e.preventDefault();
@@ -29,24 +60,17 @@ export function ImageDropZone({ value, onChange, label = "Icon" }) {
             return;
         }
         
-        // Check file size (max 2MB before processing)
-        if (file.size > 2 * 1024 * 1024) {
-            setError('Image too large (max 2MB)');
+        // Check file size before decoding
+        if (file.size > MAX_SOURCE_BYTES) {
+            setError(`Image too large (max ${MAX_SOURCE_BYTES / 1024 / 1024}MB)`);
             return;
         }
         
         setError(null);
         
-        // Convert to base64 and open editor
-        const reader = new FileReader();
-        reader.onload = (e) => {
-            setPendingImage(e.target.result);
-            setEditorOpen(true);
-        };
-        reader.onerror = () => {
-            setError('Failed to read image');
-        };
-        reader.readAsDataURL(file);
+        // The editor decodes the file itself - no base64 copy
+        setPendingImage(file);
+        setEditorOpen(true);
     }, []);
 
     const handleDrop = useCallback((e) => {
@@ -86,9 +110,23 @@ export function ImageDropZone({ value, onChange, label = "Icon" }) {
         setError(null);
     };
 
-    const handleEditorSave = (dataUrl) => {
-        onChange(dataUrl);
+    const handleEditorSave = async (blob) => {
         setPendingImage(null);
+        if (token) {
+            try {
+                onChange(await uploadIcon(blob, token));
+                return;
+            } catch (err) {
+                // Keep the edit inline so it isn't lost
+                console.error(err);
+            }
+        }
+        try {
+            onChange(await blobToDataUrl(blob));
+        } catch (err) {
+            console.error(err);
+            setError('Failed to read edited image');
+        }
     };
 
     const handleEditorClose = () => {
@@ -99,14 +137,16 @@ export function ImageDropZone({ value, onChange, label = "Icon" }) {
     // Open editor with current image
     const handleEditCurrent = () => {
         if (value) {
-            setPendingImage(value);
+            setPendingImage(iconSrc(value));
             setEditorOpen(true);
         }
     };
 
-    // Check if value is a data URL (base64)
+    // Check if value is a data URL (base64) or an uploaded icon (older items
+    // store the absolute URL)
     const isDataUrl = value?.startsWith('data:');
-    const hasImage = value && (isDataUrl || value.startsWith('http'));
+    const isUploaded = value?.startsWith(ICON_PATH) || value?.startsWith(`${ICONS_URL}/`);
+    const hasImage = value && (isDataUrl || isUploaded || value.startsWith('http'));
 
     return (
         <>
@@ -136,7 +176,7 @@ export function ImageDropZone({ value, onChange, label = "Icon" }) {
                                 {/* Checkerboard background for transparency */}
                                 <div className="absolute inset-0 bg-[url('data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMTYiIGhlaWdodD0iMTYiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+PHJlY3Qgd2lkdGg9IjgiIGhlaWdodD0iOCIgZmlsbD0iIzQ0NCIvPjxyZWN0IHg9IjgiIHk9IjgiIHdpZHRoPSI4IiBoZWlnaHQ9IjgiIGZpbGw9IiM0NDQiLz48cmVjdCB4PSI4IiB3aWR0aD0iOCIgaGVpZ2h0PSI4IiBmaWxsPSIjMzMzIi8+PHJlY3QgeT0iOCIgd2lkdGg9IjgiIGhlaWdodD0iOCIgZmlsbD0iIzMzMyIvPjwvc3ZnPg==')]" />
                                 <img 
-                                    src={value} 
+                                    src={iconSrc(value)} 
                                     alt="Icon preview"
                                     className="relative w-full h-full object-contain p-2"
                                     onError={() => setError('Failed to load image')}
@@ -177,9 +217,9 @@ export function ImageDropZone({ value, onChange, label = "Icon" }) {
                     <div className="flex-1 flex flex-col gap-2">
                         <input
                             type="text"
-                            value={isDataUrl ? '(Edited image)' : value || ''}
+                            value={isDataUrl || isUploaded ? '(Edited image)' : value || ''}
                             onChange={handleUrlChange}
-                            disabled={isDataUrl}
+                            disabled={isDataUrl || isUploaded}
                             placeholder="Or paste URL..."
                             className="px-3 py-2 bg-[var(--input-bg)] border border-[var(--input-border)] rounded-lg text-[var(--text-primary)] placeholder-[var(--text-muted)] focus:outline-none focus:border-blue-500/50 focus:ring-1 focus:ring-blue-500/30 transition-all text-sm disabled:opacity-50"
                         />
@@ -193,13 +233,17 @@ export function ImageDropZone({ value, onChange, label = "Icon" }) {
                 </div>
             </div>
 
-            {/* Image Editor Modal */}
-            <ImageEditor
-                isOpen={editorOpen}
-                onClose={handleEditorClose}
-                imageSrc={pendingImage}
-                onSave={handleEditorSave}
-            />
+            {/* Image Editor Modal (mounted from its first open) */}
+            {editorMounted && (
+                <Suspense fallback={null}>
+                    <ImageEditor
+                        isOpen={editorOpen}
+                        onClose={handleEditorClose}
+                        imageSrc={pendingImage}
+                        onSave={handleEditorSave}
+                    />
+                </Suspense>
+            )}
         </>
     );
 }
@@ -1,21 +1,49 @@
-import { useState, useRef, useCallback, useEffect } from 'react';
+import { useState, useCallback, useEffect } from 'react';
 import { Modal, Button } from './Modal';
 import { useToast } from './Toast';
 import { ZoomIn, ZoomOut, Move, RotateCcw, Crop, Droplet, AlertCircle } from 'lucide-react';
-import { PROXY_IMAGE_URL } from '../../config/api';
+import { PROXY_IMAGE_URL, ICONS_URL } from '../../config/api';
+import { EDITOR_SIZE, iconLayout } from '../../utils/iconDraw';
+import { PIPELINE_MODE, getIconPipeline } from '../../utils/iconPipeline';
+import { createFrameMonitor, mark, measure } from '../../utils/perf';
 
+// Frame times while dragging or sliding, per pipeline (worker vs main thread)
+const frameMonitor = createFrameMonitor(`image_editor.frame.${PIPELINE_MODE}`);
+
+// The editor's source as a Blob. Dropped files pass straight through; data
+// URLs and our own icons are fetched; external URLs go through the proxy (CORS).
+async function loadSourceBlob(src) {
+    if (src instanceof Blob) return src;
+    if (src.startsWith('data:') || src.startsWith(ICONS_URL)) {
+        const response = await fetch(src);
+        if (!response.ok) throw new Error(`Image request failed (${response.status})`);
+        return response.blob();
+    }
+    const response = await fetch(`${PROXY_IMAGE_URL}?url=${encodeURIComponent(src)}`);
+    if (!response.ok) {
+        throw new Error('Proxy request failed');
+    }
+    const data = await response.json();
+    if (!data.dataUrl) {
+        throw new Error('No data URL in response');
+    }
+    return (await fetch(data.dataUrl)).blob();
+}
+
+// Decoding, preview drawing and encoding happen in the icon pipeline (a worker
+// where supported); this component only tracks the transform.
 export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
     const [scale, setScale] = useState(1);
     const [position, setPosition] = useState({ x: 0, y: 0 });
     const [opacity, setOpacity] = useState(1);
     const [isDragging, setIsDragging] = useState(false);
-    const canvasRef = useRef(null);
-    const renderCanvasRef = useRef(null);
     const toast = useToast();
-    const [imageObj, setImageObj] = useState(null);
+    // { width, height } of the decoded source
+    const [source, setSource] = useState(null);
+    // External image the proxy couldn't fetch: shown, but not readable/savable
+    const [viewOnlyUrl, setViewOnlyUrl] = useState(null);
+    const [saving, setSaving] = useState(false);
     const [dragStart, setDragStart] = useState({ x: 0, y: 0 });
-    
-    const CANVAS_SIZE = 200; // Output size for icons
 
     // Reset on new image
     useEffect(() => {
@@ -23,73 +51,59 @@ export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
             setScale(1);
             setPosition({ x: 0, y: 0 });
             setOpacity(1);
+            setSource(null);
+            setViewOnlyUrl(null);
         }
     }, [isOpen, imageSrc]);
 
-    // Load image object when src changes
+    // Decode the source in the pipeline; free it when the editor closes
     useEffect(() => {
-        if (imageSrc) {
-            // If it's already a data URL, load directly
-            if (imageSrc.startsWith('data:')) {
-                const img = new Image();
-                img.onload = () => setImageObj(img);
-                img.onerror = () => {
+        if (!isOpen || !imageSrc) return;
+        const pipeline = getIconPipeline();
+        let cancelled = false;
+
+        mark('image-editor-load');
+        loadSourceBlob(imageSrc)
+            .then(blob => pipeline.load(blob))
+            .then(size => {
+                if (cancelled) return;
+                measure('Image editor decode', 'image-editor-load', `image_editor.decode.${pipeline.mode}`);
+                setSource(size);
+            })
+            .catch(err => {
+                if (cancelled) return;
+                console.error('Image load failed:', err);
+                if (typeof imageSrc === 'string' && /^https?:/.test(imageSrc) && !imageSrc.startsWith(ICONS_URL)) {
+                    // Fallback: show it directly (fine for display, but it can't be saved)
+                    setViewOnlyUrl(imageSrc);
+                    toast.error('Remote image restrictions: You can view but NOT edit/save this image.', 5000);
+                } else {
                     toast.error('Failed to load image');
-                    setImageObj(null);
-                };
-                img.src = imageSrc;
-                return;
-            }
-            
-            // For external URLs, use the proxy to bypass CORS
-            const loadViaProxy = async () => {
-                try {
-                    const proxyUrl = `${PROXY_IMAGE_URL}?url=${encodeURIComponent(imageSrc)}`;
-                    const response = await fetch(proxyUrl);
-                    
-                    if (!response.ok) {
-                        throw new Error('Proxy request failed');
-                    }
-                    
-                    const data = await response.json();
-                    
-                    if (data.dataUrl) {
-                        const img = new Image();
-                        img.onload = () => setImageObj(img);
-                        img.onerror = () => {
-                            toast.error('Failed to load proxied image');
-                            setImageObj(null);
-                        };
-                        img.src = data.dataUrl;
-                    } else {
-                        throw new Error('No data URL in response');
-                    }
-                } catch (err) {
-                    console.error('Proxy load failed:', err);
-                    // Fallback: try loading directly (will work for display but not save)
-                    const img = new Image();
-                    img.onload = () => {
-                        setImageObj(img);
-                        toast.error('Remote image restrictions: You can view but NOT edit/save this image.', 5000);
-                    };
-                    img.onerror = () => {
-                        toast.error('Failed to load image');
-                        setImageObj(null);
-                    };
-                    img.src = imageSrc;
                 }
-            };
-            
-            loadViaProxy();
-        } else {
-            setImageObj(null);
-        }
-    }, [imageSrc, toast]);
+            });
+
+        return () => {
+            cancelled = true;
+            pipeline.release();
+        };
+    }, [isOpen, imageSrc, toast]);
+
+    // Hand the preview canvas to the pipeline (a new element on every open)
+    const previewRef = useCallback((canvas) => {
+        if (canvas) getIconPipeline().attachPreview(canvas);
+    }, []);
+
+    // Redraw the preview; the pipeline coalesces to one draw per frame
+    useEffect(() => {
+        if (!isOpen || !source || viewOnlyUrl) return;
+        getIconPipeline().render({ scale, x: position.x, y: position.y, opacity });
+    }, [isOpen, source, viewOnlyUrl, scale, position, opacity]);
 
     // Handle mouse down for dragging
     const handleMouseDown = (e) => {
         e.preventDefault();
         setIsDragging(true);
+        frameMonitor.start();
         setDragStart({
             x: e.clientX - position.x,
             y: e.clientY - position.y
@@ -110,6 +124,7 @@ export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
     // Handle mouse up
     const handleMouseUp = useCallback(() => {
         setIsDragging(false);
+        frameMonitor.stop();
     }, []);
 
     // Add/remove event listeners
@@ -133,104 +148,34 @@ export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
         setOpacity(1);
     };
 
-    // Process and save the image
-    const handleSave = () => {
-        const canvas = canvasRef.current;
-        if (!canvas) return;
-        const ctx = canvas.getContext('2d');
-        if (!ctx || !imageSrc) return;
+    // Render and encode the icon (WebP/PNG Blob at ICON_SIZE) off the main thread
+    const handleSave = async () => {
+        if (viewOnlyUrl) {
+            toast.error('CORS Error: Cannot save this remote image.');
+            return;
+        }
+        if (!source || saving) return;
 
+        const pipeline = getIconPipeline();
+        setSaving(true);
+        mark('image-editor-export');
         try {
-            // Let's use the hidden canvas to ensure we output exactly CANVAS_SIZE x CANVAS_SIZE
-            canvas.width = CANVAS_SIZE;
-            canvas.height = CANVAS_SIZE;
-            ctx.clearRect(0, 0, CANVAS_SIZE, CANVAS_SIZE);
-            
-            if (imageObj) {
-                 const containerSize = 200;
-                 const scaleRatio = CANVAS_SIZE / containerSize;
-                 
-                 // Helper to replicate the "contain" logic + user transform
-                 const imgAspect = imageObj.naturalWidth / imageObj.naturalHeight;
-                 let drawWidth, drawHeight;
-                 
-                 if (imgAspect > 1) {
-                    drawHeight = containerSize * scale;
-                    drawWidth = drawHeight * imgAspect;
-                 } else {
-                    drawWidth = containerSize * scale;
-                    drawHeight = drawWidth / imgAspect;
-                 }
-                 
-                 const offsetX = ((containerSize - drawWidth) / 2 + position.x) * scaleRatio;
-                 const offsetY = ((containerSize - drawHeight) / 2 + position.y) * scaleRatio;
-                 
-                 ctx.globalAlpha = opacity;
-                 ctx.drawImage(
-                    imageObj, 
-                    offsetX, 
-                    offsetY, 
-                    drawWidth * scaleRatio, 
-                    drawHeight * scaleRatio
-                 );
-            }
-            
-            const dataUrl = canvas.toDataURL('image/png');
-            onSave(dataUrl);
+            const blob = await pipeline.export({ scale, x: position.x, y: position.y, opacity });
+            measure('Image editor export', 'image-editor-export', `image_editor.export.${pipeline.mode}`);
+            onSave(blob);
             onClose();
         } catch (err) {
-             console.error('Failed to save image:', err);
-             if (err.name === 'SecurityError') {
-                toast.error('CORS Error: Cannot save this remote image.');
-             } else {
-                toast.error('Failed to save image.');
-             }
+            console.error('Failed to save image:', err);
+            toast.error('Failed to save image.');
+        } finally {
+            setSaving(false);
         }
     };
-    
-    // Draw preview canvas
-    useEffect(() => {
-        const canvas = renderCanvasRef.current;
-        if (!canvas || !isOpen) return;
-        
-        const ctx = canvas.getContext('2d');
-        if (!ctx) return;
-        
-        // Clear background
-        ctx.clearRect(0, 0, canvas.width, canvas.height);
-        
-        if (!imageObj) return;
-
-        const containerSize = 200;
-        canvas.width = containerSize;
-        canvas.height = containerSize;
-
-        const imgAspect = imageObj.naturalWidth / imageObj.naturalHeight;
-        let drawWidth, drawHeight;
-
-        if (imgAspect > 1) {
-            drawHeight = containerSize * scale;
-            drawWidth = drawHeight * imgAspect;
-        } else {
-            drawWidth = containerSize * scale;
-            drawHeight = drawWidth / imgAspect;
-        }
-
-        const offsetX = (containerSize - drawWidth) / 2 + position.x;
-        const offsetY = (containerSize - drawHeight) / 2 + position.y;
-
-        ctx.globalAlpha = opacity;
-        
-        // Draw image
-        try {
-            ctx.drawImage(imageObj, offsetX, offsetY, drawWidth, drawHeight);
-        } catch {
-            // CORS might fail here if not handled, but we handle in load
-        }
-        
-    }, [imageObj, scale, position, opacity, isOpen]);
-
 
+    // View-only images are placed with CSS using the same layout as the canvas
+    const viewOnlyLayout = viewOnlyUrl && source
+        ? iconLayout(source.width, source.height, { scale, x: position.x, y: position.y }, EDITOR_SIZE)
+        : null;
 
     return (
         <Modal isOpen={isOpen} onClose={onClose} title="Edit Icon">
@@ -242,11 +187,22 @@ export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
                         onMouseDown={handleMouseDown}
                     >
                         <canvas 
-                            ref={renderCanvasRef}
+                            ref={previewRef}
                             className="absolute inset-0 w-full h-full pointer-events-none"
-                            width={200}
-                            height={200}
+                            width={EDITOR_SIZE}
+                            height={EDITOR_SIZE}
                         />
+                        {viewOnlyUrl && (
+                            <img
+                                src={viewOnlyUrl}
+                                alt=""
+                                onLoad={(e) => setSource({ width: e.currentTarget.naturalWidth, height: e.currentTarget.naturalHeight })}
+                                className="absolute max-w-none pointer-events-none"
+                                style={viewOnlyLayout
+                                    ? { left: viewOnlyLayout.dx, top: viewOnlyLayout.dy, width: viewOnlyLayout.dw, height: viewOnlyLayout.dh, opacity }
+                                    : { visibility: 'hidden' }}
+                            />
+                        )}
                         
                         {/* Crop overlay guides */}
                         <div className="absolute inset-0 pointer-events-none">
@@ -259,9 +215,6 @@ export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
                     </div>
                 </div>
                 
-                {/* Hidden canvas for processing */}
-                <canvas ref={canvasRef} className="hidden" />
-
                 {/* Controls */}
                 <div className="flex flex-col gap-3">
                     {/* Zoom controls */}
@@ -277,6 +230,8 @@ export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
                             step="0.05"
                             value={scale}
                             onChange={(e) => setScale(parseFloat(e.target.value))}
+                            onPointerDown={frameMonitor.start}
+                            onPointerUp={frameMonitor.stop}
                             className="flex-1 h-2 bg-[var(--glass-border)] rounded-lg appearance-none cursor-pointer accent-blue-500"
                         />
                         <button onClick={zoomIn} className="p-2 rounded-lg bg-[var(--input-bg)] hover:bg-[var(--glass-bg-hover)] transition-colors text-[var(--text-primary)]">
@@ -296,6 +251,8 @@ export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
                             step="0.05"
                             value={opacity}
                             onChange={(e) => setOpacity(parseFloat(e.target.value))}
+                            onPointerDown={frameMonitor.start}
+                            onPointerUp={frameMonitor.stop}
                             className="flex-1 h-2 bg-[var(--glass-border)] rounded-lg appearance-none cursor-pointer accent-blue-500"
                         />
                         <span className="text-xs text-[var(--text-muted)] w-12 text-right">{Math.round(opacity * 100)}%</span>
@@ -315,8 +272,8 @@ export function ImageEditor({ isOpen, onClose, imageSrc, onSave }) {
                         Reset
                     </Button>
                     <div className="flex-1" />
-                    <Button variant="primary" onClick={handleSave}>
-                        Apply
+                    <Button variant="primary" onClick={handleSave} disabled={!source || saving}>
+                        {saving ? 'Saving...' : 'Apply'}
                     </Button>
                 </div>
             </div>
@@ -6,6 +6,7 @@ import { AppSelector } from './AppSelector';
 import { CategorySelector } from './CategorySelector';
 import { KeySequenceInput } from './KeySequenceInput';
 import { Trash2, Link, Unlink, Info, X, Archive, ArchiveRestore } from 'lucide-react';
+import { iconSrc } from '../../config/api';
 
 // Special Actions Help Tooltip Component
 const SpecialActionsHelp = () => {
@@ -320,7 +321,7 @@ export function ShortcutForm({
                     ) : (
                         <div className="flex items-center gap-3 p-3 bg-[var(--input-bg)] rounded-lg border border-[var(--input-border)]">
                             <div className="w-12 h-12 rounded-xl bg-[var(--input-bg)] flex items-center justify-center overflow-hidden">
-                                <img src={linkedApp.iconUrl} alt={linkedApp.name} className="w-10 h-10 object-contain" />
+                                <img src={iconSrc(linkedApp.iconUrl)} alt={linkedApp.name} className="w-10 h-10 object-contain" />
                             </div>
                             <div>
                                 <p className="text-[var(--text-primary)] text-sm">Using {linkedApp.name}'s icon</p>
@@ -416,7 +417,7 @@ export function ShortcutForm({
                     ) : (
                         <div className="flex items-center gap-3 p-3 bg-[var(--input-bg)] rounded-lg border border-[var(--input-border)]">
                             <div className="w-12 h-12 rounded-xl bg-[var(--input-bg)] flex items-center justify-center overflow-hidden">
-                                <img src={linkedApp.iconUrl} alt={linkedApp.name} className="w-10 h-10 object-contain" />
+                                <img src={iconSrc(linkedApp.iconUrl)} alt={linkedApp.name} className="w-10 h-10 object-contain" />
                             </div>
                             <div>
                                 <p className="text-[var(--text-primary)] text-sm">Using {linkedApp.name}'s icon</p>
@@ -516,7 +517,7 @@ export function ShortcutForm({
                     ) : (
                         <div className="flex items-center gap-3 p-3 bg-[var(--input-bg)] rounded-lg border border-[var(--input-border)]">
                             <div className="w-12 h-12 rounded-xl bg-[var(--input-bg)] flex items-center justify-center overflow-hidden">
-                                <img src={linkedApp.iconUrl} alt={linkedApp.name} className="w-10 h-10 object-contain" />
+                                <img src={iconSrc(linkedApp.iconUrl)} alt={linkedApp.name} className="w-10 h-10 object-contain" />
                             </div>
                             <div>
                                 <p className="text-[var(--text-primary)] text-sm">Using {linkedApp.name}'s icon</p>
@@ -3,13 +3,14 @@ import { GlassCard } from '../ui/GlassPanel';
 import { motion, AnimatePresence } from 'framer-motion';
 import { Box, Edit2, Link, Keyboard, Command, LayoutGrid } from 'lucide-react';
 import { getCategoryIcon } from '../../config/categories';
+import { iconSrc } from '../../config/api';
 
 // App Icon component with fallback
 const AppIcon = memo(function AppIcon({ iconUrl, name, size = 48 }) {
     if (iconUrl) {
         return (
             <img 
-                src={iconUrl} 
+                src={iconSrc(iconUrl)} 
                 alt={name}
                 className="rounded-xl object-contain"
                 style={{ width: size, height: size }}
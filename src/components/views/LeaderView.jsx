@@ -4,6 +4,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import { ChevronRight, Folder, File, ArrowLeft, ArrowRight, Box, Zap, Search, Edit2, Plus, Settings, Home } from 'lucide-react';
 import { clsx } from 'clsx';
 import { getAppIcon } from '../../config/icons';
+import { iconSrc } from '../../config/api';
 
 
 // App Icon component with fallback - supports custom iconUrl
@@ -14,7 +15,7 @@ const AppIcon = memo(function AppIcon({ name, customUrl, size = 24, className =
     if (iconUrl) {
         return (
             <img 
-                src={iconUrl} 
+                src={iconSrc(iconUrl)} 
                 alt={name}
                 className={`rounded object-contain ${className}`}
                 style={{ width: size, height: size }}
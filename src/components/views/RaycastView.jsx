@@ -3,6 +3,7 @@ import { motion, AnimatePresence } from 'framer-motion';
 import { useMemo, useState, memo } from 'react';
 import { Command, Box, Type, ArrowRight, Edit2, Settings, Archive, ChevronDown, ChevronRight } from 'lucide-react';
 import { getAppIcon } from '../../config/icons';
+import { iconSrc } from '../../config/api';
 
 
 // Diamond icon for Hyper key (like Raycast uses)
@@ -61,7 +62,7 @@ const AppIcon = memo(function AppIcon({ name, customUrl, size = 24, className =
     if (iconUrl) {
         return (
             <img 
-                src={iconUrl} 
+                src={iconSrc(iconUrl)} 
                 alt={name}
                 className={`rounded object-contain ${className}`}
                 style={{ width: size, height: size }}
@@ -5,6 +5,7 @@ import { Monitor, AppWindow, Keyboard, Settings, Camera, Folder, Zap, Volume2, L
 // Icon mapping for categories (Removed, now using centralized config)
 import { getCategoryIcon } from '../../config/categories';
 import { getAppIcon } from '../../config/icons';
+import { iconSrc } from '../../config/api';
 
 // Diamond icon for Hyper key
 const HyperIcon = memo(function HyperIcon({ size = 12, className = "" }) {
@@ -62,7 +63,7 @@ const AppIcon = memo(function AppIcon({ name, customUrl, size = 24 }) {
     if (iconUrl) {
         return (
             <img 
-                src={iconUrl} 
+                src={iconSrc(iconUrl)} 
                 alt={name}
                 className="rounded object-contain"
                 style={{ width: size, height: size }}
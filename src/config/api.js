@@ -7,5 +7,24 @@ const API_URL = import.meta.env.VITE_API_URL || (import.meta.env.PROD ? '' : 'ht
 export const API_BASE = `${API_URL}/api/shortcuts`;
 export const AUTH_API_BASE = `${API_URL}/api/auth`;
 export const PROXY_IMAGE_URL = `${API_URL}/api/proxy-image`;
+export const EXPORT_URL = `${API_URL}/api/export`;
+export const ICONS_URL = `${API_URL}/api/icons`;
+export const TELEMETRY_URL = `${API_URL}/api/telemetry`;
+
+// Uploaded icons are stored on items as `/api/icons/:id`, relative to the API
+// host, so they survive a change of VITE_API_URL. Resolve them when rendering.
+export const ICON_PATH = '/api/icons/';
+export const iconSrc = (url) => (url?.startsWith(ICON_PATH) ? `${API_URL}${url}` : url);
+
+// GET /api/shortcuts narrowed to some collections and/or fields, e.g.
+// shortcutsUrl({ collections: ['raycastShortcuts'], fields: ['keys', 'appId'] })
+// (`id` is always returned; fields: ['-iconUrl'] returns everything but icons)
+export const shortcutsUrl = ({ collections, fields } = {}) => {
+  const params = new URLSearchParams();
+  if (collections?.length) params.set('collections', collections.join(','));
+  if (fields?.length) params.set('fields', fields.join(','));
+  const query = params.toString();
+  return query ? `${API_BASE}?${query}` : API_BASE;
+};
 
 export default API_URL;
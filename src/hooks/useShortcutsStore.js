@@ -4,16 +4,33 @@
  * Responsibilities:
  * - All shortcut/group/app state management
  * - Fetching from /api/shortcuts
- * - CRUD operations with optimistic updates
- * - Client-side caching with localStorage/IndexedDB
+ * - CRUD operations: applied on screen at once, queued in the mutation
+ *   outbox (utils/outbox.js) and flushed as one batch when online
+ * - Client-side caching with localStorage
  * - Integration with HistoryContext for logging changes
  */
 
 import { useState, useCallback, useEffect, useRef } from 'react';
-import { API_BASE } from '../config/api';
+import { API_BASE, shortcutsUrl } from '../config/api';
 import { useAuth } from '../context/AuthContext';
 import { useHistory } from '../context/HistoryContext';
 import { useToast } from '../components/ui/Toast';
+import { measureFirstData } from '../utils/perf';
+import {
+  applyBatchResult,
+  applyOperations,
+  completeBatch,
+  createTempId,
+  dropOperations,
+  getOutboxKey,
+  loadOutbox,
+  nextBatch,
+  queueOperation,
+  resolveId,
+  splitBatch,
+  updateOutbox,
+  withOutboxLock,
+} from '../utils/outbox';
 
 // Cache configuration
 const CACHE_KEY_PREFIX = 'shortcuts_cache_';
@@ -25,16 +42,13 @@ const getCacheKey = (user) => {
   return `${CACHE_KEY_PREFIX}${user.id}_${user.role}_v${CACHE_VERSION}`;
 };
 
-// Load from localStorage cache
+// Load from localStorage cache. Any age is shown (it is revalidated right
+// away), so the app opens offline with the last data it saw.
 const loadFromCache = (cacheKey) => {
   try {
     const cached = localStorage.getItem(cacheKey);
     if (cached) {
-      const { data, timestamp } = JSON.parse(cached);
-      // Cache is valid for 24 hours
-      if (Date.now() - timestamp < 24 * 60 * 60 * 1000) {
-        return data;
-      }
+      return JSON.parse(cached).data;
     }
   } catch (e) {
     console.warn('Failed to load from cache:', e);
@@ -75,6 +89,16 @@ const clearCache = (cacheKey) => {
   }
 };
 
+// Collections the app keeps in state; asking for them by name also skips the
+// server's duplicate `appsLibrary` copy of the apps
+const STORE_COLLECTIONS = ['leaderShortcuts', 'raycastShortcuts', 'systemShortcuts', 'leaderGroups', 'apps'];
+
+// Outbox: wait this long after an edit so a burst goes out as one batch
+const OUTBOX_FLUSH_DELAY_MS = 250;
+// Retry backoff while offline or the server is unreachable
+const OUTBOX_RETRY_MIN_MS = 2 * 1000;
+const OUTBOX_RETRY_MAX_MS = 60 * 1000;
+
 // Default empty state
 const DEFAULT_DATA = {
   leaderShortcuts: [],
@@ -101,6 +125,16 @@ export function useShortcutsStore() {
   const hasFetched = useRef(false);
   const currentCacheKey = useRef(null);
   
+  // Last data confirmed by the server; `data` is this plus queued edits
+  const baseRef = useRef(DEFAULT_DATA);
+  // Outbox of the signed-in user (null for guests)
+  const outboxKey = useRef(null);
+  const flushTimer = useRef(null);
+  const flushing = useRef(false);
+  const retryDelay = useRef(0);
+  // Latest flushOutbox, for timers and event listeners
+  const flushRef = useRef(() => {});
+  
   // Get auth headers for API calls
   const getAuthHeaders = useCallback(() => {
     const headers = { 'Content-Type': 'application/json' };
@@ -118,7 +152,7 @@ export function useShortcutsStore() {
     }
     
     try {
-      const response = await fetch(API_BASE, { headers });
+      const response = await fetch(shortcutsUrl({ collections: STORE_COLLECTIONS }), { headers });
       if (!response.ok) {
         throw new Error(`HTTP ${response.status}`);
       }
@@ -140,24 +174,42 @@ export function useShortcutsStore() {
     }
   }, [token]);
   
+  // What the user sees: the last confirmed data with queued edits on top
+  const publish = useCallback(() => {
+    const ops = outboxKey.current ? loadOutbox(outboxKey.current).ops : [];
+    setData(applyOperations(baseRef.current, ops));
+  }, []);
+  
+  // New confirmed data from the server
+  const setBaseData = useCallback((freshData) => {
+    baseRef.current = freshData;
+    if (currentCacheKey.current) {
+      saveToCache(currentCacheKey.current, freshData);
+    }
+    publish();
+  }, [publish]);
+  
   // Initialize data - first from cache, then fetch from server
   const initializeData = useCallback(async () => {
     const cacheKey = getCacheKey(user);
     currentCacheKey.current = cacheKey;
+    // Only signed-in users can edit, so only they have an outbox
+    outboxKey.current = user ? getOutboxKey(user) : null;
     
     // Try to load from cache first for instant render
     const cachedData = loadFromCache(cacheKey);
     if (cachedData) {
-      setData(cachedData);
+      baseRef.current = cachedData;
+      publish();
       setLoading(false);
+      measureFirstData('cache');
       
       // Then fetch fresh data in background
       fetchFromServer()
         .then(freshData => {
           // Only update if data has changed
           if (JSON.stringify(freshData) !== JSON.stringify(cachedData)) {
-            setData(freshData);
-            saveToCache(cacheKey, freshData);
+            setBaseData(freshData);
           }
         })
         .catch(err => {
@@ -167,10 +219,9 @@ export function useShortcutsStore() {
     } else {
       // No cache, fetch immediately
       try {
-        const freshData = await fetchFromServer();
-        setData(freshData);
-        saveToCache(cacheKey, freshData);
+        setBaseData(await fetchFromServer());
         setLoading(false);
+        measureFirstData('network');
       } catch (err) {
         setError(err.message);
         setLoading(false);
@@ -178,7 +229,7 @@ export function useShortcutsStore() {
     }
     
     hasFetched.current = true;
-  }, [user, fetchFromServer]);
+  }, [user, fetchFromServer, publish, setBaseData]);
   
   // Effect to initialize data when auth state changes
   useEffect(() => {
@@ -191,27 +242,166 @@ export function useShortcutsStore() {
   const refresh = useCallback(async () => {
     try {
       const freshData = await fetchFromServer();
-      setData(freshData);
-      if (currentCacheKey.current) {
-        saveToCache(currentCacheKey.current, freshData);
-      }
+      setBaseData(freshData);
       return freshData;
     } catch (err) {
       setError(err.message);
       throw err;
     }
-  }, [fetchFromServer]);
+  }, [fetchFromServer, setBaseData]);
   
-  // Clear data and cache (for logout)
+  // Clear data and cache (for logout). Queued edits stay in the outbox and
+  // are sent when the same user signs in again.
   const clearData = useCallback(() => {
     if (currentCacheKey.current) {
       clearCache(currentCacheKey.current);
     }
+    baseRef.current = DEFAULT_DATA;
     setData(DEFAULT_DATA);
     hasFetched.current = false;
   }, []);
   
-  // ============= CRUD Operations with Optimistic Updates =============
+  // ============= Mutation Outbox =============
+  
+  const scheduleFlush = useCallback((delay) => {
+    clearTimeout(flushTimer.current);
+    flushTimer.current = setTimeout(() => flushRef.current(), delay);
+  }, []);
+  
+  // Send the next batch; resolves true while more is queued
+  const sendBatch = useCallback(async (key) => {
+    const outbox = updateOutbox(key, current => (current.ops.length > 0 ? nextBatch(current) : current));
+    if (!outbox.inflight) return false;
+    
+    const { batchId, size } = outbox.inflight;
+    const operations = outbox.ops.slice(0, size);
+    const response = await fetch(`${API_BASE}/batch`, {
+      method: 'POST',
+      headers: getAuthHeaders(),
+      body: JSON.stringify({ batchId, operations })
+    });
+    
+    if (response.status === 400) {
+      // Rejected by validation: drop the offending edits (reverting them on
+      // screen) and send the rest. Without details, drop the whole batch
+      // rather than block the queue behind it.
+      const { error, details = [] } = await response.json().catch(() => ({}));
+      const rejected = new Set(details.length > 0 ? details.map(d => d.index) : operations.map((_, index) => index));
+      updateOutbox(key, current => dropOperations(current, rejected));
+      const reason = details[0]?.details?.[0] || details[0]?.error || error || 'invalid change';
+      toast.error(`${rejected.size} change${rejected.size === 1 ? '' : 's'} could not be saved: ${reason}`, 5000);
+      return true;
+    }
+    if (response.status === 413) {
+      // Too large for one request: halve it, or give up on a single edit
+      // that is too large on its own
+      if (size > 1) {
+        updateOutbox(key, splitBatch);
+      } else {
+        updateOutbox(key, current => dropOperations(current, new Set([0])));
+        toast.error('1 change could not be saved: it is too large', 5000);
+      }
+      return true;
+    }
+    if (!response.ok) {
+      const err = new Error(`HTTP ${response.status}`);
+      err.status = response.status;
+      throw err;
+    }
+    
+    const result = await response.json();
+    // The user may have switched accounts while this was in flight
+    if (outboxKey.current === key) {
+      baseRef.current = applyBatchResult(baseRef.current, operations, result);
+      saveToCache(currentCacheKey.current, baseRef.current);
+    }
+    return updateOutbox(key, current => completeBatch(current, result)).ops.length > 0;
+  }, [getAuthHeaders, toast]);
+  
+  // Flush the outbox in order; on failure keep it and retry with backoff
+  const flushOutbox = useCallback(async () => {
+    const key = outboxKey.current;
+    if (!key || !token || flushing.current) return;
+    clearTimeout(flushTimer.current);
+    
+    const pending = loadOutbox(key).ops.length;
+    if (pending === 0) return;
+    if (typeof navigator !== 'undefined' && navigator.onLine === false) {
+      // The 'online' listener flushes when the connection returns
+      if (!retryDelay.current) {
+        toast.info(`Offline - ${pending} change${pending === 1 ? '' : 's'} will sync when you reconnect`, 4000);
+        retryDelay.current = OUTBOX_RETRY_MIN_MS;
+      }
+      return;
+    }
+    
+    flushing.current = true;
+    try {
+      while (await withOutboxLock(key, () => sendBatch(key))) {
+        // keep sending until the queue is empty
+      }
+      if (retryDelay.current) {
+        toast.success('Offline changes synced');
+        retryDelay.current = 0;
+      }
+    } catch (err) {
+      if (err.status === 401 || err.status === 403) {
+        // Retrying cannot help: keep the queue until the user signs in again
+        // (the startup flush sends it then)
+        const left = loadOutbox(key).ops.length;
+        toast.error(`Your session has expired - sign in again to save ${left} change${left === 1 ? '' : 's'}`, 8000);
+        retryDelay.current = 0;
+        return;
+      }
+      console.warn('Outbox flush failed, will retry:', err);
+      if (!retryDelay.current) {
+        toast.info('Connection problem - your changes are saved and will sync automatically', 4000);
+      }
+      retryDelay.current = Math.min(Math.max(retryDelay.current * 2, OUTBOX_RETRY_MIN_MS), OUTBOX_RETRY_MAX_MS);
+      scheduleFlush(retryDelay.current);
+    } finally {
+      flushing.current = false;
+      publish();
+    }
+  }, [token, sendBatch, scheduleFlush, publish, toast]);
+  
+  useEffect(() => {
+    flushRef.current = flushOutbox;
+  }, [flushOutbox]);
+  
+  // Send anything queued in an earlier session (or before signing in again)
+  useEffect(() => {
+    if (!authLoading) flushOutbox();
+  }, [authLoading, flushOutbox]);
+  
+  // Flush when the connection returns; follow queue changes made in other tabs
+  useEffect(() => {
+    const handleOnline = () => flushRef.current();
+    const handleStorage = (event) => {
+      if (event.key && event.key === outboxKey.current) publish();
+    };
+    window.addEventListener('online', handleOnline);
+    window.addEventListener('storage', handleStorage);
+    return () => {
+      window.removeEventListener('online', handleOnline);
+      window.removeEventListener('storage', handleStorage);
+      clearTimeout(flushTimer.current);
+    };
+  }, [publish]);
+  
+  // Queue an edit: it shows immediately and is sent with the next batch
+  const enqueue = useCallback((operation) => {
+    const key = outboxKey.current;
+    if (!key) {
+      toast.error('Login required');
+      throw new Error('Login required');
+    }
+    updateOutbox(key, outbox => queueOperation(outbox, operation));
+    publish();
+    scheduleFlush(OUTBOX_FLUSH_DELAY_MS);
+  }, [publish, scheduleFlush, toast]);
+  
+  // ============= CRUD Operations =============
   
   // Helper to get shortcut type key
   const getShortcutType = useCallback((activeTab) => {
@@ -235,619 +425,223 @@ export function useShortcutsStore() {
     }
   };
   
+  // Shared by every entity type: queue the edit and return the item as shown
+  const createItem = useCallback((type, itemData) => {
+    const newItem = { ...itemData, id: createTempId() };
+    enqueue({ op: 'create', type, id: newItem.id, item: itemData });
+    return newItem;
+  }, [enqueue]);
+  
+  // The item as shown; a form opened before its create was sent may still
+  // hold the temp id
+  const findItem = useCallback((type, id) => {
+    const itemId = outboxKey.current ? resolveId(loadOutbox(outboxKey.current), id) : id;
+    return data[type]?.find(item => item.id === itemId);
+  }, [data]);
+  
+  const updateItem = useCallback((type, id, changes, notFound) => {
+    const previousData = findItem(type, id);
+    if (!previousData) {
+      throw new Error(notFound);
+    }
+    enqueue({ op: 'update', type, id: previousData.id, changes });
+    return { previousData, updatedItem: { ...previousData, ...changes, id: previousData.id } };
+  }, [findItem, enqueue]);
+  
+  const deleteItem = useCallback((type, id, notFound) => {
+    const itemToDelete = findItem(type, id);
+    if (!itemToDelete) {
+      throw new Error(notFound);
+    }
+    enqueue({ op: 'delete', type, id: itemToDelete.id });
+    return itemToDelete;
+  }, [findItem, enqueue]);
+  
   // Create shortcut
   const createShortcut = useCallback(async (shortcutData, type) => {
-    // Optimistic update
-    const tempId = `temp_${Date.now()}`;
-    const optimisticItem = { ...shortcutData, id: tempId };
+    const newItem = createItem(type, shortcutData);
     
-    setData(prev => ({
-      ...prev,
-      [type]: [...prev[type], optimisticItem]
-    }));
+    history.addChange({
+      action: 'create',
+      entityType: type,
+      entityId: newItem.id,
+      entityName: shortcutData.name || shortcutData.action,
+      before: null,
+      after: newItem
+    }, getTabFromEntityType(type));
     
-    try {
-      const response = await fetch(`${API_BASE}/${type}`, {
-        method: 'POST',
-        headers: getAuthHeaders(),
-        body: JSON.stringify(shortcutData)
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to create');
-      }
-      
-      const newItem = await response.json();
-      
-      // Replace temp item with real item
-      setData(prev => ({
-        ...prev,
-        [type]: prev[type].map(item => item.id === tempId ? newItem : item)
-      }));
-      
-      // Update cache
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      // Log to history
-      history.addChange({
-        action: 'create',
-        entityType: type,
-        entityId: newItem.id,
-        entityName: shortcutData.name || shortcutData.action,
-        before: null,
-        after: newItem
-      }, getTabFromEntityType(type));
-      
-      toast.success('Shortcut created successfully!');
-      return newItem;
-    } catch (err) {
-      // Rollback on failure
-      setData(prev => ({
-        ...prev,
-        [type]: prev[type].filter(item => item.id !== tempId)
-      }));
-      toast.error(err.message || 'Failed to create shortcut');
-      throw err;
-    }
-  }, [getAuthHeaders, history, toast]);
+    toast.success('Shortcut created successfully!');
+    return newItem;
+  }, [createItem, history, toast]);
   
   // Update shortcut
   const updateShortcut = useCallback(async (id, shortcutData, type) => {
-    // Store previous state for rollback
-    const previousData = data[type]?.find(item => item.id === id);
-    if (!previousData) {
-      throw new Error('Item not found');
-    }
+    const { previousData, updatedItem } = updateItem(type, id, shortcutData, 'Item not found');
     
-    // Optimistic update
-    const updatedItem = { ...previousData, ...shortcutData };
-    setData(prev => ({
-      ...prev,
-      [type]: prev[type].map(item => item.id === id ? updatedItem : item)
-    }));
+    history.addChange({
+      action: 'update',
+      entityType: type,
+      entityId: id,
+      entityName: shortcutData.name || shortcutData.action || previousData.name,
+      before: previousData,
+      after: updatedItem
+    }, getTabFromEntityType(type));
     
-    try {
-      const response = await fetch(`${API_BASE}/${type}/${id}`, {
-        method: 'PUT',
-        headers: getAuthHeaders(),
-        body: JSON.stringify(shortcutData)
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to update');
-      }
-      
-      const serverItem = await response.json();
-      
-      // Update with server response
-      setData(prev => ({
-        ...prev,
-        [type]: prev[type].map(item => item.id === id ? serverItem : item)
-      }));
-      
-      // Update cache
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      // Log to history
-      history.addChange({
-        action: 'update',
-        entityType: type,
-        entityId: id,
-        entityName: shortcutData.name || shortcutData.action || previousData.name,
-        before: previousData,
-        after: serverItem
-      }, getTabFromEntityType(type));
-      
-      toast.success('Shortcut updated successfully!');
-      return serverItem;
-    } catch (err) {
-      // Rollback on failure
-      setData(prev => ({
-        ...prev,
-        [type]: prev[type].map(item => item.id === id ? previousData : item)
-      }));
-      toast.error(err.message || 'Failed to update shortcut');
-      throw err;
-    }
-  }, [data, getAuthHeaders, history, toast]);
+    toast.success('Shortcut updated successfully!');
+    return updatedItem;
+  }, [updateItem, history, toast]);
   
   // Archive/Unarchive shortcut (toggle)
   const archiveShortcut = useCallback(async (id, type, archived = true) => {
-    // Store previous state for rollback
-    const previousData = data[type]?.find(item => item.id === id);
-    if (!previousData) {
-      throw new Error('Item not found');
-    }
+    const { previousData, updatedItem } = updateItem(type, id, { archived }, 'Item not found');
     
-    // Optimistic update
-    const updatedItem = { ...previousData, archived };
-    setData(prev => ({
-      ...prev,
-      [type]: prev[type].map(item => item.id === id ? updatedItem : item)
-    }));
+    // Log to history with specific archive/unarchive action
+    history.addChange({
+      action: archived ? 'archive' : 'unarchive',
+      entityType: type,
+      entityId: id,
+      entityName: previousData.name || previousData.commandName || previousData.action,
+      before: previousData,
+      after: updatedItem
+    }, getTabFromEntityType(type));
     
-    try {
-      const response = await fetch(`${API_BASE}/${type}/${id}`, {
-        method: 'PUT',
-        headers: getAuthHeaders(),
-        body: JSON.stringify({ ...previousData, archived })
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to archive');
-      }
-      
-      const serverItem = await response.json();
-      
-      // Update with server response
-      setData(prev => ({
-        ...prev,
-        [type]: prev[type].map(item => item.id === id ? serverItem : item)
-      }));
-      
-      // Update cache
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      // Log to history with specific archive/unarchive action
-      history.addChange({
-        action: archived ? 'archive' : 'unarchive',
-        entityType: type,
-        entityId: id,
-        entityName: previousData.name || previousData.commandName || previousData.action,
-        before: previousData,
-        after: serverItem
-      }, getTabFromEntityType(type));
-      
-      toast.success(archived ? 'Moved to Archive' : 'Restored from Archive');
-      return serverItem;
-    } catch (err) {
-      // Rollback on failure
-      setData(prev => ({
-        ...prev,
-        [type]: prev[type].map(item => item.id === id ? previousData : item)
-      }));
-      toast.error(err.message || 'Failed to archive shortcut');
-      throw err;
-    }
-  }, [data, getAuthHeaders, history, toast]);
+    toast.success(archived ? 'Moved to Archive' : 'Restored from Archive');
+    return updatedItem;
+  }, [updateItem, history, toast]);
   
   // Delete shortcut
   const deleteShortcut = useCallback(async (id, type) => {
-    // Store for rollback and history
-    const itemToDelete = data[type]?.find(item => item.id === id);
-    if (!itemToDelete) {
-      throw new Error('Item not found');
-    }
+    const itemToDelete = deleteItem(type, id, 'Item not found');
     
-    // Optimistic update
-    setData(prev => ({
-      ...prev,
-      [type]: prev[type].filter(item => item.id !== id)
-    }));
+    history.addChange({
+      action: 'delete',
+      entityType: type,
+      entityId: id,
+      entityName: itemToDelete.name || itemToDelete.action,
+      before: itemToDelete,
+      after: null
+    }, getTabFromEntityType(type));
     
-    try {
-      const response = await fetch(`${API_BASE}/${type}/${id}`, {
-        method: 'DELETE',
-        headers: getAuthHeaders()
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to delete');
-      }
-      
-      // Update cache
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      // Log to history
-      history.addChange({
-        action: 'delete',
-        entityType: type,
-        entityId: id,
-        entityName: itemToDelete.name || itemToDelete.action,
-        before: itemToDelete,
-        after: null
-      }, getTabFromEntityType(type));
-      
-      toast.success('Shortcut deleted successfully!');
-    } catch (err) {
-      // Rollback on failure
-      setData(prev => ({
-        ...prev,
-        [type]: [...prev[type], itemToDelete]
-      }));
-      toast.error(err.message || 'Failed to delete shortcut');
-      throw err;
-    }
-  }, [data, getAuthHeaders, history, toast]);
+    toast.success('Shortcut deleted successfully!');
+  }, [deleteItem, history, toast]);
   
   // Create group
   const createGroup = useCallback(async (groupData) => {
-    const tempId = `temp_${Date.now()}`;
-    const optimisticItem = { ...groupData, id: tempId };
+    const newGroup = createItem('leaderGroups', groupData);
     
-    setData(prev => ({
-      ...prev,
-      leaderGroups: [...prev.leaderGroups, optimisticItem]
-    }));
+    history.addChange({
+      action: 'create',
+      entityType: 'leaderGroups',
+      entityId: newGroup.id,
+      entityName: groupData.name,
+      before: null,
+      after: newGroup
+    }, getTabFromEntityType('leaderGroups'));
     
-    try {
-      const response = await fetch(`${API_BASE}/leaderGroups`, {
-        method: 'POST',
-        headers: getAuthHeaders(),
-        body: JSON.stringify(groupData)
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to create');
-      }
-      
-      const newGroup = await response.json();
-      
-      setData(prev => ({
-        ...prev,
-        leaderGroups: prev.leaderGroups.map(g => g.id === tempId ? newGroup : g)
-      }));
-      
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      history.addChange({
-        action: 'create',
-        entityType: 'leaderGroups',
-        entityId: newGroup.id,
-        entityName: groupData.name,
-        before: null,
-        after: newGroup
-      }, getTabFromEntityType('leaderGroups'));
-      
-      toast.success('Group created successfully!');
-      return newGroup;
-    } catch (err) {
-      setData(prev => ({
-        ...prev,
-        leaderGroups: prev.leaderGroups.filter(g => g.id !== tempId)
-      }));
-      toast.error(err.message || 'Failed to create group');
-      throw err;
-    }
-  }, [getAuthHeaders, history, toast]);
+    toast.success('Group created successfully!');
+    return newGroup;
+  }, [createItem, history, toast]);
   
   // Update group
   const updateGroup = useCallback(async (id, groupData) => {
-    const previousData = data.leaderGroups?.find(g => g.id === id);
-    if (!previousData) {
-      throw new Error('Group not found');
-    }
+    const { previousData, updatedItem } = updateItem('leaderGroups', id, groupData, 'Group not found');
     
-    const updatedGroup = { ...previousData, ...groupData };
-    setData(prev => ({
-      ...prev,
-      leaderGroups: prev.leaderGroups.map(g => g.id === id ? updatedGroup : g)
-    }));
+    history.addChange({
+      action: 'update',
+      entityType: 'leaderGroups',
+      entityId: id,
+      entityName: groupData.name || previousData.name,
+      before: previousData,
+      after: updatedItem
+    }, getTabFromEntityType('leaderGroups'));
     
-    try {
-      const response = await fetch(`${API_BASE}/leaderGroups/${id}`, {
-        method: 'PUT',
-        headers: getAuthHeaders(),
-        body: JSON.stringify(groupData)
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to update');
-      }
-      
-      const serverGroup = await response.json();
-      
-      setData(prev => ({
-        ...prev,
-        leaderGroups: prev.leaderGroups.map(g => g.id === id ? serverGroup : g)
-      }));
-      
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      history.addChange({
-        action: 'update',
-        entityType: 'leaderGroups',
-        entityId: id,
-        entityName: groupData.name || previousData.name,
-        before: previousData,
-        after: serverGroup
-      }, getTabFromEntityType('leaderGroups'));
-      
-      toast.success('Group updated successfully!');
-      return serverGroup;
-    } catch (err) {
-      setData(prev => ({
-        ...prev,
-        leaderGroups: prev.leaderGroups.map(g => g.id === id ? previousData : g)
-      }));
-      toast.error(err.message || 'Failed to update group');
-      throw err;
-    }
-  }, [data.leaderGroups, getAuthHeaders, history, toast]);
+    toast.success('Group updated successfully!');
+    return updatedItem;
+  }, [updateItem, history, toast]);
   
   // Delete group
   const deleteGroup = useCallback(async (id) => {
-    const groupToDelete = data.leaderGroups?.find(g => g.id === id);
-    if (!groupToDelete) {
-      throw new Error('Group not found');
-    }
+    const groupToDelete = deleteItem('leaderGroups', id, 'Group not found');
     
-    setData(prev => ({
-      ...prev,
-      leaderGroups: prev.leaderGroups.filter(g => g.id !== id)
-    }));
+    history.addChange({
+      action: 'delete',
+      entityType: 'leaderGroups',
+      entityId: id,
+      entityName: groupToDelete.name,
+      before: groupToDelete,
+      after: null
+    }, getTabFromEntityType('leaderGroups'));
     
-    try {
-      const response = await fetch(`${API_BASE}/leaderGroups/${id}`, {
-        method: 'DELETE',
-        headers: getAuthHeaders()
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to delete');
-      }
-      
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      history.addChange({
-        action: 'delete',
-        entityType: 'leaderGroups',
-        entityId: id,
-        entityName: groupToDelete.name,
-        before: groupToDelete,
-        after: null
-      }, getTabFromEntityType('leaderGroups'));
-      
-      toast.success('Group deleted successfully!');
-    } catch (err) {
-      setData(prev => ({
-        ...prev,
-        leaderGroups: [...prev.leaderGroups, groupToDelete]
-      }));
-      toast.error(err.message || 'Failed to delete group');
-      throw err;
-    }
-  }, [data.leaderGroups, getAuthHeaders, history, toast]);
+    toast.success('Group deleted successfully!');
+  }, [deleteItem, history, toast]);
   
   // Create app
   const createApp = useCallback(async (appData) => {
-    const tempId = `temp_${Date.now()}`;
-    const optimisticItem = { ...appData, id: tempId };
+    const newApp = createItem('apps', appData);
     
-    setData(prev => ({
-      ...prev,
-      apps: [...prev.apps, optimisticItem]
-    }));
+    history.addChange({
+      action: 'create',
+      entityType: 'apps',
+      entityId: newApp.id,
+      entityName: appData.name,
+      before: null,
+      after: newApp
+    }, getTabFromEntityType('apps'));
     
-    try {
-      const response = await fetch(`${API_BASE}/apps`, {
-        method: 'POST',
-        headers: getAuthHeaders(),
-        body: JSON.stringify(appData)
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to create');
-      }
-      
-      const newApp = await response.json();
-      
-      setData(prev => ({
-        ...prev,
-        apps: prev.apps.map(a => a.id === tempId ? newApp : a)
-      }));
-      
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      history.addChange({
-        action: 'create',
-        entityType: 'apps',
-        entityId: newApp.id,
-        entityName: appData.name,
-        before: null,
-        after: newApp
-      }, getTabFromEntityType('apps'));
-      
-      toast.success('App added to library!');
-      return newApp;
-    } catch (err) {
-      setData(prev => ({
-        ...prev,
-        apps: prev.apps.filter(a => a.id !== tempId)
-      }));
-      toast.error(err.message || 'Failed to add app');
-      throw err;
-    }
-  }, [getAuthHeaders, history, toast]);
+    toast.success('App added to library!');
+    return newApp;
+  }, [createItem, history, toast]);
   
   // Update app
   const updateApp = useCallback(async (id, appData) => {
-    const previousData = data.apps?.find(a => a.id === id);
-    if (!previousData) {
-      throw new Error('App not found');
-    }
+    const { previousData, updatedItem } = updateItem('apps', id, appData, 'App not found');
     
-    const updatedApp = { ...previousData, ...appData };
-    setData(prev => ({
-      ...prev,
-      apps: prev.apps.map(a => a.id === id ? updatedApp : a)
-    }));
+    history.addChange({
+      action: 'update',
+      entityType: 'apps',
+      entityId: id,
+      entityName: appData.name || previousData.name,
+      before: previousData,
+      after: updatedItem
+    }, getTabFromEntityType('apps'));
     
-    try {
-      const response = await fetch(`${API_BASE}/apps/${id}`, {
-        method: 'PUT',
-        headers: getAuthHeaders(),
-        body: JSON.stringify(appData)
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to update');
-      }
-      
-      const serverApp = await response.json();
-      
-      setData(prev => ({
-        ...prev,
-        apps: prev.apps.map(a => a.id === id ? serverApp : a)
-      }));
-      
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      history.addChange({
-        action: 'update',
-        entityType: 'apps',
-        entityId: id,
-        entityName: appData.name || previousData.name,
-        before: previousData,
-        after: serverApp
-      }, getTabFromEntityType('apps'));
-      
-      toast.success('App updated successfully!');
-      return serverApp;
-    } catch (err) {
-      setData(prev => ({
-        ...prev,
-        apps: prev.apps.map(a => a.id === id ? previousData : a)
-      }));
-      toast.error(err.message || 'Failed to update app');
-      throw err;
-    }
-  }, [data.apps, getAuthHeaders, history, toast]);
+    toast.success('App updated successfully!');
+    return updatedItem;
+  }, [updateItem, history, toast]);
   
   // Delete app
   const deleteApp = useCallback(async (id) => {
-    const appToDelete = data.apps?.find(a => a.id === id);
-    if (!appToDelete) {
-      throw new Error('App not found');
-    }
+    const appToDelete = deleteItem('apps', id, 'App not found');
     
-    setData(prev => ({
-      ...prev,
-      apps: prev.apps.filter(a => a.id !== id)
-    }));
+    history.addChange({
+      action: 'delete',
+      entityType: 'apps',
+      entityId: id,
+      entityName: appToDelete.name,
+      before: appToDelete,
+      after: null
+    }, getTabFromEntityType('apps'));
     
-    try {
-      const response = await fetch(`${API_BASE}/apps/${id}`, {
-        method: 'DELETE',
-        headers: getAuthHeaders()
-      });
-      
-      if (!response.ok) {
-        const error = await response.json();
-        throw new Error(error.error || 'Failed to delete');
-      }
-      
-      if (currentCacheKey.current) {
-        setData(current => {
-          saveToCache(currentCacheKey.current, current);
-          return current;
-        });
-      }
-      
-      history.addChange({
-        action: 'delete',
-        entityType: 'apps',
-        entityId: id,
-        entityName: appToDelete.name,
-        before: appToDelete,
-        after: null
-      }, getTabFromEntityType('apps'));
-      
-      toast.success('App removed from library!');
-    } catch (err) {
-      setData(prev => ({
-        ...prev,
-        apps: [...prev.apps, appToDelete]
-      }));
-      toast.error(err.message || 'Failed to delete app');
-      throw err;
-    }
-  }, [data.apps, getAuthHeaders, history, toast]);
+    toast.success('App removed from library!');
+  }, [deleteItem, history, toast]);
   
-  // Apply a change (used by undo/redo)
+  // Apply a change (used by undo/redo). Queued like any edit; temp ids in
+  // history entries resolve to server ids in the outbox.
   const applyChange = useCallback(async (entityType, action, entityId, entityData) => {
     try {
       if (action === 'create') {
-        await fetch(`${API_BASE}/${entityType}`, {
-          method: 'POST',
-          headers: getAuthHeaders(),
-          body: JSON.stringify(entityData)
-        });
+        enqueue({ op: 'create', type: entityType, id: entityData?.id || createTempId(), item: entityData });
       } else if (action === 'update') {
-        await fetch(`${API_BASE}/${entityType}/${entityId}`, {
-          method: 'PUT',
-          headers: getAuthHeaders(),
-          body: JSON.stringify(entityData)
-        });
+        enqueue({ op: 'update', type: entityType, id: entityId, changes: entityData });
       } else if (action === 'delete') {
-        await fetch(`${API_BASE}/${entityType}/${entityId}`, {
-          method: 'DELETE',
-          headers: getAuthHeaders()
-        });
+        enqueue({ op: 'delete', type: entityType, id: entityId });
       }
-      
-      // Refresh data after undo/redo
-      await refresh();
       return true;
     } catch (err) {
       console.error('Failed to apply change:', err);
       return false;
     }
-  }, [getAuthHeaders, refresh]);
+  }, [enqueue]);
   
   return {
     // State
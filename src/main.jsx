@@ -5,6 +5,7 @@ import App from './App.jsx'
 import { ToastProvider } from './components/ui/Toast.jsx'
 import { HistoryProvider } from './context/HistoryContext.jsx'
 import { AuthProvider } from './context/AuthContext.jsx'
+import { registerServiceWorker } from './utils/serviceWorker.js'
 
 createRoot(document.getElementById('root')).render(
   <StrictMode>
@@ -17,3 +18,5 @@ createRoot(document.getElementById('root')).render(
     </AuthProvider>
   </StrictMode>,
 )
+
+registerServiceWorker()
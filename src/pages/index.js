@@ -1,11 +1,35 @@
 /**
- * Page components barrel export
+ * Page components - each page is its own chunk, loaded on first visit
+ *
+ * `preloadPage(tab)` starts a page's download early (sidebar hover/focus);
+ * the browser's module cache makes repeat calls free, and the lazy
+ * component then renders without suspending.
  */
 
-export { LeaderPage } from './LeaderPage';
-export { RaycastPage } from './RaycastPage';
-export { SystemPage } from './SystemPage';
-export { AppsPage } from './AppsPage';
-export { HistoryPage } from './HistoryPage';
-export { ExportPage } from './ExportPage';
-export { ShortcutCheckerPage } from './ShortcutCheckerPage';
+import { lazy } from 'react';
+
+const PAGE_LOADERS = {
+  leader: () => import('./LeaderPage'),
+  raycast: () => import('./RaycastPage'),
+  system: () => import('./SystemPage'),
+  apps: () => import('./AppsPage'),
+  history: () => import('./HistoryPage'),
+  export: () => import('./ExportPage'),
+  checker: () => import('./ShortcutCheckerPage'),
+};
+
+export const preloadPage = (tab) => {
+  const load = PAGE_LOADERS[tab];
+  // Failures surface (and retry) when the page actually renders
+  if (load) load().catch(() => {});
+};
+
+const lazyPage = (tab, name) => lazy(() => PAGE_LOADERS[tab]().then(module => ({ default: module[name] })));
+
+export const LeaderPage = lazyPage('leader', 'LeaderPage');
+export const RaycastPage = lazyPage('raycast', 'RaycastPage');
+export const SystemPage = lazyPage('system', 'SystemPage');
+export const AppsPage = lazyPage('apps', 'AppsPage');
+export const HistoryPage = lazyPage('history', 'HistoryPage');
+export const ExportPage = lazyPage('export', 'ExportPage');
+export const ShortcutCheckerPage = lazyPage('checker', 'ShortcutCheckerPage');
@@ -0,0 +1,75 @@
+/**
+ * Service worker: offline app shell
+ *
+ * Not bundled. scripts/serviceWorker.js copies it to dist/sw.js at build time
+ * and replaces `self.__PRECACHE__` with the build's file list and version.
+ *
+ * - install: precaches index.html and every hashed build file
+ * - navigations: answered with the precached index.html, so the app opens
+ *   instantly and offline; the data comes from the store's local cache
+ * - build files: answered from the precache (they never change at a URL)
+ * - /api/icons/:id: cache-first (immutable by id), capped at ICON_CACHE_MAX
+ * - everything else, including all other API calls, goes to the network
+ *
+ * A new build installs in the background and takes over once every tab of
+ * the old one is closed; activation then drops the old caches.
+ */
+
+const { version, urls } = self.__PRECACHE__;
+
+const SHELL_CACHE = `shell-${version}`;
+const ICON_CACHE = 'icons-v1';
+const ICON_CACHE_MAX = 300;
+const INDEX_URL = urls.find(url => url.endsWith('/index.html'));
+const PRECACHED = new Set(urls);
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(caches.open(SHELL_CACHE).then(cache => cache.addAll(urls)));
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then(keys => Promise.all(keys
+        .filter(key => key.startsWith('shell-') && key !== SHELL_CACHE)
+        .map(key => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+const fromShell = (url, request) => caches.open(SHELL_CACHE)
+  .then(cache => cache.match(url))
+  .then(cached => cached || fetch(request));
+
+// Oldest entries go first (cache keys keep insertion order)
+const trimCache = async (cache, max) => {
+  const keys = await cache.keys();
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - max)).map(key => cache.delete(key)));
+};
+
+const cachedIcon = async (request) => {
+  const cache = await caches.open(ICON_CACHE);
+  const cached = await cache.match(request);
+  if (cached) return cached;
+  const response = await fetch(request);
+  if (response.ok) {
+    await cache.put(request, response.clone());
+    trimCache(cache, ICON_CACHE_MAX);
+  }
+  return response;
+};
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) return;
+
+  if (request.mode === 'navigate' && INDEX_URL && !url.pathname.startsWith('/api/')) {
+    event.respondWith(fromShell(INDEX_URL, request));
+  } else if (PRECACHED.has(url.pathname)) {
+    event.respondWith(fromShell(url.pathname, request));
+  } else if (url.pathname.startsWith('/api/icons/')) {
+    event.respondWith(cachedIcon(request));
+  }
+});
@@ -0,0 +1,90 @@
+/**
+ * Client-side export of the data on screen, for when /api/export can't be
+ * used: offline, on a network error, or while edits are still queued in the
+ * outbox (the server doesn't have them yet).
+ *
+ * Markdown, JSON and CSV match server/lib/exportFormats.js - keep them in
+ * sync. The native Raycast / Leader Key formats are server-only.
+ */
+
+export const LOCAL_EXPORT_FORMATS = {
+  markdown: 'text/markdown',
+  json: 'application/json',
+  csv: 'text/csv',
+};
+
+const SECTION_TITLES = {
+  leaderShortcuts: 'Leader Key Shortcuts',
+  raycastShortcuts: 'Raycast Shortcuts',
+  systemShortcuts: 'System Shortcuts',
+};
+
+const MARKDOWN_TABLES = {
+  leaderShortcuts: {
+    header: '| Sequence | Action | Category | Notes |\n|----------|--------|----------|-------|\n',
+    row: (s) => [(s.sequence || []).join(' → '), s.action, s.category, s.notes],
+  },
+  raycastShortcuts: {
+    header: '| Keys/Alias | Command | Extension | Notes |\n|------------|---------|-----------|-------|\n',
+    row: (s) => [s.keys || s.aliasText || 'N/A', s.commandName, s.category, s.notes],
+  },
+  systemShortcuts: {
+    header: '| Keys | Action | Category | Notes |\n|------|--------|----------|-------|\n',
+    row: (s) => [s.keys || 'N/A', s.action, s.category, s.notes],
+  },
+};
+
+const CSV_COLUMNS = [
+  'collection', 'id', 'keys', 'sequence', 'aliasText', 'action', 'commandName', 'name',
+  'appOrContext', 'category', 'appId', 'key', 'parentKey', 'bundleId', 'tags', 'notes',
+];
+
+const mdCell = (value) => (value === null || value === undefined ? '' : String(value).replace(/\|/g, '\\|').replace(/\r?\n/g, ' '));
+
+const csvCell = (value) => {
+  if (value === null || value === undefined) return '';
+  const str = Array.isArray(value) ? value.join(' ') : String(value);
+  return /[",\r\n]/.test(str) ? `"${str.replace(/"/g, '""')}"` : str;
+};
+
+// Icons are left out, as in the server's default export
+const withoutIcon = ({ iconUrl, ...item }) => item;
+
+function markdown(data, collections) {
+  let text = `# Keyboard Shortcuts Reference\n\n*Exported on ${new Date().toISOString().split('T')[0]}*\n\n`;
+  for (const name of collections) {
+    const items = data[name] || [];
+    if (items.length === 0) continue;
+    text += `## ${SECTION_TITLES[name]}\n\n${MARKDOWN_TABLES[name].header}`;
+    text += items.map(item => `| ${MARKDOWN_TABLES[name].row(item).map(mdCell).join(' | ')} |\n`).join('');
+    text += '\n';
+  }
+  return text;
+}
+
+function json(data, collections) {
+  const sections = collections.map((name) => {
+    const items = (data[name] || []).map(item => `\n    ${JSON.stringify(withoutIcon(item))}`);
+    return `\n  ${JSON.stringify(name)}: [${items.length ? `${items.join(',')}\n  ]` : ']'}`;
+  });
+  return `{${sections.join(',')}\n}\n`;
+}
+
+function csv(data, collections) {
+  let text = `${CSV_COLUMNS.join(',')}\n`;
+  for (const name of collections) {
+    for (const item of data[name] || []) {
+      text += `${CSV_COLUMNS.map(col => (col === 'collection' ? name : csvCell(item[col]))).join(',')}\n`;
+    }
+  }
+  return text;
+}
+
+const WRITERS = { markdown, json, csv };
+
+/**
+ * Build an export of `collections` from store data; returns a Blob
+ */
+export function exportLocally(format, data, collections) {
+  return new Blob([WRITERS[format](data, collections)], { type: LOCAL_EXPORT_FORMATS[format] });
+}
@@ -0,0 +1,75 @@
+/**
+ * Icon drawing shared by the image editor's worker and main-thread pipelines
+ * (see iconPipeline.js). No DOM access, so it runs in a worker too.
+ */
+
+// Editor preview box (CSS px); drag offsets are in these units
+export const EDITOR_SIZE = 200;
+// Saved icon size (px)
+export const ICON_SIZE = 200;
+// WebP where the browser can encode it; others fall back to PNG
+export const ICON_TYPE = 'image/webp';
+export const ICON_QUALITY = 0.9;
+// Sources are decoded at most this large: 3x zoom of a 200px icon needs 600px
+export const MAX_SOURCE_EDGE = 1024;
+
+/**
+ * Where the source lands on a `size` canvas: fit the short edge to the box,
+ * then apply the editor's zoom and drag offset.
+ */
+export function iconLayout(width, height, { scale, x, y }, size) {
+  const aspect = width / height;
+  const drawWidth = aspect > 1 ? EDITOR_SIZE * scale * aspect : EDITOR_SIZE * scale;
+  const drawHeight = aspect > 1 ? EDITOR_SIZE * scale : (EDITOR_SIZE * scale) / aspect;
+  const ratio = size / EDITOR_SIZE;
+  return {
+    dx: ((EDITOR_SIZE - drawWidth) / 2 + x) * ratio,
+    dy: ((EDITOR_SIZE - drawHeight) / 2 + y) * ratio,
+    dw: drawWidth * ratio,
+    dh: drawHeight * ratio,
+  };
+}
+
+export function drawIcon(ctx, source, transform, size) {
+  const { dx, dy, dw, dh } = iconLayout(source.width, source.height, transform, size);
+  ctx.clearRect(0, 0, size, size);
+  ctx.globalAlpha = transform.opacity;
+  ctx.imageSmoothingQuality = 'high';
+  ctx.drawImage(source, dx, dy, dw, dh);
+  ctx.globalAlpha = 1;
+}
+
+/**
+ * Decode an image Blob to an ImageBitmap no larger than MAX_SOURCE_EDGE, so
+ * every later draw works on a small bitmap instead of the full-size original.
+ */
+export async function decodeIcon(blob) {
+  const bitmap = await createImageBitmap(blob);
+  const longest = Math.max(bitmap.width, bitmap.height);
+  if (longest <= MAX_SOURCE_EDGE) return bitmap;
+
+  const ratio = MAX_SOURCE_EDGE / longest;
+  const resized = await createImageBitmap(bitmap, {
+    resizeWidth: Math.round(bitmap.width * ratio),
+    resizeHeight: Math.round(bitmap.height * ratio),
+    resizeQuality: 'high',
+  });
+  bitmap.close();
+  return resized;
+}
+
+/**
+ * Encode a canvas (OffscreenCanvas or <canvas>) to a compact Blob
+ */
+export function encodeIcon(canvas) {
+  if (canvas.convertToBlob) {
+    return canvas.convertToBlob({ type: ICON_TYPE, quality: ICON_QUALITY });
+  }
+  return new Promise((resolve, reject) => {
+    canvas.toBlob(
+      (blob) => (blob ? resolve(blob) : reject(new Error('Failed to encode image'))),
+      ICON_TYPE,
+      ICON_QUALITY
+    );
+  });
+}
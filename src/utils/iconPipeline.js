@@ -0,0 +1,146 @@
+/**
+ * Image editor pipeline
+ *
+ * Decoding, the live preview and encoding the saved icon run in a worker on
+ * an OffscreenCanvas (iconPipeline.worker.js) where the browser supports it,
+ * so large sources never block the main thread. Elsewhere the same interface
+ * runs on the main thread. VITE_IMAGE_EDITOR_WORKER=false forces the
+ * main-thread pipeline, e.g. to compare frame times.
+ *
+ *   const pipeline = getIconPipeline();
+ *   pipeline.attachPreview(canvasElement);
+ *   const { width, height } = await pipeline.load(blob);
+ *   pipeline.render({ scale, x, y, opacity });   // coalesced to one draw per frame
+ *   const icon = await pipeline.export(transform); // WebP (or PNG) Blob at ICON_SIZE
+ */
+
+import { ICON_SIZE, decodeIcon, drawIcon, encodeIcon } from './iconDraw';
+
+export const WORKER_PIPELINE_SUPPORTED = typeof Worker !== 'undefined'
+  && typeof OffscreenCanvas !== 'undefined'
+  && typeof createImageBitmap === 'function'
+  && typeof HTMLCanvasElement !== 'undefined'
+  && 'transferControlToOffscreen' in HTMLCanvasElement.prototype
+  && import.meta.env.VITE_IMAGE_EDITOR_WORKER !== 'false';
+
+export const PIPELINE_MODE = WORKER_PIPELINE_SUPPORTED ? 'worker' : 'main';
+
+function createWorkerPipeline() {
+  const worker = new Worker(new URL('./iconPipeline.worker.js', import.meta.url), { type: 'module' });
+  const calls = new Map();
+  const transferred = new WeakSet();
+  let nextId = 1;
+
+  worker.onmessage = ({ data }) => {
+    const call = calls.get(data.id);
+    if (!call) return;
+    calls.delete(data.id);
+    if (data.error) call.reject(new Error(data.error));
+    else call.resolve(data);
+  };
+  worker.onerror = (event) => {
+    const error = new Error(event.message || 'Image worker failed');
+    calls.forEach(call => call.reject(error));
+    calls.clear();
+  };
+
+  const request = (message) => new Promise((resolve, reject) => {
+    const id = nextId++;
+    calls.set(id, { resolve, reject });
+    worker.postMessage({ ...message, id });
+  });
+
+  return {
+    mode: 'worker',
+    attachPreview(canvas) {
+      // A canvas can hand over control once (StrictMode attaches refs twice)
+      if (transferred.has(canvas)) return;
+      transferred.add(canvas);
+      const offscreen = canvas.transferControlToOffscreen();
+      worker.postMessage({ type: 'preview', canvas: offscreen }, [offscreen]);
+    },
+    load: (blob) => request({ type: 'load', blob }).then(({ width, height }) => ({ width, height })),
+    render: (transform) => worker.postMessage({ type: 'render', transform }),
+    export: (transform) => request({ type: 'export', transform, size: ICON_SIZE }).then(({ blob }) => blob),
+    release: () => worker.postMessage({ type: 'release' }),
+    terminate: () => worker.terminate(),
+  };
+}
+
+// Image element fallback for browsers without createImageBitmap
+const decodeWithImage = (blob) => new Promise((resolve, reject) => {
+  const url = URL.createObjectURL(blob);
+  const img = new Image();
+  img.onload = () => {
+    URL.revokeObjectURL(url);
+    resolve(img);
+  };
+  img.onerror = () => {
+    URL.revokeObjectURL(url);
+    reject(new Error('Failed to decode image'));
+  };
+  img.src = url;
+});
+
+function createMainThreadPipeline() {
+  let source = null;
+  let preview = null;
+  let pendingTransform = null;
+  let frame = 0;
+
+  const renderPreview = () => {
+    frame = 0;
+    if (preview && source && pendingTransform) {
+      drawIcon(preview.getContext('2d'), source, pendingTransform, preview.width);
+    }
+  };
+  const release = () => {
+    source?.close?.();
+    source = null;
+    pendingTransform = null;
+    preview?.getContext('2d').clearRect(0, 0, preview.width, preview.height);
+  };
+
+  return {
+    mode: 'main',
+    attachPreview(canvas) {
+      preview = canvas;
+      if (!frame) frame = requestAnimationFrame(renderPreview);
+    },
+    async load(blob) {
+      const decoded = typeof createImageBitmap === 'function' ? await decodeIcon(blob) : await decodeWithImage(blob);
+      release();
+      source = decoded;
+      return { width: decoded.width, height: decoded.height };
+    },
+    render(transform) {
+      pendingTransform = transform;
+      if (!frame) frame = requestAnimationFrame(renderPreview);
+    },
+    async export(transform) {
+      if (!source) throw new Error('No image loaded');
+      const canvas = document.createElement('canvas');
+      canvas.width = ICON_SIZE;
+      canvas.height = ICON_SIZE;
+      drawIcon(canvas.getContext('2d'), source, transform, ICON_SIZE);
+      return encodeIcon(canvas);
+    },
+    release,
+    terminate() {
+      cancelAnimationFrame(frame);
+      release();
+    },
+  };
+}
+
+export function createIconPipeline() {
+  return WORKER_PIPELINE_SUPPORTED ? createWorkerPipeline() : createMainThreadPipeline();
+}
+
+// One pipeline (and worker) per page, created on first use: only one editor
+// is ever open at a time
+let sharedPipeline = null;
+export function getIconPipeline() {
+  if (!sharedPipeline) sharedPipeline = createIconPipeline();
+  return sharedPipeline;
+}
@@ -0,0 +1,67 @@
+/**
+ * Image editor worker: decodes the source, draws the live preview into the
+ * editor's transferred canvas and encodes the saved icon, all off the main
+ * thread. Protocol (see iconPipeline.js):
+ *   { type: 'preview', canvas }              OffscreenCanvas to draw into
+ *   { id, type: 'load', blob }            -> { id, width, height }
+ *   { type: 'render', transform }            draws on the next frame (latest wins)
+ *   { id, type: 'export', transform, size } -> { id, blob }
+ *   { type: 'release' }                      frees the decoded source
+ */
+
+import { decodeIcon, drawIcon, encodeIcon } from './iconDraw';
+
+let source = null;
+let preview = null;
+let pendingTransform = null;
+let frameScheduled = false;
+
+const nextFrame = self.requestAnimationFrame
+  ? (callback) => self.requestAnimationFrame(callback)
+  : (callback) => setTimeout(callback, 16);
+
+const renderPreview = () => {
+  frameScheduled = false;
+  if (!preview || !source || !pendingTransform) return;
+  drawIcon(preview.ctx, source, pendingTransform, preview.canvas.width);
+};
+
+const scheduleRender = () => {
+  if (frameScheduled) return;
+  frameScheduled = true;
+  nextFrame(renderPreview);
+};
+
+const release = () => {
+  source?.close();
+  source = null;
+  pendingTransform = null;
+  preview?.ctx.clearRect(0, 0, preview.canvas.width, preview.canvas.height);
+};
+
+self.onmessage = async ({ data }) => {
+  const { id, type } = data;
+  try {
+    if (type === 'preview') {
+      preview = { canvas: data.canvas, ctx: data.canvas.getContext('2d') };
+      scheduleRender();
+    } else if (type === 'render') {
+      pendingTransform = data.transform;
+      scheduleRender();
+    } else if (type === 'load') {
+      const bitmap = await decodeIcon(data.blob);
+      release();
+      source = bitmap;
+      self.postMessage({ id, width: bitmap.width, height: bitmap.height });
+    } else if (type === 'export') {
+      if (!source) throw new Error('No image loaded');
+      const canvas = new OffscreenCanvas(data.size, data.size);
+      drawIcon(canvas.getContext('2d'), source, data.transform, data.size);
+      self.postMessage({ id, blob: await encodeIcon(canvas) });
+    } else if (type === 'release') {
+      release();
+    }
+  } catch (err) {
+    if (id) self.postMessage({ id, error: err.message || String(err) });
+  }
+};
@@ -0,0 +1,173 @@
+/**
+ * Mutation outbox
+ *
+ * Edits are shown at once and queued here; useShortcutsStore sends the queue
+ * in order as one POST /api/shortcuts/batch whenever the network allows. The
+ * queue is kept in localStorage (per user), so edits made offline survive a
+ * reload and go out the next time the app is open.
+ *
+ * Items created while queued have a `temp_` id until the server assigns one.
+ * `ids` remembers each mapping, so later edits, undo and history entries can
+ * keep using the temp id.
+ *
+ * Stored shape:
+ *   { ops: [{ op, type, id, item?, changes? }],     oldest first
+ *     inflight: { batchId, size } | null,            batch being sent (reused on retry)
+ *     ids: { [tempId]: serverId } }
+ */
+
+const OUTBOX_KEY_PREFIX = 'shortcuts_outbox_';
+
+// Operations per request (the server accepts up to 5000)...
+export const OUTBOX_BATCH_SIZE = 500;
+// ...and JSON characters per request: updates carry whole items, icons
+// included (the server accepts 16mb on this route)
+export const OUTBOX_BATCH_BYTES = 4 * 1024 * 1024;
+
+// Temp -> server id pairs kept for late references (undo, history)
+const MAX_REMEMBERED_IDS = 500;
+
+export const getOutboxKey = (user) => `${OUTBOX_KEY_PREFIX}${user.id}`;
+
+const emptyOutbox = () => ({ ops: [], inflight: null, ids: {} });
+
+export function loadOutbox(key) {
+  try {
+    const stored = localStorage.getItem(key);
+    if (stored) return { ...emptyOutbox(), ...JSON.parse(stored) };
+  } catch (e) {
+    console.warn('Failed to load outbox:', e);
+  }
+  return emptyOutbox();
+}
+
+export function saveOutbox(key, outbox) {
+  try {
+    if (outbox.ops.length === 0 && Object.keys(outbox.ids).length === 0) {
+      localStorage.removeItem(key);
+    } else {
+      localStorage.setItem(key, JSON.stringify(outbox));
+    }
+  } catch (e) {
+    console.warn('Failed to save outbox:', e);
+  }
+}
+
+// Read-modify-write against storage, so tabs of the same user share one queue
+export function updateOutbox(key, update) {
+  const next = update(loadOutbox(key));
+  saveOutbox(key, next);
+  return next;
+}
+
+// Run `send` while holding this queue's lock; another tab already sending it
+// wins and `send` is skipped (returns false). Without Web Locks it just runs.
+export function withOutboxLock(key, send) {
+  if (typeof navigator === 'undefined' || !navigator.locks) return send();
+  return navigator.locks.request(key, { ifAvailable: true }, lock => (lock ? send() : false));
+}
+
+let tempCounter = 0;
+export const createTempId = () => `temp_${Date.now()}_${(tempCounter++).toString(36)}`;
+
+const newBatchId = () => (globalThis.crypto?.randomUUID
+  ? crypto.randomUUID()
+  : `${Date.now()}_${Math.random().toString(36).slice(2)}`);
+
+// Swap temp ids for server ids: the target id and any field holding one (appId)
+function remapOperation(operation, ids) {
+  const remap = (value) => (typeof value === 'string' && ids[value] ? ids[value] : value);
+  const remapFields = (fields) => fields && Object.fromEntries(Object.entries(fields).map(([name, value]) => [name, remap(value)]));
+  const remapped = { ...operation, id: remap(operation.id) };
+  if (operation.item) remapped.item = remapFields(operation.item);
+  if (operation.changes) remapped.changes = remapFields(operation.changes);
+  return remapped;
+}
+
+// Server id of an item created from the outbox (or the id itself)
+export const resolveId = (outbox, id) => outbox.ids[id] || id;
+
+export const queueOperation = (outbox, operation) => ({
+  ...outbox,
+  ops: [...outbox.ops, remapOperation(operation, outbox.ids)],
+});
+
+// How many of the oldest ops fit one request (always at least one)
+function batchSize(ops) {
+  let bytes = 0;
+  let size = 0;
+  while (size < Math.min(ops.length, OUTBOX_BATCH_SIZE)) {
+    bytes += JSON.stringify(ops[size]).length + 1;
+    if (size > 0 && bytes > OUTBOX_BATCH_BYTES) break;
+    size++;
+  }
+  return size;
+}
+
+// The next batch to send: the in-flight one again after a failure (same id,
+// so the server can replay it), otherwise the oldest ops that fit one request
+export function nextBatch(outbox) {
+  const inflight = outbox.inflight || { batchId: newBatchId(), size: batchSize(outbox.ops) };
+  return { ...outbox, inflight };
+}
+
+// The server refused the in-flight batch as too large (413), so it never
+// applied it: send the first half under a new id instead
+export const splitBatch = (outbox) => ({
+  ...outbox,
+  inflight: { batchId: newBatchId(), size: Math.ceil(outbox.inflight.size / 2) },
+});
+
+// After the server applied the in-flight batch
+export function completeBatch(outbox, result) {
+  const ids = { ...outbox.ids, ...result.ids };
+  const remembered = Object.keys(ids);
+  remembered.slice(0, Math.max(0, remembered.length - MAX_REMEMBERED_IDS)).forEach(tempId => delete ids[tempId]);
+  return {
+    ops: outbox.ops.slice(outbox.inflight.size).map(operation => remapOperation(operation, result.ids || {})),
+    inflight: null,
+    ids,
+  };
+}
+
+// Drop in-flight operations the server rejected (by index); the rest is resent
+export const dropOperations = (outbox, rejected) => ({
+  ...outbox,
+  ops: outbox.ops.filter((_, index) => !(index < outbox.inflight.size && rejected.has(index))),
+  inflight: null,
+});
+
+/**
+ * Apply operations to store data (keys as in the store). A create of an id
+ * that exists replaces it, so confirmed items can be applied more than once.
+ */
+export function applyOperations(data, ops) {
+  if (ops.length === 0) return data;
+  const next = { ...data };
+  for (const { op, type, id, item, changes } of ops) {
+    const items = next[type] || [];
+    if (op === 'create') {
+      const created = { ...item, id };
+      next[type] = items.some(existing => existing.id === id)
+        ? items.map(existing => (existing.id === id ? created : existing))
+        : [...items, created];
+    } else if (op === 'update') {
+      next[type] = items.map(existing => (existing.id === id ? { ...existing, ...changes, id } : existing));
+    } else if (op === 'delete') {
+      next[type] = items.filter(existing => existing.id !== id);
+    }
+  }
+  return next;
+}
+
+// Fold a batch response into the last confirmed data: the server's copy of
+// every created/updated item (`items[i]`, null when it no longer exists)
+export function applyBatchResult(base, ops, result) {
+  const ids = result.ids || {};
+  const confirmed = ops.map((operation, index) => {
+    if (operation.op === 'delete') return { ...operation, id: ids[operation.id] || operation.id };
+    const item = result.items?.[index];
+    return item ? { op: 'create', type: operation.type, id: item.id, item } : null;
+  });
+  return applyOperations(base, confirmed.filter(Boolean));
+}
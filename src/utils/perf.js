@@ -1,37 +1,99 @@
 /**
- * Performance measurement utilities for development
+ * Performance measurement utilities
  * 
- * Enable by setting VITE_DEBUG_PERF=true in environment
+ * Development: set VITE_DEBUG_PERF=true to log measurements to the console.
+ * Production: a sample of sessions (VITE_TELEMETRY_SAMPLE_RATE, default 0.1)
+ * records timings and sends them in batches to /api/telemetry with
+ * navigator.sendBeacon. VITE_RELEASE tags the samples with the build.
  */
 
+import { TELEMETRY_URL } from '../config/api';
+
 const DEBUG_PERF = import.meta.env.VITE_DEBUG_PERF === 'true';
 
+const TELEMETRY_SAMPLE_RATE = Number(import.meta.env.VITE_TELEMETRY_SAMPLE_RATE ?? 0.1);
+const RELEASE = import.meta.env.VITE_RELEASE || 'dev';
+const TELEMETRY = import.meta.env.PROD
+  && typeof navigator !== 'undefined'
+  && typeof navigator.sendBeacon === 'function'
+  && Math.random() < TELEMETRY_SAMPLE_RATE;
+
+// Measurements run when either consumer is active
+const PERF_ENABLED = DEBUG_PERF || TELEMETRY;
+
+const TELEMETRY_BATCH_SIZE = 50;
+const TELEMETRY_FLUSH_MS = 30 * 1000;
+
 // Store performance marks
 const marks = {};
 const renderCounts = {};
+let pendingSamples = [];
+
+/**
+ * Queue a timing (ms) for the telemetry endpoint
+ */
+export function recordMetric(metric, value) {
+  if (!TELEMETRY || !Number.isFinite(value)) return;
+  pendingSamples.push({ m: metric, v: Math.round(value * 10) / 10 });
+  if (pendingSamples.length >= TELEMETRY_BATCH_SIZE) flushTelemetry();
+}
+
+/**
+ * Send queued samples. sendBeacon survives page unload and never blocks.
+ * text/plain keeps the beacon a simple (preflight-free) request.
+ */
+export function flushTelemetry() {
+  if (!TELEMETRY || pendingSamples.length === 0) return;
+  const body = JSON.stringify({ release: RELEASE, samples: pendingSamples });
+  pendingSamples = [];
+  navigator.sendBeacon(TELEMETRY_URL, new Blob([body], { type: 'text/plain' }));
+}
+
+/**
+ * Start batching and long-task observation (once per page load)
+ */
+let telemetryStarted = false;
+function startTelemetry() {
+  if (!TELEMETRY || telemetryStarted) return;
+  telemetryStarted = true;
+
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') flushTelemetry();
+  });
+  window.addEventListener('pagehide', flushTelemetry);
+  setInterval(flushTelemetry, TELEMETRY_FLUSH_MS);
+
+  // Long tasks (>50ms on the main thread) - Chromium only
+  if (typeof PerformanceObserver !== 'undefined' && PerformanceObserver.supportedEntryTypes?.includes('longtask')) {
+    new PerformanceObserver((list) => {
+      for (const entry of list.getEntries()) recordMetric('long_task', entry.duration);
+    }).observe({ type: 'longtask', buffered: true });
+  }
+}
 
 /**
  * Mark the start of a performance measurement
  */
 export function mark(name) {
-  if (!DEBUG_PERF) return;
+  if (!PERF_ENABLED) return;
   marks[name] = performance.now();
 }
 
 /**
- * Measure time since a previous mark
+ * Measure time since a previous mark. `metric` also records it for telemetry.
  */
-export function measure(name, markName) {
-  if (!DEBUG_PERF) return;
+export function measure(name, markName, metric) {
+  if (!PERF_ENABLED) return;
   
   const startTime = marks[markName];
   if (startTime === undefined) {
-    console.warn(`[Perf] No mark found: ${markName}`);
+    if (DEBUG_PERF) console.warn(`[Perf] No mark found: ${markName}`);
     return;
   }
   
   const duration = performance.now() - startTime;
-  console.log(`[Perf] ${name}: ${duration.toFixed(2)}ms`);
+  if (DEBUG_PERF) console.log(`[Perf] ${name}: ${duration.toFixed(2)}ms`);
+  if (metric) recordMetric(metric, duration);
   
   return duration;
 }
@@ -108,17 +170,84 @@ export function useFirstRenderTime(componentName) {
  * Mark app start time (call in main.jsx)
  */
 export function markAppStart() {
-  if (!DEBUG_PERF) return;
+  if (!PERF_ENABLED) return;
   mark('app-start');
-  console.log('[Perf] App starting...');
+  startTelemetry();
+  if (DEBUG_PERF) console.log('[Perf] App starting...');
 }
 
 /**
  * Measure time from app start to first view render
  */
 export function measureFirstViewRender(viewName) {
-  if (!DEBUG_PERF) return;
-  measure(`First view (${viewName}) rendered`, 'app-start');
+  if (!PERF_ENABLED) return;
+  measure(`First view (${viewName}) rendered`, 'app-start', `first_view.${viewName}`);
+}
+
+/**
+ * Time to first data: navigation start until shortcuts are on screen,
+ * split by whether they came from the local cache or the network
+ */
+let firstDataMeasured = false;
+export function measureFirstData(source) {
+  if (!PERF_ENABLED || firstDataMeasured) return;
+  firstDataMeasured = true;
+  const duration = performance.now();
+  if (DEBUG_PERF) console.log(`[Perf] First data (${source}): ${duration.toFixed(2)}ms`);
+  recordMetric(`ttfd.${source}`, duration);
+}
+
+/**
+ * Search latency: from the query change to the committed, filtered view
+ */
+export function markSearch() {
+  mark('search');
+}
+
+export function measureSearch() {
+  if (!PERF_ENABLED || marks.search === undefined) return;
+  measure('Search', 'search', 'search');
+  delete marks.search;
+}
+
+/**
+ * Main-thread frame intervals during an interaction (dragging, a slider):
+ * start() when it begins, stop() when it ends. Records the p50, p95 and
+ * worst frame as `<metric>.p50` / `.p95` / `.max`; anything far above 16.7ms
+ * is a dropped frame the user saw.
+ */
+export function createFrameMonitor(metric) {
+  let frames = [];
+  let last = 0;
+  let rafId = 0;
+
+  const tick = (now) => {
+    if (last) frames.push(now - last);
+    last = now;
+    rafId = requestAnimationFrame(tick);
+  };
+
+  return {
+    start() {
+      if (!PERF_ENABLED || rafId) return;
+      frames = [];
+      last = 0;
+      rafId = requestAnimationFrame(tick);
+    },
+    stop() {
+      if (!rafId) return;
+      cancelAnimationFrame(rafId);
+      rafId = 0;
+      if (frames.length < 2) return;
+      const sorted = frames.sort((a, b) => a - b);
+      const at = (q) => sorted[Math.min(sorted.length - 1, Math.floor(q * sorted.length))];
+      const stats = { p50: at(0.5), p95: at(0.95), max: sorted[sorted.length - 1] };
+      if (DEBUG_PERF) {
+        console.log(`[Perf] ${metric}: ${sorted.length} frames, p50 ${stats.p50.toFixed(1)}ms, p95 ${stats.p95.toFixed(1)}ms, max ${stats.max.toFixed(1)}ms`);
+      }
+      Object.entries(stats).forEach(([name, value]) => recordMetric(`${metric}.${name}`, value));
+    },
+  };
 }
 
 /**
@@ -126,7 +255,11 @@ export function measureFirstViewRender(viewName) {
  */
 let lastRouteChange = 0;
 export function trackRouteChange(from, to) {
-  if (!DEBUG_PERF) return;
+  if (!PERF_ENABLED) return;
+  if (!DEBUG_PERF) {
+    mark(`route-${to}`);
+    return;
+  }
   
   const now = performance.now();
   if (lastRouteChange > 0) {
@@ -143,8 +276,8 @@ export function trackRouteChange(from, to) {
  * Measure route change completion
  */
 export function measureRouteComplete(routeName) {
-  if (!DEBUG_PERF) return;
-  measure(`Route ${routeName} fully rendered`, `route-${routeName}`);
+  if (!PERF_ENABLED) return;
+  measure(`Route ${routeName} fully rendered`, `route-${routeName}`, `route.${routeName}`);
 }
 
 /**
@@ -155,5 +288,5 @@ export function logListRender(listName, itemCount) {
   console.log(`[Perf] ${listName}: ${itemCount} items rendered`);
 }
 
-// Export DEBUG flag for conditional logging
-export { DEBUG_PERF };
+// Export flags for conditional instrumentation
+export { DEBUG_PERF, PERF_ENABLED };
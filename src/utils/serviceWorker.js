@@ -0,0 +1,21 @@
+/**
+ * Service worker registration (production builds; the worker is src/sw.js,
+ * built by scripts/serviceWorker.js). VITE_SERVICE_WORKER=false unregisters
+ * an installed worker instead, e.g. to rule it out while debugging.
+ */
+
+export function registerServiceWorker() {
+  if (!import.meta.env.PROD || typeof navigator === 'undefined' || !('serviceWorker' in navigator)) return;
+
+  if (import.meta.env.VITE_SERVICE_WORKER === 'false') {
+    navigator.serviceWorker.getRegistrations()
+      .then(registrations => registrations.forEach(registration => registration.unregister()));
+    return;
+  }
+
+  // After load, so installing (precaching the build) never competes with startup
+  window.addEventListener('load', () => {
+    navigator.serviceWorker.register(`${import.meta.env.BASE_URL}sw.js`)
+      .catch(err => console.warn('Service worker registration failed:', err));
+  });
+}
@@ -54,28 +54,14 @@ def delete_item(token, type_, item_id):
 def test_create_new_shortcut_group_or_app_with_authorization():
     # Item data samples for each collection type
     sample_items = {
-        "shortcuts": {
-            # generic shortcut data
-            "sequence": ["Ctrl", "Shift", "N"],
-            "category": "TestCategory",
-            "app": "TestApp",
-            "action": "TestAction",
-            "notes": "Test notes",
-            "appId": "app_test_123"
-        },
-        "groups": {
-            "name": "Test Group",
-            "icon": "test_icon",
-            "color": "#123456"
-        },
         "apps": {
             "name": "Test App",
-            "icon": "dGVzdF9pbWFnZQ==",  # base64 encoded string 'test_image'
             "category": "Utility",
-            "linkedShortcuts": []
+            "bundleId": "com.example.testapp",
+            "tags": ["test"]
         },
         "leaderShortcuts": {
-            "sequence": ["Cmd", "L"],
+            "sequence": ["Leader", "t", "l"],
             "category": "LeaderCategory",
             "app": "LeaderApp",
             "action": "LeaderAction",
@@ -83,34 +69,23 @@ def test_create_new_shortcut_group_or_app_with_authorization():
             "appId": "leader_app_id"
         },
         "raycastShortcuts": {
-            "action": "RaycastAction",
-            "key": "R",
-            "modifiers": ["Cmd", "Shift"],
-            "group": "RaycastGroup",
-            "type": "RaycastType",
-            "description": "Raycast test shortcut"
+            "commandName": "RaycastAction",
+            "keys": "Cmd+Shift+R",
+            "aliasText": None,
+            "category": "RaycastGroup",
+            "notes": "Raycast test shortcut"
         },
         "systemShortcuts": {
             "action": "SystemAction",
-            "key": "S",
-            "modifiers": ["Ctrl"],
-            "group": "SystemGroup",
-            "description": None
+            "keys": "Ctrl+S",
+            "appOrContext": "Global",
+            "category": "SystemGroup",
+            "notes": None
         },
         "leaderGroups": {
+            "key": "t",
             "name": "Leader Group",
-            "icon": "leader_icon_data",
-            "color": "#abcdef"
-        },
-        "raycastGroups": {
-            "name": "Raycast Group",
-            "icon": "raycast_icon_data",
-            "color": "#fedcba"
-        },
-        "systemGroups": {
-            "name": "System Group",
-            "icon": "system_icon_data",
-            "color": "#654321"
+            "parentKey": None
         }
     }
 
@@ -167,4 +142,22 @@ def test_create_new_shortcut_group_or_app_with_authorization():
                 except AssertionError as err:
                     raise
 
+    # Items are validated against the collection schema
+    token = login_get_token(USERS["admin"]["username"], USERS["admin"]["password"])
+    response = create_item(token, "raycastShortcuts", {"keys": "Cmd+K", "notes": 42})
+    assert response.status_code == 400, f"Expected 400 for an invalid item, got {response.status_code}"
+    details = response.json().get("details", [])
+    assert "commandName is required" in details and "notes must be a string" in details, f"Unexpected details: {details}"
+
+    response = create_item(token, "raycastGroups", {"name": "Not a collection"})
+    assert response.status_code == 400, f"Expected 400 for an unknown type, got {response.status_code}"
+
+    # Unknown fields are dropped and the legacy 'extension' field lands in 'category'
+    response = create_item(token, "raycastShortcuts", {"commandName": "Legacy", "extension": "Old Ext", "color": "#fff"})
+    assert response.status_code == 200, f"Expected 200 for a valid item, got {response.status_code}"
+    created = response.json()
+    assert created.get("category") == "Old Ext", "Legacy 'extension' should be moved to 'category'"
+    assert "extension" not in created and "color" not in created, "Unknown fields should be stripped"
+    delete_item(token, "raycastShortcuts", created["id"])
+
 test_create_new_shortcut_group_or_app_with_authorization()
\ No newline at end of file
@@ -49,9 +49,9 @@ def test_TC007_update_existing_shortcut_group_or_app_with_authorization():
 
     # Sample creation data for group (without id to auto-generate)
     create_data = {
+        "key": "u",
         "name": "Test Group for Update",
-        "icon": "test-icon",
-        "color": "#123456"
+        "parentKey": None
     }
 
     admin_item_id = None
@@ -70,9 +70,7 @@ def test_TC007_update_existing_shortcut_group_or_app_with_authorization():
 
         # Updated data for PUT request
         update_data = {
-            "name": "Updated Test Group",
-            "icon": "updated-icon",
-            "color": "#654321"
+            "name": "Updated Test Group"
         }
 
         # 1. Valid update by admin on admin's item - expect 200
@@ -83,6 +81,10 @@ def test_TC007_update_existing_shortcut_group_or_app_with_authorization():
         resp = update_item(demo_token, type_, demo_item_id, update_data)
         assert resp.status_code == 200, f"Demo user update failed with status {resp.status_code}"
 
+        # 2b. Update that breaks the schema - expect 400
+        resp_invalid_item = update_item(admin_token, type_, admin_item_id, {"name": ""})
+        assert resp_invalid_item.status_code == 400, f"Expected 400 for invalid update, got {resp_invalid_item.status_code}"
+
         # 3. Invalid type - expect 400
         invalid_type = "invalidType123"
         resp_invalid_type = update_item(admin_token, invalid_type, admin_item_id, update_data)
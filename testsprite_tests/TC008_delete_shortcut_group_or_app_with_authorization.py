@@ -9,15 +9,11 @@ DEMO_CREDENTIALS = {"username": "gabby_demo", "password": "gabby123"}
 GUEST_TOKEN = None  # No token for guest (unauthorized)
 
 VALID_TYPES = [
-    "shortcuts",
-    "groups",
     "apps",
     "leaderShortcuts",
     "raycastShortcuts",
     "systemShortcuts",
-    "leaderGroups",
-    "raycastGroups",
-    "systemGroups"
+    "leaderGroups"
 ]
 
 INVALID_TYPE = "invalidTypeTest"
@@ -66,16 +62,16 @@ def test_tc008_delete_shortcut_group_app_authorization():
     assert admin_token is not None, "Admin login failed"
     assert demo_token is not None, "Demo login failed"
 
-    # Prepare a new item data for creation (choosing 'groups' as a type example)
-    type_ = "groups"
+    # Prepare a new item data for creation (choosing 'leaderGroups' as a type example)
+    type_ = "leaderGroups"
     created_id = None
     created_by_demo_id = None
 
     # Sample valid group data without id (id auto-generated by server)
     group_data = {
+        "key": "d",
         "name": f"Test Group {uuid.uuid4()}",
-        "icon": "test-icon",
-        "color": "#abcdef",
+        "parentKey": None,
     }
 
     # Create resource with admin token
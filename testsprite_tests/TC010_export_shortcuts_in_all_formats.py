@@ -0,0 +1,58 @@
+import csv
+import io
+import requests
+
+BASE_URL = "http://localhost:3001"
+EXPORT_ENDPOINT = f"{BASE_URL}/api/export"
+TIMEOUT = 30
+
+def test_export_shortcuts_in_all_formats():
+    # Not logged in - exports the demo data (showcase mode)
+    try:
+        # Markdown (default format)
+        response = requests.get(EXPORT_ENDPOINT, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
+        assert response.headers.get("Content-Type", "").startswith("text/markdown"), "Markdown export should be text/markdown"
+        assert "attachment" in response.headers.get("Content-Disposition", ""), "Export should be served as a download"
+        assert response.text.startswith("# Keyboard Shortcuts Reference"), "Markdown export missing title"
+
+        # JSON - must parse and leave icons out by default
+        response = requests.get(EXPORT_ENDPOINT, params={"format": "json", "collections": "appsLibrary,raycastShortcuts"}, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected status 200 for json export, got {response.status_code}"
+        data = response.json()
+        assert set(data.keys()) <= {"appsLibrary", "raycastShortcuts"}, f"Unexpected collections in export: {list(data.keys())}"
+        for items in data.values():
+            assert all("iconUrl" not in item for item in items), "iconUrl should be omitted unless icons=true"
+
+        # JSON with icons requested
+        response = requests.get(EXPORT_ENDPOINT, params={"format": "json", "collections": "appsLibrary", "icons": "true"}, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected status 200 for json export with icons, got {response.status_code}"
+        apps = response.json().get("appsLibrary", [])
+        if apps:
+            assert any("iconUrl" in app for app in apps), "iconUrl should be included when icons=true"
+
+        # CSV - header row plus one row per item
+        response = requests.get(EXPORT_ENDPOINT, params={"format": "csv"}, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected status 200 for csv export, got {response.status_code}"
+        rows = list(csv.reader(io.StringIO(response.text)))
+        assert rows and rows[0][:2] == ["collection", "id"], f"Unexpected CSV header: {rows[0] if rows else None}"
+
+        # Native config formats
+        response = requests.get(EXPORT_ENDPOINT, params={"format": "raycast"}, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected status 200 for raycast export, got {response.status_code}"
+        assert isinstance(response.json().get("commands"), list), "Raycast export should contain a commands list"
+
+        response = requests.get(EXPORT_ENDPOINT, params={"format": "leaderkey"}, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected status 200 for leaderkey export, got {response.status_code}"
+        tree = response.json()
+        assert tree.get("type") == "group" and isinstance(tree.get("actions"), list), "Leader Key export should be a group tree"
+
+        # Invalid format and collection are rejected
+        response = requests.get(EXPORT_ENDPOINT, params={"format": "pdf"}, timeout=TIMEOUT)
+        assert response.status_code == 400, f"Expected status 400 for unknown format, got {response.status_code}"
+        response = requests.get(EXPORT_ENDPOINT, params={"format": "json", "collections": "bogus"}, timeout=TIMEOUT)
+        assert response.status_code == 400, f"Expected status 400 for unknown collection, got {response.status_code}"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+test_export_shortcuts_in_all_formats()
@@ -0,0 +1,64 @@
+import requests
+import uuid
+
+BASE_URL = "http://localhost:3001"
+REGISTER_ENDPOINT = f"{BASE_URL}/api/auth/register"
+IMPORT_ENDPOINT = f"{BASE_URL}/api/import"
+SHORTCUTS_ENDPOINT = f"{BASE_URL}/api/shortcuts"
+TIMEOUT = 30
+
+def test_bulk_import_native_config_exports():
+    # Fresh client user so the import starts from an empty library
+    username = f"import_{uuid.uuid4().hex[:8]}"
+    try:
+        reg = requests.post(REGISTER_ENDPOINT, json={"username": username, "password": "ImportPass123!"}, timeout=TIMEOUT)
+        assert reg.status_code == 201, f"Registration failed with status {reg.status_code}"
+        headers = {"Authorization": f"Bearer {reg.json()['token']}", "Content-Type": "application/json"}
+
+        # Import requires authentication
+        response = requests.post(IMPORT_ENDPOINT, json={"data": {"commands": []}}, timeout=TIMEOUT)
+        assert response.status_code == 401, f"Expected 401 without token, got {response.status_code}"
+
+        raycast_export = {
+            "commands": [
+                {"title": f"Command {i}", "hotkey": f"command+shift+{i}", "extension": "Imported"}
+                for i in range(2000)
+            ] + [{"title": "Clipboard History", "alias": "ch"}]
+        }
+        response = requests.post(IMPORT_ENDPOINT, json={"data": raycast_export}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200 for import, got {response.status_code}"
+        result = response.json()
+        assert result["format"] == "raycast", f"Format should be auto-detected as raycast, got {result['format']}"
+        assert result["added"].get("raycastShortcuts") == 2001, f"Expected 2001 new items, got {result['added']}"
+        assert result["durationMs"] < 1000, f"Import took {result['durationMs']}ms of server time"
+
+        # Importing the same export again adds nothing
+        response = requests.post(IMPORT_ENDPOINT, json={"data": raycast_export}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200 for re-import, got {response.status_code}"
+        assert response.json()["added"] == {}, "Re-importing should skip every duplicate"
+        assert response.json()["skipped"] == 2001, "Every item should be reported as a duplicate"
+
+        # Keys are normalized to the library's display form
+        data = requests.get(SHORTCUTS_ENDPOINT, headers=headers, timeout=TIMEOUT).json()
+        keys = {s["commandName"]: s.get("keys") for s in data["raycastShortcuts"]}
+        assert keys["Command 7"] == "Cmd+Shift+7", f"Unexpected normalized keys: {keys['Command 7']}"
+
+        # Leader Key config in dry-run mode is reported but not saved
+        leader_config = {"type": "group", "actions": [
+            {"key": "o", "type": "group", "label": "Open", "actions": [
+                {"key": "s", "type": "application", "value": "/Applications/Safari.app", "label": "Safari"}
+            ]}
+        ]}
+        response = requests.post(IMPORT_ENDPOINT, json={"data": leader_config, "dryRun": True}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200 for dry run, got {response.status_code}"
+        assert response.json()["added"] == {"leaderGroups": 1, "leaderShortcuts": 1}, f"Unexpected dry run result: {response.json()}"
+        data = requests.get(SHORTCUTS_ENDPOINT, headers=headers, timeout=TIMEOUT).json()
+        assert data["leaderShortcuts"] == [], "Dry run must not save anything"
+
+        # Unknown payloads are rejected
+        response = requests.post(IMPORT_ENDPOINT, json={"data": {"foo": 1}}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 400, f"Expected 400 for unrecognized format, got {response.status_code}"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+test_bulk_import_native_config_exports()
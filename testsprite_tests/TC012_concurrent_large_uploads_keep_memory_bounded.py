@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:3001"
+LOGIN_ENDPOINT = f"{BASE_URL}/api/auth/login"
+HEALTH_ENDPOINT = f"{BASE_URL}/api/health"
+ICONS_ENDPOINT = f"{BASE_URL}/api/icons"
+SHORTCUTS_ENDPOINT = f"{BASE_URL}/api/shortcuts"
+TIMEOUT = 60
+
+UPLOADS = 24
+UPLOAD_SIZE = 4 * 1024 * 1024          # just under the 5MB icon limit
+CONCURRENCY = 8
+# Buffering the uploads would cost UPLOADS * UPLOAD_SIZE (96MB); streaming should cost far less
+MAX_RSS_GROWTH = 48 * 1024 * 1024
+
+
+def login(username, password):
+    response = requests.post(LOGIN_ENDPOINT, json={"username": username, "password": password}, timeout=TIMEOUT)
+    assert response.status_code == 200, f"Login failed with status {response.status_code}"
+    return response.json()["token"]
+
+
+def server_rss():
+    response = requests.get(HEALTH_ENDPOINT, timeout=TIMEOUT)
+    assert response.status_code == 200, f"Health check failed with status {response.status_code}"
+    return response.json()["memory"]["rss"]
+
+
+def chunked(data, size=256 * 1024):
+    # Generator body -> chunked transfer encoding, so the server can't rely on Content-Length
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+class MemorySampler:
+    """Polls the server's RSS in the background while the load runs."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.samples.append(server_rss())
+            except (requests.RequestException, AssertionError):
+                pass
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def test_concurrent_large_uploads_keep_memory_bounded():
+    token = login("renshu", "renshu123")
+    headers = {"Authorization": f"Bearer {token}"}
+    payload = os.urandom(UPLOAD_SIZE)
+    uploaded = []
+
+    try:
+        # Uploads are raw bytes with an image content type
+        response = requests.post(ICONS_ENDPOINT, data=b"x", headers={**headers, "Content-Type": "application/json"}, timeout=TIMEOUT)
+        assert response.status_code == 415, f"Expected 415 for a non-image upload, got {response.status_code}"
+        response = requests.post(ICONS_ENDPOINT, data=b"\x89PNG", headers={"Content-Type": "image/png"}, timeout=TIMEOUT)
+        assert response.status_code == 401, f"Expected 401 without token, got {response.status_code}"
+
+        # Oversized bodies are refused, whether or not the size is declared up front
+        too_big = os.urandom(6 * 1024 * 1024)
+        response = requests.post(ICONS_ENDPOINT, data=too_big, headers={**headers, "Content-Type": "image/png"}, timeout=TIMEOUT)
+        assert response.status_code == 413, f"Expected 413 for a declared oversized upload, got {response.status_code}"
+        response = requests.post(ICONS_ENDPOINT, data=chunked(too_big), headers={**headers, "Content-Type": "image/png"}, timeout=TIMEOUT)
+        assert response.status_code == 413, f"Expected 413 for a streamed oversized upload, got {response.status_code}"
+
+        # CRUD routes only accept small JSON bodies
+        response = requests.post(
+            f"{SHORTCUTS_ENDPOINT}/raycastShortcuts",
+            json={"commandName": "Too big", "notes": "x" * (2 * 1024 * 1024)},
+            headers=headers,
+            timeout=TIMEOUT,
+        )
+        assert response.status_code == 413, f"Expected 413 for an oversized JSON body, got {response.status_code}"
+        assert "error" in response.json(), "Oversized JSON bodies should get a JSON error"
+
+        def upload(i):
+            body = payload if i % 2 else chunked(payload)
+            response = requests.post(ICONS_ENDPOINT, data=body, headers={**headers, "Content-Type": "image/png"}, timeout=TIMEOUT)
+            assert response.status_code == 201, f"Upload {i} failed with status {response.status_code}: {response.text}"
+            return response.json()
+
+        baseline = server_rss()
+        with MemorySampler() as sampler, ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+            uploaded.extend(pool.map(upload, range(UPLOADS)))
+        peak = max(sampler.samples + [server_rss()])
+
+        assert len(uploaded) == UPLOADS, f"Expected {UPLOADS} uploads, got {len(uploaded)}"
+        assert all(icon["size"] == UPLOAD_SIZE for icon in uploaded), "Every upload should be stored in full"
+        growth = peak - baseline
+        assert growth < MAX_RSS_GROWTH, (
+            f"Server RSS grew by {growth / 1024 / 1024:.1f}MB for {UPLOADS} x {UPLOAD_SIZE // 1024 // 1024}MB uploads"
+        )
+
+        # Stored bytes come back unchanged and are cacheable forever
+        response = requests.get(f"{BASE_URL}{uploaded[0]['url']}", timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200 for icon download, got {response.status_code}"
+        assert response.content == payload, "Downloaded icon differs from the upload"
+        assert "immutable" in response.headers.get("Cache-Control", ""), "Icons should be served as immutable"
+        assert response.headers.get("Content-Type") == "image/png", "Icons keep their uploaded content type"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+    finally:
+        for icon in uploaded:
+            requests.delete(f"{ICONS_ENDPOINT}/{icon['id']}", headers=headers, timeout=TIMEOUT)
+
+
+test_concurrent_large_uploads_keep_memory_bounded()
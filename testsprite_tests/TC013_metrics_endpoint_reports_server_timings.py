@@ -0,0 +1,101 @@
+import re
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:3001"
+METRICS_ENDPOINT = f"{BASE_URL}/api/metrics"
+LOGIN_ENDPOINT = f"{BASE_URL}/api/auth/login"
+SHORTCUTS_ENDPOINT = f"{BASE_URL}/api/shortcuts"
+TIMEOUT = 30
+REQUESTS_PER_ROUTE = 40
+
+SAMPLE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+LABEL_PATTERN = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def scrape():
+    """Fetch /api/metrics and return {(name, frozenset(labels)): value}."""
+    response = requests.get(METRICS_ENDPOINT, timeout=TIMEOUT)
+    assert response.status_code == 200, f"Expected 200 from metrics, got {response.status_code}"
+    assert response.headers.get("Content-Type", "").startswith("text/plain"), "Metrics must use the Prometheus text format"
+    samples = {}
+    for line in response.text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = SAMPLE_PATTERN.match(line)
+        assert match, f"Malformed metrics line: {line}"
+        name, labels, value = match.groups()
+        samples[(name, frozenset(LABEL_PATTERN.findall(labels or "")))] = float(value)
+    return samples
+
+
+def total(samples, name, **labels):
+    wanted = set(labels.items())
+    return sum(value for (n, l), value in samples.items() if n == name and wanted <= set(l))
+
+
+def server_mean(before, after, route, method="GET"):
+    """Mean server-side latency (seconds) for `route` between two scrapes."""
+    count = total(after, "http_request_duration_seconds_count", route=route, method=method) - \
+        total(before, "http_request_duration_seconds_count", route=route, method=method)
+    seconds = total(after, "http_request_duration_seconds_sum", route=route, method=method) - \
+        total(before, "http_request_duration_seconds_sum", route=route, method=method)
+    return count, (seconds / count if count else 0.0)
+
+
+def timed_get(url, headers=None):
+    started = time.perf_counter()
+    response = requests.get(url, headers=headers or {}, timeout=TIMEOUT)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, f"GET {url} failed with status {response.status_code}"
+    return elapsed
+
+
+def test_metrics_endpoint_reports_server_timings():
+    try:
+        login = requests.post(LOGIN_ENDPOINT, json={"username": "renshu", "password": "renshu123"}, timeout=TIMEOUT)
+        assert login.status_code == 200, f"Login failed with status {login.status_code}"
+        headers = {"Authorization": f"Bearer {login.json()['token']}"}
+
+        before = scrape()
+        runs = {
+            "/api/shortcuts (demo)": ("/api/shortcuts", lambda: timed_get(SHORTCUTS_ENDPOINT)),
+            "/api/shortcuts (admin)": ("/api/shortcuts", lambda: timed_get(SHORTCUTS_ENDPOINT, headers)),
+            "/api/export": ("/api/export", lambda: timed_get(f"{BASE_URL}/api/export?format=json")),
+        }
+        client = {}
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for label, (_, call) in runs.items():
+                client[label] = list(pool.map(lambda _: call(), range(REQUESTS_PER_ROUTE)))
+        after = scrape()
+
+        # Server-side numbers next to client-side latency
+        print(f"{'route':<26}{'client p50':>12}{'client mean':>13}{'server mean':>13}")
+        for route in sorted({route for route, _ in runs.values()}):
+            latencies = [t for label, (r, _) in runs.items() if r == route for t in client[label]]
+            count, mean = server_mean(before, after, route)
+            assert count >= len(latencies), f"Expected {len(latencies)} requests recorded for {route}, got {count}"
+            client_mean = statistics.mean(latencies)
+            print(f"{route:<26}{statistics.median(latencies) * 1000:>10.1f}ms{client_mean * 1000:>11.1f}ms{mean * 1000:>11.1f}ms")
+            assert mean <= client_mean, f"Server time for {route} can't exceed what the client measured"
+
+        # DB timings, payload sizes, cache hits and event-loop lag are all exposed
+        for name, labels in [
+            ("userdata_operation_duration_seconds_count", {"operation": "get"}),
+            ("mongodb_command_duration_seconds_count", {"command": "find"}),
+            ("http_response_size_bytes_sum", {"route": "/api/export"}),
+            ("cache_lookups_total", {"cache": "demo_owner"}),
+        ]:
+            assert total(after, name, **labels) > total(before, name, **labels), f"{name} {labels} did not move under load"
+        assert ("cache_hit_ratio", frozenset({("cache", "demo_owner")})) in after, "Demo owner cache hit ratio missing"
+        assert total(after, "cache_hit_ratio", cache="demo_owner") > 0.5, "Repeated anonymous reads should hit the demo owner cache"
+        assert any(name == "nodejs_eventloop_lag_seconds" for name, _ in after), "Event-loop lag missing"
+        assert total(after, "process_resident_memory_bytes") > 0, "Process memory missing"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+
+test_metrics_endpoint_reports_server_timings()
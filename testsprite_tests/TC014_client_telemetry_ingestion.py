@@ -0,0 +1,73 @@
+import json
+import uuid
+
+import requests
+
+BASE_URL = "http://localhost:3001"
+TELEMETRY_ENDPOINT = f"{BASE_URL}/api/telemetry"
+LOGIN_ENDPOINT = f"{BASE_URL}/api/auth/login"
+TIMEOUT = 30
+
+
+def login(username, password):
+    response = requests.post(LOGIN_ENDPOINT, json={"username": username, "password": password}, timeout=TIMEOUT)
+    assert response.status_code == 200, f"Login failed with status {response.status_code}"
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+
+# The release a dev build reports (no VITE_RELEASE / TELEMETRY_RELEASES set);
+# metric names are unique per run so earlier runs don't skew the counts
+RELEASE = "dev"
+
+
+def test_client_telemetry_ingestion():
+    run = uuid.uuid4().hex[:8]
+    search, network = f"search_{run}", f"ttfd.network_{run}"
+    try:
+        # Beacons arrive as text/plain JSON, without auth
+        for start in range(0, 100, 50):
+            batch = {"release": RELEASE, "samples": [{"m": search, "v": float(v)} for v in range(start, start + 50)]}
+            response = requests.post(
+                TELEMETRY_ENDPOINT,
+                data=json.dumps(batch),
+                headers={"Content-Type": "text/plain;charset=UTF-8"},
+                timeout=TIMEOUT,
+            )
+            assert response.status_code == 204, f"Expected 204 for a beacon, got {response.status_code}"
+
+        # Plain JSON works too; bad samples are dropped, malformed batches rejected
+        response = requests.post(TELEMETRY_ENDPOINT, json={"release": RELEASE, "samples": [
+            {"m": network, "v": 420.5}, {"m": "bad metric!", "v": 1}, {"m": search, "v": -5}
+        ]}, timeout=TIMEOUT)
+        assert response.status_code == 204, f"Expected 204 for a JSON batch, got {response.status_code}"
+        # Releases the server didn't build are accepted but never recorded
+        response = requests.post(TELEMETRY_ENDPOINT, json={"release": f"fake-{run}", "samples": [
+            {"m": search, "v": 1.0}
+        ]}, timeout=TIMEOUT)
+        assert response.status_code == 204, f"Expected 204 for an unknown release, got {response.status_code}"
+        response = requests.post(TELEMETRY_ENDPOINT, data="not json", headers={"Content-Type": "text/plain"}, timeout=TIMEOUT)
+        assert response.status_code == 400, f"Expected 400 for a malformed batch, got {response.status_code}"
+        response = requests.post(TELEMETRY_ENDPOINT, json={"samples": [{"m": "x", "v": 1}] * 500}, timeout=TIMEOUT)
+        assert response.status_code == 400, f"Expected 400 for an oversized batch, got {response.status_code}"
+
+        # Rolling percentiles are admin-only
+        response = requests.get(TELEMETRY_ENDPOINT, headers=login("gabby_demo", "gabby123"), timeout=TIMEOUT)
+        assert response.status_code == 403, f"Expected 403 for non-admin, got {response.status_code}"
+        response = requests.get(TELEMETRY_ENDPOINT, headers=login("renshu", "renshu123"), timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200 for admin, got {response.status_code}"
+        summary = response.json()["metrics"]
+        rows = {row["metric"]: row for row in summary if row["release"] == RELEASE and row["metric"].endswith(run)}
+        assert set(rows) == {search, network}, f"Unexpected metrics recorded: {sorted(rows)}"
+        assert rows[search]["count"] == 100, f"Expected 100 search samples, got {rows[search]['count']}"
+        assert rows[search]["p50"] == 50 and rows[search]["p95"] == 95, f"Unexpected percentiles: {rows[search]}"
+        assert not any(row["release"] == f"fake-{run}" for row in summary), "Unknown release was recorded"
+
+        # And they show up on the Prometheus endpoint
+        metrics = requests.get(f"{BASE_URL}/api/metrics", timeout=TIMEOUT).text
+        assert f'client_perf_milliseconds{{release="{RELEASE}",metric="{search}",quantile="0.5"}} 50' in metrics, \
+            "Client percentiles missing from /api/metrics"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+
+test_client_telemetry_ingestion()
@@ -0,0 +1,36 @@
+import requests
+
+BASE_URL = "http://localhost:3001"
+TIMEOUT = 30
+
+
+def test_liveness_and_readiness_probes():
+    try:
+        # Liveness only says the process is serving HTTP
+        for path in ("/api/health", "/api/health/live"):
+            response = requests.get(f"{BASE_URL}{path}", timeout=TIMEOUT)
+            assert response.status_code == 200, f"Expected 200 from {path}, got {response.status_code}"
+            assert response.json().get("status") == "ok", f"Unexpected liveness body from {path}: {response.json()}"
+
+        # A running test server has finished connecting and bootstrapping
+        response = requests.get(f"{BASE_URL}/api/health/ready", timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200 from readiness, got {response.status_code}"
+        body = response.json()
+        assert body["status"] == "ready", f"Unexpected readiness status: {body}"
+        assert body["checks"] == {"mongo": True, "bootstrap": True}, f"Unexpected readiness checks: {body['checks']}"
+        assert isinstance(body["startupMs"], int) and body["startupMs"] > 0, "Readiness should report time-to-ready"
+        assert "error" not in (body.get("bootstrap") or {}), f"Bootstrap failed: {body['bootstrap']}"
+
+        # Bootstrap is idempotent: the default accounts exist exactly as seeded
+        for username, password in (("renshu", "renshu123"), ("gabby_demo", "gabby123")):
+            login = requests.post(f"{BASE_URL}/api/auth/login", json={"username": username, "password": password}, timeout=TIMEOUT)
+            assert login.status_code == 200, f"Default account {username} missing after bootstrap"
+
+        # Time-to-ready is exported for dashboards too
+        metrics = requests.get(f"{BASE_URL}/api/metrics", timeout=TIMEOUT).text
+        assert "server_startup_seconds " in metrics, "server_startup_seconds missing from /api/metrics"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+
+test_liveness_and_readiness_probes()
@@ -0,0 +1,92 @@
+import threading
+import time
+import uuid
+
+import requests
+
+BASE_URL = "http://localhost:3001"
+REGISTER_ENDPOINT = f"{BASE_URL}/api/auth/register"
+LOGIN_ENDPOINT = f"{BASE_URL}/api/auth/login"
+SHORTCUTS_ENDPOINT = f"{BASE_URL}/api/shortcuts"
+TIMEOUT = 30
+READ_SAMPLES = 60
+STORM_THREADS = 16
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def time_reads(session, headers, count):
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        response = session.get(SHORTCUTS_ENDPOINT, headers=headers, timeout=TIMEOUT)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200, f"GET /api/shortcuts returned {response.status_code}"
+    return latencies
+
+
+def test_login_storm_keeps_reads_fast():
+    # TC001 flow: a fresh account to log in with
+    username = f"storm_{uuid.uuid4().hex[:8]}"
+    password = "StormPassword123!"
+    response = requests.post(REGISTER_ENDPOINT, json={"username": username, "password": password}, timeout=TIMEOUT)
+    assert response.status_code == 201, f"Registration failed: {response.status_code} {response.text}"
+
+    # TC002 flow: valid and invalid logins, both of which cost a bcrypt compare
+    login = requests.post(LOGIN_ENDPOINT, json={"username": username, "password": password}, timeout=TIMEOUT)
+    assert login.status_code == 200, f"Login failed: {login.status_code}"
+    headers = {"Authorization": f"Bearer {login.json()['token']}"}
+
+    session = requests.Session()
+    time_reads(session, headers, 5)  # warm up connection and caches
+    baseline = time_reads(session, headers, READ_SAMPLES)
+
+    stop = threading.Event()
+    statuses = {}
+    missing_retry_after = []
+    lock = threading.Lock()
+
+    def storm(worker):
+        storm_session = requests.Session()
+        credentials = {"username": username, "password": password if worker % 2 == 0 else "WrongPass!"}
+        while not stop.is_set():
+            r = storm_session.post(LOGIN_ENDPOINT, json=credentials, timeout=TIMEOUT)
+            with lock:
+                statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+                if r.status_code == 503 and not r.headers.get("Retry-After"):
+                    missing_retry_after.append(r)
+
+    threads = [threading.Thread(target=storm, args=(i,), daemon=True) for i in range(STORM_THREADS)]
+    try:
+        for t in threads:
+            t.start()
+        time.sleep(1)  # let the password queue fill up
+        during = time_reads(session, headers, READ_SAMPLES)
+    finally:
+        stop.set()
+        for t in threads:
+            t.join(timeout=TIMEOUT)
+
+    base_p50, base_p95 = percentile(baseline, 0.5), percentile(baseline, 0.95)
+    storm_p50, storm_p95 = percentile(during, 0.5), percentile(during, 0.95)
+    print(f"GET /api/shortcuts baseline p50 {base_p50:.1f}ms p95 {base_p95:.1f}ms")
+    print(f"GET /api/shortcuts storm    p50 {storm_p50:.1f}ms p95 {storm_p95:.1f}ms")
+    print(f"login responses during storm: {dict(sorted(statuses.items()))}")
+
+    assert sum(statuses.values()) > 0, "The login storm sent no requests"
+    assert set(statuses) <= {200, 401, 503}, f"Unexpected login statuses under load: {statuses}"
+    assert not missing_retry_after, "503 responses must carry Retry-After"
+
+    # bcrypt runs on worker threads, so reads stay close to their unloaded latency
+    assert storm_p95 <= base_p95 * 3 + 50, (
+        f"Read p95 rose from {base_p95:.1f}ms to {storm_p95:.1f}ms during the login storm"
+    )
+
+    metrics = requests.get(f"{BASE_URL}/api/metrics", timeout=TIMEOUT).text
+    assert "password_hash_duration_seconds_count" in metrics, "bcrypt timings missing from /api/metrics"
+
+
+test_login_storm_keeps_reads_fast()
@@ -0,0 +1,80 @@
+import uuid
+
+import requests
+
+BASE_URL = "http://localhost:3001"
+REGISTER_ENDPOINT = f"{BASE_URL}/api/auth/register"
+SHORTCUTS_ENDPOINT = f"{BASE_URL}/api/shortcuts"
+BATCH_ENDPOINT = f"{BASE_URL}/api/shortcuts/batch"
+TIMEOUT = 30
+
+
+def ids(data, collection):
+    return {item["id"] for item in data.get(collection, [])}
+
+
+def test_batch_merge_of_duplicate_shortcuts():
+    # Fresh client account so the batch only touches its own library
+    username = f"batch_{uuid.uuid4().hex[:8]}"
+    response = requests.post(REGISTER_ENDPOINT, json={"username": username, "password": "BatchPassword123!"}, timeout=TIMEOUT)
+    assert response.status_code == 201, f"Registration failed: {response.status_code} {response.text}"
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+    # The same action in three collections, as dedupe_shortcuts.py would find it
+    suffix = uuid.uuid4().hex[:6]
+    items = {
+        "leaderShortcuts": {"id": f"leader_comet_{suffix}", "sequence": ["Leader", "v", "c"], "action": "Open Comet browser", "appId": "app_comet"},
+        "raycastShortcuts": {"id": f"raycast_comet_{suffix}", "commandName": "Open Comet", "keys": "Hyper+B", "notes": "Daily driver", "appId": "app_comet"},
+        "systemShortcuts": {"id": f"sys_comet_{suffix}", "action": "Open Comet browser", "keys": "Hyper+B", "appId": "app_comet"},
+    }
+    for collection, item in items.items():
+        created = requests.post(f"{SHORTCUTS_ENDPOINT}/{collection}", json=item, headers=headers, timeout=TIMEOUT)
+        assert created.status_code == 200, f"Create {collection} failed: {created.status_code} {created.text}"
+
+    operations = [
+        {"op": "update", "type": "leaderShortcuts", "id": items["leaderShortcuts"]["id"], "changes": {"notes": "Daily driver"}},
+        {"op": "delete", "type": "raycastShortcuts", "id": items["raycastShortcuts"]["id"]},
+        {"op": "delete", "type": "systemShortcuts", "id": items["systemShortcuts"]["id"]},
+        {"op": "delete", "type": "systemShortcuts", "id": f"missing_{suffix}"},
+    ]
+
+    # Authentication is required
+    response = requests.post(BATCH_ENDPOINT, json={"operations": operations}, timeout=TIMEOUT)
+    assert response.status_code == 401, f"Expected 401 without a token, got {response.status_code}"
+
+    # One invalid operation rejects the whole batch
+    invalid = operations + [{"op": "update", "type": "raycastShortcuts", "id": items["raycastShortcuts"]["id"], "changes": {"commandName": ""}}]
+    response = requests.post(BATCH_ENDPOINT, json={"operations": invalid}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 400, f"Expected 400 for an invalid operation, got {response.status_code}"
+    response = requests.post(BATCH_ENDPOINT, json={"operations": [{"op": "rename", "type": "systemShortcuts", "id": "x"}]}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 400, f"Expected 400 for an unknown op, got {response.status_code}"
+    response = requests.post(BATCH_ENDPOINT, json={"operations": []}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 400, f"Expected 400 for an empty batch, got {response.status_code}"
+
+    # Dry run reports the changes without writing
+    response = requests.post(BATCH_ENDPOINT, json={"operations": operations, "dryRun": True}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 200, f"Dry run failed: {response.status_code} {response.text}"
+    dry = response.json()
+    assert dry["dryRun"] is True
+    assert dry["deleted"] == {"raycastShortcuts": 1, "systemShortcuts": 1}, dry
+    data = requests.get(SHORTCUTS_ENDPOINT, headers=headers, timeout=TIMEOUT).json()
+    for collection, item in items.items():
+        assert item["id"] in ids(data, collection), f"Dry run removed {collection} item"
+
+    # Apply: one request, one write
+    response = requests.post(BATCH_ENDPOINT, json={"operations": operations}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 200, f"Batch failed: {response.status_code} {response.text}"
+    result = response.json()
+    assert result["deleted"] == {"raycastShortcuts": 1, "systemShortcuts": 1}, result
+    assert result["updated"] == {"leaderShortcuts": 1}, result
+    assert result["missing"] == [{"type": "systemShortcuts", "id": f"missing_{suffix}"}], result
+
+    data = requests.get(SHORTCUTS_ENDPOINT, headers=headers, timeout=TIMEOUT).json()
+    assert items["raycastShortcuts"]["id"] not in ids(data, "raycastShortcuts")
+    assert items["systemShortcuts"]["id"] not in ids(data, "systemShortcuts")
+    kept = next(item for item in data["leaderShortcuts"] if item["id"] == items["leaderShortcuts"]["id"])
+    assert kept["notes"] == "Daily driver", kept
+    assert kept["sequence"] == ["Leader", "v", "c"], "Update must merge into the existing item"
+
+
+test_batch_merge_of_duplicate_shortcuts()
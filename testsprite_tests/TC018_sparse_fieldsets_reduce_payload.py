@@ -0,0 +1,69 @@
+import json
+
+import requests
+
+BASE_URL = "http://localhost:3001"
+SHORTCUTS_ENDPOINT = f"{BASE_URL}/api/shortcuts"
+TIMEOUT = 30
+
+COLLECTIONS = ["leaderShortcuts", "raycastShortcuts", "systemShortcuts", "leaderGroups", "appsLibrary"]
+STORE_COLLECTIONS = "leaderShortcuts,raycastShortcuts,systemShortcuts,leaderGroups,apps"
+
+
+def fetch(params=None):
+    # identity: compare JSON sizes, not what compression makes of them
+    response = requests.get(SHORTCUTS_ENDPOINT, params=params, headers={"Accept-Encoding": "identity"}, timeout=TIMEOUT)
+    assert response.status_code == 200, f"GET {response.url} returned {response.status_code}: {response.text[:200]}"
+    return response.json(), len(response.content)
+
+
+def test_sparse_fieldsets_reduce_payload():
+    # Guests read the demo library, which has icons in several collections
+    full, full_size = fetch()
+    assert set(COLLECTIONS) <= set(full), f"Full read is missing collections: {sorted(full)}"
+    assert full["apps"] == full["appsLibrary"], "Default response keeps the apps alias"
+
+    # What the app loads: every collection once (no appsLibrary + apps copy)
+    store, store_size = fetch({"collections": STORE_COLLECTIONS})
+    assert sorted(store) == sorted(STORE_COLLECTIONS.split(",")), f"Unexpected collections: {sorted(store)}"
+    assert store["apps"] == full["appsLibrary"]
+    for name in ["leaderShortcuts", "raycastShortcuts", "systemShortcuts", "leaderGroups"]:
+        assert store[name] == full[name], f"{name} differs from the full read"
+    apps_size = len(json.dumps(full["appsLibrary"], separators=(",", ":")).encode())
+    assert store_size <= full_size - apps_size + 64, f"Store read {store_size}B should drop the {apps_size}B apps copy from {full_size}B"
+
+    # Shortcut checker: keys and app links only
+    checker, checker_size = fetch({"collections": "raycastShortcuts,systemShortcuts", "fields": "keys,id,appId"})
+    assert sorted(checker) == ["raycastShortcuts", "systemShortcuts"]
+    for name, items in checker.items():
+        assert len(items) == len(full[name]), f"{name}: projection must not drop items"
+        for item in items:
+            assert set(item) <= {"id", "keys", "appId"}, f"{name} item has extra fields: {sorted(item)}"
+            assert "id" in item
+    assert checker_size < full_size * 0.25, f"Checker read {checker_size}B is not < 25% of the full {full_size}B"
+
+    # Everything but icon blobs
+    no_icons, no_icons_size = fetch({"fields": "-iconUrl"})
+    has_icons = any(item.get("iconUrl") for name in COLLECTIONS for item in full[name])
+    for name in COLLECTIONS:
+        assert len(no_icons[name]) == len(full[name])
+        assert all("iconUrl" not in item for item in no_icons[name]), f"{name} still has iconUrl"
+    if has_icons:
+        assert no_icons_size < full_size, f"Dropping icons did not shrink the payload ({no_icons_size}B vs {full_size}B)"
+
+    # Ids only, always kept even when not asked for
+    ids, _ = fetch({"collections": "leaderShortcuts", "fields": "sequence"})
+    assert [item["id"] for item in ids["leaderShortcuts"]] == [item["id"] for item in full["leaderShortcuts"]]
+
+    # Bad parameters are rejected rather than ignored
+    for params in [
+        {"collections": "notACollection"},
+        {"fields": "keys,-iconUrl"},
+        {"fields": "$where"},
+        {"fields": "raycastShortcuts.keys"},
+    ]:
+        response = requests.get(SHORTCUTS_ENDPOINT, params=params, timeout=TIMEOUT)
+        assert response.status_code == 400, f"Expected 400 for {params}, got {response.status_code}"
+
+
+test_sparse_fieldsets_reduce_payload()
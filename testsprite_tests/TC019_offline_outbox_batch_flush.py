@@ -0,0 +1,86 @@
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+BASE_URL = "http://localhost:3001"
+REGISTER_ENDPOINT = f"{BASE_URL}/api/auth/register"
+SHORTCUTS_ENDPOINT = f"{BASE_URL}/api/shortcuts"
+BATCH_ENDPOINT = f"{BASE_URL}/api/shortcuts/batch"
+TIMEOUT = 30
+
+
+def by_id(data, collection):
+    return {item["id"]: item for item in data.get(collection, [])}
+
+
+def test_offline_outbox_batch_flush():
+    username = f"outbox_{uuid.uuid4().hex[:8]}"
+    response = requests.post(REGISTER_ENDPOINT, json={"username": username, "password": "OutboxPassword123!"}, timeout=TIMEOUT)
+    assert response.status_code == 201, f"Registration failed: {response.status_code} {response.text}"
+    headers = {"Authorization": f"Bearer {response.json()['token']}"}
+
+    existing = {"id": f"raycast_keep_{uuid.uuid4().hex[:6]}", "commandName": "Clipboard History", "keys": "Hyper+V"}
+    created = requests.post(f"{SHORTCUTS_ENDPOINT}/raycastShortcuts", json=existing, headers=headers, timeout=TIMEOUT)
+    assert created.status_code == 200, f"Create failed: {created.status_code} {created.text}"
+
+    # What the client queues offline: an app and a shortcut that points at it
+    # (both with temp ids), an edit of the new shortcut, then edits of an
+    # existing item and of one that was deleted elsewhere
+    operations = [
+        {"op": "create", "type": "apps", "id": "temp_1_0", "item": {"name": "Comet"}},
+        {"op": "create", "type": "raycastShortcuts", "id": "temp_1_1", "item": {"commandName": "Open Comet", "appId": "temp_1_0"}},
+        {"op": "update", "type": "raycastShortcuts", "id": "temp_1_1", "changes": {"keys": "Hyper+B"}},
+        {"op": "update", "type": "raycastShortcuts", "id": existing["id"], "changes": {"notes": "Edited offline"}},
+        {"op": "delete", "type": "systemShortcuts", "id": "deleted_elsewhere"},
+    ]
+    batch_id = str(uuid.uuid4())
+    response = requests.post(BATCH_ENDPOINT, json={"batchId": batch_id, "operations": operations}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 200, f"Batch failed: {response.status_code} {response.text}"
+    result = response.json()
+    assert set(result["ids"]) == {"temp_1_0", "temp_1_1"}, result
+    app_id, shortcut_id = result["ids"]["temp_1_0"], result["ids"]["temp_1_1"]
+    assert not app_id.startswith("temp_") and not shortcut_id.startswith("temp_")
+    assert result["created"] == {"appsLibrary": 1, "raycastShortcuts": 1}, result
+    assert result["updated"] == {"raycastShortcuts": 2}, result
+    assert result["missing"] == [{"type": "systemShortcuts", "id": "deleted_elsewhere"}], result
+    assert len(result["items"]) == len(operations)
+    assert result["items"][2] == {"id": shortcut_id, "commandName": "Open Comet", "appId": app_id, "keys": "Hyper+B"}, result["items"][2]
+
+    data = requests.get(SHORTCUTS_ENDPOINT, headers=headers, timeout=TIMEOUT).json()
+    assert by_id(data, "apps")[app_id]["name"] == "Comet"
+    shortcut = by_id(data, "raycastShortcuts")[shortcut_id]
+    assert shortcut["appId"] == app_id, "Temp id references must be remapped"
+    assert shortcut["keys"] == "Hyper+B"
+    assert by_id(data, "raycastShortcuts")[existing["id"]]["notes"] == "Edited offline"
+
+    # A retry after a lost response replays instead of creating duplicates
+    response = requests.post(BATCH_ENDPOINT, json={"batchId": batch_id, "operations": operations}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 200
+    assert response.json()["ids"] == result["ids"]
+    assert response.json().get("replayed") is True
+    data = requests.get(SHORTCUTS_ENDPOINT, headers=headers, timeout=TIMEOUT).json()
+    assert sum(1 for item in data["raycastShortcuts"] if item.get("commandName") == "Open Comet") == 1
+    assert sum(1 for item in data["apps"] if item.get("name") == "Comet") == 1
+
+    # The same batch sent twice at once (a retry racing the original, possibly
+    # on another server worker) is applied once; both get the same ids
+    racing = [{"op": "create", "type": "systemShortcuts", "id": "temp_3_0", "item": {"action": "Race Lock", "keys": "Cmd+Ctrl+Q"}}]
+    body = {"batchId": str(uuid.uuid4()), "operations": racing}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        responses = list(pool.map(lambda _: requests.post(BATCH_ENDPOINT, json=body, headers=headers, timeout=TIMEOUT), range(2)))
+    assert all(r.status_code == 200 for r in responses), [r.text for r in responses]
+    assert responses[0].json()["ids"] == responses[1].json()["ids"]
+    data = requests.get(SHORTCUTS_ENDPOINT, headers=headers, timeout=TIMEOUT).json()
+    assert sum(1 for item in data["systemShortcuts"] if item.get("action") == "Race Lock") == 1, "A batchId must only ever apply once"
+
+    # One invalid operation rejects the batch and names its index
+    bad = [{"op": "create", "type": "raycastShortcuts", "id": "temp_2_0", "item": {"keys": "Hyper+X"}}]
+    response = requests.post(BATCH_ENDPOINT, json={"batchId": str(uuid.uuid4()), "operations": bad}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 400
+    assert response.json()["details"][0]["index"] == 0
+    response = requests.post(BATCH_ENDPOINT, json={"batchId": 42, "operations": operations}, headers=headers, timeout=TIMEOUT)
+    assert response.status_code == 400, "batchId must be a string"
+
+
+test_offline_outbox_batch_flush()
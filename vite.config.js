@@ -1,9 +1,15 @@
 import { defineConfig } from 'vite'
 import react from '@vitejs/plugin-react'
+import { bundleBudget } from './scripts/bundleBudget.js'
+import { precompress } from './scripts/precompress.js'
+import { serviceWorker } from './scripts/serviceWorker.js'
 
 // https://vite.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  // bundleBudget fails the build when the initial JS (gzip) exceeds the budget;
+  // precompress writes .br/.gz next to every asset for the server to send as-is;
+  // serviceWorker emits dist/sw.js with the build's precache list
+  plugins: [react(), bundleBudget({ budgetKb: 150 }), serviceWorker(), precompress()],
   
   // Build optimizations
   build: {
@@ -16,14 +22,16 @@ export default defineConfig({
     // Code splitting configuration
     rollupOptions: {
       output: {
-        // Chunk splitting for better caching
+        // Chunk splitting for better caching. Pages and editors are lazy
+        // chunks of their own (src/pages/index.js); lucide-react stays out of
+        // the vendor chunks so each page only carries the icons it uses.
         manualChunks: {
           // Separate React into its own chunk
           'react-vendor': ['react', 'react-dom'],
           // Separate animations (heavy library)
           'framer': ['framer-motion'],
           // UI utilities
-          'ui-utils': ['lucide-react', 'clsx', 'tailwind-merge'],
+          'ui-utils': ['clsx', 'tailwind-merge'],
         },
       },
     },
@@ -44,6 +52,7 @@ export default defineConfig({
     warmup: {
       clientFiles: [
         './src/App.jsx',
+        './src/pages/*.jsx',
         './src/components/**/*.jsx',
       ],
     },